@@ -5,12 +5,9 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
-from src.location_fetcher import LocationFetcher, GeocodingError
-from src.enhanced_location_fetcher import EnhancedLocationFetcher
-from src.document_parser import DocumentParser
-from src.building_estimator import BuildingEstimator
-from src.idf_generator import IDFGenerator
-from src.professional_idf_generator import ProfessionalIDFGenerator
+from src.location_fetcher import GeocodingError
+from src.core.instrumentation import span
+from src.core.stage_reporting import report_stage
 from src.utils import ConfigManager, merge_params, ensure_directory
 
 
@@ -28,30 +25,84 @@ class IDFCreator:
         """
         self.config_manager = ConfigManager.get_instance(config_path)
         self.config = self.config_manager.config
+        self.config_path = config_path
+        self.enhanced = enhanced
+        self.professional = professional
+        
+        # Subsystems are created on first use so constructing a creator (and
+        # importing this module) stays cheap; see the properties below.
+        self._location_fetcher = None
+        self._document_parser = None
+        self._building_estimator = None
+        self._idf_generator = None
+        # Fallback generator for professional mode, created when first needed
+        self.standard_idf_generator = None
         
-        # Use enhanced fetcher if requested
         if enhanced:
-            self.location_fetcher = EnhancedLocationFetcher()
             print("✨ Using ENHANCED mode with multiple free APIs!")
         else:
-            self.location_fetcher = LocationFetcher()
             print("📝 Using BASIC mode")
         
-        self.document_parser = DocumentParser()
-        self.building_estimator = BuildingEstimator(config_path)
-        
-        # Use professional generator if requested
         if professional:
-            self.idf_generator = ProfessionalIDFGenerator()
-            self.standard_idf_generator = IDFGenerator()
             print("🏗️ Using PROFESSIONAL mode with advanced features!")
         else:
-            self.idf_generator = IDFGenerator()
-            self.standard_idf_generator = None
             print("📝 Using STANDARD mode")
-        
-        self.enhanced = enhanced
-        self.professional = professional
+    
+    @property
+    def location_fetcher(self):
+        """Location fetcher (enhanced or basic), created on first use."""
+        if self._location_fetcher is None:
+            if self.enhanced:
+                from src.enhanced_location_fetcher import EnhancedLocationFetcher
+                self._location_fetcher = EnhancedLocationFetcher()
+            else:
+                from src.location_fetcher import LocationFetcher
+                self._location_fetcher = LocationFetcher()
+        return self._location_fetcher
+    
+    @location_fetcher.setter
+    def location_fetcher(self, fetcher) -> None:
+        self._location_fetcher = fetcher
+    
+    @property
+    def document_parser(self):
+        """Document parser, created on first use."""
+        if self._document_parser is None:
+            from src.document_parser import DocumentParser
+            self._document_parser = DocumentParser()
+        return self._document_parser
+    
+    @document_parser.setter
+    def document_parser(self, parser) -> None:
+        self._document_parser = parser
+    
+    @property
+    def building_estimator(self):
+        """Building estimator shared through the template registry, resolved on first use."""
+        if self._building_estimator is None:
+            from src.template_registry import TemplateRegistry
+            self._building_estimator = TemplateRegistry.get_instance().building_estimator(self.config_path)
+        return self._building_estimator
+    
+    @building_estimator.setter
+    def building_estimator(self, estimator) -> None:
+        self._building_estimator = estimator
+    
+    @property
+    def idf_generator(self):
+        """Professional or standard IDF generator, created on first use."""
+        if self._idf_generator is None:
+            if self.professional:
+                from src.professional_idf_generator import ProfessionalIDFGenerator
+                self._idf_generator = ProfessionalIDFGenerator()
+            else:
+                from src.idf_generator import IDFGenerator
+                self._idf_generator = IDFGenerator()
+        return self._idf_generator
+    
+    @idf_generator.setter
+    def idf_generator(self, generator) -> None:
+        self._idf_generator = generator
     
     def process_inputs(self, address: str, documents: List[str] = None,
                       user_params: Dict = None) -> Dict:
@@ -67,10 +118,17 @@ class IDFCreator:
             Dictionary with all building and location information
         """
         print("🔍 Fetching location data...")
+        report_stage('geocode')
         
         # Use enhanced method if available
         if hasattr(self.location_fetcher, 'fetch_comprehensive_location_data'):
-            location = self.location_fetcher.fetch_comprehensive_location_data(address)
+            context_radius = (user_params or {}).get('context_shading_radius')
+            if context_radius:
+                location = self.location_fetcher.fetch_comprehensive_location_data(
+                    address, context_radius_m=context_radius
+                )
+            else:
+                location = self.location_fetcher.fetch_comprehensive_location_data(address)
         else:
             location = self.location_fetcher.fetch_location_data(address)
         
@@ -81,11 +139,12 @@ class IDFCreator:
         doc_params = {}
         if documents:
             print(f"📄 Parsing {len(documents)} document(s)...")
-            for doc_path in documents:
-                if os.path.exists(doc_path):
-                    params = self.document_parser.parse_document(doc_path)
-                    doc_params.update(params)
-                    print(f"✓ Parsed {Path(doc_path).name}")
+            existing = [doc_path for doc_path in documents if os.path.exists(doc_path)]
+            with span('documents'):
+                parsed = self.document_parser.parse_documents(existing)
+            for doc_path, params in zip(existing, parsed):
+                doc_params.update(params)
+                print(f"✓ Parsed {Path(doc_path).name}")
         
         # Merge all parameters (user params override doc params, which override defaults)
         defaults = self.building_estimator.get_defaults()
@@ -249,7 +308,8 @@ class IDFCreator:
         # Attach location-derived building info for estimation (OSM area/levels)
         bp = dict(data['building_params'])
         bp['__location_building'] = data.get('location', {}).get('building') or {}
-        params = self.estimate_missing_parameters(bp)
+        with span('estimate'):
+            params = self.estimate_missing_parameters(bp)
         print(f"✓ Building dimensions: {params['building']['length']:.1f}m × {params['building']['width']:.1f}m")
         
         # Generate IDF
@@ -269,6 +329,7 @@ class IDFCreator:
                 print(f"   Reason: {professional_error}")
                 print(f"   Traceback:\n{error_trace}")
                 if not self.standard_idf_generator:
+                    from src.idf_generator import IDFGenerator
                     self.standard_idf_generator = IDFGenerator()
                 idf_content = self.standard_idf_generator.generate_complete_idf(
                     data['location'],
@@ -295,7 +356,8 @@ class IDFCreator:
             ensure_directory(output_dir)
         
         # Write IDF file
-        with open(output_path, 'w') as f:
+        report_stage('write')
+        with span('write'), open(output_path, 'w') as f:
             f.write(idf_content)
         
         print(f"\n✅ IDF file created: {output_path}")
@@ -500,6 +562,8 @@ def _parse_user_params(args: argparse.Namespace) -> Dict[str, any]:
         user_params['wwr_w'] = args.wwr_w
     if args.force_area:
         user_params['force_area'] = True
+    if args.context_shading is not None:
+        user_params['context_shading_radius'] = args.context_shading
     
     # Equipment parameters
     if args.equip_source:
@@ -584,6 +648,8 @@ Examples:
                        help='West facade window-to-wall ratio (0-1)')
     parser.add_argument('--force-area', action='store_true',
                        help='Force target floor area by scaling footprint per floor')
+    parser.add_argument('--context-shading', type=float, nargs='?', const=150.0, metavar='RADIUS_M',
+                       help='Model surrounding buildings within RADIUS_M (default 150) as shading')
     # Equipment catalog options
     parser.add_argument('--equip-source', type=str, choices=['bcl','ahri','mock'],
                        help='Equipment source catalog (default: mock in professional mode)')
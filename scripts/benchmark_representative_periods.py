@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark representative-period simulation against full-year runs.
+
+For each benchmark building the same IDF is generated twice, once with the
+full-year RunPeriod and once with representative weeks, both are simulated
+with EnergyPlus, and the extrapolated annual end uses are compared with the
+full-year results: relative error, whether the full-year value falls inside
+the reported bounds, and the wall-clock speed-up.
+
+Usage:
+    python scripts/benchmark_representative_periods.py WEATHER.epw [--weeks-per-season N] [--output DIR]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from src.model_calibration import ModelCalibrator
+from src.professional_idf_generator import ProfessionalIDFGenerator
+from src.representative_periods import (
+    DEFAULT_WEEKS_PER_SEASON, END_USE_METERS, extract_representative_results, select_representative_weeks
+)
+from src.utils.sql_results import ELECTRICITY_METER, GAS_METER, read_meter_series
+
+# Buildings covering internal-load-, envelope- and HVAC-dominated cases
+BENCHMARK_BUILDINGS = [
+    {'building_type': 'Office', 'stories': 3, 'floor_area': 4500, 'year_built': 1995, 'name': 'Bench_Office'},
+    {'building_type': 'Retail', 'stories': 1, 'floor_area': 2000, 'year_built': 1980, 'name': 'Bench_Retail'},
+    {'building_type': 'School', 'stories': 2, 'floor_area': 6000, 'year_built': 2010, 'name': 'Bench_School'},
+    {'building_type': 'Warehouse', 'stories': 1, 'floor_area': 8000, 'year_built': 1970, 'name': 'Bench_Warehouse'},
+]
+
+
+def _generate(generator, params, location, output_file):
+    np.random.seed(42)
+    with contextlib.redirect_stdout(io.StringIO()):
+        idf = generator.generate_professional_idf(params['name'], dict(params), dict(location))
+    if not params.get('representative_periods'):
+        # Report the same end uses from the full-year run
+        idf += '\n\n' + generator.generate_end_use_meters()
+    output_file.write_text(idf)
+    return output_file
+
+
+def _simulate(calibrator, idf_file, weather_file, output_dir):
+    start = time.perf_counter()
+    calibrator._run_simulation(str(idf_file), weather_file, output_dir)
+    return time.perf_counter() - start
+
+
+def benchmark(weather_file: str, weeks_per_season: int, output_dir: Path) -> list:
+    """Run every benchmark building both ways and return one comparison per building."""
+    calibrator = ModelCalibrator()
+    if not calibrator.energyplus_path:
+        raise SystemExit("❌ EnergyPlus not found; the benchmark needs real simulations")
+
+    selection = select_representative_weeks(weather_file, weeks_per_season)
+    generator = ProfessionalIDFGenerator()
+    location = {'weather_file': weather_file, 'latitude': 0.0, 'longitude': 0.0, 'elevation': 0, 'time_zone': 0}
+    # Location fields the generator reads from the EPW header
+    header = Path(weather_file).read_text(errors='ignore').split('\n', 1)[0].split(',')
+    location.update(latitude=float(header[6]), longitude=float(header[7]),
+                    time_zone=float(header[8]), elevation=float(header[9]))
+
+    comparisons = []
+    for params in BENCHMARK_BUILDINGS:
+        case_dir = output_dir / params['name']
+        case_dir.mkdir(parents=True, exist_ok=True)
+        full_idf = _generate(generator, params, location, case_dir / 'full_year.idf')
+        sub_idf = _generate(generator, dict(params, representative_periods=selection), location,
+                            case_dir / 'representative.idf')
+        full_seconds = _simulate(calibrator, full_idf, weather_file, case_dir / 'full_year')
+        sub_seconds = _simulate(calibrator, sub_idf, weather_file, case_dir / 'representative')
+
+        full = read_meter_series(case_dir / 'full_year' / 'eplusout.sql', (ELECTRICITY_METER, GAS_METER) + END_USE_METERS)
+        estimate = extract_representative_results(case_dir / 'representative' / 'eplusout.sql', selection)
+
+        meters = {}
+        for meter, values in estimate['end_uses'].items():
+            if meter not in full or not full[meter]['annual']:
+                continue
+            actual = full[meter]['annual']
+            low, high = values['low_kwh'], values['high_kwh']
+            meters[meter] = {
+                'full_year_kwh': actual,
+                'estimate_kwh': values['annual_kwh'],
+                'relative_error': (values['annual_kwh'] - actual) / actual,
+                'within_bounds': None if low is None else low <= actual <= high,
+            }
+        comparisons.append({
+            'building': params['name'],
+            'speedup': full_seconds / sub_seconds if sub_seconds else None,
+            'simulated_days': estimate['simulated_days'],
+            'meters': meters,
+        })
+
+        facility = meters.get(ELECTRICITY_METER, {})
+        print(f"📊 {params['name']}: {full_seconds:.1f}s → {sub_seconds:.1f}s "
+              f"({comparisons[-1]['speedup'] or 0:.1f}x), electricity error "
+              f"{100 * facility.get('relative_error', float('nan')):+.1f}%, "
+              f"within bounds: {facility.get('within_bounds')}")
+    return comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark representative-period runs against full-year runs')
+    parser.add_argument('weather_file', help='EPW weather file')
+    parser.add_argument('--weeks-per-season', type=int, default=DEFAULT_WEEKS_PER_SEASON)
+    parser.add_argument('--output', default='artifacts/representative_periods_benchmark')
+    args = parser.parse_args()
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    comparisons = benchmark(args.weather_file, args.weeks_per_season, output_dir)
+    (output_dir / 'benchmark.json').write_text(json.dumps(comparisons, indent=2))
+
+    errors = [abs(c['meters'][ELECTRICITY_METER]['relative_error'])
+              for c in comparisons if ELECTRICITY_METER in c['meters']]
+    if errors:
+        print(f"\n✅ Mean absolute electricity error {100 * np.mean(errors):.1f}% "
+              f"(max {100 * max(errors):.1f}%) over {len(errors)} buildings")
+    print(f"   Results: {output_dir / 'benchmark.json'}")
+
+
+if __name__ == '__main__':
+    main()
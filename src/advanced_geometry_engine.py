@@ -23,6 +23,7 @@ class BuildingFootprint:
     roof_type: str
     courtyards: List[Polygon] = None
     wings: List[Polygon] = None
+    simplification: Optional['SimplificationReport'] = None
     
     def __post_init__(self):
         if self.courtyards is None:
@@ -31,6 +32,27 @@ class BuildingFootprint:
             self.wings = []
 
 
+@dataclass
+class FootprintSimplification:
+    """Settings of the footprint simplification stage run before zoning"""
+    enabled: bool = True
+    max_area_error: float = 0.005   # Allowed |area change| as a fraction of the footprint area
+    max_tolerance: float = 0.5      # Largest Douglas-Peucker tolerance used within the area budget (m)
+    max_vertices: int = 48          # Vertex cap over all rings; enforced even beyond the area budget
+    search_steps: int = 24          # Bisection steps per tolerance search
+
+
+@dataclass
+class SimplificationReport:
+    """How much a footprint changed when simplified"""
+    original_vertices: int
+    simplified_vertices: int
+    tolerance: float
+    area_change_pct: float
+    perimeter_change_pct: float
+    within_area_budget: bool = True
+
+
 @dataclass
 class ZoneGeometry:
     """Represents a single zone's geometry"""
@@ -47,12 +69,19 @@ class ZoneGeometry:
             self.adjacent_zones = []
 
 
+def _vertex_count(polygon) -> int:
+    """Number of distinct vertices over all rings of a Polygon or MultiPolygon"""
+    polygons = polygon.geoms if hasattr(polygon, 'geoms') else [polygon]
+    return sum(len(ring.coords) - 1 for p in polygons for ring in [p.exterior, *p.interiors])
+
+
 class AdvancedGeometryEngine:
     """Generates complex building geometries for professional IDF creation"""
     
-    def __init__(self):
+    def __init__(self, simplification: Optional[FootprintSimplification] = None):
         self.building_templates = self._load_building_templates()
         self.zone_templates = self._load_zone_templates()
+        self.simplification = simplification or FootprintSimplification()
     
     def _load_building_templates(self) -> Dict:
         """Load building type templates for geometry generation"""
@@ -139,8 +168,13 @@ class AdvancedGeometryEngine:
         }
     
     def generate_complex_footprint(self, osm_data: Dict, building_type: str, 
-                                 total_area: float, stories: int) -> BuildingFootprint:
-        """Generate complex building footprint from OSM data and building parameters"""
+                                 total_area: float, stories: int,
+                                 simplification: Optional[FootprintSimplification] = None) -> BuildingFootprint:
+        """Generate complex building footprint from OSM data and building parameters
+        
+        The final polygon goes through the simplification stage (see
+        simplify_footprint) with ``simplification`` or the engine's settings.
+        """
         
         # Get building template
         template = self.building_templates.get(building_type, self.building_templates['office'])
@@ -192,6 +226,15 @@ class AdvancedGeometryEngine:
         if footprint is None or footprint.area < 1:
             footprint = base_polygon
         
+        # Drop redundant vertices before zoning (dense OSM / Microsoft outlines)
+        footprint, report = self.simplify_footprint(footprint, simplification)
+        if report and report.simplified_vertices < report.original_vertices:
+            print(f"  ✓ Simplified footprint: {report.original_vertices} → {report.simplified_vertices} vertices "
+                  f"(area {report.area_change_pct:+.2f}%, perimeter {report.perimeter_change_pct:+.2f}%)")
+            if not report.within_area_budget:
+                print(f"  ⚠️  Warning: Vertex cap required an area change beyond the "
+                      f"{(simplification or self.simplification).max_area_error * 100:.1f}% budget")
+        
         # Extract height information
         height = self._extract_building_height(osm_data, stories)
         
@@ -200,9 +243,77 @@ class AdvancedGeometryEngine:
             height=height,
             stories=stories,
             building_type=building_type,
-            roof_type=self._determine_roof_type(building_type, osm_data)
+            roof_type=self._determine_roof_type(building_type, osm_data),
+            simplification=report
         )
     
+    def simplify_footprint(self, polygon, settings: Optional[FootprintSimplification] = None):
+        """Simplify a footprint with topology-preserving Douglas-Peucker
+        
+        Uses the largest tolerance (up to ``max_tolerance``) whose area change
+        stays within ``max_area_error``; if the result still has more than
+        ``max_vertices`` vertices, the smallest tolerance meeting the cap is
+        used instead and the report flags the exceeded area budget.
+        
+        Args:
+            polygon: Footprint Polygon or MultiPolygon
+            settings: Simplification settings (default: the engine's)
+            
+        Returns:
+            Tuple of (simplified polygon, SimplificationReport or None if skipped)
+        """
+        settings = settings or self.simplification
+        if not settings.enabled or polygon is None or polygon.is_empty or polygon.area <= 0:
+            return polygon, None
+        
+        area = polygon.area
+        original_vertices = _vertex_count(polygon)
+        
+        def candidate(tolerance):
+            simplified = polygon.simplify(tolerance, preserve_topology=True)
+            if simplified.is_empty or not simplified.is_valid or simplified.area <= 0:
+                return None
+            return simplified
+        
+        def area_error(simplified):
+            return abs(simplified.area - area) / area
+        
+        # Largest tolerance within the area budget (bisection keeps the last feasible one)
+        tolerance, simplified = 0.0, polygon
+        low, high = 0.0, settings.max_tolerance
+        for _ in range(settings.search_steps):
+            mid = (low + high) / 2
+            trial = candidate(mid)
+            if trial is not None and area_error(trial) <= settings.max_area_error:
+                tolerance, simplified, low = mid, trial, mid
+            else:
+                high = mid
+        full = candidate(settings.max_tolerance)
+        if full is not None and area_error(full) <= settings.max_area_error:
+            tolerance, simplified = settings.max_tolerance, full
+        
+        # Enforce the vertex cap with the smallest sufficient tolerance
+        if _vertex_count(simplified) > settings.max_vertices:
+            minx, miny, maxx, maxy = polygon.bounds
+            low, high = tolerance, math.hypot(maxx - minx, maxy - miny)
+            for _ in range(settings.search_steps):
+                mid = (low + high) / 2
+                trial = candidate(mid)
+                if trial is not None and _vertex_count(trial) <= settings.max_vertices:
+                    tolerance, simplified, high = mid, trial, mid
+                else:
+                    low = mid
+        
+        report = SimplificationReport(
+            original_vertices=original_vertices,
+            simplified_vertices=_vertex_count(simplified),
+            tolerance=tolerance,
+            area_change_pct=(simplified.area - area) / area * 100.0,
+            perimeter_change_pct=(simplified.length - polygon.length) / polygon.length * 100.0,
+            within_area_budget=area_error(simplified) <= settings.max_area_error
+        )
+        return simplified, report
+    
     def _parse_osm_geometry(self, geometry_data: Dict) -> Polygon:
         """Parse OSM geometry data into Shapely polygon
         Handles both GeoJSON (projected coords) and geographic lat/lon coords
@@ -490,7 +601,12 @@ class AdvancedGeometryEngine:
     
     def generate_zone_layout(self, footprint: BuildingFootprint, 
                            building_type: str) -> List[ZoneGeometry]:
-        """Generate detailed zone layout for complex building footprint"""
+        """Generate detailed zone layout for complex building footprint
+        
+        The 2D zone partition and zone adjacencies are computed once per
+        distinct floor plate; stories sharing a plate get copies of its zones
+        (sharing their polygons) at their own floor level.
+        """
         
         template = self.zone_templates.get(building_type, self.zone_templates['office'])
         zones = []
@@ -498,17 +614,44 @@ class AdvancedGeometryEngine:
         # Calculate total floor area
         total_area = footprint.polygon.area * footprint.stories
         
+        # Zone partition and adjacency per distinct floor plate
+        plate_layouts = {}
+        
         # Generate zones for each floor
-        for floor in range(footprint.stories):
-            floor_zones = self._generate_floor_zones(
-                footprint.polygon, floor, building_type, template, total_area
-            )
+        for floor, plate in enumerate(self._floor_plates(footprint)):
+            key = plate.wkb
+            if key not in plate_layouts:
+                floor_zones = self._generate_floor_zones(
+                    plate, floor, building_type, template, total_area
+                )
+                plate_layouts[key] = (floor_zones, self._plate_adjacency(floor_zones))
+            else:
+                floor_zones = self._stack_floor_zones(plate_layouts[key][0], floor)
+            
+            # Add zone adjacencies
+            for zone, neighbours in zip(floor_zones, plate_layouts[key][1]):
+                zone.adjacent_zones.extend(floor_zones[j].name for j in neighbours)
             zones.extend(floor_zones)
         
-        # Add zone adjacencies
-        zones = self._calculate_zone_adjacencies(zones)
-        
         return zones
+    
+    def _floor_plates(self, footprint: BuildingFootprint) -> List[Polygon]:
+        """Floor plate polygon of each story (every story uses the footprint)"""
+        return [footprint.polygon] * footprint.stories
+    
+    def _stack_floor_zones(self, plate_zones: List[ZoneGeometry], floor_level: int) -> List[ZoneGeometry]:
+        """Copies of a floor plate's zones at another floor level, sharing their polygons"""
+        return [
+            ZoneGeometry(
+                name=f"{zone.name.rsplit('_', 1)[0]}_{floor_level}",
+                polygon=zone.polygon,
+                floor_level=floor_level,
+                height=zone.height,
+                area=zone.area,
+                perimeter=zone.perimeter
+            )
+            for zone in plate_zones
+        ]
 
     def match_layout_to_total_area(self, footprint: BuildingFootprint, zones: List[ZoneGeometry],
                                    target_total_area: float, tolerance: float = 0.01) -> Tuple[BuildingFootprint, List[ZoneGeometry], Dict[str, float]]:
@@ -586,15 +729,21 @@ class AdvancedGeometryEngine:
                 except Exception as e:
                     print(f"⚠️  Warning: Could not scale wings: {e}")
 
-        # Scale all zone polygons
+        # Scale all zone polygons (once per polygon shared by stacked stories)
+        scaled_polygons = {}
         for zone in zones:
             zone_polygon = getattr(zone, 'polygon', None)
             if zone_polygon is not None:
                 try:
-                    scaled_polygon = shapely_scale(zone_polygon, xfact=scale_factor, yfact=scale_factor, origin=origin)
-                    # Ensure polygon remains valid after scaling
-                    if not scaled_polygon.is_valid:
-                        scaled_polygon = scaled_polygon.buffer(0)
+                    if id(zone_polygon) in scaled_polygons:
+                        scaled_polygon = scaled_polygons[id(zone_polygon)][1]
+                    else:
+                        scaled_polygon = shapely_scale(zone_polygon, xfact=scale_factor, yfact=scale_factor, origin=origin)
+                        # Ensure polygon remains valid after scaling
+                        if not scaled_polygon.is_valid:
+                            scaled_polygon = scaled_polygon.buffer(0)
+                        # Keep the original alive so its id is not reused
+                        scaled_polygons[id(zone_polygon)] = (zone_polygon, scaled_polygon)
                     zone.polygon = scaled_polygon
                     zone.area = scaled_polygon.area
                     zone.perimeter = scaled_polygon.length
@@ -819,43 +968,78 @@ class AdvancedGeometryEngine:
         
         return None
     
-    def _calculate_zone_adjacencies(self, zones: List[ZoneGeometry]) -> List[ZoneGeometry]:
-        """Calculate which zones are adjacent to each other"""
-        for i, zone1 in enumerate(zones):
-            for j, zone2 in enumerate(zones):
-                if i != j and zone1.floor_level == zone2.floor_level:
-                    # Check if zones are adjacent (simplified)
-                    if zone1.polygon.touches(zone2.polygon) or zone1.polygon.distance(zone2.polygon) < 0.1:
-                        zone1.adjacent_zones.append(zone2.name)
-        
-        return zones
+    def _plate_adjacency(self, plate_zones: List[ZoneGeometry]) -> List[List[int]]:
+        """Indices of the zones adjacent to each zone of one floor plate"""
+        adjacency = []
+        for i, zone1 in enumerate(plate_zones):
+            adjacency.append([
+                j for j, zone2 in enumerate(plate_zones)
+                if i != j and (zone1.polygon.touches(zone2.polygon) or zone1.polygon.distance(zone2.polygon) < 0.1)
+            ])
+        return adjacency
     
     def generate_building_surfaces(self, zones: List[ZoneGeometry], 
                                  footprint: BuildingFootprint) -> List[Dict]:
         """Generate detailed building surfaces for complex geometry"""
         surfaces = []
         
+        # Surfaces of the first zone seen with each polygon; zones stacked on
+        # the same floor plate reuse them with only Z changed
+        plate_surfaces = {}
+        
         for zone in zones:
+            plate = plate_surfaces.get(id(zone.polygon))
+            if plate is not None:
+                surfaces.extend(self._restack_surfaces(*plate, zone))
+                continue
+            
             # Skip zones with invalid polygons
             if not zone.polygon or not zone.polygon.is_valid or zone.polygon.area < 0.1:
                 continue
+            
+            zone_surfaces = []
                 
             # Generate floor surface
             floor_surface = self._generate_floor_surface(zone, footprint)
             if floor_surface:
-                surfaces.append(floor_surface)
+                zone_surfaces.append(floor_surface)
             
             # Generate ceiling surface
             ceiling_surface = self._generate_ceiling_surface(zone, footprint)
             if ceiling_surface:
-                surfaces.append(ceiling_surface)
+                zone_surfaces.append(ceiling_surface)
             
             # Generate wall surfaces
             wall_surfaces = self._generate_wall_surfaces(zone, footprint)
-            surfaces.extend(wall_surfaces)
+            zone_surfaces.extend(wall_surfaces)
+            
+            plate_surfaces[id(zone.polygon)] = (zone, zone_surfaces)
+            surfaces.extend(zone_surfaces)
         
         return surfaces
     
+    def _restack_surfaces(self, plate_zone: ZoneGeometry, plate_surfaces: List[Dict],
+                          zone: ZoneGeometry) -> List[Dict]:
+        """Copy one zone's surfaces to a zone with the same polygon on another floor
+        
+        All surfaces span the story from floor_level * 3.0 to (floor_level + 1) * 3.0,
+        so only the names and the formatted Z coordinates change.
+        """
+        z_map = {
+            f"{plate_zone.floor_level * 3.0:.4f}": f"{zone.floor_level * 3.0:.4f}",
+            f"{(plate_zone.floor_level + 1) * 3.0:.4f}": f"{(zone.floor_level + 1) * 3.0:.4f}"
+        }
+        prefix = len(plate_zone.name)
+        restacked = []
+        for surface in plate_surfaces:
+            vertices = []
+            for vertex in surface['vertices']:
+                xy, z = vertex.rsplit(',', 1)
+                vertices.append(f"{xy},{z_map[z]}")
+            restacked.append(dict(surface, name=zone.name + surface['name'][prefix:], zone=zone.name,
+                                  vertices=vertices))
+        return restacked
+    
     def _generate_floor_surface(self, zone: ZoneGeometry, footprint: BuildingFootprint) -> Optional[Dict]:
         """Generate floor surface for zone with correct orientation (tilt ~180°)"""
         # Import geometry utilities
@@ -3,13 +3,20 @@ Advanced HVAC Systems for IDF Creator
 Real HVAC systems instead of simple ideal loads
 """
 
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Tuple
+from dataclasses import dataclass, replace
+from types import MappingProxyType
 import json
 import re
 from .building_age_adjustments import BuildingAgeAdjuster
+from .core.generation_context import GenerationContext, current_generation_context
 from .utils.common import normalize_node_name, calculate_dx_supply_air_flow
 
+# Zone index suffixes stripped from zone names to get the space usage
+# ('office_open_2_z7' -> 'office_open')
+_ZONE_INDEX_SUFFIX = re.compile(r'_z\d+$')
+_NUMERIC_SUFFIX = re.compile(r'(_\d+)+$')
+
 
 @dataclass
 class HVACSystem:
@@ -27,13 +34,26 @@ class HVACSystem:
 class AdvancedHVACSystems:
     """Manages advanced HVAC system generation"""
     
-    def __init__(self, node_generator=None):
-        self.hvac_templates = self._load_hvac_templates()
-        self.equipment_templates = self._load_equipment_templates()
-        self.control_templates = self._load_control_templates()
-        self.age_adjuster = BuildingAgeAdjuster()
-        # Ensure we only inject the shared VAV minimum flow schedule once per building
-        self._vav_min_flow_schedule_added = False
+    def __init__(self, node_generator=None, registry=None):
+        """
+        Args:
+            node_generator: Optional helper that creates shared OutdoorAir nodes
+            registry: Optional TemplateRegistry whose templates are shared instead of reloaded
+        """
+        if registry is not None:
+            self.hvac_templates = registry.hvac_templates
+            self.equipment_templates = registry.hvac_equipment_templates
+            self.control_templates = registry.hvac_control_templates
+            self.age_adjuster = registry.age_adjuster
+            self._resolution_cache = registry.hvac_resolution_cache
+        else:
+            self.hvac_templates = self._load_hvac_templates()
+            self.equipment_templates = self._load_equipment_templates()
+            self.control_templates = self._load_control_templates()
+            self.age_adjuster = BuildingAgeAdjuster()
+            self._resolution_cache = {}
+        # Generation state used outside a generation context (standalone use)
+        self._default_context = GenerationContext()
         # Optional helper that can create shared OutdoorAir nodes (from BaseIDFGenerator)
         self.node_generator = node_generator
     
@@ -152,36 +172,10 @@ class AdvancedHVACSystems:
         equipment catalog to replace template coils where applicable.
         """
         
-        hvac_template = self.hvac_templates.get(hvac_type)
-        if not hvac_template:
-            hvac_template = self.hvac_templates['VAV']  # Default fallback
-        
-        # Adjust efficiency based on building age and LEED certification
-        if year_built is not None or leed_level:
-            age_efficiency = self.age_adjuster.get_hvac_efficiency_values(year_built, hvac_type, leed_level)
-            # Create adjusted efficiency dict
-            adjusted_efficiency = hvac_template.efficiency.copy()
-            if 'heating_cop' in adjusted_efficiency and 'heating_cop' in age_efficiency:
-                adjusted_efficiency['heating_cop'] = age_efficiency['heating_cop']
-            if 'cooling_eer' in adjusted_efficiency and 'cooling_eer' in age_efficiency:
-                adjusted_efficiency['cooling_eer'] = age_efficiency['cooling_eer']
-            if 'cooling_cop' in adjusted_efficiency and 'cooling_cop' in age_efficiency:
-                adjusted_efficiency['cooling_cop'] = age_efficiency['cooling_cop']
-            elif 'cooling_eer' in adjusted_efficiency:
-                # Calculate COP from EER if not provided
-                adjusted_efficiency['cooling_cop'] = adjusted_efficiency['cooling_eer'] / 3.412
-            if 'heating_efficiency' in adjusted_efficiency and 'heating_efficiency' in age_efficiency:
-                adjusted_efficiency['heating_efficiency'] = age_efficiency['heating_efficiency']
-            
-            # Update template with adjusted values
-            from dataclasses import replace
-            hvac_template = replace(hvac_template, efficiency=adjusted_efficiency)
+        hvac_template = self._resolve_hvac_template(hvac_type, year_built, leed_level)
         
         # Size equipment based on zone area and building type
-        raw_usage = zone_name.lower()
-        usage = re.sub(r'_z\d+$', '', raw_usage)
-        usage = re.sub(r'(_\d+)+$', '', usage)
-        sizing_params = self._calculate_hvac_sizing(building_type, zone_area, climate_zone, usage)
+        sizing_params = self._calculate_hvac_sizing(building_type, zone_area, climate_zone, self._zone_usage(zone_name))
         
         # Generate system components
         components = []
@@ -206,6 +200,60 @@ class AdvancedHVACSystems:
 
         return components
     
+    @staticmethod
+    def _zone_usage(zone_name: str) -> str:
+        """Space usage of a zone: its lower-cased name without zone index suffixes."""
+        return _NUMERIC_SUFFIX.sub('', _ZONE_INDEX_SUFFIX.sub('', zone_name.lower()))
+    
+    def _resolve_hvac_template(self, hvac_type: str, year_built: Optional[int] = None,
+                               leed_level: Optional[str] = None) -> HVACSystem:
+        """
+        Resolve the HVAC template with age / LEED adjusted efficiencies.
+        
+        The result only depends on the type, the code era of the year (see
+        BuildingAgeAdjuster.era) and the LEED level, so it is memoized (and
+        shared between generators, possibly on other threads, using the same
+        template registry). The cached template is read-only: its efficiency
+        is a MappingProxyType and its components a tuple.
+        """
+        key = ('template', hvac_type, self.age_adjuster.era(year_built), leed_level)
+        hvac_template = self._resolution_cache.get(key)
+        if hvac_template is None:
+            hvac_template = self._build_hvac_template(hvac_type, year_built, leed_level)
+            hvac_template = replace(hvac_template, efficiency=MappingProxyType(dict(hvac_template.efficiency)),
+                                    components=tuple(hvac_template.components))
+            self._resolution_cache[key] = hvac_template
+        return hvac_template
+    
+    def _build_hvac_template(self, hvac_type: str, year_built: Optional[int] = None,
+                             leed_level: Optional[str] = None) -> HVACSystem:
+        """Look up the HVAC template and apply age / LEED efficiency adjustments."""
+        hvac_template = self.hvac_templates.get(hvac_type)
+        if not hvac_template:
+            hvac_template = self.hvac_templates['VAV']  # Default fallback
+        
+        # Adjust efficiency based on building age and LEED certification
+        if year_built is not None or leed_level:
+            age_efficiency = self.age_adjuster.get_hvac_efficiency_values(year_built, hvac_type, leed_level)
+            # Create adjusted efficiency dict
+            adjusted_efficiency = hvac_template.efficiency.copy()
+            if 'heating_cop' in adjusted_efficiency and 'heating_cop' in age_efficiency:
+                adjusted_efficiency['heating_cop'] = age_efficiency['heating_cop']
+            if 'cooling_eer' in adjusted_efficiency and 'cooling_eer' in age_efficiency:
+                adjusted_efficiency['cooling_eer'] = age_efficiency['cooling_eer']
+            if 'cooling_cop' in adjusted_efficiency and 'cooling_cop' in age_efficiency:
+                adjusted_efficiency['cooling_cop'] = age_efficiency['cooling_cop']
+            elif 'cooling_eer' in adjusted_efficiency:
+                # Calculate COP from EER if not provided
+                adjusted_efficiency['cooling_cop'] = adjusted_efficiency['cooling_eer'] / 3.412
+            if 'heating_efficiency' in adjusted_efficiency and 'heating_efficiency' in age_efficiency:
+                adjusted_efficiency['heating_efficiency'] = age_efficiency['heating_efficiency']
+            
+            # Update template with adjusted values
+            hvac_template = replace(hvac_template, efficiency=adjusted_efficiency)
+        
+        return hvac_template
+    
     def _generate_outdoor_air_node(self, node_name: str = "SITE OUTDOOR AIR NODE") -> str:
         """
         Generate an OutdoorAir:Node definition, delegating to the parent IDF generator
@@ -223,60 +271,12 @@ class AdvancedHVACSystems:
                                climate_zone: str, zone_usage: Optional[str] = None) -> Dict:
         """Calculate HVAC sizing parameters based on DOE reference building data."""
 
-        bt = (building_type or "office").lower()
-
-        cooling_load_density_lookup = {
-            'office': 70.0,
-            'residential': 55.0,
-            'retail': 110.0,
-            'healthcare': 140.0,
-            'education': 65.0,
-            'industrial': 120.0,
-            'hospitality': 100.0
-        }
-
-        heating_load_density_lookup = {
-            'office': 45.0,
-            'residential': 45.0,
-            'retail': 55.0,
-            'healthcare': 80.0,
-            'education': 45.0,
-            'industrial': 65.0,
-            'hospitality': 55.0
-        }
-
-        cooling_load_density = cooling_load_density_lookup.get(bt, 220.0)
-        heating_load_density = heating_load_density_lookup.get(bt, 160.0)
-
         usage = (zone_usage or '').lower()
-        sensible_heat_ratio = 0.70
-        usage_overrides = {
-            'break_room': {'cooling': 110.0, 'heating': 75.0, 'shr': 0.60},
-            'mechanical': {'cooling': 95.0, 'heating': 85.0, 'shr': 0.65},
-            'storage': {'cooling': 55.0, 'heating': 40.0, 'shr': 0.72},
-            'corridor': {'cooling': 45.0, 'heating': 35.0, 'shr': 0.78},
-            'lobby': {'cooling': 90.0, 'heating': 60.0, 'shr': 0.68}
-        }
-        for key, data in usage_overrides.items():
-            if key in usage:
-                cooling_load_density = data['cooling']
-                heating_load_density = data['heating']
-                sensible_heat_ratio = data['shr']
-                break
-
-        climate_multipliers = {
-            '1': {'cooling': 1.1, 'heating': 0.4},
-            '2': {'cooling': 1.05, 'heating': 0.5},
-            '3': {'cooling': 1.0, 'heating': 0.65},
-            '4': {'cooling': 0.95, 'heating': 0.85},
-            '5': {'cooling': 0.9, 'heating': 1.0},
-            '6': {'cooling': 0.85, 'heating': 1.2},
-            '7': {'cooling': 0.8, 'heating': 1.35},
-            '8': {'cooling': 0.75, 'heating': 1.55}
-        }
-
-        cz = (climate_zone or "3")[0]
-        multipliers = climate_multipliers.get(cz, {'cooling': 1.0, 'heating': 1.0})
+        profile = self._sizing_profile(building_type, climate_zone, usage)
+        cooling_load_density = profile['cooling_load_density']
+        heating_load_density = profile['heating_load_density']
+        sensible_heat_ratio = profile['sensible_heat_ratio']
+        multipliers = profile['climate_multipliers']
 
         cooling_load = zone_area * cooling_load_density * multipliers['cooling']
         heating_load = zone_area * heating_load_density * multipliers['heating']
@@ -345,6 +345,82 @@ class AdvancedHVACSystems:
             'zone_usage': usage
         }
     
+    def _sizing_profile(self, building_type: str, climate_zone: str, usage: str) -> Mapping:
+        """
+        Load densities, sensible heat ratio and climate multipliers for a
+        (building type, climate zone, usage) combination (memoized).
+
+        Profiles are shared through the template registry, so they are
+        returned as read-only mappings.
+        """
+        cache_key = ('sizing', (building_type or "office").lower(), (climate_zone or "3")[0], usage)
+        profile = self._resolution_cache.get(cache_key)
+        if profile is not None:
+            return profile
+
+        bt = (building_type or "office").lower()
+
+        cooling_load_density_lookup = {
+            'office': 70.0,
+            'residential': 55.0,
+            'retail': 110.0,
+            'healthcare': 140.0,
+            'education': 65.0,
+            'industrial': 120.0,
+            'hospitality': 100.0
+        }
+
+        heating_load_density_lookup = {
+            'office': 45.0,
+            'residential': 45.0,
+            'retail': 55.0,
+            'healthcare': 80.0,
+            'education': 45.0,
+            'industrial': 65.0,
+            'hospitality': 55.0
+        }
+
+        cooling_load_density = cooling_load_density_lookup.get(bt, 220.0)
+        heating_load_density = heating_load_density_lookup.get(bt, 160.0)
+
+        sensible_heat_ratio = 0.70
+        usage_overrides = {
+            'break_room': {'cooling': 110.0, 'heating': 75.0, 'shr': 0.60},
+            'mechanical': {'cooling': 95.0, 'heating': 85.0, 'shr': 0.65},
+            'storage': {'cooling': 55.0, 'heating': 40.0, 'shr': 0.72},
+            'corridor': {'cooling': 45.0, 'heating': 35.0, 'shr': 0.78},
+            'lobby': {'cooling': 90.0, 'heating': 60.0, 'shr': 0.68}
+        }
+        for key, data in usage_overrides.items():
+            if key in usage:
+                cooling_load_density = data['cooling']
+                heating_load_density = data['heating']
+                sensible_heat_ratio = data['shr']
+                break
+
+        climate_multipliers = {
+            '1': {'cooling': 1.1, 'heating': 0.4},
+            '2': {'cooling': 1.05, 'heating': 0.5},
+            '3': {'cooling': 1.0, 'heating': 0.65},
+            '4': {'cooling': 0.95, 'heating': 0.85},
+            '5': {'cooling': 0.9, 'heating': 1.0},
+            '6': {'cooling': 0.85, 'heating': 1.2},
+            '7': {'cooling': 0.8, 'heating': 1.35},
+            '8': {'cooling': 0.75, 'heating': 1.55}
+        }
+
+        cz = (climate_zone or "3")[0]
+        multipliers = climate_multipliers.get(cz, {'cooling': 1.0, 'heating': 1.0})
+
+        profile = MappingProxyType({
+            'cooling_load_density': cooling_load_density,
+            'heating_load_density': heating_load_density,
+            'sensible_heat_ratio': sensible_heat_ratio,
+            'climate_multipliers': MappingProxyType(dict(multipliers)),
+        })
+        self._resolution_cache[cache_key] = profile
+        return profile
+
     def _generate_vav_system(self, zone_name: str, sizing_params: Dict, 
                            hvac_template: HVACSystem, unique_suffix: str = "", 
                            climate_zone: str = "") -> List[Dict]:
@@ -1139,8 +1215,7 @@ class AdvancedHVACSystems:
         
         # ZoneControl:Thermostat (connects zone to thermostat - REQUIRED!)
         # Ensure zone name matches actual Zone object (strip any _zN suffix)
-        import re
-        zone_base_name = re.sub(r'_z\d+$', '', zone_name)
+        zone_base_name = _ZONE_INDEX_SUFFIX.sub('', zone_name)
         zone_control = {
             'type': 'ZoneControl:Thermostat',
             'name': f"{zone_name}_ZoneControl",
@@ -1193,7 +1268,9 @@ class AdvancedHVACSystems:
 
     def _ensure_vav_min_flow_schedule(self, components: List[Dict]) -> None:
         """Append a default VAV minimum flow schedule once so post-processing can reference it."""
-        if self._vav_min_flow_schedule_added:
+        # Only inject the shared schedule once per building (generation)
+        context = current_generation_context() or self._default_context
+        if context.vav_min_flow_schedule_added:
             return
 
         schedule_raw = """Schedule:Compact,
@@ -1214,4 +1291,4 @@ class AdvancedHVACSystems:
             'name': 'VAV Minimum Flow Fraction Schedule',
             'raw': schedule_raw
         })
-        self._vav_min_flow_schedule_added = True
+        context.vav_min_flow_schedule_added = True
@@ -5,9 +5,13 @@ Provides age-based adjustments to building parameters including HVAC efficiency,
 envelope properties, infiltration, and internal loads.
 """
 
+from bisect import bisect_right
 from typing import Dict, Optional
 from dataclasses import dataclass
 
+# First years of the energy code eras adjust_parameters distinguishes
+AGE_ERA_BOUNDARIES = (1980, 2000, 2010)
+
 
 @dataclass
 class AgeParams:
@@ -24,6 +28,16 @@ class BuildingAgeAdjuster:
     def __init__(self):
         pass
     
+    @staticmethod
+    def era(year_built: Optional[int]) -> Optional[int]:
+        """
+        Index of the energy code era of a construction year (None if unknown).
+
+        Age adjustments only depend on the era, so results derived from them
+        can be keyed on it instead of the exact year.
+        """
+        return None if year_built is None else bisect_right(AGE_ERA_BOUNDARIES, year_built)
+    
     def adjust_parameters(self, year_built: int) -> AgeParams:
         """
         Get age-based multiplier adjustments for building parameters.
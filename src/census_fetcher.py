@@ -1,7 +1,7 @@
 """Module for fetching building demographics from Census Bureau."""
-import requests
 from typing import Dict, Optional
 import os
+from .utils.http_client import SharedHTTPClient
 
 
 class CensusFetcher:
@@ -17,7 +17,7 @@ class CensusFetcher:
             api_key: Census API key (optional, not always required)
         """
         self.api_key = api_key or os.getenv('CENSUS_API_KEY')
-        self.session = requests.Session()
+        self.session = SharedHTTPClient.get_instance().session()
         self.session.headers.update({'User-Agent': 'IDF-Creator/1.0'})
     
     def get_median_year_built(self, zip_code: str) -> Optional[int]:
@@ -4,8 +4,8 @@ Integrates with free city APIs for building energy benchmarking and characterist
 """
 
 from typing import Dict, Optional, List
-import requests
 import time
+from .utils.http_client import SharedHTTPClient
 
 
 class CityDataFetcher:
@@ -14,7 +14,7 @@ class CityDataFetcher:
     def __init__(self):
         self.nyc_api_base = "https://data.cityofnewyork.us/api/views"
         self.sf_api_base = "https://data.sfgov.org/api"
-        self.session = requests.Session()
+        self.session = SharedHTTPClient.get_instance().session()
         self.session.headers.update({
             'User-Agent': 'IDF-Creator/1.0',
             'Accept': 'application/json'
@@ -0,0 +1,347 @@
+"""
+Context Shading Module
+Turns surrounding building footprints (OSM area search) into a bounded set of
+Shading:Building:Detailed surfaces.
+
+Every neighbour adds walls and a roof to EnergyPlus' shadow calculation, so
+the neighbours are screened first: a spatial index picks those within the
+search radius, neighbours too low for their distance (obstruction angle) or
+standing where the sun never passes behind them are culled, touching
+neighbours of similar height are merged into blocks, and the blocks are
+simplified and emitted most-shading-first until the surface budget is spent.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from shapely.geometry import JOIN_STYLE, Point, Polygon
+from shapely.geometry.polygon import orient
+from shapely.ops import unary_union
+from shapely.strtree import STRtree
+
+from .advanced_geometry_engine import AdvancedGeometryEngine, FootprintSimplification
+from .renewable_energy import _CUMULATIVE_DAYS, EPWSolarData
+
+# Earth radius used by the local equirectangular projection (m)
+EARTH_RADIUS_M = 6371000
+
+# Default neighbour search radius around the site (m)
+CONTEXT_SEARCH_RADIUS_M = 150.0
+
+# Neighbours whose top is seen below this elevation from the site are culled (deg)
+MIN_OBSTRUCTION_ANGLE_DEG = 8.0
+
+# Most shading surfaces emitted for the whole context
+MAX_CONTEXT_SURFACES = 60
+
+# Neighbours closer than this (m) and of similar height are merged into one block
+MERGE_GAP_M = 1.0
+
+# Taller / shorter height ratio up to which touching neighbours are merged
+MERGE_HEIGHT_RATIO = 1.3
+
+# Height assumptions when OSM has no height tag (m)
+CONTEXT_STORY_HEIGHT_M = 3.0
+DEFAULT_CONTEXT_HEIGHT_M = 6.0
+
+# Context blocks are reduced to a few walls; shadows tolerate a coarse outline
+CONTEXT_SIMPLIFICATION = FootprintSimplification(max_area_error=0.05, max_tolerance=2.0, max_vertices=8)
+
+# Sun path sampling (every n-th day of the year, minutes between samples)
+SUN_PATH_DAY_STEP = 7
+SUN_PATH_MINUTE_STEP = 20
+
+# Hourly weather columns of EPWSolarData, unused for sun positions
+_EPW_WEATHER_FIELDS = ('dry_bulb', 'ghi', 'dni', 'dhi', 'extraterrestrial_dni', 'albedo')
+
+
+@dataclass
+class ContextBuilding:
+    """A neighbouring building (or merged block) in site coordinates"""
+    polygon: Polygon
+    height: float
+    source_count: int = 1
+    obstruction_angle: float = 0.0  # Elevation of its top seen from the site (deg)
+    sun_blocked_fraction: float = 0.0  # Share of daytime sun positions it can block
+
+
+def sun_path(latitude: float, day_step: int = SUN_PATH_DAY_STEP,
+             minute_step: int = SUN_PATH_MINUTE_STEP) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sun positions above the horizon over a year, sampled through each day.
+
+    Args:
+        latitude: Site latitude (deg)
+        day_step: Sample every n-th day
+        minute_step: Minutes between samples within a day
+
+    Returns:
+        Tuple of (azimuth clockwise from north, elevation) arrays in degrees
+    """
+    days = np.arange(1, 366, day_step)
+    hours = np.arange(0, 24 * 60, minute_step) / 60.0
+    day_of_year, hour = (grid.ravel() for grid in np.meshgrid(days, hours, indexing='ij'))
+    month = np.searchsorted(_CUMULATIVE_DAYS, day_of_year, side='left')
+    # Positions at the time zone meridian; sun_vectors takes hour-ending hours
+    times = EPWSolarData(latitude=latitude, longitude=0.0, time_zone=0.0, month=month,
+                         day=day_of_year - _CUMULATIVE_DAYS[month - 1], hour=hour + 0.5,
+                         **{name: np.zeros(len(hour)) for name in _EPW_WEATHER_FIELDS})
+    east, north, up = times.sun_vectors()
+    above = up > 0
+    azimuth = np.degrees(np.arctan2(east[above], north[above])) % 360.0
+    elevation = np.degrees(np.arcsin(np.clip(up[above], -1.0, 1.0)))
+    return azimuth, elevation
+
+
+class ContextShadingBuilder:
+    """Builds shading surfaces for the buildings around a site"""
+
+    def __init__(self, geometry_engine: Optional[AdvancedGeometryEngine] = None,
+                 radius: float = CONTEXT_SEARCH_RADIUS_M,
+                 min_obstruction_angle: float = MIN_OBSTRUCTION_ANGLE_DEG,
+                 max_surfaces: int = MAX_CONTEXT_SURFACES,
+                 merge_gap: float = MERGE_GAP_M):
+        """
+        Initialize the builder.
+
+        Args:
+            geometry_engine: Engine whose footprint simplification is reused
+            radius: Neighbours farther than this from the site footprint are ignored (m)
+            min_obstruction_angle: Cull neighbours seen below this elevation (deg)
+            max_surfaces: Budget of shading surfaces for the whole context
+            merge_gap: Merge neighbours closer than this (m)
+        """
+        self.geometry_engine = geometry_engine or AdvancedGeometryEngine()
+        self.radius = radius
+        self.min_obstruction_angle = min_obstruction_angle
+        self.max_surfaces = max_surfaces
+        self.merge_gap = merge_gap
+        # Sun path per rounded latitude
+        self._sun_paths: Dict[float, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def neighbours_from_osm(self, buildings: List[Dict], latitude: float, longitude: float,
+                            site_polygon: Polygon) -> List[ContextBuilding]:
+        """
+        Project OSM area-search results into site coordinates.
+
+        The geocoded site point is placed at the centroid of the model
+        footprint; footprints are projected around it with a local
+        equirectangular projection (north = +y).
+
+        Args:
+            buildings: Results of OSMFetcher.search_area_buildings ((lat, lon) footprints)
+            latitude: Site latitude
+            longitude: Site longitude
+            site_polygon: Model footprint in local meters
+
+        Returns:
+            Valid neighbour footprints with heights, excluding the site building
+        """
+        origin = site_polygon.centroid
+        cos_lat = math.cos(math.radians(latitude))
+        site_point = Point(origin.x, origin.y)
+        neighbours = []
+        for building in buildings or []:
+            footprint = building.get('footprint') or []
+            if len(footprint) < 3:
+                continue
+            coords = [(origin.x + EARTH_RADIUS_M * math.radians(lon - longitude) * cos_lat,
+                       origin.y + EARTH_RADIUS_M * math.radians(lat - latitude))
+                      for lat, lon in footprint]
+            polygon = Polygon(coords)
+            if not polygon.is_valid:
+                polygon = polygon.buffer(0)
+            if polygon.is_empty or polygon.area < 1.0 or polygon.geom_type != 'Polygon':
+                continue
+            # The OSM way of the site building itself
+            if polygon.contains(site_point) or polygon.intersects(site_polygon):
+                continue
+            neighbours.append(ContextBuilding(polygon=polygon, height=self._height(building)))
+        return neighbours
+
+    def select(self, neighbours: List[ContextBuilding], site_polygon: Polygon,
+               latitude: float, radius: Optional[float] = None) -> List[ContextBuilding]:
+        """
+        Cull, merge and rank neighbours.
+
+        Args:
+            neighbours: Neighbour footprints in site coordinates
+            site_polygon: Model footprint in local meters
+            latitude: Site latitude (sun path)
+            radius: Search radius for this site (m, default: the builder's)
+
+        Returns:
+            Context blocks that can shade the site, most shading first
+        """
+        if not neighbours:
+            return []
+        tree = STRtree([n.polygon for n in neighbours])
+        search_area = site_polygon.buffer(radius or self.radius)
+        nearby = [neighbours[i] for i in sorted(tree.query(search_area, predicate='intersects'))]
+        relevant = [n for n in nearby if self._score(n, site_polygon, latitude)]
+        blocks = [block for block in self._merge(relevant) if self._score(block, site_polygon, latitude)]
+        blocks.sort(key=lambda b: (-b.sun_blocked_fraction, -b.obstruction_angle))
+        return blocks
+
+    def build_surfaces(self, buildings: List[Dict], latitude: float, longitude: float,
+                       site_polygon: Polygon, radius: Optional[float] = None) -> List[Dict]:
+        """
+        Shading surfaces for the buildings around a site, within the surface budget.
+
+        Args:
+            buildings: Results of OSMFetcher.search_area_buildings
+            latitude: Site latitude
+            longitude: Site longitude
+            site_polygon: Model footprint in local meters
+            radius: Search radius the neighbours were fetched with (m, default: the builder's)
+
+        Returns:
+            List of shading surface dicts (name, vertices as "x,y,z" strings)
+        """
+        neighbours = self.neighbours_from_osm(buildings, latitude, longitude, site_polygon)
+        blocks = self.select(neighbours, site_polygon, latitude, radius)
+
+        surfaces = []
+        emitted = 0
+        for block in blocks:
+            budget = self.max_surfaces - len(surfaces)
+            outline = self._outline(block.polygon, budget)
+            if outline is None:
+                continue
+            emitted += 1
+            surfaces.extend(self._block_surfaces(f"Context_{emitted}", outline, block.height))
+
+        if buildings:
+            print(f"✓ Context shading: {len(buildings)} neighbours → {len(blocks)} blocks, "
+                  f"{emitted} emitted as {len(surfaces)} surfaces")
+        return surfaces
+
+    def _height(self, building: Dict) -> float:
+        """Neighbour height from OSM height / levels tags."""
+        properties = building.get('properties') or {}
+        try:
+            height = float(properties.get('height') or 0)
+        except (TypeError, ValueError):
+            height = 0.0
+        if height > 0:
+            return height
+        try:
+            levels = float(properties.get('levels') or 0)
+        except (TypeError, ValueError):
+            levels = 0.0
+        return levels * CONTEXT_STORY_HEIGHT_M if levels > 0 else DEFAULT_CONTEXT_HEIGHT_M
+
+    def _site_sun_path(self, latitude: float) -> Tuple[np.ndarray, np.ndarray]:
+        key = round(latitude, 1)
+        if key not in self._sun_paths:
+            self._sun_paths[key] = sun_path(key)
+        return self._sun_paths[key]
+
+    def _score(self, building: ContextBuilding, site_polygon: Polygon, latitude: float) -> bool:
+        """
+        Set a building's obstruction angle and blocked sun share.
+
+        Returns:
+            True if it rises above the minimum obstruction angle and the
+            sun passes behind it at a lower elevation
+        """
+        distance = max(site_polygon.distance(building.polygon), 0.1)
+        building.obstruction_angle = math.degrees(math.atan2(building.height, distance))
+        building.sun_blocked_fraction = 0.0
+        if building.obstruction_angle < self.min_obstruction_angle:
+            return False
+
+        # Azimuth range the building spans, seen from the site footprint
+        center = site_polygon.centroid
+        coords = np.asarray(building.polygon.exterior.coords)
+        bearings = np.degrees(np.arctan2(coords[:, 0] - center.x, coords[:, 1] - center.y)) % 360.0
+        reference = bearings[0]
+        offsets = (bearings - reference + 180.0) % 360.0 - 180.0
+        # Widen by the site's own angular size at the building's distance
+        site_radius = math.sqrt(site_polygon.area / math.pi)
+        spread = math.degrees(math.atan2(site_radius, distance + site_radius))
+        low, high = offsets.min() - spread, offsets.max() + spread
+
+        azimuth, elevation = self._site_sun_path(latitude)
+        relative = (azimuth - reference + 180.0) % 360.0 - 180.0
+        behind = (relative >= low) & (relative <= high) & (elevation < building.obstruction_angle)
+        building.sun_blocked_fraction = float(behind.mean()) if len(azimuth) else 0.0
+        return building.sun_blocked_fraction > 0.0
+
+    def _merge(self, buildings: List[ContextBuilding]) -> List[ContextBuilding]:
+        """Merge touching neighbours of similar height into blocks."""
+        if len(buildings) < 2:
+            return buildings
+        polygons = [b.polygon for b in buildings]
+        tree = STRtree(polygons)
+        parent = list(range(len(buildings)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, polygon in enumerate(polygons):
+            for j in tree.query(polygon.buffer(self.merge_gap), predicate='intersects'):
+                j = int(j)
+                if j <= i:
+                    continue
+                tall, short = sorted((buildings[i].height, buildings[j].height), reverse=True)
+                if tall <= short * MERGE_HEIGHT_RATIO:
+                    parent[find(j)] = find(i)
+
+        groups: Dict[int, List[ContextBuilding]] = {}
+        for i, building in enumerate(buildings):
+            groups.setdefault(find(i), []).append(building)
+
+        half_gap = self.merge_gap / 2
+        blocks = []
+        for members in groups.values():
+            if len(members) == 1:
+                blocks.append(members[0])
+                continue
+            merged = unary_union([m.polygon.buffer(half_gap, join_style=JOIN_STYLE.mitre) for m in members])
+            merged = merged.buffer(-half_gap, join_style=JOIN_STYLE.mitre)
+            area = sum(m.polygon.area for m in members)
+            height = sum(m.height * m.polygon.area for m in members) / area
+            parts = list(merged.geoms) if merged.geom_type == 'MultiPolygon' else [merged]
+            for part in parts:
+                if part.geom_type == 'Polygon' and not part.is_empty and part.area >= 1.0:
+                    blocks.append(ContextBuilding(polygon=part, height=height, source_count=len(members)))
+        return blocks
+
+    def _outline(self, polygon: Polygon, budget: int) -> Optional[Polygon]:
+        """
+        Simplified outer ring whose walls plus roof fit the remaining budget.
+
+        Falls back to the minimum rotated rectangle (four walls); returns None
+        if not even that fits.
+        """
+        outline = Polygon(polygon.exterior)
+        outline, _ = self.geometry_engine.simplify_footprint(outline, CONTEXT_SIMPLIFICATION)
+        # One wall per edge plus the roof
+        if outline.geom_type != 'Polygon' or len(outline.exterior.coords) > budget:
+            outline = polygon.minimum_rotated_rectangle
+            if budget < 5 or outline.geom_type != 'Polygon':
+                return None
+        return orient(Polygon(outline.exterior), sign=1.0)
+
+    def _block_surfaces(self, name: str, outline: Polygon, height: float) -> List[Dict]:
+        """Outward-facing walls and an upward-facing roof of a counter-clockwise outline."""
+        ring = list(outline.exterior.coords)[:-1]
+        surfaces = []
+        for i, (ax, ay) in enumerate(ring):
+            bx, by = ring[(i + 1) % len(ring)]
+            surfaces.append({
+                'name': f"{name}_Wall_{i + 1}",
+                'vertices': [f"{ax:.4f},{ay:.4f},{height:.4f}", f"{ax:.4f},{ay:.4f},{0.0:.4f}",
+                             f"{bx:.4f},{by:.4f},{0.0:.4f}", f"{bx:.4f},{by:.4f},{height:.4f}"]
+            })
+        surfaces.append({
+            'name': f"{name}_Roof",
+            'vertices': [f"{x:.4f},{y:.4f},{height:.4f}" for x, y in ring]
+        })
+        return surfaces
@@ -3,6 +3,25 @@ Core module for IDF generation base classes.
 """
 
 from .base_idf_generator import BaseIDFGenerator
+from .generation_context import GenerationContext, activate_generation_context, current_generation_context
+from .instrumentation import MetricsRegistry, PipelineMetrics, add_bytes, collect_metrics, count, span
+from .name_allocator import NameAllocator
+from .stage_reporting import PIPELINE_STAGES, report_stage, stage_listener
 
-__all__ = ['BaseIDFGenerator']
+__all__ = [
+    'BaseIDFGenerator',
+    'GenerationContext',
+    'activate_generation_context',
+    'current_generation_context',
+    'MetricsRegistry',
+    'PipelineMetrics',
+    'add_bytes',
+    'collect_metrics',
+    'count',
+    'span',
+    'NameAllocator',
+    'PIPELINE_STAGES',
+    'report_stage',
+    'stage_listener',
+]
 
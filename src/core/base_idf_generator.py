@@ -2,10 +2,14 @@
 Base class for IDF generators.
 Provides common functionality shared by IDFGenerator and ProfessionalIDFGenerator.
 """
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Set, Optional, Dict
+from typing import Set, Optional, Dict, Iterator
 import math
 
+from .generation_context import GenerationContext, activate_generation_context, current_generation_context
+from .name_allocator import NameAllocator
+
 
 class BaseIDFGenerator:
     """Base class for IDF generators with common functionality."""
@@ -18,9 +22,44 @@ class BaseIDFGenerator:
             version: EnergyPlus version string (default: 24.2 to match EnergyPlus 24.2.0)
         """
         self.version = version
-        self.unique_names: Set[str] = set()
-        self._outdoor_air_nodelist_emitted = False
-        self._outdoor_air_nodes: Set[str] = set()
+        # State used when helpers are called outside a generation context
+        self._default_context = GenerationContext()
+    
+    @property
+    def context(self) -> GenerationContext:
+        """Generation state of the current call (the generator's own state outside a call)."""
+        return current_generation_context() or self._default_context
+    
+    @contextmanager
+    def generation_context(self, context: Optional[GenerationContext] = None) -> Iterator[GenerationContext]:
+        """
+        Run one generation against its own state.
+        
+        Args:
+            context: Optional context to use (a fresh one by default)
+            
+        Yields:
+            The active generation context
+        """
+        with activate_generation_context(context) as active:
+            yield active
+    
+    @property
+    def unique_names(self) -> NameAllocator:
+        """Object names allocated in the current generation."""
+        return self.context.unique_names
+    
+    @property
+    def _outdoor_air_nodes(self) -> Set[str]:
+        return self.context.outdoor_air_nodes
+    
+    @property
+    def _outdoor_air_nodelist_emitted(self) -> bool:
+        return self.context.outdoor_air_nodelist_emitted
+    
+    @_outdoor_air_nodelist_emitted.setter
+    def _outdoor_air_nodelist_emitted(self, emitted: bool) -> None:
+        self.context.outdoor_air_nodelist_emitted = emitted
     
     def _generate_unique_name(self, base_name: str) -> str:
         """
@@ -30,25 +69,14 @@ class BaseIDFGenerator:
             base_name: Base name for the object
             
         Returns:
-            Unique name (base_name if available, otherwise base_name_N)
+            Unique name (base_name if available, otherwise base_name_N);
+            names are compared case-insensitively, as EnergyPlus does
         """
-        if base_name not in self.unique_names:
-            self.unique_names.add(base_name)
-            return base_name
-        
-        counter = 1
-        while f"{base_name}_{counter}" in self.unique_names:
-            counter += 1
-        
-        unique_name = f"{base_name}_{counter}"
-        self.unique_names.add(unique_name)
-        return unique_name
+        return self.unique_names.allocate(base_name)
     
     def reset_unique_names(self) -> None:
-        """Reset the unique names set (useful for generating multiple IDFs)."""
-        self.unique_names.clear()
-        self._outdoor_air_nodelist_emitted = False
-        self._outdoor_air_nodes.clear()
+        """Reset the state of the current generation (useful for generating multiple IDFs)."""
+        self.context.reset()
     
     def generate_header(self, generator_name: str = "IDF Creator") -> str:
         """
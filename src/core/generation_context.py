@@ -0,0 +1,63 @@
+"""
+Per-call generation state.
+
+Everything that is accumulated while one IDF is generated (allocated object
+names, outdoor air nodes, the surface construction mapping, one-time
+objects) lives in a GenerationContext instead of on the generator, so one
+warmed generator can serve concurrent requests. The active context is held
+in a context variable, so each thread (and each asyncio task) sees its own.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional, Set
+
+from .name_allocator import NameAllocator
+
+
+@dataclass
+class GenerationContext:
+    """Mutable state of one IDF generation."""
+    unique_names: NameAllocator = field(default_factory=NameAllocator)
+    outdoor_air_nodes: Set[str] = field(default_factory=set)
+    outdoor_air_nodelist_emitted: bool = False
+    # Template construction name -> selected construction name
+    construction_map: Dict[str, str] = field(default_factory=dict)
+    # Shared VAV minimum flow schedule already emitted
+    vav_min_flow_schedule_added: bool = False
+
+    def reset(self) -> None:
+        """Clear all accumulated state."""
+        self.unique_names.clear()
+        self.outdoor_air_nodes.clear()
+        self.outdoor_air_nodelist_emitted = False
+        self.construction_map = {}
+        self.vav_min_flow_schedule_added = False
+
+
+_ACTIVE_CONTEXT: ContextVar[Optional[GenerationContext]] = ContextVar('idf_generation_context', default=None)
+
+
+def current_generation_context() -> Optional[GenerationContext]:
+    """Return the context of the generation running in this thread / task, if any."""
+    return _ACTIVE_CONTEXT.get()
+
+
+@contextmanager
+def activate_generation_context(context: Optional[GenerationContext] = None) -> Iterator[GenerationContext]:
+    """
+    Make ``context`` (or a fresh one) the active context for the enclosed block.
+
+    Args:
+        context: Optional context to use (e.g. to inspect it afterwards)
+
+    Yields:
+        The active context
+    """
+    context = context if context is not None else GenerationContext()
+    token = _ACTIVE_CONTEXT.set(context)
+    try:
+        yield context
+    finally:
+        _ACTIVE_CONTEXT.reset(token)
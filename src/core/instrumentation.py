@@ -0,0 +1,213 @@
+"""
+Lightweight instrumentation of the generation pipeline.
+
+Stages are timed with span(), a context manager (or decorator), and object
+counts and output sizes are recorded with count() and add_bytes(). Every
+measurement goes to the process-wide MetricsRegistry, which can be rendered
+in the Prometheus text format. Inside collect_metrics() the measurements of
+that one run are also collected, e.g. to return them with an API response.
+
+Spans are inclusive: a span that encloses another also contains its time.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds (s) of the stage duration histogram buckets
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_PREFIX = 'idf_creator'
+
+
+@dataclass
+class PipelineMetrics:
+    """Measurements of one pipeline run."""
+    # Stage -> total seconds / number of spans
+    spans: Dict[str, float] = field(default_factory=dict)
+    span_calls: Dict[str, int] = field(default_factory=dict)
+    # Object kind -> count
+    counters: Dict[str, int] = field(default_factory=dict)
+    # Output kind -> bytes produced
+    bytes: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """JSON-serializable view (durations in milliseconds)."""
+        return {
+            'spans_ms': {name: round(seconds * 1000.0, 3) for name, seconds in self.spans.items()},
+            'span_calls': dict(self.span_calls),
+            'counters': dict(self.counters),
+            'bytes': dict(self.bytes),
+        }
+
+
+class MetricsRegistry:
+    """Process-wide aggregate of all measurements (thread-safe)."""
+
+    _instance: Optional['MetricsRegistry'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Stage -> [bucket counts..., +Inf count], sum of seconds
+        self._histograms: Dict[str, List[int]] = {}
+        self._durations: Dict[str, float] = {}
+        self._counters: Dict[str, int] = {}
+        self._bytes: Dict[str, int] = {}
+        self.runs = 0
+
+    @classmethod
+    def get_instance(cls) -> 'MetricsRegistry':
+        """Get the process-wide registry."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop the process-wide registry (measurements start from zero)."""
+        with cls._instance_lock:
+            cls._instance = None
+
+    def observe_span(self, name: str, seconds: float) -> None:
+        with self._lock:
+            buckets = self._histograms.get(name)
+            if buckets is None:
+                buckets = self._histograms[name] = [0] * (len(DURATION_BUCKETS) + 1)
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    buckets[index] += 1
+                    break
+            else:
+                buckets[-1] += 1
+            self._durations[name] = self._durations.get(name, 0.0) + seconds
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def add_bytes(self, name: str, amount: int) -> None:
+        with self._lock:
+            self._bytes[name] = self._bytes.get(name, 0) + amount
+
+    def record_run(self) -> None:
+        with self._lock:
+            self.runs += 1
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Aggregated totals: span count and seconds per stage, counters, bytes."""
+        with self._lock:
+            return {
+                'spans': {
+                    name: {'count': sum(buckets), 'seconds': self._durations[name]}
+                    for name, buckets in self._histograms.items()
+                },
+                'counters': dict(self._counters),
+                'bytes': dict(self._bytes),
+                'runs': self.runs,
+            }
+
+    def render_prometheus(self) -> str:
+        """Render all measurements in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = {name: list(buckets) for name, buckets in self._histograms.items()}
+            durations = dict(self._durations)
+            counters = dict(self._counters)
+            produced = dict(self._bytes)
+            runs = self.runs
+
+        lines = [
+            f'# HELP {METRIC_PREFIX}_runs_total Instrumented pipeline runs.',
+            f'# TYPE {METRIC_PREFIX}_runs_total counter',
+            f'{METRIC_PREFIX}_runs_total {runs}',
+            f'# HELP {METRIC_PREFIX}_stage_duration_seconds Time spent per pipeline stage.',
+            f'# TYPE {METRIC_PREFIX}_stage_duration_seconds histogram',
+        ]
+        for name in sorted(histograms):
+            cumulative = 0
+            bounds: List[Tuple[str, int]] = []
+            for bound, bucket_count in zip(DURATION_BUCKETS, histograms[name]):
+                cumulative += bucket_count
+                bounds.append((repr(bound), cumulative))
+            bounds.append(('+Inf', cumulative + histograms[name][-1]))
+            label = _escape_label(name)
+            for bound, total in bounds:
+                lines.append(f'{METRIC_PREFIX}_stage_duration_seconds_bucket{{stage="{label}",le="{bound}"}} {total}')
+            lines.append(f'{METRIC_PREFIX}_stage_duration_seconds_sum{{stage="{label}"}} {durations[name]:.6f}')
+            lines.append(f'{METRIC_PREFIX}_stage_duration_seconds_count{{stage="{label}"}} {bounds[-1][1]}')
+
+        lines.append(f'# HELP {METRIC_PREFIX}_objects_total Objects generated, by kind.')
+        lines.append(f'# TYPE {METRIC_PREFIX}_objects_total counter')
+        for name in sorted(counters):
+            lines.append(f'{METRIC_PREFIX}_objects_total{{kind="{_escape_label(name)}"}} {counters[name]}')
+
+        lines.append(f'# HELP {METRIC_PREFIX}_output_bytes_total Bytes produced, by output kind.')
+        lines.append(f'# TYPE {METRIC_PREFIX}_output_bytes_total counter')
+        for name in sorted(produced):
+            lines.append(f'{METRIC_PREFIX}_output_bytes_total{{kind="{_escape_label(name)}"}} {produced[name]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_ACTIVE_METRICS: ContextVar[Optional[PipelineMetrics]] = ContextVar('idf_pipeline_metrics', default=None)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time the enclosed block (or decorated function) as stage ``name``.
+
+    Args:
+        name: Stage name; repeated spans of the same stage add up
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        MetricsRegistry.get_instance().observe_span(name, elapsed)
+        metrics = _ACTIVE_METRICS.get()
+        if metrics is not None:
+            metrics.spans[name] = metrics.spans.get(name, 0.0) + elapsed
+            metrics.span_calls[name] = metrics.span_calls.get(name, 0) + 1
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Count ``amount`` generated objects of kind ``name``."""
+    MetricsRegistry.get_instance().increment(name, amount)
+    metrics = _ACTIVE_METRICS.get()
+    if metrics is not None:
+        metrics.counters[name] = metrics.counters.get(name, 0) + amount
+
+
+def add_bytes(name: str, amount: int) -> None:
+    """Record ``amount`` bytes of output kind ``name``."""
+    MetricsRegistry.get_instance().add_bytes(name, amount)
+    metrics = _ACTIVE_METRICS.get()
+    if metrics is not None:
+        metrics.bytes[name] = metrics.bytes.get(name, 0) + amount
+
+
+@contextmanager
+def collect_metrics() -> Iterator[PipelineMetrics]:
+    """
+    Collect the measurements of the enclosed run (in this thread / task).
+
+    Yields:
+        PipelineMetrics filled in as the block runs
+    """
+    metrics = PipelineMetrics()
+    token = _ACTIVE_METRICS.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _ACTIVE_METRICS.reset(token)
+        MetricsRegistry.get_instance().record_run()
@@ -0,0 +1,74 @@
+"""
+Unique object name allocation.
+
+EnergyPlus compares object names case-insensitively, so "Zone1 Fan" and
+"ZONE1 FAN" collide. The allocator keeps a per-base counter so repeated
+requests for the same base name cost O(1) instead of probing ``base_1``,
+``base_2``, ... on every call.
+"""
+
+from typing import Dict, Iterable, Iterator
+
+
+class NameAllocator:
+    """
+    Case-insensitive set of used names that hands out ``base``, ``base_1``, ``base_2``, ...
+
+    Supports the set operations the generators use (``in``, ``add``,
+    ``clear``, iteration), so it can stand in for a plain set of names.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        # Upper-cased name -> name as first allocated
+        self._used: Dict[str, str] = {}
+        # Upper-cased base name -> next suffix to try
+        self._next_suffix: Dict[str, int] = {}
+        for name in names:
+            self.add(name)
+
+    def allocate(self, base_name: str) -> str:
+        """
+        Reserve and return a unique name derived from ``base_name``.
+
+        Args:
+            base_name: Preferred name
+
+        Returns:
+            ``base_name`` if unused, otherwise ``base_name_N`` with the smallest N
+            not handed out for this base before
+        """
+        key = base_name.upper()
+        if key not in self._used:
+            self._used[key] = base_name
+            return base_name
+
+        suffix = self._next_suffix.get(key, 1)
+        # Only names reserved directly with add() can be skipped here, so the
+        # probing is amortized O(1) per allocation
+        while f"{key}_{suffix}" in self._used:
+            suffix += 1
+        self._next_suffix[key] = suffix + 1
+        unique_name = f"{base_name}_{suffix}"
+        self._used[unique_name.upper()] = unique_name
+        return unique_name
+
+    def add(self, name: str) -> None:
+        """Mark ``name`` as used."""
+        self._used.setdefault(name.upper(), name)
+
+    def clear(self) -> None:
+        """Forget all names."""
+        self._used.clear()
+        self._next_suffix.clear()
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name.upper() in self._used
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._used.values())
+
+    def __len__(self) -> int:
+        return len(self._used)
+
+    def __repr__(self) -> str:
+        return f"NameAllocator({len(self._used)} names)"
@@ -0,0 +1,43 @@
+"""
+Pipeline stage reporting.
+
+Creating an IDF runs through a fixed sequence of stages (geocoding,
+footprint lookup, geometry, HVAC, writing the file). The pipeline calls
+report_stage() as it enters each one; whoever runs it (e.g. a background
+job) installs a listener with stage_listener() to follow progress. The
+listener is held in a context variable, so concurrent generations in
+other threads report to their own listener.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+# Stages of IDF creation, in pipeline order
+PIPELINE_STAGES = ('geocode', 'footprint', 'geometry', 'hvac', 'write')
+
+StageListener = Callable[[str], None]
+
+_STAGE_LISTENER: ContextVar[Optional[StageListener]] = ContextVar('idf_stage_listener', default=None)
+
+
+def report_stage(stage: str) -> None:
+    """Tell the active listener (if any) that the pipeline entered ``stage``."""
+    listener = _STAGE_LISTENER.get()
+    if listener is not None:
+        listener(stage)
+
+
+@contextmanager
+def stage_listener(listener: Optional[StageListener]) -> Iterator[None]:
+    """
+    Send the stages reported in the enclosed block to ``listener``.
+
+    Args:
+        listener: Callable receiving each stage name (None disables reporting)
+    """
+    token = _STAGE_LISTENER.set(listener)
+    try:
+        yield
+    finally:
+        _STAGE_LISTENER.reset(token)
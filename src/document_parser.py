@@ -1,14 +1,131 @@
 """Module for parsing building documents and extracting parameters."""
+import hashlib
+import os
 import re
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 
+from .utils.common import resolve_worker_count
+
+# Parameters parse_text can extract; parsing stops once all are found
+TARGET_FIELDS = ('floor_area', 'stories', 'building_type', 'window_to_wall_ratio', 'year_built')
+
+# Trailing characters of a page carried into the next one, so matches that
+# straddle a page break are still found
+PAGE_OVERLAP_CHARS = 80
+
+# Pages handed to one worker when a PDF is split across processes
+PDF_PAGE_CHUNK = 16
+
+# Rough peak memory of one parsing worker (PDF reader or OCR engine)
+DOCUMENT_WORKER_MEMORY_MB = 256.0
+
+# Environment variable naming a directory to persist OCR text in
+OCR_CACHE_ENV = 'IDF_CREATOR_OCR_CACHE'
+
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.bmp')
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file's contents, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class OCRTextCache:
+    """
+    OCR text keyed by the SHA-256 of the image file.
+
+    Without a directory the cache lives in memory; with one each entry is
+    also written to ``<dir>/<hash>.txt`` so scans are only OCRed once across
+    runs and worker processes.
+    """
+
+    _instances: Dict[Optional[str], 'OCRTextCache'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Optional directory to persist OCR text in
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._texts: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def get_instance(cls, cache_dir: Optional[str] = None) -> 'OCRTextCache':
+        """
+        Get the process-wide cache for ``cache_dir`` (default: $IDF_CREATOR_OCR_CACHE).
+
+        Args:
+            cache_dir: Optional persistence directory
+
+        Returns:
+            Shared cache instance
+        """
+        cache_dir = cache_dir or os.environ.get(OCR_CACHE_ENV) or None
+        with cls._instances_lock:
+            if cache_dir not in cls._instances:
+                cls._instances[cache_dir] = cls(cache_dir)
+            return cls._instances[cache_dir]
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all shared cache instances."""
+        with cls._instances_lock:
+            cls._instances.clear()
+
+    def get(self, file_hash: str) -> Optional[str]:
+        """Return the cached OCR text of a file hash, or None."""
+        text = self._texts.get(file_hash)
+        if text is None and self.cache_dir:
+            entry = self.cache_dir / f"{file_hash}.txt"
+            if entry.exists():
+                text = self._texts[file_hash] = entry.read_text(encoding='utf-8')
+        if text is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return text
+
+    def put(self, file_hash: str, text: str) -> None:
+        """Store the OCR text of a file hash."""
+        self._texts[file_hash] = text
+        if self.cache_dir:
+            entry = self.cache_dir / f"{file_hash}.txt"
+            tmp = entry.with_suffix(f'.{os.getpid()}.tmp')
+            tmp.write_text(text, encoding='utf-8')
+            os.replace(tmp, entry)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
 
 class DocumentParser:
     """Parses PDF, image, and text documents to extract building parameters."""
     
-    def __init__(self):
+    def __init__(self, ocr_cache: Optional[OCRTextCache] = None, max_workers: Optional[int] = None):
+        """
+        Initialize the parser.
+        
+        Args:
+            ocr_cache: OCR text cache (default: the shared instance)
+            max_workers: Process-pool size for large PDFs and document batches
+                (default: one per CPU, capped by memory)
+        """
         self.footprints = []
+        self.ocr_cache = ocr_cache if ocr_cache is not None else OCRTextCache.get_instance()
+        self.max_workers = max_workers or os.cpu_count() or 1
     
     def parse_text(self, text: str) -> Dict:
         """
@@ -55,47 +172,95 @@ class DocumentParser:
         
         return params
     
+    def parse_pages(self, pages: Iterable[str]) -> Dict:
+        """
+        Parse a stream of page texts, keeping the first value found per field.
+        
+        Pages are consumed one at a time (only the tail of the previous page
+        is kept, for matches across the page break) and the stream is not
+        read further once every target field has been found.
+        
+        Args:
+            pages: Iterable of page texts, in document order
+        
+        Returns:
+            Dictionary with extracted building parameters
+        """
+        params = {}
+        tail = ''
+        for page in pages:
+            text = tail + (page or '')
+            for field, value in self.parse_text(text).items():
+                params.setdefault(field, value)
+            if all(field in params for field in TARGET_FIELDS):
+                break
+            tail = text[-PAGE_OVERLAP_CHARS:]
+        return params
+    
     def parse_pdf(self, pdf_path: str) -> Dict:
         """
-        Extract text from PDF and parse it.
+        Extract text from PDF page by page and parse it.
+        
+        PDFs longer than one chunk are split into page ranges parsed in a
+        process pool; ranges are merged in page order and no further ranges
+        are started once all target fields are known.
         
         Args:
             pdf_path: Path to PDF file
-            
+        
         Returns:
             Dictionary with extracted building parameters
         """
         try:
-            import PyPDF2
-            
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-            
-            return self.parse_text(text)
+            page_count = pdf_page_count(pdf_path)
+            workers = min(resolve_worker_count(self.max_workers, DOCUMENT_WORKER_MEMORY_MB),
+                          -(-page_count // PDF_PAGE_CHUNK))
+            if workers <= 1:
+                return self.parse_pages(iter_pdf_pages(pdf_path))
+            return self._parse_pdf_parallel(pdf_path, page_count, workers)
         
         except Exception as e:
             print(f"Error parsing PDF: {e}")
             return {}
     
+    def _parse_pdf_parallel(self, pdf_path: str, page_count: int, workers: int) -> Dict:
+        """Parse page ranges of one PDF in a process pool, ``workers`` ranges at a time."""
+        from concurrent.futures import ProcessPoolExecutor
+        
+        # Ranges overlap by one page so matches across a range boundary are kept
+        ranges = [(max(start - 1, 0), min(start + PDF_PAGE_CHUNK, page_count))
+                  for start in range(0, page_count, PDF_PAGE_CHUNK)]
+        params = {}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for first in range(0, len(ranges), workers):
+                futures = [executor.submit(_parse_pdf_range, pdf_path, start, stop)
+                           for start, stop in ranges[first:first + workers]]
+                for future in futures:
+                    for field, value in future.result().items():
+                        params.setdefault(field, value)
+                if all(field in params for field in TARGET_FIELDS):
+                    break
+        return params
+    
     def parse_image(self, image_path: str) -> Dict:
         """
         Extract text from image using OCR.
         
+        The OCR text is cached by the file's SHA-256, so re-submitted scans
+        are not OCRed again.
+        
         Args:
             image_path: Path to image file
-            
+        
         Returns:
             Dictionary with extracted building parameters
         """
         try:
-            from pytesseract import image_to_string
-            from PIL import Image
-            
-            image = Image.open(image_path)
-            text = image_to_string(image)
+            file_hash = file_sha256(image_path)
+            text = self.ocr_cache.get(file_hash)
+            if text is None:
+                text = ocr_image(image_path)
+                self.ocr_cache.put(file_hash, text)
             
             return self.parse_text(text)
         
@@ -109,7 +274,7 @@ class DocumentParser:
         
         Args:
             file_path: Path to document file
-            
+        
         Returns:
             Dictionary with extracted building parameters
         """
@@ -117,38 +282,104 @@ class DocumentParser:
         
         if path.suffix.lower() == '.pdf':
             return self.parse_pdf(file_path)
-        elif path.suffix.lower() in ['.png', '.jpg', '.jpeg', '.gif', '.bmp']:
+        elif path.suffix.lower() in IMAGE_SUFFIXES:
             return self.parse_image(file_path)
         elif path.suffix.lower() == '.txt':
             with open(file_path, 'r') as f:
-                return self.parse_text(f.read())
+                return self.parse_pages(f)
         else:
             print(f"Unsupported file type: {path.suffix}")
             return {}
+    
+    def parse_documents(self, file_paths: List[str]) -> List[Dict]:
+        """
+        Parse several documents, in a process pool when more than one worker is available.
+        
+        Images whose OCR text is already cached are parsed in this process;
+        OCR text produced by the workers is added to this parser's cache.
+        A single document is parsed with parse_document (which may still
+        split a large PDF across processes).
+        
+        Args:
+            file_paths: Paths to document files
+        
+        Returns:
+            Extracted parameters per document, in the order given
+        """
+        results: List[Dict] = [{} for _ in file_paths]
+        jobs = []
+        for index, file_path in enumerate(file_paths):
+            if Path(file_path).suffix.lower() in IMAGE_SUFFIXES and os.path.exists(file_path):
+                text = self.ocr_cache.get(file_sha256(file_path))
+                if text is not None:
+                    results[index] = self.parse_text(text)
+                    continue
+            jobs.append((index, file_path))
+        
+        workers = min(resolve_worker_count(self.max_workers, DOCUMENT_WORKER_MEMORY_MB), len(jobs))
+        if workers <= 1:
+            for index, file_path in jobs:
+                results[index] = self.parse_document(file_path)
+            return results
+        
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_parse_document_job, file_path): (index, file_path)
+                       for index, file_path in jobs}
+            for future in as_completed(futures):
+                index, file_path = futures[future]
+                try:
+                    results[index], ocr_texts = future.result()
+                except Exception as e:
+                    print(f"Error parsing {Path(file_path).name}: {e}")
+                    continue
+                for file_hash, text in ocr_texts.items():
+                    self.ocr_cache.put(file_hash, text)
+        return results
 
 
+def pdf_page_count(pdf_path: str) -> int:
+    """Number of pages in a PDF."""
+    import PyPDF2
 
+    with open(pdf_path, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
 
 
+def iter_pdf_pages(pdf_path: str, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield the text of PDF pages ``start`` to ``stop`` one page at a time.
 
+    Args:
+        pdf_path: Path to PDF file
+        start: First page index
+        stop: Page index to stop before (default: end of document)
+    """
+    import PyPDF2
 
+    with open(pdf_path, 'rb') as file:
+        pages = PyPDF2.PdfReader(file).pages
+        for index in range(start, len(pages) if stop is None else min(stop, len(pages))):
+            yield pages[index].extract_text() or ''
 
 
+def ocr_image(image_path: str) -> str:
+    """OCR the text of an image file."""
+    from pytesseract import image_to_string
+    from PIL import Image
 
+    with Image.open(image_path) as image:
+        return image_to_string(image)
 
 
+def _parse_pdf_range(pdf_path: str, start: int, stop: int) -> Dict:
+    """Process-pool entry point for one page range of a PDF."""
+    return DocumentParser(max_workers=1).parse_pages(iter_pdf_pages(pdf_path, start, stop))
 
 
-
-
-
-
-
-
-
-
-
-
-
-
-
+def _parse_document_job(file_path: str) -> Tuple[Dict, Dict[str, str]]:
+    """Process-pool entry point for one document; also returns any new OCR text."""
+    parser = DocumentParser(ocr_cache=OCRTextCache(os.environ.get(OCR_CACHE_ENV) or None), max_workers=1)
+    params = parser.parse_document(file_path)
+    return params, dict(parser.ocr_cache._texts)
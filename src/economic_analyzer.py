@@ -17,11 +17,15 @@ Reference:
 - FEMP LCC Guidelines
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Union
 from dataclasses import dataclass
 from datetime import datetime
 import json
 
+import numpy as np
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
 
 @dataclass
 class EconomicParameters:
@@ -98,6 +102,233 @@ class EconomicAnalysisResult:
         return self.npv > 0 and self.payback_years < 10
 
 
+@dataclass
+class BatchEconomicsResult:
+    """Economic metrics for a batch of cash-flow vectors (one entry per project)"""
+    npv: np.ndarray  # Net Present Value
+    irr: np.ndarray  # Internal Rate of Return (NaN where undefined)
+    sir: np.ndarray  # Savings to Investment Ratio (discounted)
+    simple_payback: np.ndarray  # Initial cost / year-1 net savings (inf if none)
+    discounted_payback: np.ndarray  # Years until discounted cash flow breaks even (inf if never)
+    roi: np.ndarray  # Year-1 savings / initial cost (%)
+    annual_savings_year1: np.ndarray
+    total_savings: np.ndarray  # Undiscounted savings over the analysis period
+
+
+def escalated_savings(
+    year1_savings: ArrayLike,
+    years: int,
+    escalation_rate: float = 0.03,
+    first_year_escalated: bool = False
+) -> np.ndarray:
+    """
+    Savings streams for a batch of projects.
+    
+    Args:
+        year1_savings: Base annual savings per project
+        years: Analysis period (years)
+        escalation_rate: Annual utility rate escalation
+        first_year_escalated: Apply escalation already in year 1
+    
+    Returns:
+        Array (projects x years) of savings by year
+    """
+    exponents = np.arange(1, years + 1) - (0 if first_year_escalated else 1)
+    return np.atleast_1d(np.asarray(year1_savings, dtype=float))[:, None] * (1 + escalation_rate) ** exponents
+
+
+def replacement_schedule(
+    component_costs: np.ndarray,
+    lifetimes: np.ndarray,
+    years: int,
+    cost_escalation_rate: float = 0.0
+) -> np.ndarray:
+    """
+    Replacement costs by year for components that wear out within the analysis period.
+    
+    A component with lifetime L is replaced in years L, 2L, ... before the end of
+    the period (no replacement in the final year).
+    
+    Args:
+        component_costs: Array (projects x components) of component costs
+        lifetimes: Component lifetimes (years), broadcastable to component_costs
+        years: Analysis period (years)
+        cost_escalation_rate: Annual escalation of replacement costs
+    
+    Returns:
+        Array (projects x years) of replacement costs
+    """
+    component_costs = np.atleast_2d(np.asarray(component_costs, dtype=float))
+    lifetimes = np.broadcast_to(np.asarray(lifetimes, dtype=float), component_costs.shape)
+    year = np.arange(1, years + 1)
+    due = (year[None, None, :] % np.maximum(lifetimes, 1)[:, :, None] == 0) & (year < years)
+    due &= lifetimes[:, :, None] > 0
+    escalation = (1 + cost_escalation_rate) ** year
+    return (component_costs[:, :, None] * due).sum(axis=1) * escalation
+
+
+def batch_npv(initial_costs: ArrayLike, cash_flows: np.ndarray, discount_rate: ArrayLike) -> np.ndarray:
+    """
+    Net present value of (initial cost, cash flows in years 1..T) per project.
+    
+    Args:
+        initial_costs: Investment at year 0 per project
+        cash_flows: Array (projects x years) of net cash flows
+        discount_rate: Scalar or per-project discount rate
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    rate = np.asarray(discount_rate, dtype=float).reshape(-1, 1)
+    discount = (1 + rate) ** -np.arange(1, cash_flows.shape[1] + 1)
+    return (cash_flows * discount).sum(axis=1) - np.asarray(initial_costs, dtype=float)
+
+
+def batch_irr(
+    initial_costs: ArrayLike,
+    cash_flows: np.ndarray,
+    low: float = -0.99,
+    high: float = 10.0,
+    tol: float = 1e-10,
+    max_iter: int = 100
+) -> np.ndarray:
+    """
+    Internal rate of return per project by safeguarded Newton iteration.
+    
+    Each project keeps a bracket [low, high] on which its NPV changes sign;
+    Newton steps that leave the bracket fall back to bisection, so every
+    project converges. Projects without a sign change get NaN.
+    
+    Args:
+        initial_costs: Investment at year 0 per project
+        cash_flows: Array (projects x years) of net cash flows
+    
+    Returns:
+        IRR per project (fraction, NaN where undefined)
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    n, years = cash_flows.shape
+    flows = np.column_stack([-np.broadcast_to(np.asarray(initial_costs, dtype=float), (n,)), cash_flows])
+    t = np.arange(years + 1)
+    
+    def npv_and_slope(rate):
+        discount = (1 + rate)[:, None] ** -t
+        values = flows * discount
+        return values.sum(axis=1), -(values * t).sum(axis=1) / (1 + rate)
+    
+    lo = np.full(n, low)
+    hi = np.full(n, high)
+    f_lo = npv_and_slope(lo)[0]
+    f_hi = npv_and_slope(hi)[0]
+    valid = np.isfinite(f_lo) & np.isfinite(f_hi) & (np.sign(f_lo) != np.sign(f_hi))
+    lo_positive = f_lo > 0
+    
+    # Start from the rate at which the undiscounted total, spread evenly,
+    # would recover the investment; Newton then converges in a few steps
+    initial = -flows[:, 0]
+    total = flows[:, 1:].sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        guess = np.where((total > 0) & (initial > 0), (total / initial) ** (2.0 / (years + 1)) - 1, 0.1)
+    rate = np.clip(np.nan_to_num(guess, nan=0.1), low + 1e-6, high - 1e-6)
+    active = valid.copy()
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        f, slope = npv_and_slope(rate)
+        same_as_lo = (f > 0) == lo_positive
+        lo = np.where(active & same_as_lo, rate, lo)
+        hi = np.where(active & ~same_as_lo, rate, hi)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = f / slope
+        newton = rate - step
+        converged = (f == 0) | (np.abs(step) < tol)
+        use_newton = np.isfinite(newton) & (newton >= lo) & (newton <= hi)
+        new_rate = np.where(converged, rate, np.where(use_newton, newton, (lo + hi) / 2))
+        
+        rate = np.where(active, new_rate, rate)
+        active &= ~converged & (hi - lo > tol)
+    
+    return np.where(valid, rate, np.nan)
+
+
+def batch_payback(initial_costs: ArrayLike, cash_flows: np.ndarray, discount_rate: float = 0.0) -> np.ndarray:
+    """
+    Years until the cumulative (discounted) cash flow recovers the initial cost.
+    
+    Interpolates linearly within the break-even year; inf if never recovered.
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    n, years = cash_flows.shape
+    discounted = cash_flows * (1 + discount_rate) ** -np.arange(1, years + 1)
+    cumulative = np.column_stack([
+        -np.broadcast_to(np.asarray(initial_costs, dtype=float), (n,)),
+        np.zeros((n, years))
+    ])
+    cumulative[:, 1:] = cumulative[:, :1] + np.cumsum(discounted, axis=1)
+    
+    recovered = cumulative >= 0
+    first = recovered.argmax(axis=1)
+    payback = np.full(n, np.inf)
+    has = recovered.any(axis=1)
+    
+    at_start = has & (first == 0)
+    payback[at_start] = 0.0
+    rows = np.nonzero(has & (first > 0))[0]
+    before = cumulative[rows, first[rows] - 1]
+    after = cumulative[rows, first[rows]]
+    payback[rows] = first[rows] - 1 + (-before) / (after - before)
+    return payback
+
+
+def analyze_cash_flows(
+    initial_costs: ArrayLike,
+    savings: np.ndarray,
+    discount_rate: float,
+    operating_costs: Optional[np.ndarray] = None,
+    replacement_costs: Optional[np.ndarray] = None
+) -> BatchEconomicsResult:
+    """
+    Evaluate NPV, IRR, SIR and payback for a batch of projects in one call.
+    
+    Args:
+        initial_costs: Investment at year 0 per project
+        savings: Array (projects x years) of energy cost savings
+        discount_rate: Discount rate
+        operating_costs: Array (projects x years) of maintenance/operating costs
+        replacement_costs: Array (projects x years) of replacement costs
+    
+    Returns:
+        BatchEconomicsResult with one entry per project
+    """
+    savings = np.atleast_2d(np.asarray(savings, dtype=float))
+    n, years = savings.shape
+    initial = np.broadcast_to(np.asarray(initial_costs, dtype=float), (n,)).astype(float)
+    operating = np.zeros_like(savings) if operating_costs is None else np.broadcast_to(operating_costs, savings.shape)
+    replacement = np.zeros_like(savings) if replacement_costs is None else np.broadcast_to(replacement_costs, savings.shape)
+    
+    net = savings - operating - replacement
+    discount = (1 + discount_rate) ** -np.arange(1, years + 1)
+    pv_net_savings = ((savings - operating) * discount).sum(axis=1)
+    pv_investment = initial + (replacement * discount).sum(axis=1)
+    
+    year1 = savings[:, 0] if years else np.zeros(n)
+    year1_net = net[:, 0] if years else np.zeros(n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sir = np.where(pv_investment > 0, pv_net_savings / pv_investment, 0.0)
+        roi = np.where(initial > 0, year1 / initial * 100.0, 0.0)
+        simple_payback = np.where(year1_net > 0, initial / year1_net, np.inf)
+    
+    return BatchEconomicsResult(
+        npv=pv_net_savings - pv_investment,
+        irr=batch_irr(initial, net),
+        sir=sir,
+        simple_payback=simple_payback,
+        discounted_payback=batch_payback(initial, net, discount_rate),
+        roi=roi,
+        annual_savings_year1=year1,
+        total_savings=savings.sum(axis=1)
+    )
+
+
 class EconomicAnalyzer:
     """
     Perform comprehensive economic analysis for energy projects.
@@ -122,42 +353,83 @@ class EconomicAnalyzer:
         Returns:
             EconomicAnalysisResult with all metrics
         """
-        # Calculate annual savings by year
-        savings_by_year = savings.calculate_annual_savings(
-            escalation_rate=self.params.utility_escalation_rate
-        )
+        return self.analyze_projects([costs], [savings])[0]
+    
+    def analyze_projects(
+        self,
+        costs: List[ProjectCosts],
+        savings: List[ProjectSavings]
+    ) -> List[EconomicAnalysisResult]:
+        """
+        Analyze many projects in one vectorized pass.
         
-        # Calculate NPV
-        npv = self._calculate_npv(costs, savings_by_year)
+        Args:
+            costs: Cost structure per project
+            savings: Savings structure per project (same order as costs)
         
-        # Calculate simple payback
-        year1_savings = savings_by_year.get(1, 0.0)
-        payback = costs.implementation_cost / year1_savings if year1_savings > 0 else float('inf')
+        Returns:
+            EconomicAnalysisResult per project
+        """
+        years = self.params.analysis_period_years
+        year1 = np.array([s.calculate_annual_savings(self.params.utility_escalation_rate)[1] for s in savings])
         
-        # Calculate ROI (simple, annual)
-        roi = (year1_savings / costs.implementation_cost * 100.0) if costs.implementation_cost > 0 else 0.0
+        replacement = np.zeros((len(costs), years))
+        for i, c in enumerate(costs):
+            if c.replacement_cost and c.replacement_year and 1 <= c.replacement_year <= years:
+                replacement[i, c.replacement_year - 1] = c.replacement_cost
         
-        # Calculate IRR
-        irr = self._calculate_irr(costs, savings_by_year)
+        batch = self.analyze_batch(
+            implementation_costs=[c.implementation_cost for c in costs],
+            year1_savings=year1,
+            annual_costs=[c.annual_maintenance + c.annual_operating for c in costs],
+            replacement_costs=replacement
+        )
         
-        # Calculate LCC (negative NPV from owner perspective)
-        lcc = -npv
+        results = []
+        for i in range(len(costs)):
+            irr = batch.irr[i]
+            results.append(EconomicAnalysisResult(
+                npv=float(batch.npv[i]),
+                roi=float(batch.roi[i]),
+                payback_years=float(costs[i].implementation_cost / year1[i]) if year1[i] > 0 else float('inf'),
+                irr=None if np.isnan(irr) else float(irr),
+                lcc=float(-batch.npv[i]),  # Negative NPV from owner perspective
+                annual_savings_year1=float(batch.annual_savings_year1[i]),
+                total_savings_20yr=float(batch.total_savings[i]),
+                savings_to_investment_ratio=float(batch.sir[i])
+            ))
+        return results
+    
+    def analyze_batch(
+        self,
+        implementation_costs: ArrayLike,
+        year1_savings: ArrayLike,
+        annual_costs: ArrayLike = 0.0,
+        replacement_costs: Optional[np.ndarray] = None,
+        first_year_escalated: bool = False
+    ) -> BatchEconomicsResult:
+        """
+        Evaluate NPV, IRR, SIR and payback for arrays of projects.
         
-        # Total savings over analysis period
-        total_savings = sum(savings_by_year.values())
+        Savings escalate at the utility escalation rate over the analysis
+        period and are discounted at the discount rate.
         
-        # Savings to Investment Ratio
-        sir = total_savings / costs.implementation_cost if costs.implementation_cost > 0 else 0.0
+        Args:
+            implementation_costs: Initial investment per project
+            year1_savings: Base annual energy cost savings per project
+            annual_costs: Annual maintenance/operating cost per project
+            replacement_costs: Array (projects x years) of replacement costs
+            first_year_escalated: Apply escalation already in year 1
         
-        return EconomicAnalysisResult(
-            npv=npv,
-            roi=roi,
-            payback_years=payback,
-            irr=irr,
-            lcc=lcc,
-            annual_savings_year1=year1_savings,
-            total_savings_20yr=total_savings,
-            savings_to_investment_ratio=sir
+        Returns:
+            BatchEconomicsResult with one entry per project
+        """
+        years = self.params.analysis_period_years
+        savings = escalated_savings(year1_savings, years, self.params.utility_escalation_rate, first_year_escalated)
+        operating = np.broadcast_to(np.asarray(annual_costs, dtype=float).reshape(-1, 1), savings.shape)
+        return analyze_cash_flows(
+            implementation_costs, savings, self.params.discount_rate,
+            operating_costs=operating, replacement_costs=replacement_costs
         )
     
     def _calculate_npv(
@@ -170,27 +442,7 @@ class EconomicAnalyzer:
         
         NPV = -Initial Cost + Σ(Savings_t / (1+r)^t) - Σ(Costs_t / (1+r)^t)
         """
-        # Initial investment (negative cash flow)
-        npv = -costs.implementation_cost
-        
-        # Discounted savings and costs over analysis period
-        for year in range(1, self.params.analysis_period_years + 1):
-            discount_factor = 1.0 / ((1 + self.params.discount_rate) ** year)
-            
-            # Savings (positive cash flow)
-            savings = savings_by_year.get(year, 0.0)
-            npv += savings * discount_factor
-            
-            # Annual maintenance/operating (negative cash flow)
-            annual_costs = costs.annual_maintenance + costs.annual_operating
-            npv -= annual_costs * discount_factor
-            
-            # Replacement cost (if applicable)
-            if costs.replacement_year and year == costs.replacement_year:
-                if costs.replacement_cost:
-                    npv -= costs.replacement_cost * discount_factor
-        
-        return npv
+        return float(batch_npv(costs.implementation_cost, self._net_cash_flows(costs, savings_by_year), self.params.discount_rate)[0])
     
     def _calculate_irr(
         self,
@@ -200,19 +452,19 @@ class EconomicAnalyzer:
         """
         Calculate Internal Rate of Return (IRR).
         
-        IRR is the discount rate where NPV = 0.
-        Uses iterative approximation.
+        IRR is the discount rate where NPV = 0, found by root finding.
         """
-        # Try different discount rates
-        for rate in [i / 100.0 for i in range(1, 101)]:  # 1% to 100%
-            test_params = EconomicParameters(discount_rate=rate)
-            test_analyzer = EconomicAnalyzer(params=test_params)
-            npv = test_analyzer._calculate_npv(costs, savings_by_year)
-            
-            if abs(npv) < 100.0:  # Close enough to zero
-                return rate
-        
-        return None
+        irr = batch_irr(costs.implementation_cost, self._net_cash_flows(costs, savings_by_year))[0]
+        return None if np.isnan(irr) else float(irr)
+    
+    def _net_cash_flows(self, costs: ProjectCosts, savings_by_year: Dict[int, float]) -> np.ndarray:
+        """Net cash flows for years 1..analysis period (savings minus annual and replacement costs)."""
+        years = self.params.analysis_period_years
+        flows = np.array([savings_by_year.get(year, 0.0) for year in range(1, years + 1)])
+        flows -= costs.annual_maintenance + costs.annual_operating
+        if costs.replacement_cost and costs.replacement_year and 1 <= costs.replacement_year <= years:
+            flows[costs.replacement_year - 1] -= costs.replacement_cost
+        return flows
     
     def generate_report(
         self,
@@ -284,14 +536,13 @@ ECONOMIC VIABILITY ASSESSMENT
         Returns:
             Ranked list of scenarios with analysis results
         """
-        results = []
+        analyses = self.analyze_projects(
+            [scenario['costs'] for scenario in scenarios],
+            [scenario['savings'] for scenario in scenarios]
+        )
         
-        for scenario in scenarios:
-            analysis = self.analyze_project(
-                costs=scenario['costs'],
-                savings=scenario['savings']
-            )
-            
+        results = []
+        for scenario, analysis in zip(scenarios, analyses):
             results.append({
                 'name': scenario['name'],
                 'costs': scenario['costs'],
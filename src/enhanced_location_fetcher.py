@@ -9,6 +9,7 @@ from .nrel_fetcher import NRELFetcher
 from .census_fetcher import CensusFetcher
 from .city_data_fetcher import CityDataFetcher
 from .cbecs_lookup import CBECSLookup
+from .core.stage_reporting import report_stage
 
 
 class EnhancedLocationFetcher(LocationFetcher):
@@ -30,12 +31,15 @@ class EnhancedLocationFetcher(LocationFetcher):
         self.city_fetcher = CityDataFetcher()
         self.cbecs_lookup = CBECSLookup()
     
-    def fetch_comprehensive_location_data(self, address: str) -> Dict:
+    def fetch_comprehensive_location_data(self, address: str,
+                                          context_radius_m: Optional[float] = None) -> Dict:
         """
         Fetch comprehensive location data from multiple sources.
         
         Args:
             address: Building address
+            context_radius_m: If set, also fetch the surrounding buildings within
+                this radius (``building['context_buildings']``) for context shading
             
         Returns:
             Dictionary with comprehensive location and building data
@@ -76,6 +80,7 @@ class EnhancedLocationFetcher(LocationFetcher):
         print(f"✓ Climate zone: {climate_zone}")
         
         # 3. Building footprint data (priority: Microsoft → Google → OSM)
+        report_stage('footprint')
         building_info = {}
         lat = coords['latitude']
         lon = coords['longitude']
@@ -140,6 +145,12 @@ class EnhancedLocationFetcher(LocationFetcher):
             building_info['primary_area_m2'] = building_info['osm_area_m2']
             building_info['primary_area_source'] = 'osm'
         
+        # Surrounding buildings for context shading (opt-in: one more Overpass query)
+        if context_radius_m:
+            print(f"🏙️  Fetching surrounding buildings within {context_radius_m:.0f} m...")
+            building_info['context_buildings'] = self.osm_fetcher.search_area_buildings(lat, lon, int(context_radius_m))
+            print(f"✓ Found {len(building_info['context_buildings'])} surrounding buildings")
+        
         # 4. Weather file
         print(f"🌤️  Getting weather data from NREL...")
         weather_info = self.nrel_fetcher.get_closest_weather_file(
@@ -0,0 +1,197 @@
+"""
+Background IDF generation jobs.
+
+Geocoding (with its rate-limit sleeps), footprint lookups and generation can
+take longer than proxies keep an HTTP request open. The job manager runs
+each request on a worker pool instead: submitting returns a job ID at once,
+and the job records which pipeline stage it is in (see
+src.core.stage_reporting) so clients can poll or subscribe to progress.
+"""
+
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .core.stage_reporting import PIPELINE_STAGES, stage_listener
+
+# Job states
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_FAILED = 'failed'
+FINISHED_STATES = (JOB_SUCCEEDED, JOB_FAILED)
+
+
+@dataclass
+class GenerationJob:
+    """State of one background generation request."""
+    job_id: str
+    request: Dict[str, Any]
+    status: str = JOB_QUEUED
+    stage: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # Runner result (e.g. filename, parameters used, 'output_path')
+    result: Optional[Dict[str, Any]] = None
+    # {'error': message, 'type': exception class name}
+    error: Optional[Dict[str, Any]] = None
+    # Incremented on every change so waiters can tell what they have seen
+    version: int = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def output_path(self) -> Optional[str]:
+        """Path of the generated file, once the job succeeded."""
+        return (self.result or {}).get('output_path') if self.status == JOB_SUCCEEDED else None
+
+    def stage_states(self) -> List[Dict[str, str]]:
+        """Status ('pending', 'running', 'done') of every pipeline stage."""
+        if self.status == JOB_SUCCEEDED:
+            return [{'name': name, 'status': 'done'} for name in PIPELINE_STAGES]
+        current = PIPELINE_STAGES.index(self.stage) if self.stage in PIPELINE_STAGES else -1
+        states = []
+        for index, name in enumerate(PIPELINE_STAGES):
+            if index < current:
+                status = 'done'
+            elif index == current:
+                status = 'failed' if self.status == JOB_FAILED else 'running'
+            else:
+                status = 'pending'
+            states.append({'name': name, 'status': status})
+        return states
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable view of the job (without the request or file path)."""
+        done = sum(1 for state in self.stage_states() if state['status'] == 'done')
+        result = {key: value for key, value in (self.result or {}).items() if key != 'output_path'}
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'stage': self.stage,
+            'stages': self.stage_states(),
+            'progress': done / len(PIPELINE_STAGES),
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'result': result or None,
+            'error': dict(self.error) if self.error else None,
+        }
+
+
+class GenerationJobManager:
+    """
+    Runs generation requests on a thread pool and tracks their progress.
+
+    Threads (rather than processes) are used because most of the wall time is
+    spent waiting on geocoding and footprint services, and because generators
+    keep per-call state in a GenerationContext, so concurrent jobs are isolated.
+    """
+
+    def __init__(self, runner: Callable[[GenerationJob], Dict[str, Any]],
+                 max_workers: int = 4, max_finished_jobs: int = 200):
+        """
+        Initialize the manager.
+
+        Args:
+            runner: Callable performing one job; returns the job result
+                (include 'output_path' to make the file downloadable)
+            max_workers: Number of worker threads
+            max_finished_jobs: Finished jobs kept for status queries
+        """
+        self.runner = runner
+        self.max_workers = max(1, int(max_workers))
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs: 'OrderedDict[str, GenerationJob]' = OrderedDict()
+        self._changed = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='idf-job')
+
+    def submit(self, request: Dict[str, Any]) -> GenerationJob:
+        """
+        Queue a generation request.
+
+        Args:
+            request: Request payload handed to the runner
+
+        Returns:
+            The queued job
+        """
+        job = GenerationJob(job_id=uuid.uuid4().hex, request=request)
+        with self._changed:
+            self._jobs[job.job_id] = job
+            self._prune()
+        self._executor.submit(self._run, job)
+        print(f"🧵 Queued generation job {job.job_id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        """Return the job with ``job_id`` or None."""
+        with self._changed:
+            return self._jobs.get(job_id)
+
+    def wait_for_change(self, job: GenerationJob, seen_version: int, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the job changes past ``seen_version`` or ``timeout`` elapses.
+
+        Returns:
+            True if the job changed
+        """
+        with self._changed:
+            return self._changed.wait_for(lambda: job.version != seen_version, timeout)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[GenerationJob]:
+        """Block until the job finished (or ``timeout`` elapsed) and return it."""
+        job = self.get(job_id)
+        if job is not None:
+            with self._changed:
+                self._changed.wait_for(lambda: job.finished, timeout)
+        return job
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and release the worker threads."""
+        self._executor.shutdown(wait=wait)
+
+    def _update(self, job: GenerationJob, **changes: Any) -> None:
+        with self._changed:
+            for name, value in changes.items():
+                setattr(job, name, value)
+            job.version += 1
+            self._changed.notify_all()
+
+    def _enter_stage(self, job: GenerationJob, stage: str) -> None:
+        """Advance the job to ``stage``; repeated or out-of-order reports are ignored."""
+        if stage not in PIPELINE_STAGES:
+            return
+        current = PIPELINE_STAGES.index(job.stage) if job.stage in PIPELINE_STAGES else -1
+        if PIPELINE_STAGES.index(stage) > current:
+            self._update(job, stage=stage)
+
+    def _run(self, job: GenerationJob) -> None:
+        self._update(job, status=JOB_RUNNING, started_at=time.time())
+        try:
+            with stage_listener(lambda stage: self._enter_stage(job, stage)):
+                result = self.runner(job)
+        except Exception as e:
+            print(f"❌ Generation job {job.job_id} failed: {e}")
+            print(f"Traceback:\n{traceback.format_exc()}")
+            self._update(job, status=JOB_FAILED, finished_at=time.time(),
+                         error={'error': str(e), 'type': type(e).__name__})
+        else:
+            print(f"✅ Generation job {job.job_id} finished")
+            self._update(job, status=JOB_SUCCEEDED, finished_at=time.time(), result=result or {})
+        with self._changed:
+            self._prune()
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond ``max_finished_jobs`` (caller holds the lock)."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
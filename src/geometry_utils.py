@@ -6,6 +6,8 @@ Provides functions for calculating surface normals, tilt angles, and fixing vert
 import math
 from typing import List, Tuple, Optional, Dict
 
+import numpy as np
+
 
 def remove_coincident_vertices(vertices_3d: List[Tuple[float, float, float]], 
                                tolerance: float = 0.001) -> List[Tuple[float, float, float]]:
@@ -312,6 +314,59 @@ def fix_vertex_ordering_for_wall(vertices_3d: List[Tuple[float, float, float]],
     return vertices_3d
 
 
+def calculate_surface_normals(vertices: np.ndarray) -> np.ndarray:
+    """Batched calculate_surface_normal over an array of surfaces.
+    
+    Args:
+        vertices: Array of shape (n, k, 3), k >= 3 vertices per surface
+        
+    Returns:
+        Array of shape (n, 3) of normalized normals; (0, 0, 1) for degenerate surfaces
+    """
+    edge1 = vertices[:, 1] - vertices[:, 0]
+    edge2 = vertices[:, 2] - vertices[:, 0]
+    normal = np.cross(edge1, edge2)
+    length = np.sqrt((normal ** 2).sum(axis=1))
+    degenerate = length <= 0
+    normal = normal / np.where(degenerate, 1.0, length)[:, None]
+    normal[degenerate] = (0.0, 0.0, 1.0)
+    return normal
+
+
+def fix_vertex_ordering_for_walls(vertices: np.ndarray, zone_centers_2d: np.ndarray) -> np.ndarray:
+    """Batched fix_vertex_ordering_for_wall over an array of wall rectangles.
+    
+    Args:
+        vertices: Array of shape (n, k, 3), k >= 3 vertices per wall
+        zone_centers_2d: Array of shape (n, 2), center of each wall's zone
+        
+    Returns:
+        Array of shape (n, k, 3) with each wall's vertex order reversed where
+        its normal points toward the zone
+    """
+    normal = calculate_surface_normals(vertices)
+    
+    # Unit vector from zone center to wall center (first three vertices),
+    # falling back to the first edge direction
+    to_wall = vertices[:, :3, :2].sum(axis=1) / 3 - zone_centers_2d
+    to_wall_length = np.sqrt((to_wall ** 2).sum(axis=1))
+    edge = vertices[:, 1, :2] - vertices[:, 0, :2]
+    edge_length = np.sqrt((edge ** 2).sum(axis=1))
+    fallback = np.where(edge_length[:, None] > 0, edge / np.where(edge_length > 0, edge_length, 1.0)[:, None],
+                        np.array([1.0, 0.0]))
+    to_wall = np.where(to_wall_length[:, None] > 0,
+                       to_wall / np.where(to_wall_length > 0, to_wall_length, 1.0)[:, None], fallback)
+    
+    # Wall normal projected to 2D
+    normal_2d = normal[:, :2]
+    normal_length = np.sqrt((normal_2d ** 2).sum(axis=1))
+    normal_2d = np.where(normal_length[:, None] > 0,
+                         normal_2d / np.where(normal_length > 0, normal_length, 1.0)[:, None], np.array([1.0, 0.0]))
+    
+    dot_product = (to_wall * normal_2d).sum(axis=1)
+    return np.where((dot_product < 0.1)[:, None, None], vertices[:, ::-1], vertices)
+
+
 def calculate_zone_volume_from_surfaces(surfaces: List[Dict], zone_center_2d: Tuple[float, float]) -> float:
     """Calculate zone volume using divergence theorem (Gauss's theorem).
     
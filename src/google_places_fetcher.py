@@ -6,7 +6,6 @@ Requires GOOGLE_MAPS_API_KEY environment variable.
 Cost: ~$5-17 per 1,000 requests (Places API)
 """
 import os
-import requests
 from typing import Dict, List, Optional, Tuple
 import math
 try:
@@ -15,6 +14,8 @@ try:
     SHAPELY_AVAILABLE = True
 except ImportError:
     SHAPELY_AVAILABLE = False
+from .core.instrumentation import span
+from .utils.http_client import SharedHTTPClient
 
 
 class GooglePlacesFetcher:
@@ -35,7 +36,7 @@ class GooglePlacesFetcher:
             api_key: Optional Google Maps API key. If not provided, checks environment variable.
         """
         self.api_key = api_key or os.getenv('GOOGLE_MAPS_API_KEY', '')
-        self.session = requests.Session()
+        self.session = SharedHTTPClient.get_instance().session()
         self.session.headers.update({
             'User-Agent': 'IDF-Creator/1.0',
             'Accept': 'application/json'
@@ -50,6 +51,7 @@ class GooglePlacesFetcher:
         """
         return bool(self.api_key and self.api_key.strip())
     
+    @span('footprint')
     def get_building_footprint(self, latitude: float, longitude: float,
                                radius_meters: int = 50) -> Optional[Dict]:
         """
@@ -5,6 +5,7 @@ Connects catalog equipment to HVAC systems with proper node connections
 
 from typing import Dict, List, Optional
 from dataclasses import dataclass
+from .core.name_allocator import NameAllocator
 from .equipment_catalog.schema import EquipmentSpec
 from .utils.common import calculate_dx_supply_air_flow
 
@@ -32,22 +33,12 @@ class HVACPlumbing:
     """Manages HVAC system plumbing and node connections"""
     
     def __init__(self):
-        self.unique_nodes = set()
+        self.unique_nodes = NameAllocator()
         self.node_counter = 0
     
     def generate_unique_node_name(self, base_name: str) -> str:
         """Generate unique node name"""
-        if base_name not in self.unique_nodes:
-            self.unique_nodes.add(base_name)
-            return base_name
-        
-        counter = 1
-        while f"{base_name}_{counter}" in self.unique_nodes:
-            counter += 1
-        
-        unique_name = f"{base_name}_{counter}"
-        self.unique_nodes.add(unique_name)
-        return unique_name
+        return self.unique_nodes.allocate(base_name)
     
     def wire_catalog_equipment_to_vav(self, zone_name: str, equipment_spec: EquipmentSpec, 
                                      sizing_params: Dict) -> List[Dict]:
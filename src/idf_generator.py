@@ -4,6 +4,7 @@ import os
 import math
 
 from src.core.base_idf_generator import BaseIDFGenerator
+from src.core.stage_reporting import report_stage
 
 
 class IDFGenerator(BaseIDFGenerator):
@@ -844,7 +845,12 @@ Output:Meter,
         Returns:
             Complete IDF file as string
         """
-        self.reset_unique_names()
+        with self.generation_context():
+            return self._generate_complete_idf(location, building_params, zone_params, config)
+    
+    def _generate_complete_idf(self, location: Dict, building_params: Dict,
+                               zone_params: Dict, config: Dict) -> str:
+        """Generate the IDF within the active generation context."""
         idf_content = []
         
         # Header
@@ -869,6 +875,7 @@ Output:Meter,
         idf_content.append(self.generate_construction_objects({}))
         
         # Zones
+        report_stage('geometry')
         zones = self.generate_zone_objects(building_params)
         for zone in zones:
             idf_content.append(zone)
@@ -878,7 +885,8 @@ Output:Meter,
         for surface in surfaces:
             idf_content.append(surface)
         
-        # Loads for all zones
+        # Loads and HVAC for all zones
+        report_stage('hvac')
         for story in range(1, building_params.get('stories', 3) + 1):
             zone_name = f"{building_params.get('name', 'Building')}_Zone_{story}"
             idf_content.append(self.generate_people_objects(zone_params, zone_name))
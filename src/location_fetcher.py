@@ -1,13 +1,12 @@
 """Module for fetching location and climate data from user inputs."""
 import os
-import requests
-from geopy.geocoders import Nominatim
 import ssl
-import certifi
 import time
 import re
 from typing import Dict, Tuple, Optional
-from threading import Lock
+
+from .core.instrumentation import span
+from .utils.http_client import SharedHTTPClient
 
 
 class GeocodingError(Exception):
@@ -97,26 +96,30 @@ class LocationFetcher:
         'Anchorage, AK': {'latitude': 61.2181, 'longitude': -149.9003, 'time_zone': -9.0, 'elevation': 31}
     }
     
-    # Rate limiting: Nominatim allows 1 request per second
-    _last_request_time = 0.0
-    _rate_limit_lock = Lock()
+    # Rate limiting: Nominatim allows 1 request per second (token bucket of the shared client)
+    NOMINATIM_HOST = 'nominatim.openstreetmap.org'
     
     def __init__(self):
-        # Fix SSL certificate issue on macOS
-        ctx = ssl.create_default_context(cafile=certifi.where())
-        self.geolocator = Nominatim(user_agent="idf_creator", scheme='https', ssl_context=ctx)
+        self._geolocator = None
         self.google_api_key = os.getenv('GOOGLE_MAPS_API_KEY', '')
     
+    @property
+    def geolocator(self):
+        """Nominatim client, created on first use (most addresses never reach it)."""
+        if self._geolocator is None:
+            import certifi
+            from geopy.geocoders import Nominatim
+            # Fix SSL certificate issue on macOS
+            ctx = ssl.create_default_context(cafile=certifi.where())
+            self._geolocator = Nominatim(user_agent="idf_creator", scheme='https', ssl_context=ctx)
+        return self._geolocator
+    
     @classmethod
     def _respect_rate_limit(cls):
         """Ensure we respect Nominatim's 1 request per second rate limit."""
-        with cls._rate_limit_lock:
-            elapsed = time.time() - cls._last_request_time
-            if elapsed < 1.1:  # Add 0.1s buffer for safety
-                sleep_time = 1.1 - elapsed
-                time.sleep(sleep_time)
-            cls._last_request_time = time.time()
+        SharedHTTPClient.get_instance().rate_limit(cls.NOMINATIM_HOST)
     
+    @span('geocode')
     def geocode_address(self, address: str) -> Optional[Dict[str, float]]:
         """
         Convert address to lat/lon coordinates.
@@ -283,7 +286,7 @@ class LocationFetcher:
                 'key': self.google_api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = SharedHTTPClient.get_instance().get(url, params=params, timeout=10)
             
             if response.status_code != 200:
                 print(f"⚠️  Google Maps API returned status {response.status_code}")
@@ -406,6 +409,7 @@ class LocationFetcher:
             "Please provide a valid address with city and state information."
         )
     
+    @span('geocode')
     def _geocode_fallback(self, address: str) -> Optional[Dict[str, float]]:
         """
         Legacy fallback method - now redirects to final fallback.
@@ -6,7 +6,6 @@ Data Source: https://github.com/microsoft/USBuildingFootprints
 129M+ buildings across the United States with computer-generated footprints from satellite imagery.
 """
 import os
-import requests
 import json
 from typing import Dict, List, Optional, Tuple
 import math
@@ -15,6 +14,8 @@ try:
     SHAPELY_AVAILABLE = True
 except ImportError:
     SHAPELY_AVAILABLE = False
+from .core.instrumentation import span
+from .utils.http_client import SharedHTTPClient
 
 
 class MicrosoftFootprintsFetcher:
@@ -38,13 +39,14 @@ class MicrosoftFootprintsFetcher:
         Args:
             azure_maps_api_key: Optional Azure Maps API key for direct API access
         """
-        self.session = requests.Session()
+        self.session = SharedHTTPClient.get_instance().session()
         self.session.headers.update({
             'User-Agent': 'IDF-Creator/1.0',
             'Accept': 'application/json'
         })
         self.azure_maps_api_key = azure_maps_api_key or os.getenv('AZURE_MAPS_API_KEY')
     
+    @span('footprint')
     def get_building_footprint(self, latitude: float, longitude: float,
                                radius_meters: int = 50) -> Optional[Dict]:
         """
@@ -14,7 +14,7 @@ Reference:
 - IPMVP (International Performance Measurement and Verification Protocol)
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 import subprocess
@@ -22,6 +22,48 @@ import json
 import re
 import os
 
+import numpy as np
+
+from .parametric_edits import ParametricEdit, ParametricModel
+from .utils.common import resolve_worker_count
+from .utils.sql_results import calibration_metrics, extract_energy_results
+
+# Rough peak memory of one EnergyPlus run, used to cap concurrent simulations
+SIMULATION_MEMORY_MB = 512.0
+
+# ASHRAE Guideline 14 monthly calibration criteria (%)
+GUIDELINE_14_MONTHLY_MBE = 5.0
+GUIDELINE_14_MONTHLY_CVRMSE = 15.0
+
+# Natural gas energy content (kWh per therm)
+KWH_PER_THERM = 29.3071
+
+# Bounds on calibration multipliers relative to the baseline
+CALIBRATION_MULTIPLIER_BOUNDS = (0.5, 2.0)
+
+
+# Parametric fields scaled by each calibration adjustment
+CALIBRATION_PARAMETER_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'infiltration': ('ZoneInfiltration:DesignFlowRate.flow',),
+    'lighting_multiplier': ('Lights.power',),
+    'equipment_multiplier': ('ElectricEquipment.power',),
+    'hvac_efficiency': ('cooling_cop', 'heating_efficiency'),
+}
+
+
+def calibration_edits(adjustments: Dict[str, float]) -> List[ParametricEdit]:
+    """
+    Translate calibration multipliers into parametric edits.
+    
+    Heating efficiencies are capped at 1.0.
+    """
+    edits = []
+    for param, multiplier in adjustments.items():
+        for target in CALIBRATION_PARAMETER_FIELDS.get(param, ()):
+            maximum = 1.0 if target == 'heating_efficiency' else None
+            edits.append(ParametricEdit(target, scale=multiplier, maximum=maximum))
+    return edits
+
 
 @dataclass
 class UtilityData:
@@ -108,18 +150,31 @@ class ModelCalibrator:
         weather_file: str,
         tolerance: float = 0.10,
         max_iterations: int = 20,
-        output_dir: Optional[str] = None
+        output_dir: Optional[str] = None,
+        batch_size: int = 0,
+        sampling: str = 'lhs',
+        max_concurrent: int = 4,
+        seed: Optional[int] = None
     ) -> CalibrationResult:
         """
         Auto-calibrate IDF to match utility bills.
         
+        By default each iteration simulates one adjusted model. With
+        ``batch_size`` > 0 each iteration is instead a round that simulates a
+        batch of parameter sets in parallel and fits the next adjustment to
+        them (see ``_calibrate_batched``), which converges in far fewer rounds.
+        
         Args:
             idf_file: Path to baseline IDF file
             utility_data: Utility bill data
             weather_file: Path to weather file (.epw)
             tolerance: Target accuracy (default 10%)
-            max_iterations: Maximum calibration iterations
+            max_iterations: Maximum calibration iterations (rounds when batched)
             output_dir: Directory for calibrated IDF and reports
+            batch_size: Parameter sets simulated per round (0 = one per iteration)
+            sampling: 'lhs' (Latin hypercube) or 'coordinate' (± perturbation per parameter)
+            max_concurrent: Maximum concurrent simulations in batched mode
+            seed: Random seed for Latin hypercube sampling
             
         Returns:
             CalibrationResult with calibrated IDF path and metrics
@@ -148,6 +203,13 @@ class ModelCalibrator:
         print(f"  Actual: {actual_annual:.0f} kWh/year")
         print(f"  Initial error: {abs(baseline_annual - actual_annual) / actual_annual * 100:.1f}%")
         
+        if batch_size > 0:
+            return self._calibrate_batched(
+                idf_file, utility_data, weather_file, baseline_results,
+                tolerance, max_iterations, output_dir,
+                batch_size, sampling, max_concurrent, seed
+            )
+        
         # Calibration loop
         current_idf = idf_file
         adjusted_params = {}
@@ -157,8 +219,11 @@ class ModelCalibrator:
             iteration += 1
             print(f"\n🔄 Calibration iteration {iteration}/{max_iterations}...")
             
-            # Run simulation
-            results = self._run_simulation(current_idf, weather_file, output_dir / f"iteration_{iteration}")
+            # Run simulation (the first iteration is the unmodified baseline)
+            if iteration == 1:
+                results = baseline_results
+            else:
+                results = self._run_simulation(current_idf, weather_file, output_dir / f"iteration_{iteration}")
             
             # Calculate accuracy metrics
             monthly_error = self._calculate_monthly_error(results, utility_data)
@@ -174,7 +239,7 @@ class ModelCalibrator:
             # Adjust parameters
             adjustment = self._calculate_adjustment(results, utility_data)
             current_idf = self._adjust_idf_parameters(
-                current_idf if iteration == 1 else current_idf,
+                current_idf,
                 adjustment,
                 output_dir / f"calibrated_iteration_{iteration}.idf"
             )
@@ -218,6 +283,277 @@ class ModelCalibrator:
             converged=annual_error <= tolerance
         )
     
+    def _calibrate_batched(
+        self,
+        idf_file: str,
+        utility_data: UtilityData,
+        weather_file: str,
+        baseline_results: Dict,
+        tolerance: float,
+        max_rounds: int,
+        output_dir: Path,
+        batch_size: int,
+        sampling: str,
+        max_concurrent: int,
+        seed: Optional[int]
+    ) -> CalibrationResult:
+        """
+        Calibrate by simulating batches of parameter sets in parallel.
+        
+        Parameters are calibration multipliers (CALIBRATION_PARAMETER_FIELDS)
+        applied to the parsed baseline, searched in log space. Each round
+        simulates the previous round's fitted step plus ``batch_size`` samples
+        around the best point so far, fits a linear response of the
+        monthly (or annual) consumption to the samples, and solves a damped
+        least-squares step towards the utility data. The sampling radius
+        halves every round. The baseline result is reused as the first point.
+        
+        Returns:
+            CalibrationResult with calibrated IDF path and metrics
+        """
+        model = ParametricModel.from_file(idf_file)
+        params = list(CALIBRATION_PARAMETER_FIELDS)
+        rng = np.random.default_rng(seed)
+        low, high = np.log(CALIBRATION_MULTIPLIER_BOUNDS)
+        workers = resolve_worker_count(max_concurrent, SIMULATION_MEMORY_MB)
+        
+        points = [np.zeros(len(params))]
+        outcomes = [baseline_results]
+        best = 0
+        candidate = None
+        radius = 0.2
+        rounds = 0
+        
+        while rounds < max_rounds and not self._meets_calibration_targets(outcomes[best], utility_data, tolerance):
+            rounds += 1
+            center = points[best]
+            batch = [] if candidate is None else [candidate]
+            batch.extend(self._sample_parameter_sets(center, radius, batch_size, sampling, rng, low, high))
+            
+            print(f"\n🔄 Calibration round {rounds}/{max_rounds}: {len(batch)} parameter sets...")
+            
+            jobs = []
+            for x in batch:
+                index = len(points) + len(jobs)
+                jobs.append((
+                    index,
+                    self._multipliers(params, x),
+                    str(output_dir / f"candidate_{index}.idf"),
+                    str(weather_file),
+                    str(output_dir / f"candidate_{index}")
+                ))
+            results = dict(self._iter_batch_results(model, jobs, min(workers, len(jobs))))
+            
+            round_points, round_outcomes = [center], [outcomes[best]]
+            for (index, *_), x in zip(jobs, batch):
+                if results.get(index, {}).get('annual_kwh', 0.0) > 0:
+                    points.append(x)
+                    outcomes.append(results[index])
+                    round_points.append(x)
+                    round_outcomes.append(results[index])
+            
+            best = min(range(len(points)), key=lambda i: self._calibration_score(outcomes[i], utility_data))
+            annual_error = abs(outcomes[best].get('annual_kwh', 0) - utility_data.annual_kwh()) / utility_data.annual_kwh()
+            print(f"  Best annual error: {annual_error * 100:.1f}%")
+            
+            candidate = self._fit_parameter_step(round_points, round_outcomes, points[best], outcomes[best], utility_data, low, high)
+            radius *= 0.5
+        
+        best_results = outcomes[best]
+        adjusted_params = self._multipliers(params, points[best])
+        converged = self._meets_calibration_targets(best_results, utility_data, tolerance)
+        if converged:
+            print(f"✅ Calibration converged within {tolerance * 100:.0f}% tolerance!")
+        
+        if best > 0:
+            calibrated_idf = Path(model.write(output_dir / "calibrated_final.idf", calibration_edits(adjusted_params)))
+        else:
+            calibrated_idf = Path(idf_file)
+        
+        report_path = self._generate_calibration_report(
+            calibrated_idf,
+            weather_file,
+            utility_data,
+            baseline_results,
+            adjusted_params,
+            rounds,
+            converged,
+            output_dir / "calibration_report.json",
+            final_results=best_results
+        )
+        
+        monthly_error = self._calculate_monthly_error(best_results, utility_data)
+        annual_error = abs(best_results.get('annual_kwh', 0) - utility_data.annual_kwh()) / utility_data.annual_kwh()
+        return CalibrationResult(
+            calibrated_idf_path=str(calibrated_idf),
+            calibration_report_path=str(report_path),
+            accuracy_monthly_mbe=monthly_error.get('mbe', 0.0),
+            accuracy_monthly_cvrmse=monthly_error.get('cvrmse', 0.0),
+            accuracy_annual=annual_error * 100,
+            adjusted_parameters=adjusted_params,
+            iterations=rounds,
+            converged=converged
+        )
+    
+    @staticmethod
+    def _multipliers(params: List[str], x: np.ndarray) -> Dict[str, float]:
+        """Map a log-space parameter vector to named multipliers."""
+        return {param: float(np.exp(value)) for param, value in zip(params, x)}
+    
+    @staticmethod
+    def _sample_parameter_sets(
+        center: np.ndarray,
+        radius: float,
+        count: int,
+        sampling: str,
+        rng: np.random.Generator,
+        low: float,
+        high: float
+    ) -> List[np.ndarray]:
+        """
+        Sample parameter sets (log multipliers) around ``center``.
+        
+        'coordinate' perturbs one parameter at a time by ±radius (count is
+        ignored); 'lhs' draws ``count`` Latin hypercube samples in
+        [center - radius, center + radius].
+        """
+        dims = len(center)
+        if sampling == 'coordinate':
+            offsets = np.vstack([np.eye(dims), -np.eye(dims)]) * radius
+        elif sampling == 'lhs':
+            strata = np.argsort(rng.random((count, dims)), axis=0)
+            offsets = ((strata + rng.random((count, dims))) / count * 2.0 - 1.0) * radius
+        else:
+            raise ValueError(f"Unknown sampling method: {sampling}")
+        return list(np.clip(center + offsets, low, high))
+    
+    def _response_vector(self, results: Dict, actual: UtilityData) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simulated and actual consumption used for fitting, each block normalized
+        by its mean actual value: monthly electricity when available (else
+        annual), plus monthly gas when gas bills and a gas meter are present.
+        """
+        sim_monthly = results.get('monthly_kwh', [])
+        act_monthly = actual.monthly_kwh[:12]
+        if len(sim_monthly) == 12 and len(act_monthly) == 12:
+            simulated, measured = [np.asarray(sim_monthly, dtype=float)], [np.asarray(act_monthly, dtype=float)]
+        else:
+            simulated, measured = [np.array([results.get('annual_kwh', 0.0)])], [np.array([actual.annual_kwh()])]
+        
+        sim_gas = results.get('monthly_gas_kwh', [])
+        act_gas = (actual.gas_therms or [])[:12]
+        if len(sim_gas) == 12 and len(act_gas) == 12 and sum(act_gas) > 0:
+            simulated.append(np.asarray(sim_gas, dtype=float))
+            measured.append(np.asarray(act_gas, dtype=float) * KWH_PER_THERM)
+        
+        scales = [block.mean() for block in measured]
+        return (
+            np.concatenate([block / scale for block, scale in zip(simulated, scales)]),
+            np.concatenate([block / scale for block, scale in zip(measured, scales)])
+        )
+    
+    def _calibration_score(self, results: Dict, actual: UtilityData) -> float:
+        """Mean squared normalized residual of a simulation against the utility data."""
+        if results.get('annual_kwh', 0.0) <= 0:
+            return float('inf')
+        simulated, measured = self._response_vector(results, actual)
+        return float(np.mean((simulated - measured) ** 2))
+    
+    def _meets_calibration_targets(self, results: Dict, actual: UtilityData, tolerance: float) -> bool:
+        """Annual error within tolerance and monthly MBE / CV(RMSE) within Guideline 14 limits."""
+        actual_annual = actual.annual_kwh()
+        if results.get('annual_kwh', 0.0) <= 0 or actual_annual <= 0:
+            return False
+        if abs(results['annual_kwh'] - actual_annual) / actual_annual > tolerance:
+            return False
+        monthly_error = self._calculate_monthly_error(results, actual)
+        return bool(monthly_error['mbe'] <= GUIDELINE_14_MONTHLY_MBE
+                    and monthly_error['cvrmse'] <= GUIDELINE_14_MONTHLY_CVRMSE)
+    
+    def _fit_parameter_step(
+        self,
+        points: List[np.ndarray],
+        outcomes: List[Dict],
+        best_point: np.ndarray,
+        best_results: Dict,
+        actual: UtilityData,
+        low: float,
+        high: float,
+        damping: float = 0.01
+    ) -> Optional[np.ndarray]:
+        """
+        Fit a linear response to a round of samples and step towards the data.
+        
+        The Jacobian of the (normalized) response with respect to the log
+        multipliers is fitted by least squares over the round; the step from
+        the best point solves a damped least-squares problem, which keeps
+        parameters the data cannot distinguish close to their current values.
+        
+        Returns:
+            Next parameter set to simulate, or None if the round is too small to fit
+        """
+        if len(points) < 2:
+            return None
+        
+        center = points[0]
+        center_response = self._response_vector(outcomes[0], actual)[0]
+        dx = np.array([p - center for p in points[1:]])
+        dy = np.array([self._response_vector(o, actual)[0] - center_response for o in outcomes[1:]])
+        jacobian = np.linalg.lstsq(dx, dy, rcond=None)[0].T
+        
+        best_response, measured = self._response_vector(best_results, actual)
+        residual = best_response - measured
+        dims = len(center)
+        a = np.vstack([jacobian, np.sqrt(damping) * np.eye(dims)])
+        b = np.concatenate([-residual, np.zeros(dims)])
+        step = np.linalg.lstsq(a, b, rcond=None)[0]
+        return np.clip(best_point + step, low, high)
+    
+    def _iter_batch_results(
+        self,
+        model: ParametricModel,
+        jobs: List[Tuple],
+        workers: int
+    ) -> Iterator[Tuple[int, Dict]]:
+        """
+        Yield (job index, results) pairs for a batch of parameter sets.
+        
+        Uses a process pool when more than one worker is available; otherwise
+        runs the jobs in order in this process.
+        """
+        if workers <= 1:
+            for job in jobs:
+                yield self._simulate_parameter_set(model, *job)
+            return
+        
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_calibration_worker,
+            initargs=(model, self.energyplus_path)
+        ) as executor:
+            futures = {executor.submit(_run_calibration_job, job): job[0] for job in jobs}
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    print(f"  ❌ Candidate {futures[future]} failed: {e}")
+                    yield futures[future], {'annual_kwh': 0.0, 'monthly_kwh': [0.0] * 12}
+    
+    def _simulate_parameter_set(
+        self,
+        model: ParametricModel,
+        index: int,
+        multipliers: Dict[str, float],
+        idf_path: str,
+        weather_file: str,
+        sim_output_dir: str
+    ) -> Tuple[int, Dict]:
+        """Write the baseline with calibration multipliers applied and simulate it."""
+        model.write(idf_path, calibration_edits(multipliers))
+        return index, self._run_simulation(idf_path, weather_file, Path(sim_output_dir))
+    
     def _run_simulation(self, idf_file: str, weather_file: str, output_dir: Path) -> Dict:
         """
         Run EnergyPlus simulation and extract results.
@@ -253,7 +589,7 @@ class ModelCalibrator:
         # Extract results from SQLite output
         sqlite_file = output_dir / "eplusout.sql"
         if sqlite_file.exists():
-            return self._extract_sqlite_results(sqlite_file)
+            return self._extract_sqlite_results(sqlite_file, weather_file)
         
         # Fallback: try to extract from tabular output
         tabular_file = output_dir / "eplusout.tab"
@@ -262,98 +598,12 @@ class ModelCalibrator:
         
         return {'annual_kwh': 0.0, 'monthly_kwh': [0.0] * 12}
     
-    def _extract_sqlite_results(self, sqlite_file: Path) -> Dict:
-        """Extract energy results from SQLite output with proper monthly breakdown"""
+    def _extract_sqlite_results(self, sqlite_file: Path, weather_file: Optional[str] = None) -> Dict:
+        """Extract monthly electricity and gas meter results from SQLite output"""
         try:
-            import sqlite3
-            conn = sqlite3.connect(str(sqlite_file))
-            cursor = conn.cursor()
-            
-            # First, try to get time mapping from Time table if it exists
-            try:
-                cursor.execute("SELECT TimeIndex, Month FROM Time ORDER BY TimeIndex")
-                time_map = {row[0]: row[1] for row in cursor.fetchall()}
-            except:
-                # Fallback: calculate from TimeIndex (assumes hourly data starting Jan 1)
-                time_map = {}
-            
-            # Query electricity consumption - try ReportMeterData first (for energy meters)
-            # Then fallback to ReportData (for variables)
-            electricity_kwh = 0.0
-            
-            # Strategy 1: ReportMeterData (preferred for energy consumption)
-            try:
-                cursor.execute("""
-                    SELECT MAX(Value)
-                    FROM ReportMeterData
-                    WHERE ReportMeterDictionaryIndex IN (
-                        SELECT ReportMeterDictionaryIndex
-                        FROM ReportMeterDictionary
-                        WHERE Name = 'Electricity:Facility'
-                        AND ReportingFrequency = 'RunPeriod'
-                    )
-                """)
-                result = cursor.fetchone()
-                if result and result[0]:
-                    # Value is in Joules, convert to kWh
-                    electricity_kwh = result[0] / 3600000.0
-            except:
-                pass
-            
-            # Strategy 2: ReportMeterDataDictionary (alternative schema)
-            if electricity_kwh == 0:
-                try:
-                    cursor.execute("""
-                        SELECT MAX(Value)
-                        FROM ReportMeterData
-                        WHERE ReportMeterDataDictionaryIndex IN (
-                            SELECT ReportMeterDataDictionaryIndex
-                            FROM ReportMeterDataDictionary
-                            WHERE Name = 'Electricity:Facility'
-                            AND ReportingFrequency = 'RunPeriod'
-                        )
-                    """)
-                    result = cursor.fetchone()
-                    if result and result[0]:
-                        electricity_kwh = result[0] / 3600000.0
-                except:
-                    pass
-            
-            # Strategy 3: ReportData (for variables, less common)
-            if electricity_kwh == 0:
-                try:
-                    cursor.execute("""
-                        SELECT SUM(Value)
-                        FROM ReportData
-                        WHERE ReportDataDictionaryIndex IN (
-                            SELECT ReportDataDictionaryIndex
-                            FROM ReportDataDictionary
-                            WHERE Name LIKE '%Electricity%Facility%'
-                            AND ReportingFrequency = 'RunPeriod'
-                        )
-                    """)
-                    result = cursor.fetchone()
-                    if result and result[0]:
-                        # Assume already in kWh or convert from Joules
-                        electricity_kwh = result[0] / 3600000.0 if result[0] > 1000000 else result[0]
-                except:
-                    pass
-            
-            # For monthly breakdown, approximate from annual (simplified)
-            # Full implementation would query hourly/monthly data
-            monthly = [electricity_kwh / 12.0] * 12
-            
-            conn.close()
-            
-            return {
-                'annual_kwh': electricity_kwh,
-                'monthly_kwh': monthly
-            }
-            
+            return extract_energy_results(sqlite_file, weather_file=weather_file)
         except Exception as e:
             print(f"⚠️  SQLite extraction error: {e}")
-            import traceback
-            traceback.print_exc()
         
         return {'annual_kwh': 0.0, 'monthly_kwh': [0.0] * 12}
     
@@ -378,27 +628,7 @@ class ModelCalibrator:
     
     def _calculate_monthly_error(self, simulated: Dict, actual: UtilityData) -> Dict:
         """Calculate monthly error metrics (MBE, CVRMSE)"""
-        sim_monthly = simulated.get('monthly_kwh', [0.0] * 12)
-        act_monthly = actual.monthly_kwh[:12]
-        
-        if len(sim_monthly) != len(act_monthly):
-            return {'mbe': 0.0, 'cvrmse': 100.0}
-        
-        # Mean Bias Error (MBE)
-        errors = [s - a for s, a in zip(sim_monthly, act_monthly)]
-        mbe = sum(errors) / len(errors) if act_monthly else 0.0
-        mbe_percent = (mbe / (sum(act_monthly) / len(act_monthly)) * 100) if act_monthly else 0.0
-        
-        # Coefficient of Variation of Root Mean Square Error (CVRMSE)
-        mse = sum(e**2 for e in errors) / len(errors) if errors else 0.0
-        rmse = mse ** 0.5
-        mean_actual = sum(act_monthly) / len(act_monthly) if act_monthly else 1.0
-        cvrmse = (rmse / mean_actual * 100) if mean_actual > 0 else 100.0
-        
-        return {
-            'mbe': abs(mbe_percent),
-            'cvrmse': cvrmse
-        }
+        return calibration_metrics(simulated.get('monthly_kwh', [0.0] * 12), actual.monthly_kwh[:12])
     
     def _calculate_adjustment(self, simulated: Dict, actual: UtilityData) -> Dict:
         """
@@ -472,88 +702,14 @@ class ModelCalibrator:
     ) -> str:
         """
         Adjust IDF parameters based on calibration adjustments.
-        Uses improved regex patterns that match full object context.
+        Each adjustment scales the parametric fields listed in
+        CALIBRATION_PARAMETER_FIELDS.
         
         Returns:
             Path to adjusted IDF file
         """
-        with open(idf_file, 'r', encoding='utf-8') as f:
-            idf_content = f.read()
-        
-        # Adjust infiltration rates - improved pattern matching
-        if 'infiltration' in adjustments:
-            multiplier = adjustments['infiltration']
-            # Match ZoneInfiltration:DesignFlowRate objects with Flow Rate field
-            # Pattern matches: ZoneInfiltration:DesignFlowRate, name, schedule, design flow rate calculation method, flow rate value
-            pattern = r'(ZoneInfiltration:DesignFlowRate[^;]*Flow Rate[^,]*,\s*)([\d.E+-]+)'
-            def replace_flow(match):
-                try:
-                    old_value = float(match.group(2))
-                    new_value = old_value * multiplier
-                    return match.group(1) + f"{new_value:.6f}"
-                except ValueError:
-                    return match.group(0)  # Return unchanged if can't parse
-            idf_content = re.sub(pattern, replace_flow, idf_content, flags=re.MULTILINE)
-        
-        # Adjust lighting power - improved pattern
-        if 'lighting_multiplier' in adjustments:
-            multiplier = adjustments['lighting_multiplier']
-            # Match Lights objects with Watts per Zone Floor Area field
-            pattern = r'(Lights[^;]*Watts per Zone Floor Area[^,]*,\s*)([\d.E+-]+)'
-            def replace_lighting(match):
-                try:
-                    old_value = float(match.group(2))
-                    new_value = old_value * multiplier
-                    return match.group(1) + f"{new_value:.2f}"
-                except ValueError:
-                    return match.group(0)
-            idf_content = re.sub(pattern, replace_lighting, idf_content, flags=re.MULTILINE)
-        
-        # Adjust equipment power - improved pattern
-        if 'equipment_multiplier' in adjustments:
-            multiplier = adjustments['equipment_multiplier']
-            # Match ElectricEquipment objects with Watts per Zone Floor Area field
-            pattern = r'(ElectricEquipment[^;]*Watts per Zone Floor Area[^,]*,\s*)([\d.E+-]+)'
-            def replace_equipment(match):
-                try:
-                    old_value = float(match.group(2))
-                    new_value = old_value * multiplier
-                    return match.group(1) + f"{new_value:.2f}"
-                except ValueError:
-                    return match.group(0)
-            idf_content = re.sub(pattern, replace_equipment, idf_content, flags=re.MULTILINE)
-        
-        # Adjust HVAC efficiency - new addition
-        if 'hvac_efficiency' in adjustments:
-            multiplier = adjustments['hvac_efficiency']
-            
-            # Cooling COP improvement
-            pattern = r'(Coil:Cooling:DX[^;]*Rated COP[^,]*,\s*)([\d.E+-]+)'
-            def improve_cop(match):
-                try:
-                    old_value = float(match.group(2))
-                    new_value = old_value * multiplier
-                    return match.group(1) + f"{new_value:.2f}"
-                except ValueError:
-                    return match.group(0)
-            idf_content = re.sub(pattern, improve_cop, idf_content, flags=re.MULTILINE)
-            
-            # Heating efficiency improvement
-            pattern = r'(Coil:Heating[^;]*Efficiency[^,]*,\s*)([\d.E+-]+)'
-            def improve_heating(match):
-                try:
-                    old_value = float(match.group(2))
-                    new_value = old_value * multiplier
-                    return match.group(1) + f"{new_value:.2f}"
-                except ValueError:
-                    return match.group(0)
-            idf_content = re.sub(pattern, improve_heating, idf_content, flags=re.MULTILINE)
-        
-        # Write adjusted IDF
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(idf_content)
-        
-        return str(output_file)
+        model = ParametricModel.from_file(idf_file)
+        return model.write(output_file, calibration_edits(adjustments))
     
     def _generate_calibration_report(
         self,
@@ -564,12 +720,14 @@ class ModelCalibrator:
         adjusted_params: Dict,
         iterations: int,
         converged: bool,
-        report_path: Path
+        report_path: Path,
+        final_results: Optional[Dict] = None
     ) -> Path:
         """Generate ASHRAE Guideline 14 compliant calibration report"""
         
-        # Run final simulation to get calibrated results
-        final_results = self._run_simulation(str(calibrated_idf), weather_file, report_path.parent / "final_calibrated")
+        # Run final simulation to get calibrated results unless already known
+        if final_results is None:
+            final_results = self._run_simulation(str(calibrated_idf), weather_file, report_path.parent / "final_calibrated")
         
         # Calculate final metrics
         monthly_error = self._calculate_monthly_error(final_results, utility_data)
@@ -585,7 +743,7 @@ class ModelCalibrator:
                 'annual_error_percent': annual_error * 100,
                 'monthly_mbe_percent': monthly_error.get('mbe', 0),
                 'monthly_cvrmse_percent': monthly_error.get('cvrmse', 0),
-                'ashrae_guideline_14_compliant': monthly_error.get('cvrmse', 100) <= 15.0
+                'ashrae_guideline_14_compliant': bool(monthly_error.get('cvrmse', 100) <= GUIDELINE_14_MONTHLY_CVRMSE)
             },
             'parameter_adjustments': adjusted_params,
             'monthly_comparison': {
@@ -603,3 +761,18 @@ class ModelCalibrator:
             json.dump(report, f, indent=2)
         
         return report_path
+
+
+# Per-process state for calibration workers (set by the pool initializer)
+_WORKER_STATE: Dict = {}
+
+
+def _init_calibration_worker(model: ParametricModel, energyplus_path: str) -> None:
+    """Process-pool initializer: keep the parsed baseline for this worker's jobs."""
+    _WORKER_STATE['model'] = model
+    _WORKER_STATE['calibrator'] = ModelCalibrator(energyplus_path=energyplus_path)
+
+
+def _run_calibration_job(job: Tuple) -> Tuple[int, Dict]:
+    """Process-pool entry point for one candidate parameter set."""
+    return _WORKER_STATE['calibrator']._simulate_parameter_set(_WORKER_STATE['model'], *job)
@@ -3,21 +3,120 @@ Natural Language Processing for Building Description Parsing
 Extracts building parameters from natural language descriptions using AI/LLM
 """
 
-from typing import Dict, List, Optional
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence
+import importlib.util
 import re
 import json
 
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+from .utils.llm_cache import LLMResponseCache
 
-try:
-    from anthropic import Anthropic
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+# The LLM SDKs take seconds to import, so only probe for them here and import
+# them when a parser actually creates a client.
+OPENAI_AVAILABLE = importlib.util.find_spec('openai') is not None
+ANTHROPIC_AVAILABLE = importlib.util.find_spec('anthropic') is not None
+
+# Per-request timeout of LLM calls (seconds)
+LLM_TIMEOUT_SECONDS = 20.0
+
+# Bumped whenever the extraction prompts change so cached results are not reused
+EXTRACTION_PROMPT_VERSION = '1'
+
+# Descriptions sent per LLM call in batch mode
+LLM_BATCH_SIZE = 10
+
+# Pattern matching is used without an LLM call when at least this share of
+# the fields generation depends on (type, stories, size) was found explicitly
+FAST_PATH_MIN_CONFIDENCE = 1.0
+
+EXTRACTION_SYSTEM_PROMPT = """You are an expert building energy modeler. Extract building parameters from descriptions 
+and return a JSON object with these fields:
+- building_type: office, retail, residential, school, hospital, warehouse, hotel, restaurant
+- stories: integer number of floors (or null if not mentioned)
+- area: floor area in square meters (convert from sq ft if needed)
+- dimensions: {length: meters, width: meters} or null
+- hvac_system: vav, rtu, ptac, heat_pump, chilled_water, or null
+- construction: {wall_type: concrete/steel_frame/wood_frame/brick, roof_type: flat/gabled, window_type: single_pane/double_pane/triple_pane}
+- year_built: integer year or null
+- special_features: array of features like ["parking", "elevator", "solar", "led"]
+
+Return ONLY valid JSON, no markdown or explanation."""
+
+BATCH_EXTRACTION_SYSTEM_PROMPT = EXTRACTION_SYSTEM_PROMPT.replace(
+    'Return ONLY valid JSON, no markdown or explanation.',
+    'You will receive a JSON array of {"id": ..., "description": ...} items. Return ONLY a valid JSON array '
+    'with one object per item, each with the fields above plus the item\'s "id", no markdown or explanation.'
+)
+
+
+class LLMProvider(ABC):
+    """
+    A chat completion backend used for description parsing.
+
+    Subclasses set ``name`` and ``model`` (both part of the cache key) and
+    implement complete(). Each provider holds its own client and API key;
+    parsers for different keys live side by side in one process.
+    """
+    name = 'llm'
+    model = ''
+
+    @abstractmethod
+    def complete(self, system_prompt: str, user_prompt: str, max_tokens: int = 500) -> str:
+        """Return the model's text response."""
+
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI chat completions."""
+    name = 'openai'
+    model = 'gpt-4o-mini'  # Fast and cheap
+
+    def __init__(self, api_key: Optional[str], timeout: float = LLM_TIMEOUT_SECONDS):
+        from openai import OpenAI
+        self.client = OpenAI(api_key=api_key, timeout=timeout)
+
+    def complete(self, system_prompt: str, user_prompt: str, max_tokens: int = 500) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.1,  # Low temperature for consistent extraction
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content
+
+
+class AnthropicProvider(LLMProvider):
+    """Anthropic messages."""
+    name = 'anthropic'
+    model = 'claude-3-haiku-20240307'  # Fast and cheap
+
+    def __init__(self, api_key: Optional[str], timeout: float = LLM_TIMEOUT_SECONDS):
+        from anthropic import Anthropic
+        self.client = Anthropic(api_key=api_key, timeout=timeout)
+
+    def complete(self, system_prompt: str, user_prompt: str, max_tokens: int = 500) -> str:
+        message = self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=0.1,
+            system=system_prompt,
+            messages=[{"role": "user", "content": user_prompt}]
+        )
+        return message.content[0].text
+
+
+def _parse_json_response(result: str):
+    """Parse a JSON response, tolerating a markdown code fence."""
+    result = result.strip()
+    if result.startswith('```json'):
+        result = result[7:]
+    elif result.startswith('```'):
+        result = result[3:]
+    if result.endswith('```'):
+        result = result[:-3]
+    return json.loads(result.strip())
 
 
 class BuildingDescriptionParser:
@@ -28,9 +127,20 @@ class BuildingDescriptionParser:
     - HVAC systems
     - Construction details
     - Operational parameters
+    
+    Descriptions that pattern matching fully understands are parsed without
+    an LLM call; LLM results are cached (see LLMResponseCache).
     """
     
-    def __init__(self, use_llm: bool = True, llm_provider: str = 'openai', api_key: str = None):
+    def __init__(
+        self,
+        use_llm: bool = True,
+        llm_provider: str = 'openai',
+        api_key: str = None,
+        provider: Optional[LLMProvider] = None,
+        cache: Optional[LLMResponseCache] = None,
+        timeout: float = LLM_TIMEOUT_SECONDS
+    ):
         """
         Initialize parser
         
@@ -38,21 +148,28 @@ class BuildingDescriptionParser:
             use_llm: Use LLM for better understanding (requires API key)
             llm_provider: 'openai' or 'anthropic'
             api_key: API key for LLM provider
+            provider: Optional ready-made LLMProvider (overrides llm_provider / api_key)
+            cache: Result cache (default: the shared LLMResponseCache)
+            timeout: Timeout of each LLM call (seconds)
         """
-        self.use_llm = use_llm and self._check_llm_availability()
+        self.use_llm = provider is not None or (use_llm and self._check_llm_availability())
         self.llm_provider = llm_provider if self.use_llm else None
+        self.api_key = api_key
+        self.provider = provider
+        self.cache = cache if cache is not None else LLMResponseCache.get_instance()
         
         # Initialize LLM client if available
-        if self.use_llm:
+        if self.use_llm and provider is None:
             self.api_key = api_key or self._get_api_key()
             if llm_provider == 'openai' and OPENAI_AVAILABLE:
-                openai.api_key = self.api_key
-                self.client = openai
+                self.provider = OpenAIProvider(self.api_key, timeout) if self.api_key else None
             elif llm_provider == 'anthropic' and ANTHROPIC_AVAILABLE:
-                self.client = Anthropic(api_key=self.api_key)
+                self.provider = AnthropicProvider(self.api_key, timeout) if self.api_key else None
             else:
                 self.use_llm = False
                 print("⚠️  LLM not available, falling back to pattern matching")
+        if self.provider is not None:
+            self.llm_provider = self.provider.name
         
         self.building_type_patterns = self._load_building_patterns()
         self.size_patterns = self._load_size_patterns()
@@ -129,30 +246,91 @@ class BuildingDescriptionParser:
         """
         # Handle None or empty description
         if not description:
-            return {
-                'building_type': 'office',
-                'stories': None,
-                'area': None,
-                'dimensions': None,
-                'hvac_system': None,
-                'construction': {},
-                'year_built': None,
-                'special_features': []
-            }
-        
-        # Try LLM first if available
-        if self.use_llm and self.api_key:
+            return self._empty_result()
+        
+        params = self._parse_with_patterns(description)
+        if self.provider is None or self._pattern_confidence(description, params) >= FAST_PATH_MIN_CONFIDENCE:
+            return params
+        
+        try:
+            llm_params = self._parse_with_llm(description)
+            if llm_params:
+                return llm_params
+        except Exception as e:
+            print(f"⚠️  LLM parsing failed: {e}, using pattern matching")
+        
+        return params
+    
+    def parse_descriptions(self, descriptions: Sequence[str], batch_size: int = LLM_BATCH_SIZE) -> List[Dict]:
+        """
+        Parse many descriptions, sending the ones that need an LLM in batches.
+        
+        Empty, fully pattern-matched and cached descriptions do not reach the
+        LLM; identical descriptions are parsed once. Descriptions a batch
+        response does not cover fall back to pattern matching.
+        
+        Args:
+            descriptions: Building descriptions
+            batch_size: Descriptions per LLM call
+            
+        Returns:
+            Parsed parameters for each description, in order
+        """
+        results: List[Optional[Dict]] = [None] * len(descriptions)
+        pending: Dict[str, List[int]] = {}
+        
+        for i, description in enumerate(descriptions):
+            if not description:
+                results[i] = self._empty_result()
+                continue
+            params = self._parse_with_patterns(description)
+            if self.provider is None or self._pattern_confidence(description, params) >= FAST_PATH_MIN_CONFIDENCE:
+                results[i] = params
+                continue
+            cached = self.cache.get(self._cache_key(description))
+            if cached is not None:
+                self.cache.hits += 1
+                results[i] = self._normalize_llm_result(cached)
+                continue
+            pending.setdefault(self._cache_key(description), []).append(i)
+        
+        keys = list(pending)
+        for start in range(0, len(keys), max(1, batch_size)):
+            chunk = keys[start:start + max(1, batch_size)]
+            chunk_descriptions = [descriptions[pending[key][0]] for key in chunk]
             try:
-                llm_params = self._parse_with_llm(description)
-                if llm_params:
-                    return llm_params
+                parsed = self._parse_batch_with_llm(chunk_descriptions)
             except Exception as e:
-                print(f"⚠️  LLM parsing failed: {e}, using pattern matching")
-        
-        # Fallback to pattern matching
+                print(f"⚠️  LLM batch parsing failed: {e}, using pattern matching")
+                parsed = [None] * len(chunk)
+            self.cache.misses += len(chunk)
+            for key, result in zip(chunk, parsed):
+                if result is not None:
+                    self.cache.put(key, result)
+                for i in pending[key]:
+                    results[i] = self._normalize_llm_result(result) if result is not None else \
+                        self._parse_with_patterns(descriptions[i])
+        
+        return results
+    
+    def _empty_result(self) -> Dict:
+        """Parameters of an empty description."""
+        return {
+            'building_type': 'office',
+            'stories': None,
+            'area': None,
+            'dimensions': None,
+            'hvac_system': None,
+            'construction': {},
+            'year_built': None,
+            'special_features': []
+        }
+    
+    def _parse_with_patterns(self, description: str) -> Dict:
+        """Parse a description with keyword and regular expression matching."""
         description_lower = description.lower()
         
-        params = {
+        return {
             'building_type': self._extract_building_type(description_lower),
             'stories': self._extract_stories(description_lower),
             'area': self._extract_area(description_lower),
@@ -162,13 +340,40 @@ class BuildingDescriptionParser:
             'year_built': self._extract_year_built(description_lower),
             'special_features': self._extract_special_features(description_lower)
         }
-        
+    
+    def _pattern_confidence(self, description: str, params: Dict) -> float:
+        """
+        Share of the fields generation depends on that pattern matching found
+        explicitly: building type (a keyword, not the default), stories and
+        size (area or dimensions).
+        """
+        found = [
+            self._match_building_type(description.lower()) is not None,
+            bool(params.get('stories')),
+            bool(params.get('area') or params.get('dimensions')),
+        ]
+        return sum(found) / len(found)
+    
+    def _cache_key(self, description: str) -> str:
+        return LLMResponseCache.make_key(
+            description, self.provider.name, self.provider.model, EXTRACTION_PROMPT_VERSION
+        )
+    
+    def _normalize_llm_result(self, result: Dict) -> Dict:
+        """Fill fields an LLM response left out with empty values."""
+        params = self._empty_result()
+        params['building_type'] = None
+        params.update({key: value for key, value in result.items() if key != 'id'})
+        params['building_type'] = params['building_type'] or 'office'
         return params
     
     def _parse_with_llm(self, description: str) -> Optional[Dict]:
         """
         Parse description using LLM for better understanding
         
+        Results are cached per normalized description and provider / model;
+        concurrent calls for the same description share one request.
+        
         Args:
             description: Building description
             
@@ -176,80 +381,48 @@ class BuildingDescriptionParser:
             Parsed parameters or None if failed
         """
         # Handle None or empty description
-        if not description:
+        if not description or self.provider is None:
             return None
         
-        system_prompt = """You are an expert building energy modeler. Extract building parameters from descriptions 
-and return a JSON object with these fields:
-- building_type: office, retail, residential, school, hospital, warehouse, hotel, restaurant
-- stories: integer number of floors (or null if not mentioned)
-- area: floor area in square meters (convert from sq ft if needed)
-- dimensions: {length: meters, width: meters} or null
-- hvac_system: vav, rtu, ptac, heat_pump, chilled_water, or null
-- construction: {wall_type: concrete/steel_frame/wood_frame/brick, roof_type: flat/gabled, window_type: single_pane/double_pane/triple_pane}
-- year_built: integer year or null
-- special_features: array of features like ["parking", "elevator", "solar", "led"]
-
-Return ONLY valid JSON, no markdown or explanation."""
-
-        user_prompt = f"Extract building parameters from this description: {description}"
-
-        if self.llm_provider == 'openai' and OPENAI_AVAILABLE:
+        def fetch() -> Optional[Dict]:
+            user_prompt = f"Extract building parameters from this description: {description}"
             try:
-                response = self.client.ChatCompletion.create(
-                    model="gpt-4o-mini",  # Fast and cheap
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    temperature=0.1,  # Low temperature for consistent extraction
-                    max_tokens=500
-                )
-                
-                result = response.choices[0].message.content.strip()
-                
-                # Parse JSON response
-                if result.startswith('```json'):
-                    result = result[7:]
-                if result.endswith('```'):
-                    result = result[:-3]
-                
-                return json.loads(result.strip())
-                
+                result = _parse_json_response(self.provider.complete(EXTRACTION_SYSTEM_PROMPT, user_prompt))
             except Exception as e:
-                print(f"OpenAI API error: {e}")
+                print(f"{self.provider.name} API error: {e}")
                 return None
+            return result if isinstance(result, dict) else None
         
-        elif self.llm_provider == 'anthropic' and ANTHROPIC_AVAILABLE:
-            try:
-                message = self.client.messages.create(
-                    model="claude-3-haiku-20240307",  # Fast and cheap
-                    max_tokens=500,
-                    temperature=0.1,
-                    system=system_prompt,
-                    messages=[{"role": "user", "content": user_prompt}]
-                )
-                
-                result = message.content[0].text.strip()
-                
-                # Parse JSON response
-                if result.startswith('```json'):
-                    result = result[7:]
-                if result.endswith('```'):
-                    result = result[:-3]
-                
-                return json.loads(result.strip())
-                
-            except Exception as e:
-                print(f"Anthropic API error: {e}")
-                return None
+        result = self.cache.get_or_fetch(self._cache_key(description), fetch)
+        return self._normalize_llm_result(result) if result is not None else None
+    
+    def _parse_batch_with_llm(self, descriptions: Sequence[str]) -> List[Optional[Dict]]:
+        """
+        Parse several descriptions with one LLM call.
         
-        return None
+        Returns:
+            Raw parsed parameters per description (None where the response had no entry)
+        """
+        items = [{'id': i, 'description': description} for i, description in enumerate(descriptions)]
+        user_prompt = f"Extract building parameters for each of these descriptions: {json.dumps(items)}"
+        response = _parse_json_response(self.provider.complete(
+            BATCH_EXTRACTION_SYSTEM_PROMPT, user_prompt, max_tokens=min(500 * len(items), 8000)
+        ))
+        
+        parsed: List[Optional[Dict]] = [None] * len(descriptions)
+        for entry in response if isinstance(response, list) else []:
+            if isinstance(entry, dict) and isinstance(entry.get('id'), int) and 0 <= entry['id'] < len(parsed):
+                parsed[entry['id']] = {key: value for key, value in entry.items() if key != 'id'}
+        return parsed
     
     def _extract_building_type(self, text: str) -> str:
         """Extract building type from description"""
+        return self._match_building_type(text) or 'office'  # Default
+    
+    def _match_building_type(self, text: str) -> Optional[str]:
+        """Building type with the most keyword matches, or None without any"""
         if not text:
-            return 'office'  # Default for empty text
+            return None
         
         scores = {}
         
@@ -260,7 +433,7 @@ Return ONLY valid JSON, no markdown or explanation."""
         
         if scores:
             return max(scores, key=scores.get)
-        return 'office'  # Default
+        return None
     
     def _extract_stories(self, text: str) -> Optional[int]:
         """Extract number of stories"""
@@ -295,10 +468,11 @@ Return ONLY valid JSON, no markdown or explanation."""
             match = re.search(pattern, text)
             if match:
                 area_str = match.group(1).replace(',', '')
+                unit = match.group(0)[len(match.group(1)):]
                 try:
                     area = float(area_str)
                     # Check if it's sq ft or m²
-                    if 'ft' in text[text.lower().find(pattern):text.lower().find(pattern)+50].lower():
+                    if any(token in unit for token in ('ft', 'feet', 'sf')):
                         # Convert sq ft to m²
                         area = area * 0.092903
                     areas.append(area)
@@ -378,7 +552,7 @@ Return ONLY valid JSON, no markdown or explanation."""
             return None
         
         # Look for year patterns (1900-2100)
-        year_pattern = r'\b(19|20)\d{2}\b'
+        year_pattern = r'\b(?:19|20)\d{2}\b'
         matches = re.findall(year_pattern, text)
         
         if matches:
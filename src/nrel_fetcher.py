@@ -1,7 +1,7 @@
 """Module for fetching weather data from NREL APIs."""
-import requests
 from typing import Dict, Optional
 import os
+from .utils.http_client import SharedHTTPClient
 
 
 class NRELFetcher:
@@ -18,7 +18,7 @@ class NRELFetcher:
             api_key: NREL API key (optional, some features work without)
         """
         self.api_key = api_key or os.getenv('NREL_API_KEY')
-        self.session = requests.Session()
+        self.session = SharedHTTPClient.get_instance().session()
         self.session.headers.update({'User-Agent': 'IDF-Creator/1.0'})
     
     def get_closest_weather_file(self, latitude: float, longitude: float,
@@ -1,6 +1,6 @@
 """Module for fetching building data from OpenStreetMap."""
-import requests
-from typing import Dict, List, Optional
+import asyncio
+from typing import Dict, List, Optional, Tuple
 import json
 import math
 try:
@@ -9,6 +9,8 @@ try:
     SHAPELY_AVAILABLE = True
 except ImportError:
     SHAPELY_AVAILABLE = False
+from .core.instrumentation import span
+from .utils.http_client import SharedHTTPClient
 
 
 class OSMFetcher:
@@ -17,9 +19,21 @@ class OSMFetcher:
     OVERPASS_URL = "https://overpass-api.de/api/interpreter"
     
     def __init__(self):
-        self.session = requests.Session()
+        self.session = SharedHTTPClient.get_instance().session()
         self.session.headers.update({'User-Agent': 'IDF-Creator/1.0'})
     
+    @staticmethod
+    def _footprint_query(latitude: float, longitude: float, radius_meters: int) -> str:
+        return f"""
+        [out:json][timeout:25];
+        (
+          way["building"](around:{radius_meters},{latitude},{longitude});
+          relation["building"](around:{radius_meters},{latitude},{longitude});
+        );
+        out geom;
+        """
+    
+    @span('footprint')
     def get_building_footprint(self, latitude: float, longitude: float, 
                                radius_meters: int = 50) -> Optional[Dict]:
         """
@@ -33,69 +47,96 @@ class OSMFetcher:
         Returns:
             Dictionary with building data or None
         """
-        query = f"""
-        [out:json][timeout:25];
-        (
-          way["building"](around:{radius_meters},{latitude},{longitude});
-          relation["building"](around:{radius_meters},{latitude},{longitude});
-        );
-        out geom;
-        """
-        
+        query = self._footprint_query(latitude, longitude, radius_meters)
         try:
             response = self.session.post(self.OVERPASS_URL, data={'data': query})
             response.raise_for_status()
+            return self._closest_building(response.json().get('elements', []), latitude, longitude)
+        except Exception as e:
+            print(f"Error fetching OSM data: {e}")
+            return None
+    
+    async def get_building_footprint_async(self, latitude: float, longitude: float,
+                                           radius_meters: int = 50) -> Optional[Dict]:
+        """Asyncio version of get_building_footprint()."""
+        query = self._footprint_query(latitude, longitude, radius_meters)
+        try:
+            response = await self.session.post_async(self.OVERPASS_URL, data={'data': query})
+            response.raise_for_status()
+            return self._closest_building(response.json().get('elements', []), latitude, longitude)
+        except Exception as e:
+            print(f"Error fetching OSM data: {e!r}")
+            return None
+    
+    def get_building_footprints(self, coordinates: List[Tuple[float, float]],
+                                radius_meters: int = 50) -> List[Optional[Dict]]:
+        """
+        Get building footprints for many locations at once.
+        
+        All lookups are queued together and sent as fast as the Overpass
+        rate and concurrency limits of the shared HTTP client allow. Must not
+        be called from a running event loop (await get_building_footprint_async
+        there instead).
+        
+        Args:
+            coordinates: (latitude, longitude) pairs
+            radius_meters: Search radius in meters
             
-            data = response.json()
-            elements = data.get('elements', [])
+        Returns:
+            Building data (or None) for each location, in input order
+        """
+        async def fetch_all():
+            return await asyncio.gather(*(
+                self.get_building_footprint_async(latitude, longitude, radius_meters)
+                for latitude, longitude in coordinates
+            ))
+        return asyncio.run(fetch_all())
+    
+    def _closest_building(self, elements: List[Dict], latitude: float, longitude: float) -> Optional[Dict]:
+        """Pick the building polygon whose centroid is closest to the coordinates."""
+        if not elements:
+            return None
+        
+        best_building = None
+        best_distance = float('inf')
+        
+        for building in elements:
+            if 'geometry' not in building:
+                continue
+            nodes = building['geometry']
+            if not nodes:
+                continue
+            footprint = [(node['lat'], node['lon']) for node in nodes]
+            if len(footprint) < 3:
+                continue
             
-            if not elements:
-                return None
+            # Centroid distance to prefer the polygon closest to the requested coordinates
+            centroid_lat = sum(node['lat'] for node in nodes) / len(nodes)
+            centroid_lon = sum(node['lon'] for node in nodes) / len(nodes)
+            distance = math.hypot(centroid_lat - latitude, centroid_lon - longitude)
             
-            best_building = None
-            best_distance = float('inf')
+            area_estimate = self._calculate_polygon_area(footprint)
             
-            for building in elements:
-                if 'geometry' not in building:
-                    continue
-                nodes = building['geometry']
-                if not nodes:
-                    continue
-                footprint = [(node['lat'], node['lon']) for node in nodes]
-                if len(footprint) < 3:
-                    continue
-                
-                # Centroid distance to prefer the polygon closest to the requested coordinates
-                centroid_lat = sum(node['lat'] for node in nodes) / len(nodes)
-                centroid_lon = sum(node['lon'] for node in nodes) / len(nodes)
-                distance = math.hypot(centroid_lat - latitude, centroid_lon - longitude)
-                
-                area_estimate = self._calculate_polygon_area(footprint)
-                
-                properties = {
-                    'building': building.get('tags', {}).get('building', 'unknown'),
-                    'building:levels': building.get('tags', {}).get('building:levels'),
-                    'height': building.get('tags', {}).get('height'),
-                    'roof:material': building.get('tags', {}).get('roof:material'),
-                    'roof:shape': building.get('tags', {}).get('roof:shape'),
-                    'addr:street': building.get('tags', {}).get('addr:street'),
-                    'addr:housenumber': building.get('tags', {}).get('addr:housenumber')
-                }
-                
-                if distance < best_distance:
-                    best_distance = distance
-                    best_building = {
-                        'footprint': footprint,
-                        'area_estimate_m2': area_estimate,
-                        'properties': properties,
-                        'tags': building.get('tags', {})
-                    }
+            properties = {
+                'building': building.get('tags', {}).get('building', 'unknown'),
+                'building:levels': building.get('tags', {}).get('building:levels'),
+                'height': building.get('tags', {}).get('height'),
+                'roof:material': building.get('tags', {}).get('roof:material'),
+                'roof:shape': building.get('tags', {}).get('roof:shape'),
+                'addr:street': building.get('tags', {}).get('addr:street'),
+                'addr:housenumber': building.get('tags', {}).get('addr:housenumber')
+            }
             
-            return best_building
+            if distance < best_distance:
+                best_distance = distance
+                best_building = {
+                    'footprint': footprint,
+                    'area_estimate_m2': area_estimate,
+                    'properties': properties,
+                    'tags': building.get('tags', {})
+                }
         
-        except Exception as e:
-            print(f"Error fetching OSM data: {e}")
-            return None
+        return best_building
     
     def get_building_height(self, tags: Dict) -> Optional[float]:
         """
@@ -0,0 +1,234 @@
+"""
+Parametric IDF edits.
+
+Model changes (retrofit measures, calibration multipliers) are expressed as
+edits to named fields - object type plus field index, e.g.
+``Lights.watts_per_area`` is field 5 of every ``Lights`` object - instead of
+regular expressions over IDF text. Generated IDFs do not always carry field
+comments, so matching on comment text misses fields; field indices do not.
+
+A :class:`ParametricModel` wraps one parsed baseline. The field edits
+(deltas) of a set of edits are resolved against the baseline once and
+memoized, so a combination of measures is just the composition of the
+cached per-measure deltas followed by a single render.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .utils.idf_utils import IDFDocument, IDFObject
+
+# Field edits keyed by (object index, field index), applied in order
+FieldDelta = Dict[Tuple[int, int], Tuple['ParametricEdit', ...]]
+
+
+def _compact_schedule_values(obj: IDFObject) -> List[int]:
+    """Indices of the value fields of a Schedule:Compact (each follows an ``Until:`` field)."""
+    return [i for i in range(2, len(obj.fields)) if obj.fields[i - 1].lower().startswith('until:')]
+
+
+@dataclass(frozen=True)
+class ParametricField:
+    """A named numeric field: object type plus field indices (index 0 is the Name)."""
+    obj_type: str
+    field_indices: Tuple[int, ...] = ()
+    selector: Optional[Callable[[IDFObject], Iterable[int]]] = None
+
+    def indices(self, obj: IDFObject) -> Iterable[int]:
+        """Field indices of this field in ``obj``."""
+        if self.selector is not None:
+            return self.selector(obj)
+        return self.field_indices
+
+
+FIELD_REGISTRY: Dict[str, ParametricField] = {
+    # Internal loads - the design level calculation method decides which of
+    # the level / per-area / per-person fields is populated, so the ``power``
+    # entries cover all three.
+    'Lights.lighting_level': ParametricField('Lights', (4,)),
+    'Lights.watts_per_area': ParametricField('Lights', (5,)),
+    'Lights.watts_per_person': ParametricField('Lights', (6,)),
+    'Lights.power': ParametricField('Lights', (4, 5, 6)),
+    'ElectricEquipment.design_level': ParametricField('ElectricEquipment', (4,)),
+    'ElectricEquipment.watts_per_area': ParametricField('ElectricEquipment', (5,)),
+    'ElectricEquipment.watts_per_person': ParametricField('ElectricEquipment', (6,)),
+    'ElectricEquipment.power': ParametricField('ElectricEquipment', (4, 5, 6)),
+    'People.number_of_people': ParametricField('People', (4,)),
+    'People.people_per_area': ParametricField('People', (5,)),
+    'ZoneInfiltration:DesignFlowRate.design_flow_rate': ParametricField('ZoneInfiltration:DesignFlowRate', (4,)),
+    'ZoneInfiltration:DesignFlowRate.flow_per_area': ParametricField('ZoneInfiltration:DesignFlowRate', (5,)),
+    'ZoneInfiltration:DesignFlowRate.flow_per_exterior_area': ParametricField('ZoneInfiltration:DesignFlowRate', (6,)),
+    'ZoneInfiltration:DesignFlowRate.air_changes_per_hour': ParametricField('ZoneInfiltration:DesignFlowRate', (7,)),
+    'ZoneInfiltration:DesignFlowRate.flow': ParametricField('ZoneInfiltration:DesignFlowRate', (4, 5, 6, 7)),
+    # HVAC
+    'Coil:Cooling:DX:SingleSpeed.rated_cop': ParametricField('Coil:Cooling:DX:SingleSpeed', (4,)),
+    'Coil:Cooling:DX:TwoSpeed.rated_cop': ParametricField('Coil:Cooling:DX:TwoSpeed', (4,)),
+    'Coil:Heating:Fuel.burner_efficiency': ParametricField('Coil:Heating:Fuel', (3,)),
+    'Coil:Heating:Gas.burner_efficiency': ParametricField('Coil:Heating:Gas', (2,)),
+    'Coil:Heating:Electric.efficiency': ParametricField('Coil:Heating:Electric', (2,)),
+    'Boiler:HotWater.nominal_capacity': ParametricField('Boiler:HotWater', (2,)),
+    'Fan:VariableVolume.pressure_rise': ParametricField('Fan:VariableVolume', (3,)),
+    'Fan:VariableVolume.fan_power_coefficients': ParametricField('Fan:VariableVolume', (10, 11, 12, 13, 14)),
+    'Fan:ConstantVolume.pressure_rise': ParametricField('Fan:ConstantVolume', (3,)),
+    'Fan:OnOff.pressure_rise': ParametricField('Fan:OnOff', (3,)),
+    # Envelope
+    'Material:NoMass.thermal_resistance': ParametricField('Material:NoMass', (2,)),
+    'WindowMaterial:SimpleGlazingSystem.u_factor': ParametricField('WindowMaterial:SimpleGlazingSystem', (1,)),
+    'WindowMaterial:SimpleGlazingSystem.shgc': ParametricField('WindowMaterial:SimpleGlazingSystem', (2,)),
+    # Schedules
+    'Schedule:Compact.values': ParametricField('Schedule:Compact', selector=_compact_schedule_values),
+}
+
+# Named groups of registry fields that one edit can target together
+FIELD_GROUPS: Dict[str, Tuple[str, ...]] = {
+    'cooling_cop': (
+        'Coil:Cooling:DX:SingleSpeed.rated_cop',
+        'Coil:Cooling:DX:TwoSpeed.rated_cop',
+    ),
+    'heating_efficiency': (
+        'Coil:Heating:Fuel.burner_efficiency',
+        'Coil:Heating:Gas.burner_efficiency',
+        'Coil:Heating:Electric.efficiency',
+    ),
+    'fan_pressure_rise': (
+        'Fan:VariableVolume.pressure_rise',
+        'Fan:ConstantVolume.pressure_rise',
+        'Fan:OnOff.pressure_rise',
+    ),
+}
+
+
+@dataclass(frozen=True)
+class ParametricEdit:
+    """
+    An edit to a named numeric field: ``value * scale + offset``, clamped.
+
+    Args:
+        target: FIELD_REGISTRY name or FIELD_GROUPS name
+        scale: Multiplier applied to the current value
+        offset: Amount added after scaling
+        minimum: Optional lower bound on the result
+        maximum: Optional upper bound on the result
+        name_contains: Only edit objects whose name contains this (case-insensitive)
+        integer: Truncate the result to an integer (e.g. number of people)
+    """
+    target: str
+    scale: float = 1.0
+    offset: float = 0.0
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    name_contains: Optional[str] = None
+    integer: bool = False
+
+    def apply(self, value: float) -> float:
+        """Apply this edit to a field value."""
+        value = value * self.scale + self.offset
+        if self.integer:
+            value = float(int(value))
+        if self.minimum is not None:
+            value = max(value, self.minimum)
+        if self.maximum is not None:
+            value = min(value, self.maximum)
+        return value
+
+
+def resolve_fields(target: str) -> Tuple[ParametricField, ...]:
+    """Look up the registry fields behind a field or group name."""
+    if target in FIELD_GROUPS:
+        return tuple(FIELD_REGISTRY[name] for name in FIELD_GROUPS[target])
+    if target in FIELD_REGISTRY:
+        return (FIELD_REGISTRY[target],)
+    raise KeyError(f"Unknown parametric field: {target}")
+
+
+def scale_edits(targets: Sequence[str], scale: float, **kwargs) -> List[ParametricEdit]:
+    """Build one scaling edit per target with shared options."""
+    return [ParametricEdit(target, scale=scale, **kwargs) for target in targets]
+
+
+def compose_deltas(*deltas: FieldDelta) -> FieldDelta:
+    """
+    Compose field deltas; edits to the same field are applied in argument order.
+    """
+    composed: FieldDelta = {}
+    for delta in deltas:
+        for key, edits in delta.items():
+            composed[key] = composed.get(key, ()) + edits
+    return composed
+
+
+class ParametricModel:
+    """
+    A parsed baseline IDF with memoized parametric edit deltas.
+
+    Deltas only depend on the baseline and the edits, so they are resolved
+    once per edit set and reused by every combination that includes it.
+    """
+
+    def __init__(self, doc: IDFDocument):
+        self.doc = doc
+        self._target_cache: Dict[Tuple[str, Optional[str]], List[Tuple[int, int]]] = {}
+        self._delta_cache: Dict[Tuple[ParametricEdit, ...], FieldDelta] = {}
+
+    @classmethod
+    def from_file(cls, idf_path: str) -> 'ParametricModel':
+        """Parse an IDF file into a parametric model."""
+        return cls(IDFDocument.from_file(idf_path))
+
+    def locate(self, target: str, name_contains: Optional[str] = None) -> List[Tuple[int, int]]:
+        """
+        Find the (object index, field index) pairs of a named field that hold a number.
+
+        Empty and non-numeric values (e.g. Autosize) are skipped.
+        """
+        key = (target, name_contains.lower() if name_contains else None)
+        if key not in self._target_cache:
+            locations = []
+            for field in resolve_fields(target):
+                for obj_idx in self.doc.indices_of_type(field.obj_type):
+                    obj = self.doc.objects[obj_idx]
+                    if key[1] and key[1] not in obj.name.lower():
+                        continue
+                    for field_idx in field.indices(obj):
+                        if field_idx < len(obj.fields) and _to_float(obj.fields[field_idx]) is not None:
+                            locations.append((obj_idx, field_idx))
+            self._target_cache[key] = locations
+        return self._target_cache[key]
+
+    def delta(self, edits: Sequence[ParametricEdit]) -> FieldDelta:
+        """Resolve a set of edits to a field delta (memoized)."""
+        key = tuple(edits)
+        if key not in self._delta_cache:
+            self._delta_cache[key] = compose_deltas(*(
+                {location: (edit,) for location in self.locate(edit.target, edit.name_contains)}
+                for edit in key
+            ))
+        return self._delta_cache[key]
+
+    def overrides(self, delta: FieldDelta) -> Dict[Tuple[int, int], str]:
+        """Evaluate a delta against the baseline values as render overrides."""
+        overrides = {}
+        for (obj_idx, field_idx), edits in delta.items():
+            value = float(self.doc.objects[obj_idx].fields[field_idx])
+            for edit in edits:
+                value = edit.apply(value)
+            overrides[(obj_idx, field_idx)] = str(int(value)) if edits[-1].integer else f"{value:.6g}"
+        return overrides
+
+    def render(self, *edit_sets: Sequence[ParametricEdit]) -> str:
+        """Render the baseline with the given edit sets applied in order."""
+        return self.doc.render(self.overrides(compose_deltas(*(self.delta(edits) for edits in edit_sets))))
+
+    def write(self, output_path: Union[str, Path], *edit_sets: Sequence[ParametricEdit]) -> str:
+        """Render the edited model to ``output_path`` and return the path."""
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(self.render(*edit_sets))
+        return str(output_path)
+
+
+def _to_float(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except ValueError:
+        return None
@@ -0,0 +1,429 @@
+"""
+Portfolio runs with archetype deduplication.
+
+Chain stores and school prototypes resolve to the same generation inputs
+over and over: building type, scaled footprint shape, stories, climate,
+construction era, HVAC type. Each building's resolved inputs are reduced to
+a canonical archetype key; every distinct archetype is generated and
+simulated once, and its results are fanned out to the member buildings,
+scaled by floor area.
+"""
+
+import hashlib
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .model_calibration import SIMULATION_MEMORY_MB, ModelCalibrator
+from .utils.common import resolve_weather_file_path, resolve_worker_count
+
+# Buildings whose floor areas are within this relative spread share an archetype
+AREA_CLUSTER_TOLERANCE = 0.05
+
+# Footprints are compared after scaling to unit area, rounded to this step
+FOOTPRINT_SHAPE_QUANTUM = 0.01
+
+# Construction years only matter through these code / tightness eras
+# (AdvancedInfiltration: 1930, 1980; BuildingAgeAdjuster: 1980, 2000, 2010)
+YEAR_ERA_BOUNDARIES = (1930, 1980, 2000, 2010)
+
+# Site elevation is compared in steps of this size (m)
+ELEVATION_QUANTUM_M = 100.0
+
+# Building parameters that name a building rather than describe it
+IDENTITY_PARAMS = ('name', 'address', 'building_id', '__location_building')
+
+# Location area sources the generator falls back to without a resolved floor area
+AREA_SOURCE_FIELDS = ('primary_area_m2', 'microsoft_area_m2', 'google_area_m2', 'osm_area_m2', 'city_area_m2')
+
+
+@dataclass
+class PortfolioBuilding:
+    """One building of a portfolio with its resolved generation inputs"""
+    building_id: str
+    address: str
+    building_params: Dict[str, Any]  # As passed to generate_professional_idf (floor_area = total m²)
+    location_data: Dict[str, Any]
+
+
+@dataclass
+class Archetype:
+    """Buildings sharing one canonical set of generation inputs"""
+    key: str
+    representative: PortfolioBuilding
+    members: List[PortfolioBuilding] = field(default_factory=list)
+    idf_path: Optional[str] = None
+    results: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class PortfolioResult:
+    """Results of one building, taken from its archetype"""
+    building_id: str
+    archetype_key: str
+    idf_path: Optional[str]
+    area_scale: float  # Member floor area / archetype floor area
+    results: Optional[Dict[str, Any]]
+
+
+def year_era(year: Any) -> Optional[int]:
+    """
+    Index of the construction era a year falls into.
+
+    Args:
+        year: Construction year (int-like) or None
+
+    Returns:
+        0 .. len(YEAR_ERA_BOUNDARIES), or None if no year is given
+    """
+    try:
+        year = int(year)
+    except (TypeError, ValueError):
+        return None
+    return sum(1 for boundary in YEAR_ERA_BOUNDARIES if year >= boundary)
+
+
+def footprint_signature(coords: Sequence[Sequence[float]]) -> Optional[List[List[float]]]:
+    """
+    Footprint shape independent of position and size, keeping orientation.
+
+    The ring is projected to local meters (equirectangular), centered,
+    scaled to unit area and rounded; rotation is kept because it changes
+    solar exposure.
+
+    Args:
+        coords: Footprint ring of (lat, lon) pairs, as stored by the location fetchers
+
+    Returns:
+        Rounded unit-area ring starting at its lowest vertex, or None
+    """
+    if not coords or len(coords) < 3:
+        return None
+    try:
+        lat0, lon0 = float(coords[0][0]), float(coords[0][1])
+        cos_lat = math.cos(math.radians(lat0))
+        points = [((float(lon) - lon0) * cos_lat, float(lat) - lat0) for lat, lon, *_ in coords]
+    except (TypeError, ValueError, IndexError):
+        return None
+    if points[0] == points[-1]:
+        points = points[:-1]
+    signed = sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1])) / 2.0
+    if abs(signed) <= 0 or len(points) < 3:
+        return None
+    if signed < 0:
+        points.reverse()
+    cx = sum(x for x, _ in points) / len(points)
+    cy = sum(y for _, y in points) / len(points)
+    scale = 1.0 / math.sqrt(abs(signed))
+    ring = [[round((x - cx) * scale / FOOTPRINT_SHAPE_QUANTUM) * FOOTPRINT_SHAPE_QUANTUM + 0.0,
+             round((y - cy) * scale / FOOTPRINT_SHAPE_QUANTUM) * FOOTPRINT_SHAPE_QUANTUM + 0.0]
+            for x, y in points]
+    start = min(range(len(ring)), key=lambda i: (ring[i][1], ring[i][0]))
+    return ring[start:] + ring[:start]
+
+
+def archetype_inputs(building: PortfolioBuilding) -> Dict[str, Any]:
+    """
+    Canonical generation inputs of a building, apart from its floor area.
+
+    Identity fields (name, address, coordinates) and the resolved floor area
+    are dropped (areas are clustered separately, see PortfolioRunner.group),
+    and the construction year is reduced to its era. Without a resolved floor
+    area the generator sizes the model from the location's area sources and
+    OSM footprint, so those (the footprint as its unit-area shape) become
+    part of the inputs. The year stays exact when internal loads are
+    age-adjusted.
+
+    Args:
+        building: Portfolio building
+
+    Returns:
+        JSON-serializable dict
+    """
+    params = {key: value for key, value in building.building_params.items() if key not in IDENTITY_PARAMS}
+    if params.get('building_type'):
+        params['building_type'] = str(params['building_type']).lower()
+    if params.get('floor_area') is not None:
+        del params['floor_area']
+    if not params.get('apply_internal_load_adjustments'):
+        for year_field in ('year_built', 'retrofit_year'):
+            if params.get(year_field) is not None:
+                params[year_field] = year_era(params[year_field])
+
+    location = building.location_data or {}
+    building_info = location.get('building') or {}
+    elevation = location.get('elevation', location.get('altitude')) or 0.0
+    site = {
+        'climate_zone': location.get('climate_zone'),
+        'weather_file': Path(str(location.get('weather_file') or location.get('weather_file_name') or '')).name,
+        'time_zone': location.get('time_zone'),
+        'elevation': round(float(elevation) / ELEVATION_QUANTUM_M),
+    }
+    if building.building_params.get('floor_area') is None:
+        site['area_sources'] = {key: building_info.get(key) for key in AREA_SOURCE_FIELDS
+                                if building_info.get(key) is not None}
+        site['area_source'] = building_info.get('primary_area_source')
+        site['footprint'] = footprint_signature(building_info.get('osm_footprint'))
+    if building_info.get('context_buildings'):
+        # Surrounding buildings make the model site-specific
+        site['context_buildings'] = building_info['context_buildings']
+    return {'params': params, 'site': site}
+
+
+def archetype_key(building: PortfolioBuilding) -> str:
+    """SHA-256 of a building's canonical generation inputs (floor area excluded)."""
+    payload = json.dumps(archetype_inputs(building), sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _floor_area(building: PortfolioBuilding) -> Optional[float]:
+    try:
+        area = float(building.building_params.get('floor_area'))
+    except (TypeError, ValueError):
+        return None
+    return area if area > 0 else None
+
+
+def scale_results(results: Dict[str, Any], factor: float) -> Dict[str, Any]:
+    """Energy results scaled by ``factor`` (numbers and number lists; flags kept)."""
+    scaled = {}
+    for key, value in results.items():
+        if isinstance(value, bool) or key.startswith('eui'):
+            scaled[key] = value
+        elif isinstance(value, (int, float)):
+            scaled[key] = value * factor
+        elif isinstance(value, list) and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value):
+            scaled[key] = [v * factor for v in value]
+        else:
+            scaled[key] = value
+    return scaled
+
+
+class PortfolioRunner:
+    """Generates and simulates each distinct archetype of a portfolio once"""
+
+    def __init__(self, generator=None, energyplus_path: Optional[str] = None,
+                 area_tolerance: float = AREA_CLUSTER_TOLERANCE):
+        """
+        Initialize the runner.
+
+        Args:
+            generator: ProfessionalIDFGenerator (created on first use if None)
+            energyplus_path: Path to EnergyPlus executable (auto-detected if None)
+            area_tolerance: Relative floor-area spread within which buildings share an archetype
+        """
+        self._generator = generator
+        self.simulator = ModelCalibrator(energyplus_path=energyplus_path)
+        self.energyplus_path = self.simulator.energyplus_path
+        self.area_tolerance = area_tolerance
+
+    @property
+    def generator(self):
+        """Professional IDF generator, created on first use."""
+        if self._generator is None:
+            from .professional_idf_generator import ProfessionalIDFGenerator
+            self._generator = ProfessionalIDFGenerator()
+        return self._generator
+
+    def group(self, buildings: Sequence[PortfolioBuilding]) -> List[Archetype]:
+        """
+        Group buildings into archetypes.
+
+        Buildings with the same archetype key are sorted by floor area and
+        split wherever the area exceeds the smallest of the current cluster
+        by more than ``area_tolerance``. The member with the median area
+        represents the cluster, which keeps the area scaling small.
+
+        Args:
+            buildings: Portfolio buildings
+
+        Returns:
+            Archetypes in order of their keys' first appearance, members in input order
+        """
+        by_key: Dict[str, List[Tuple[int, PortfolioBuilding]]] = {}
+        for position, building in enumerate(buildings):
+            by_key.setdefault(archetype_key(building), []).append((position, building))
+
+        archetypes = []
+        for key, members in by_key.items():
+            sized = sorted((m for m in members if _floor_area(m[1])), key=lambda m: _floor_area(m[1]))
+            clusters = []
+            for member in sized:
+                if clusters and _floor_area(member[1]) <= _floor_area(clusters[-1][0][1]) * (1 + self.area_tolerance):
+                    clusters[-1].append(member)
+                else:
+                    clusters.append([member])
+            unsized = [m for m in members if not _floor_area(m[1])]
+            if unsized:
+                clusters.append(unsized)
+            for cluster in clusters:
+                representative = cluster[len(cluster) // 2][1]
+                area = _floor_area(representative)
+                cluster_key = hashlib.sha256(f"{key}:{area!r}".encode('utf-8')).hexdigest() if area else key
+                archetypes.append(Archetype(key=cluster_key, representative=representative,
+                                            members=[building for _, building in sorted(cluster, key=lambda m: m[0])]))
+        return archetypes
+
+    def generate(self, archetypes: Sequence[Archetype], output_dir: str) -> None:
+        """
+        Write one IDF per archetype (``archetype_<key prefix>.idf``).
+
+        Args:
+            archetypes: Archetypes to generate
+            output_dir: Directory for the IDF files
+        """
+        output = Path(output_dir)
+        output.mkdir(parents=True, exist_ok=True)
+        for index, archetype in enumerate(archetypes, 1):
+            building = archetype.representative
+            print(f"🏗️  [{index}/{len(archetypes)}] Archetype {archetype.key[:12]} "
+                  f"({len(archetype.members)} building(s), e.g. {building.building_id})")
+            idf_content = self.generator.generate_professional_idf(
+                building.address, dict(building.building_params), building.location_data
+            )
+            idf_path = output / f"archetype_{archetype.key[:12]}.idf"
+            idf_path.write_text(idf_content, encoding='utf-8')
+            archetype.idf_path = str(idf_path)
+
+    def simulate(self, archetypes: Sequence[Archetype], output_dir: str,
+                 weather_file: Optional[str] = None, max_concurrent: int = 4) -> None:
+        """
+        Simulate each generated archetype once.
+
+        Args:
+            archetypes: Generated archetypes
+            output_dir: Directory for simulation outputs
+            weather_file: EPW for all archetypes (default: each location's weather file)
+            max_concurrent: Maximum concurrent simulations (capped by available cores and memory)
+        """
+        if not self.energyplus_path:
+            print("⚠️  EnergyPlus not found. Skipping portfolio simulations.")
+            return
+
+        jobs = []
+        for index, archetype in enumerate(archetypes):
+            weather = resolve_weather_file_path(
+                weather_file or archetype.representative.location_data.get('weather_file')
+            )
+            if not archetype.idf_path or not weather:
+                print(f"  ⚠️  Archetype {archetype.key[:12]}: no IDF or weather file, not simulated")
+                continue
+            jobs.append((index, archetype.idf_path, weather, str(Path(output_dir) / f"archetype_{archetype.key[:12]}")))
+
+        print(f"\n🔄 Simulating {len(jobs)} archetype(s) for "
+              f"{sum(len(archetype.members) for archetype in archetypes)} building(s)...")
+        workers = resolve_worker_count(max_concurrent, SIMULATION_MEMORY_MB) if len(jobs) > 1 else 1
+        for index, results in self._iter_results(jobs, workers):
+            archetype = archetypes[index]
+            if results.get('annual_kwh', 0.0) > 0:
+                archetype.results = results
+                print(f"  ✓ Archetype {archetype.key[:12]}: {results['annual_kwh']:,.0f} kWh")
+            else:
+                print(f"  ⚠️  Archetype {archetype.key[:12]}: simulation failed")
+
+    def fan_out(self, archetypes: Sequence[Archetype]) -> List[PortfolioResult]:
+        """
+        Per-building results from the archetype results, scaled by floor area.
+
+        Args:
+            archetypes: Simulated archetypes
+
+        Returns:
+            One PortfolioResult per member building
+        """
+        return [self._member_result(archetype, member) for archetype in archetypes for member in archetype.members]
+
+    def _member_result(self, archetype: Archetype, member: PortfolioBuilding) -> PortfolioResult:
+        """Archetype results scaled to one member's floor area."""
+        reference_area = _floor_area(archetype.representative)
+        member_area = _floor_area(member)
+        scale = member_area / reference_area if member_area and reference_area else 1.0
+        member_results = None
+        if archetype.results is not None:
+            member_results = scale_results(archetype.results, scale)
+            if member_area:
+                site_kwh = member_results.get('annual_kwh', 0.0) + member_results.get('gas_annual_kwh', 0.0)
+                member_results['eui_kwh_m2'] = site_kwh / member_area
+        return PortfolioResult(
+            building_id=member.building_id,
+            archetype_key=archetype.key,
+            idf_path=archetype.idf_path,
+            area_scale=scale,
+            results=member_results
+        )
+
+    def run(self, buildings: Sequence[PortfolioBuilding], output_dir: str,
+            weather_file: Optional[str] = None, simulate: bool = True,
+            max_concurrent: int = 4) -> List[PortfolioResult]:
+        """
+        Generate and simulate a portfolio, once per archetype.
+
+        Args:
+            buildings: Portfolio buildings with resolved inputs
+            output_dir: Directory for IDFs and simulation outputs
+            weather_file: EPW for all archetypes (default: each location's weather file)
+            simulate: Run EnergyPlus (False: only generate the archetype IDFs)
+            max_concurrent: Maximum concurrent simulations
+
+        Returns:
+            Results per building, in input order
+        """
+        archetypes = self.group(buildings)
+        print(f"🏘️  Portfolio: {len(buildings)} buildings → {len(archetypes)} archetypes")
+        self.generate(archetypes, output_dir)
+        if simulate:
+            self.simulate(archetypes, output_dir, weather_file, max_concurrent)
+        archetype_of = {id(member): archetype for archetype in archetypes for member in archetype.members}
+        return [self._member_result(archetype_of[id(building)], building) for building in buildings]
+
+    def _simulate_job(self, index: int, idf_path: str, weather_file: str, sim_output_dir: str) -> Tuple[int, Dict]:
+        """Simulate one archetype IDF."""
+        return index, self.simulator._run_simulation(idf_path, weather_file, Path(sim_output_dir))
+
+    def _iter_results(self, jobs: List[Tuple], workers: int) -> Iterator[Tuple[int, Dict]]:
+        """
+        Yield (archetype index, results) pairs as simulations complete.
+
+        Uses a process pool when more than one worker is available; otherwise
+        runs the jobs in order in this process.
+        """
+        if workers <= 1:
+            for job in jobs:
+                yield self._simulate_job(*job)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_portfolio_worker,
+            initargs=(self.energyplus_path,)
+        )
+        futures = {executor.submit(_run_portfolio_job, job): job[0] for job in jobs}
+        try:
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    print(f"  ❌ Archetype {futures[future]} failed: {e}")
+                    yield futures[future], {'annual_kwh': 0.0, 'monthly_kwh': [0.0] * 12}
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+
+# Per-process state for simulation workers (set by the pool initializer)
+_WORKER_STATE: Dict = {}
+
+
+def _init_portfolio_worker(energyplus_path: str) -> None:
+    """Process-pool initializer: one runner per worker."""
+    _WORKER_STATE['runner'] = PortfolioRunner(energyplus_path=energyplus_path)
+
+
+def _run_portfolio_job(job: Tuple) -> Tuple[int, Dict]:
+    """Process-pool entry point for one archetype simulation."""
+    return _WORKER_STATE['runner']._simulate_job(*job)
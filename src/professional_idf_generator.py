@@ -7,27 +7,22 @@ import os
 import math
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
+import numpy as np
 from shapely.geometry import Polygon
 from shapely.affinity import scale
 from src.core.base_idf_generator import BaseIDFGenerator
-from .advanced_geometry_engine import AdvancedGeometryEngine, BuildingFootprint, ZoneGeometry
-from .professional_material_library import ProfessionalMaterialLibrary
-from .multi_building_types import MultiBuildingTypes
+from src.core.generation_context import GenerationContext
+from src.core.instrumentation import add_bytes, count, span
+from src.core.stage_reporting import report_stage
+from .advanced_geometry_engine import BuildingFootprint, FootprintSimplification, ZoneGeometry
 from .advanced_hvac_systems import AdvancedHVACSystems
+from .context_shading import ContextShadingBuilder
 from .hvac_plumbing import HVACPlumbing
-from .advanced_hvac_controls import AdvancedHVACControls
-from .shading_daylighting import ShadingDaylightingEngine
-from .infiltration_ventilation import InfiltrationVentilationEngine
-from .renewable_energy import RenewableEnergyEngine
-from .advanced_ventilation import AdvancedVentilation
-from .advanced_window_modeling import AdvancedWindowModeling
-from .advanced_ground_coupling import AdvancedGroundCoupling
-from .advanced_infiltration import AdvancedInfiltration
-from .area_validator import AreaValidator
-from .equipment_catalog.adapters import bcl as bcl_adapter
-from .equipment_catalog.translator.idf_translator import translate as translate_equipment
+from .representative_periods import END_USE_METERS, PeriodSelection, select_representative_weeks
+from .template_registry import TemplateRegistry
 from .utils.idf_utils import dedupe_idf_string
-from .geometry_utils import fix_vertex_ordering_for_wall, calculate_polygon_center_2d
+from .utils.artifact_cache import TemplateArtifactCache
+from .geometry_utils import calculate_polygon_center_2d, calculate_surface_normals, fix_vertex_ordering_for_walls
 from .formatters.hvac_objects import (
     format_fan_variable_volume,
     format_fan_constant_volume,
@@ -38,40 +33,79 @@ from .formatters.hvac_objects import (
     format_branch_list,
     format_ptac,
 )
-from .utils.common import normalize_node_name
+from .utils.common import normalize_node_name, resolve_weather_file_path
 from pathlib import Path
 
+# Cardinal orientations in the order of _orientations_from_vectors' indices
+ORIENTATION_ORDER = ('E', 'N', 'W', 'S')
+
 
 class ProfessionalIDFGenerator(BaseIDFGenerator):
     """Professional-grade IDF generator with advanced features"""
     
-    def __init__(self):
-        """Initialize professional IDF generator with EnergyPlus version 24.2."""
+    def __init__(self, registry: Optional[TemplateRegistry] = None):
+        """
+        Initialize professional IDF generator with EnergyPlus version 24.2.
+        
+        Args:
+            registry: Template libraries to use (default: the process-wide registry)
+        """
         super().__init__(version="24.2")
         
-        # Initialize professional modules
-        self.geometry_engine = AdvancedGeometryEngine()
-        self.material_library = ProfessionalMaterialLibrary()
-        self.building_types = MultiBuildingTypes()
-        self.hvac_systems = AdvancedHVACSystems(node_generator=self)
+        # Shared, read-only template libraries (loaded once per process)
+        self.registry = registry or TemplateRegistry.get_instance()
+        self.geometry_engine = self.registry.geometry_engine
+        self.material_library = self.registry.material_library
+        self.building_types = self.registry.building_types
+        self.advanced_controls = self.registry.advanced_controls
+        self.shading_daylighting = self.registry.shading_daylighting
+        self.infiltration_ventilation = self.registry.infiltration_ventilation
+        self.advanced_ventilation = self.registry.advanced_ventilation
+        self.advanced_window = self.registry.advanced_window
+        self.advanced_ground = self.registry.advanced_ground
+        self.advanced_infiltration = self.registry.advanced_infiltration
+        self.area_validator = self.registry.area_validator
+        
+        # Modules holding per-building state
+        self.hvac_systems = AdvancedHVACSystems(node_generator=self, registry=self.registry)
         self.hvac_plumbing = HVACPlumbing()
-        self.advanced_controls = AdvancedHVACControls()
-        self.shading_daylighting = ShadingDaylightingEngine()
-        self.infiltration_ventilation = InfiltrationVentilationEngine()
-        self.renewable_energy = RenewableEnergyEngine()
-        self.advanced_ventilation = AdvancedVentilation()
-        self.advanced_window = AdvancedWindowModeling()
-        self.advanced_ground = AdvancedGroundCoupling()
-        self.advanced_infiltration = AdvancedInfiltration()
-        self.area_validator = AreaValidator()
-        self.construction_map = {}
+        self._renewable_energy = None
+        self.context_shading = ContextShadingBuilder(self.geometry_engine)
+        # Rendered schedules / envelope blocks / curves shared across models
+        self.artifact_cache = TemplateArtifactCache.get_instance()
+    
+    @property
+    def renewable_energy(self):
+        """Renewable energy engine, created on first use."""
+        if self._renewable_energy is None:
+            from .renewable_energy import RenewableEnergyEngine
+            self._renewable_energy = RenewableEnergyEngine()
+        return self._renewable_energy
+    
+    @property
+    def construction_map(self) -> Dict[str, str]:
+        """Template construction name -> selected construction for the current generation."""
+        return self.context.construction_map
+    
+    @construction_map.setter
+    def construction_map(self, construction_map: Dict[str, str]) -> None:
+        self.context.construction_map = construction_map
     
     def generate_professional_idf(self, address: str, building_params: Dict, 
-                                location_data: Dict, documents: List[str] = None) -> str:
-        """Generate professional-grade IDF with advanced features"""
-
-        # Reset per-generation state (unique names, outdoor air node flags, etc.)
-        self.reset_unique_names()
+                                location_data: Dict, documents: List[str] = None,
+                                context: Optional[GenerationContext] = None) -> str:
+        """Generate professional-grade IDF with advanced features
+        
+        Per-generation state (unique names, outdoor air nodes, construction map)
+        lives in a fresh GenerationContext, so one generator can serve
+        concurrent calls. Pass ``context`` to inspect that state afterwards.
+        """
+        with self.generation_context(context):
+            return self._generate_professional_idf(address, building_params, location_data, documents)
+    
+    def _generate_professional_idf(self, address: str, building_params: Dict,
+                                   location_data: Dict, documents: List[str] = None) -> str:
+        """Generate the IDF within the active generation context."""
         
         # Determine building type
         building_type_raw = self._determine_building_type(building_params, documents)
@@ -170,12 +204,16 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
             print(f"  ✓ Using user-specified floor area: {user_floor_area:.0f} m² total ({area_per_floor:.0f} m²/floor)")
         
         # Generate complex building footprint
-        footprint = self._generate_complex_footprint(
-            location_data, building_type, estimated_params
-        )
+        report_stage('geometry')
+        with span('footprint_geometry'):
+            footprint = self._generate_complex_footprint(
+                location_data, building_type, estimated_params,
+                self._footprint_simplification(building_params)
+            )
         
         # Generate detailed zone layout
-        zones = self.geometry_engine.generate_zone_layout(footprint, building_type)
+        with span('zone_layout'):
+            zones = self.geometry_engine.generate_zone_layout(footprint, building_type)
         # Ensure unique zone names across entire building
         name_counts = {}
         for z in zones:
@@ -193,12 +231,13 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
             requested_total_area = user_floor_area if user_floor_area else estimated_params.get('floor_area', 0)
 
             if requested_total_area and requested_total_area > 0:
-                footprint, zones, area_metrics = self.geometry_engine.match_layout_to_total_area(
-                    footprint,
-                    zones,
-                    requested_total_area,
-                    tolerance=0.01
-                )
+                with span('area_matching'):
+                    footprint, zones, area_metrics = self.geometry_engine.match_layout_to_total_area(
+                        footprint,
+                        zones,
+                        requested_total_area,
+                        tolerance=0.01
+                    )
 
                 total_zone_area = area_metrics['post_scale_total_area']
                 scale_factor = area_metrics.get('scale_factor', 1.0)
@@ -214,26 +253,24 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
         
         # Generate professional materials and constructions (with LEED envelope improvements if applicable)
         climate_zone = location_data.get('climate_zone', '3A')
-        materials_used, constructions_used = self._select_professional_materials(
-            building_type, climate_zone, year_built, leed_level
-        )
         # Build construction name mapping for surfaces/windows (with age and LEED adjustment)
-        wall_constr = self.material_library.get_construction_assembly(building_type, climate_zone, 'wall', year_built, leed_level).name
-        roof_constr = self.material_library.get_construction_assembly(building_type, climate_zone, 'roof', year_built, leed_level).name
-        floor_constr = self.material_library.get_construction_assembly(building_type, climate_zone, 'floor', year_built, leed_level).name
-        window_constr = self.material_library.get_construction_assembly(building_type, climate_zone, 'window', year_built, leed_level).name
+        envelope = self.material_library.get_envelope_constructions(building_type, climate_zone, year_built, leed_level)
+        window_constr = envelope['window'].name
         self.construction_map = {
-            'Building_ExteriorWall': wall_constr,
-            'Building_ExteriorRoof': roof_constr,
-            'Building_ExteriorFloor': floor_constr,
+            'Building_ExteriorWall': envelope['wall'].name,
+            'Building_ExteriorRoof': envelope['roof'].name,
+            'Building_ExteriorFloor': envelope['floor'].name,
             'Building_Window': window_constr,
             'Window_Double_Clear': window_constr
         }
         
         # Generate advanced HVAC systems (with LEED efficiency bonuses)
-        hvac_components = self._generate_advanced_hvac_systems(
-            zones, building_type, location_data.get('climate_zone', '3A'), building_params, leed_level
-        )
+        report_stage('hvac')
+        with span('hvac'):
+            hvac_components = self._generate_advanced_hvac_systems(
+                zones, building_type, location_data.get('climate_zone', '3A'), building_params, leed_level
+            )
+        count('hvac_components', len(hvac_components))
         
         # Generate complete IDF
         idf_content = []
@@ -267,11 +304,26 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
         idf_content.append(self.generate_site_location(location_data))
         idf_content.append(self.generate_design_day_objects(location_data))
         
+        # Materials and constructions only depend on the envelope template inputs:
+        # the code era, not the exact year (the window is part of the key because
+        # the library's fallback window is age-specific)
+        envelope_key = (building_type, climate_zone, self.material_library.code_era(year_built),
+                        leed_level, window_constr)
+        
+        def envelope_selection():
+            return self._select_professional_materials(building_type, climate_zone, year_built, leed_level)
+        
         # Materials
-        idf_content.append(self.material_library.generate_material_objects(materials_used))
+        idf_content.append(self.artifact_cache.get_or_build(
+            'materials', envelope_key,
+            lambda: self.material_library.generate_material_objects(envelope_selection()[0])
+        ))
         
         # Constructions
-        idf_content.append(self.material_library.generate_construction_objects(constructions_used))
+        idf_content.append(self.artifact_cache.get_or_build(
+            'constructions', envelope_key,
+            lambda: self.material_library.generate_construction_objects(envelope_selection()[1])
+        ))
         
         # Filter out invalid zones before processing
         valid_zones = []
@@ -298,8 +350,12 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
             else:
                 print("⚠️  Critical: Unable to generate fallback zones; proceeding with empty geometry")
         
+        count('zones', len(zones))
+        
         # Surfaces (generate first to calculate actual floor areas)
-        surfaces = self.geometry_engine.generate_building_surfaces(zones, footprint)
+        with span('surfaces'):
+            surfaces = self.geometry_engine.generate_building_surfaces(zones, footprint)
+        count('surfaces', len(surfaces))
         
         # Calculate floor surface areas for each zone
         zone_floor_areas = {}
@@ -334,18 +390,33 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
             idf_content.append(self.generate_zone_object(zone, floor_surface_area=floor_area))
         
         # Surfaces (already generated above, now format them)
-        for surface in surfaces:
-            try:
-                formatted_surface = self.format_surface_object(surface)
-                idf_content.append(formatted_surface)
-            except (ValueError, KeyError) as e:
-                print(f"⚠️  Warning: Skipping invalid surface {surface.get('name', 'Unknown')}: {e}")
-                continue
+        with span('surface_format'):
+            for surface in surfaces:
+                try:
+                    formatted_surface = self.format_surface_object(surface)
+                    idf_content.append(formatted_surface)
+                except (ValueError, KeyError) as e:
+                    print(f"⚠️  Warning: Skipping invalid surface {surface.get('name', 'Unknown')}: {e}")
+                    continue
         
         # Windows (pass surfaces to match window vertices to wall vertices)
-        windows = self._generate_windows(zones, footprint, building_type, building_params, surfaces)
-        for window in windows:
-            idf_content.append(self.format_window_object(window))
+        with span('windows'):
+            windows = self._generate_windows(zones, footprint, building_type, building_params, surfaces)
+            for window in windows:
+                idf_content.append(self.format_window_object(window))
+        count('windows', len(windows))
+        
+        # Context shading from neighbouring buildings (culled, merged, budgeted)
+        context_buildings = (location_data.get('building') or {}).get('context_buildings')
+        if context_buildings and location_data.get('latitude') is not None and footprint.polygon is not None:
+            with span('context_shading'):
+                shading_surfaces = self.context_shading.build_surfaces(
+                    context_buildings, location_data['latitude'], location_data['longitude'], footprint.polygon,
+                    radius=building_params.get('context_shading_radius')
+                )
+                for shading in shading_surfaces:
+                    idf_content.append(self.format_shading_object(shading))
+            count('context_shading_surfaces', len(shading_surfaces))
         
         # CRITICAL FIX: Generate schedules BEFORE objects that reference them
         # EnergyPlus requires schedules to be defined before they're referenced
@@ -353,7 +424,8 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
         for zone in zones:
             if zone.polygon and zone.polygon.is_valid and zone.area >= 0.1:
                 used_space_types.add(self._determine_space_type(zone.name, building_type))
-        schedules_text = self.generate_schedules(building_type, sorted(used_space_types))
+        with span('schedules'):
+            schedules_text = self.generate_schedules(building_type, sorted(used_space_types))
         
         # Add schedules to IDF (BEFORE objects that reference them)
         # CRITICAL: EnergyPlus requires schedules to be defined before they're referenced
@@ -382,63 +454,64 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
             age_adjuster_temp = BuildingAgeAdjuster()
             leed_bonuses = age_adjuster_temp.get_leed_efficiency_bonus(leed_level)
         
-        for zone in zones:
-            # Skip zones that were filtered out
-            if not zone.polygon or not zone.polygon.is_valid or zone.polygon.area < 0.1:
-                continue
-            space_type = self._determine_space_type(zone.name, building_type)
-            idf_content.append(self.generate_people_objects(zone, space_type, building_type, age_adjusted_params))
-            idf_content.append(self.generate_lighting_objects(zone, space_type, building_type, age_adjusted_params, leed_bonuses, building_params))
-            idf_content.append(self.generate_equipment_objects(zone, space_type, building_type, age_adjusted_params, leed_bonuses, building_params))
+        with span('loads'):
+            for zone in zones:
+                # Skip zones that were filtered out
+                if not zone.polygon or not zone.polygon.is_valid or zone.polygon.area < 0.1:
+                    continue
+                space_type = self._determine_space_type(zone.name, building_type)
+                idf_content.append(self.generate_people_objects(zone, space_type, building_type, age_adjusted_params))
+                idf_content.append(self.generate_lighting_objects(zone, space_type, building_type, age_adjusted_params, leed_bonuses, building_params))
+                idf_content.append(self.generate_equipment_objects(zone, space_type, building_type, age_adjusted_params, leed_bonuses, building_params))
             
-            # Add daylighting controls for office/school spaces (integrate existing framework)
-            # Apply to office spaces (not storage, mechanical, etc.)
-            if building_type in ['Office', 'School']:
-                # Only add daylighting to spaces with windows (office, conference, lobby, break_room)
-                space_type_lower = space_type.lower()
-                zone_name_lower = zone.name.lower()
-                # Eligible if space type or zone name contains office-related terms
-                # Check both exact matches and partial matches
-                daylighting_eligible = (
-                    space_type_lower in ['office_open', 'office_private', 'conference', 'lobby', 'classroom', 'break_room'] or
-                    any(x in space_type_lower for x in ['office', 'conference', 'classroom', 'lobby']) or
-                    any(x in zone_name_lower for x in ['office', 'conference', 'classroom', 'lobby', 'break'])
-                )
-                # Exclude mechanical and storage spaces
-                if not any(x in space_type_lower for x in ['storage', 'mechanical', 'warehouse']):
-                    if daylighting_eligible:
-                        try:
-                            daylighting_idf = self.shading_daylighting.generate_daylight_controls(
-                                zone.name, building_type, zone_geometry=zone
-                            )
-                            idf_content.append(daylighting_idf)
-                        except Exception as e:
-                            # If daylighting generation fails, continue without it
-                            pass
+                # Add daylighting controls for office/school spaces (integrate existing framework)
+                # Apply to office spaces (not storage, mechanical, etc.)
+                if building_type in ['Office', 'School']:
+                    # Only add daylighting to spaces with windows (office, conference, lobby, break_room)
+                    space_type_lower = space_type.lower()
+                    zone_name_lower = zone.name.lower()
+                    # Eligible if space type or zone name contains office-related terms
+                    # Check both exact matches and partial matches
+                    daylighting_eligible = (
+                        space_type_lower in ['office_open', 'office_private', 'conference', 'lobby', 'classroom', 'break_room'] or
+                        any(x in space_type_lower for x in ['office', 'conference', 'classroom', 'lobby']) or
+                        any(x in zone_name_lower for x in ['office', 'conference', 'classroom', 'lobby', 'break'])
+                    )
+                    # Exclude mechanical and storage spaces
+                    if not any(x in space_type_lower for x in ['storage', 'mechanical', 'warehouse']):
+                        if daylighting_eligible:
+                            try:
+                                daylighting_idf = self.shading_daylighting.generate_daylight_controls(
+                                    zone.name, building_type, zone_geometry=zone
+                                )
+                                idf_content.append(daylighting_idf)
+                            except Exception as e:
+                                # If daylighting generation fails, continue without it
+                                pass
             
-            # Add internal mass objects for all zones (thermal mass from furniture, partitions)
-            try:
-                internal_mass_idf = self._generate_internal_mass(zone.name, zone.area)
-                idf_content.append(internal_mass_idf)
-            except Exception as e:
-                # If internal mass generation fails, continue without it
-                pass
+                # Add internal mass objects for all zones (thermal mass from furniture, partitions)
+                try:
+                    internal_mass_idf = self._generate_internal_mass(zone.name, zone.area)
+                    idf_content.append(internal_mass_idf)
+                except Exception as e:
+                    # If internal mass generation fails, continue without it
+                    pass
             
-            # Add advanced infiltration modeling (expert-level feature: temperature/wind dependent)
-            try:
-                building_age = building_params.get('year_built')
-                leed_level = building_params.get('leed_level') or leed_level
-                infiltration_idf = self.advanced_infiltration.generate_infiltration(
-                    zone.name,
-                    zone.area,
-                    zone_height=3.0,  # Typical story height
-                    building_age=building_age,
-                    leed_level=leed_level
-                )
-                idf_content.append(infiltration_idf)
-            except Exception as e:
-                # If infiltration generation fails, continue without it
-                pass
+                # Add advanced infiltration modeling (expert-level feature: temperature/wind dependent)
+                try:
+                    building_age = building_params.get('year_built')
+                    leed_level = building_params.get('leed_level') or leed_level
+                    infiltration_idf = self.advanced_infiltration.generate_infiltration(
+                        zone.name,
+                        zone.area,
+                        zone_height=3.0,  # Typical story height
+                        building_age=building_age,
+                        leed_level=leed_level
+                    )
+                    idf_content.append(infiltration_idf)
+                except Exception as e:
+                    # If infiltration generation fails, continue without it
+                    pass
         
         # Zone Sizing (required for VAV autosizing)
         if not building_params.get('simple_hvac'):
@@ -464,76 +537,77 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
                 
                 idf_content.append(self.generate_zone_sizing_object(zone.name, zone_area=zone.area, space_type=space_type))
         
-        # HVAC Systems (advanced or simple ideal loads)
-        if building_params.get('simple_hvac'):
-            for zone in zones:
-                idf_content.append(self._generate_ideal_loads(zone.name))
-        else:
-            # Final deduplication pass before writing to IDF - use dict keyed by type:name
-            # EnergyPlus requires unique names per object type
-            # Normalize keys (case-insensitive, stripped) to catch subtle differences
-            hvac_by_key = {}
-            hvac_strings = []  # Collect formatted strings for final deduplication
+        with span('hvac_objects'):
+            # HVAC Systems (advanced or simple ideal loads)
+            if building_params.get('simple_hvac'):
+                for zone in zones:
+                    idf_content.append(self._generate_ideal_loads(zone.name))
+            else:
+                # Final deduplication pass before writing to IDF - use dict keyed by type:name
+                # EnergyPlus requires unique names per object type
+                # Normalize keys (case-insensitive, stripped) to catch subtle differences
+                hvac_by_key = {}
+                hvac_strings = []  # Collect formatted strings for final deduplication
             
-            for component in hvac_components:
-                comp_name = component.get('name', '').strip()
-                comp_type = component.get('type', '').strip()
+                for component in hvac_components:
+                    comp_name = component.get('name', '').strip()
+                    comp_type = component.get('type', '').strip()
+                
+                    # Skip components without name or type
+                    if not comp_name or not comp_type:
+                        # Allow raw IDF strings without names
+                        if comp_type == 'IDF_STRING' and 'raw' in component:
+                            hvac_strings.append(component['raw'])
+                            continue
+                        continue
                 
-                # Skip components without name or type
-                if not comp_name or not comp_type:
-                    # Allow raw IDF strings without names
+                    # Do not deduplicate raw IDF strings; append directly
                     if comp_type == 'IDF_STRING' and 'raw' in component:
                         hvac_strings.append(component['raw'])
                         continue
-                    continue
-                
-                # Do not deduplicate raw IDF strings; append directly
-                if comp_type == 'IDF_STRING' and 'raw' in component:
-                    hvac_strings.append(component['raw'])
-                    continue
 
-                # Normalize key (lowercase, stripped) for reliable matching
-                norm_key = f"{comp_type.lower()}::{comp_name.lower()}"
+                    # Normalize key (lowercase, stripped) for reliable matching
+                    norm_key = f"{comp_type.lower()}::{comp_name.lower()}"
                 
-                if norm_key in hvac_by_key:
-                    # Duplicate found - skip it
-                    continue
+                    if norm_key in hvac_by_key:
+                        # Duplicate found - skip it
+                        continue
                     
-                hvac_by_key[norm_key] = component
+                    hvac_by_key[norm_key] = component
             
-            # CRITICAL: Validate all AirLoopHVAC components before formatting
-            # This ensures no duplicate node errors in generated IDFs
-            self._validate_airloop_components(hvac_by_key.values())
+                # CRITICAL: Validate all AirLoopHVAC components before formatting
+                # This ensures no duplicate node errors in generated IDFs
+                self._validate_airloop_components(hvac_by_key.values())
             
-            # Generate Sizing:System objects for each air loop
-            airloop_names = sorted({
-                component.get('name')
-                for component in hvac_by_key.values()
-                if component.get('type') == 'AirLoopHVAC' and component.get('name')
-            })
-            for airloop_name in airloop_names:
-                idf_content.append(self.generate_system_sizing_object(airloop_name))
+                # Generate Sizing:System objects for each air loop
+                airloop_names = sorted({
+                    component.get('name')
+                    for component in hvac_by_key.values()
+                    if component.get('type') == 'AirLoopHVAC' and component.get('name')
+                })
+                for airloop_name in airloop_names:
+                    idf_content.append(self.generate_system_sizing_object(airloop_name))
             
-            # Format all unique components
-            for component in hvac_by_key.values():
-                hvac_strings.append(self.format_hvac_object(component))
+                # Format all unique components
+                for component in hvac_by_key.values():
+                    hvac_strings.append(self.format_hvac_object(component))
             
-            # Final string-level deduplication (in case formatting creates duplicates)
-            seen_strings = set()
-            for hvac_str in hvac_strings:
-                # Extract object type and name from first few lines
-                lines = hvac_str.strip().split('\n')
-                if len(lines) >= 2:
-                    obj_type = lines[0].split(',')[0].strip()
-                    obj_name = lines[1].split(',')[0].strip().lstrip('!').strip()
-                    str_key = f"{obj_type.lower()}::{obj_name.lower()}"
+                # Final string-level deduplication (in case formatting creates duplicates)
+                seen_strings = set()
+                for hvac_str in hvac_strings:
+                    # Extract object type and name from first few lines
+                    lines = hvac_str.strip().split('\n')
+                    if len(lines) >= 2:
+                        obj_type = lines[0].split(',')[0].strip()
+                        obj_name = lines[1].split(',')[0].strip().lstrip('!').strip()
+                        str_key = f"{obj_type.lower()}::{obj_name.lower()}"
                     
-                    if str_key not in seen_strings:
-                        seen_strings.add(str_key)
+                        if str_key not in seen_strings:
+                            seen_strings.add(str_key)
+                            idf_content.append(hvac_str)
+                    else:
+                        # Can't parse, just add it
                         idf_content.append(hvac_str)
-                else:
-                    # Can't parse, just add it
-                    idf_content.append(hvac_str)
         
         # HVAC Performance Curves
         idf_content.append(self._generate_hvac_performance_curves())
@@ -544,8 +618,12 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
         # For now, keep all schedules to ensure nothing is incorrectly filtered out
         # The filtering can be re-enabled later if needed, but it's safer to keep all schedules
         
-        # Run Period (allow quick one-month run for faster API validation)
-        if building_params.get('quick_run_period'):
+        # Run Period (allow quick one-month run for faster API validation, or
+        # representative weeks extrapolated to annual results)
+        representative = self._representative_selection(building_params, location_data)
+        if representative is not None:
+            idf_content.append(self.generate_representative_run_periods(representative))
+        elif building_params.get('quick_run_period'):
             idf_content.append(self.generate_quick_run_period())
         else:
             idf_content.append(self.generate_run_period())
@@ -553,6 +631,8 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
         # Outputs - check if gas equipment exists
         has_gas_equipment = self._check_for_gas_equipment(hvac_components)
         idf_content.append(self.generate_output_objects(has_gas_equipment=has_gas_equipment))
+        if representative is not None:
+            idf_content.append(self.generate_end_use_meters())
         
         # Weather File (ground temps already added in generate_site_location)
         idf_content.append(self.generate_weather_file_object(
@@ -560,9 +640,12 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
             climate_zone=location_data.get('climate_zone', 'C5').replace('ASHRAE_', '') if location_data.get('climate_zone') else None
         ))
         
-        full_idf = '\n\n'.join(idf_content)
+        with span('serialize'):
+            full_idf = '\n\n'.join(idf_content)
         # Final safety: remove any duplicate object definitions across entire IDF
-        full_idf = dedupe_idf_string(full_idf)
+        with span('dedupe'):
+            full_idf = dedupe_idf_string(full_idf)
+        add_bytes('idf', len(full_idf.encode('utf-8')))
         
         return full_idf
 
@@ -614,8 +697,22 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
         # Default to office
         return 'office'
     
+    def _footprint_simplification(self, building_params: Dict) -> Optional[FootprintSimplification]:
+        """Simplification settings requested by building_params['footprint_simplification'].
+
+        The parameter is a FootprintSimplification or a dict of its fields;
+        without it the geometry engine's defaults apply.
+        """
+        requested = building_params.get('footprint_simplification')
+        if not requested:
+            return None
+        if isinstance(requested, FootprintSimplification):
+            return requested
+        return FootprintSimplification(**requested)
+
     def _generate_complex_footprint(self, location_data: Dict, building_type: str, 
-                                  estimated_params: Dict) -> BuildingFootprint:
+                                  estimated_params: Dict,
+                                  simplification: Optional[FootprintSimplification] = None) -> BuildingFootprint:
         """Generate complex building footprint"""
         # Build OSM-like geometry payload from enhanced location data if present
         building_info = location_data.get('building') or {}
@@ -798,7 +895,8 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
             osm_data=osm_like,
             building_type=building_type,
             total_area=footprint_area,  # This is actually per-floor area
-            stories=estimated_params['stories']
+            stories=estimated_params['stories'],
+            simplification=simplification
         )
         
         # CRITICAL FIX: Scale footprint polygon to match requested area exactly
@@ -828,19 +926,18 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
         constructions_used = []
         
         # Get constructions for different surface types
-        surface_types = ['wall', 'roof', 'floor', 'window']
+        envelope = self.material_library.get_envelope_constructions(
+            building_type, climate_zone, year_built, leed_level
+        )
         
-        for surface_type in surface_types:
-            construction = self.material_library.get_construction_assembly(
-                building_type, climate_zone, surface_type, year_built, leed_level
-            )
+        for construction in envelope.values():
             if construction:
                 constructions_used.append(construction.name)
                 materials_used.extend(construction.materials)
         
-        # Remove duplicates
-        materials_used = list(set(materials_used))
-        constructions_used = list(set(constructions_used))
+        # Remove duplicates (keeping first-use order so rendered blocks are reproducible)
+        materials_used = list(dict.fromkeys(materials_used))
+        constructions_used = list(dict.fromkeys(constructions_used))
         
         return materials_used, constructions_used
     
@@ -994,12 +1091,28 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
                 "\n\nThis should never happen with the current code. Please check advanced_hvac_systems.py"
             )
     
+    def _claim_component_name(self, component: Dict) -> Dict:
+        """
+        Allocate a component's name in the generation's name allocator.
+        
+        Returns the component itself, or a renamed copy when the name (compared
+        case-insensitively) is already taken.
+        """
+        name = component.get('name', '')
+        if not name:
+            return component
+        unique_name = self.unique_names.allocate(name)
+        if unique_name == name:
+            return component
+        renamed = dict(component)
+        renamed['name'] = unique_name
+        return renamed
+    
     def _generate_advanced_hvac_systems(self, zones: List[ZoneGeometry],
                                       building_type: str, climate_zone: str,
                                       building_params: Dict, leed_level: Optional[str] = None) -> List[Dict]:
         """Generate advanced HVAC systems for all zones"""
         hvac_components = []
-        seen_names = set()  # Global tracker to prevent any duplicate names
         
         # Get HVAC system type from building template
         building_template = self.building_types.get_building_type_template(building_type)
@@ -1045,19 +1158,7 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
             )
             
             # Ensure all component names are globally unique
-            unique_zone_hvac = []
-            for comp in zone_hvac:
-                comp_name = comp.get('name', '')
-                if comp_name in seen_names:
-                    # Make it unique by adding zone index (shouldn't happen but safety check)
-                    comp_copy = dict(comp)
-                    comp_copy['name'] = f"{comp_name}_u{idx}"
-                    unique_zone_hvac.append(comp_copy)
-                    seen_names.add(comp_copy['name'])
-                else:
-                    if comp_name:
-                        seen_names.add(comp_name)
-                    unique_zone_hvac.append(comp)
+            unique_zone_hvac = [self._claim_component_name(comp) for comp in zone_hvac]
             
             hvac_components.extend(unique_zone_hvac)
             
@@ -1065,19 +1166,7 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
             if hvac_type == 'VAV':
                 branch_objects = self._generate_airloop_branches(zone.name + unique_suffix, unique_zone_hvac)
                 # Ensure branch object names are unique
-                unique_branches = []
-                for branch in branch_objects:
-                    branch_name = branch.get('name', '')
-                    if branch_name in seen_names:
-                        branch_copy = dict(branch)
-                        branch_copy['name'] = f"{branch_name}_u{idx}"
-                        unique_branches.append(branch_copy)
-                        seen_names.add(branch_copy['name'])
-                    else:
-                        if branch_name:
-                            seen_names.add(branch_name)
-                        unique_branches.append(branch)
-                hvac_components.extend(unique_branches)
+                hvac_components.extend(self._claim_component_name(branch) for branch in branch_objects)
             
             # ALL HVAC types need ZoneHVAC:EquipmentList and ZoneHVAC:EquipmentConnections
             if hvac_type == 'VAV':
@@ -1157,19 +1246,7 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
                 climate_zone=climate_zone
             )
             # Ensure control names are unique too
-            unique_controls = []
-            for ctrl in controls:
-                ctrl_name = ctrl.get('name', '')
-                if ctrl_name and ctrl_name in seen_names:
-                    ctrl_copy = dict(ctrl)
-                    ctrl_copy['name'] = f"{ctrl_name}_u{idx}"
-                    unique_controls.append(ctrl_copy)
-                    seen_names.add(ctrl_copy['name'])
-                else:
-                    if ctrl_name:
-                        seen_names.add(ctrl_name)
-                    unique_controls.append(ctrl)
-            hvac_components.extend(unique_controls)
+            hvac_components.extend(self._claim_component_name(ctrl) for ctrl in controls)
             
             # Generate zone thermostat setpoint schedules (required for ThermostatSetpoint:DualSetpoint)
             zone_name_with_suffix = zone.name + unique_suffix
@@ -1544,6 +1621,17 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
   {len(vertices)}, !- Number of Vertices
   {vertices_str};          !- Vertex 1 through {len(vertices)} X-coordinate, Y-coordinate, Z-coordinate
 
+"""
+    
+    def format_shading_object(self, shading: Dict) -> str:
+        """Format detached building shading surface for EnergyPlus."""
+        vertices_str = ',\n  '.join(shading['vertices'])
+        return f"""Shading:Building:Detailed,
+  {shading['name']},       !- Name
+  ,                        !- Transmittance Schedule Name
+  {len(shading['vertices'])}, !- Number of Vertices
+  {vertices_str};          !- Vertex 1 through {len(shading['vertices'])} X-coordinate, Y-coordinate, Z-coordinate
+
 """
     
     def format_window_object(self, window: Dict) -> str:
@@ -1938,7 +2026,11 @@ class ProfessionalIDFGenerator(BaseIDFGenerator):
             return f"! {comp_type}: {component.get('name', 'UNKNOWN')}\n"
     
     def _generate_hvac_performance_curves(self) -> str:
-        """Generate performance curves for HVAC equipment
+        """Generate performance curves for HVAC equipment (rendered once per process)."""
+        return self.artifact_cache.get_or_build('hvac_performance_curves', (), self._build_hvac_performance_curves)
+    
+    def _build_hvac_performance_curves(self) -> str:
+        """Render performance curves for HVAC equipment
         
         EIR curve is adjusted to evaluate to 1.0 at rated conditions:
         - x = 19.4°C (indoor wet-bulb, evaporator inlet)
@@ -2445,7 +2537,18 @@ InternalMass,
 """
     
     def generate_schedules(self, building_type: str, space_types_filter: List[str] = None) -> str:
-        """Generate comprehensive schedules for building type."""
+        """Generate comprehensive schedules for building type.
+
+        Schedules only depend on the building type and space types, so the
+        rendered block is cached per combination.
+        """
+        key = (building_type, *(space_types_filter or ()))
+        return self.artifact_cache.get_or_build(
+            'schedules', key, lambda: self._build_schedules(building_type, space_types_filter)
+        )
+    
+    def _build_schedules(self, building_type: str, space_types_filter: List[str] = None) -> str:
+        """Render the schedule block for a building type and its space types."""
         schedules = []
 
         # Define schedule type limits
@@ -2741,6 +2844,59 @@ InternalMass,
 
 """
     
+    def _representative_selection(self, building_params: Dict,
+                                  location_data: Dict) -> Optional[PeriodSelection]:
+        """Representative weeks requested by building_params['representative_periods'] (experimental).
+
+        The parameter is either a PeriodSelection or True (select from the
+        site weather file). Without a readable weather file the full year is
+        simulated.
+        """
+        requested = building_params.get('representative_periods')
+        if not requested:
+            return None
+        if isinstance(requested, PeriodSelection):
+            return requested
+        weather_file = location_data.get('weather_file') or location_data.get('weather_file_name')
+        epw_path = self._resolve_weather_file_path(weather_file) if weather_file else None
+        if not epw_path:
+            print(f"⚠️  No weather file found for representative periods ({weather_file}); simulating the full year")
+            return None
+        try:
+            return select_representative_weeks(epw_path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not select representative periods from {epw_path}: {e}; simulating the full year")
+            return None
+
+    def generate_representative_run_periods(self, selection: PeriodSelection) -> str:
+        """Generate one RunPeriod per representative week."""
+        objects = []
+        for period in selection.periods:
+            (begin_month, begin_day), (end_month, end_day) = period.begin, period.end
+            objects.append(f"""RunPeriod,
+  {period.name},   !- Name
+  {begin_month},                       !- Begin Month
+  {begin_day},                       !- Begin Day of Month
+  ,                        !- Begin Year (use weather file year)
+  {end_month},                       !- End Month
+  {end_day},                       !- End Day of Month
+  ,                        !- End Year (use weather file year)
+  ,                        !- Day of Week for Start Day
+  Yes,                     !- Use Weather File Holidays and Special Days
+  Yes,                     !- Use Weather File Daylight Saving Period
+  Yes,                     !- Apply Weekend Holiday Rule
+  Yes,                     !- Use Weather File Rain Indicators
+  Yes;                     !- Use Weather File Snow Indicators
+""")
+        return '\n'.join(objects) + '\n'
+
+    def generate_end_use_meters(self) -> str:
+        """Generate per-run-period end-use meters for representative-period extrapolation."""
+        return '\n'.join(f"""Output:Meter,
+  {meter},                  !- Key Name
+  RunPeriod;                             !- Reporting Frequency
+""" for meter in END_USE_METERS) + '\n'
+
     def _filter_unused_schedules(self, schedules_text: str, idf_content: str) -> str:
         """Filter out schedules that are defined but never referenced in the IDF.
         
@@ -2928,17 +3084,23 @@ Output:Meter,
   Electricity:Building,                    !- Key Name
   RunPeriod;                               !- Reporting Frequency
 
+Output:Meter,
+  Electricity:Facility,                  !- Key Name
+  Monthly;                               !- Reporting Frequency (calibration against utility bills)
+
 """
         
         # Only add gas-related outputs if gas equipment exists
-        # Note: NaturalGas:Facility meter is already added above unconditionally
-        # (it will be zero if no gas equipment exists, which is fine)
         if has_gas_equipment:
             output += """Output:Variable,
   *,                      !- Key Value
   Site Total Gas Energy,  !- Variable Name
   RunPeriod;              !- Reporting Frequency
 
+Output:Meter,
+  NaturalGas:Facility,                   !- Key Name
+  Monthly;                               !- Reporting Frequency (calibration against utility bills)
+
 """
         
         return output
@@ -3022,6 +3184,21 @@ Output:Meter,
         best = min(cardinals.items(), key=lambda kv: abs(kv[1]-angle))
         return best[0]
 
+    @staticmethod
+    def _orientations_from_vectors(dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+        """Vectorized _orientation_from_vector: indices into ORIENTATION_ORDER.
+
+        The angles come from math.atan2 (np.arctan2 may differ in the last
+        bit), so walls on a sector boundary resolve exactly as in the scalar
+        version.
+        """
+        angle = np.fromiter(map(math.atan2, dy.tolist(), dx.tolist()), dtype=float, count=len(dx)) + math.pi/2
+        # Normalize to [0, 2pi)
+        angle = np.where(angle < 0, angle + 2*math.pi, angle)
+        angle = np.where(angle >= 2*math.pi, angle - 2*math.pi, angle)
+        cardinals = np.array([0.0, math.pi/2, math.pi, 3*math.pi/2])
+        return np.abs(cardinals[None, :] - angle[:, None]).argmin(axis=1)
+
     def _generate_windows(self, zones: List[ZoneGeometry], footprint: BuildingFootprint, building_type: str, building_params: Dict, surfaces: List[Dict] = None) -> List[Dict]:
         """Generate windows for zones, targeting building-type Window-to-Wall Ratio (WWR).
 
@@ -3031,13 +3208,13 @@ Output:Meter,
         - Use a centered ribbon window sized to meet target area, with limits
         - Maintain margins from floor/ceiling and wall edges
         - CRITICAL: Match window vertex ordering to parent wall vertex ordering
+
+        All polygon edges of all zones are sized and placed together as arrays.
         """
-        windows = []
-        
         # Check if zones exist
         if not zones:
             print("⚠️  Warning: No zones found for window generation")
-            return windows
+            return []
 
         # Build a map of wall surfaces by name for quick lookup
         wall_surfaces_by_name = {}
@@ -3050,169 +3227,136 @@ Output:Meter,
         base_oriented = self._get_default_oriented_wwr(building_type)
         oriented_wwr = self._resolve_wwr_overrides(base_oriented, building_params)
 
-        for zone in zones:
-            coords = list(zone.polygon.exterior.coords[:-1])
-            z_bottom = zone.floor_level * 3.0
-            z_top = (zone.floor_level + 1) * 3.0
-            story_height = max(0.5, z_top - z_bottom)
-            
-            # Calculate zone center for window vertex ordering (must match wall ordering)
-            zone_center_2d = calculate_polygon_center_2d(coords)
+        # Every polygon edge of every zone as one row: start / end points,
+        # owning zone and edge index
+        zone_coords = [list(zone.polygon.exterior.coords[:-1]) for zone in zones]
+        if not any(zone_coords):
+            return []
+        rings = [np.array([xy[:2] for xy in coords], dtype=float).reshape(-1, 2) for coords in zone_coords]
+        start_xy = np.concatenate(rings)
+        end_xy = np.concatenate([np.roll(ring, -1, axis=0) for ring in rings])
+        zone_index = np.repeat(np.arange(len(zones)), [len(ring) for ring in rings])
+        edge_index = np.concatenate([np.arange(len(ring)) for ring in rings])
+        floor_level = np.array([zone.floor_level for zone in zones], dtype=float)[zone_index]
+
+        z_bottom = floor_level * 3.0
+        z_top = (floor_level + 1) * 3.0
+        story_height = np.maximum(0.5, z_top - z_bottom)
+
+        delta = end_xy - start_xy
+        wall_length = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+
+        # Wall orientation and its WWR
+        wwr_by_orientation = np.array([oriented_wwr[ori] for ori in ORIENTATION_ORDER])
+        wwr = wwr_by_orientation[self._orientations_from_vectors(delta[:, 0], delta[:, 1])]
+
+        wall_area = wall_length * story_height
+        target_window_area = np.maximum(0.0, np.minimum(wwr * wall_area, wall_area * 0.8))  # cap at 80% for constructability
+
+        keep = (wall_length >= 2.0) & (target_window_area > 0.01)
+        if not keep.any():
+            return []
+        start_xy, end_xy, delta = start_xy[keep], end_xy[keep], delta[keep]
+        zone_index, edge_index = zone_index[keep], edge_index[keep]
+        z_bottom, story_height = z_bottom[keep], story_height[keep]
+        wall_length, target_window_area = wall_length[keep], target_window_area[keep]
+
+        # Ribbon window: 70% of the wall length, height from the target area
+        # within top/bottom margins; widen to 90% if that is too short
+        margin_h = np.maximum(0.3, story_height * 0.15)
+        max_win_height = np.maximum(0.3, story_height - 2 * margin_h)
+        win_width = np.maximum(1.0, np.minimum(wall_length * 0.7, wall_length - 0.6))
+        win_height = np.minimum(max_win_height, target_window_area / np.maximum(win_width, 0.1))
+        short = win_height < 0.3
+        wide_width = np.maximum(1.0, np.minimum(wall_length * 0.9, wall_length - 0.4))
+        win_width = np.where(short, wide_width, win_width)
+        win_height = np.where(short, np.minimum(max_win_height, target_window_area / np.maximum(wide_width, 0.1)),
+                              win_height)
+
+        # Vertical placement: center within allowed band
+        win_z_bottom = z_bottom + (story_height - win_height) / 2
+        win_z_top = win_z_bottom + win_height
+
+        # Horizontal placement: centered along the wall segment
+        center = (start_xy + end_xy) / 2
+        axis = delta / wall_length[:, None]
+        half_w = (win_width / 2)[:, None]
+        a_xy = center - axis * half_w
+        b_xy = center + axis * half_w
+
+        zone_names = [zones[z].name for z in zone_index.tolist()]
+        wall_names = [f"{name}_Wall_{i + 1}" for name, i in zip(zone_names, edge_index.tolist())]
+        window_vertices_3d = self._order_window_vertices(
+            a_xy, b_xy, win_z_bottom, win_z_top, delta,
+            [self._parse_wall_vertices(wall_surfaces_by_name.get(name)) for name in wall_names],
+            np.array([calculate_polygon_center_2d(coords) for coords in zone_coords])[zone_index]
+        )
 
-            for i, (x1, y1) in enumerate(coords):
-                x2, y2 = coords[(i + 1) % len(coords)]
+        windows = []
+        for name, i, wall_name, vertices in zip(zone_names, edge_index.tolist(), wall_names, window_vertices_3d.tolist()):
+            windows.append({
+                'name': f"{name}_Window_{i + 1}",
+                'construction': 'Window_Double_Clear',
+                'building_surface_name': wall_name,
+                # Format vertices as strings for EnergyPlus
+                'vertices': [f"{x:.4f},{y:.4f},{z:.4f}" for x, y, z in vertices]
+            })
 
-                wall_length = math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
-                if wall_length < 2.0:
-                    continue
+        return windows
 
-                # Determine wall orientation and its WWR
-                wwr = oriented_wwr[self._orientation_from_vector(x2 - x1, y2 - y1)]
+    @staticmethod
+    def _parse_wall_vertices(wall_surface: Optional[Dict]) -> Optional[List[Tuple[float, float, float]]]:
+        """First four vertices of a wall surface dict, or None if missing or malformed."""
+        if not wall_surface or len(wall_surface.get('vertices') or []) < 4:
+            return None
+        try:
+            wall_verts = [tuple(float(part) for part in v_str.split(',')[:3]) for v_str in wall_surface['vertices'][:4]]
+        except (ValueError, AttributeError):
+            return None
+        return wall_verts if all(len(v) == 3 for v in wall_verts) else None
 
-                wall_area = wall_length * story_height
-                target_window_area = max(0.0, min(wwr * wall_area, wall_area * 0.8))  # cap at 80% for constructability
+    def _order_window_vertices(self, a_xy: np.ndarray, b_xy: np.ndarray, z_bottom: np.ndarray, z_top: np.ndarray,
+                               segment: np.ndarray, wall_vertices: List[Optional[List[Tuple[float, float, float]]]],
+                               zone_centers: np.ndarray) -> np.ndarray:
+        """Window rectangles whose vertex order matches their parent walls.
 
-                if target_window_area <= 0.01:
-                    continue
+        CRITICAL: a window must list its vertices in the same rotational
+        direction as its wall. Where the wall is known, the window starts at
+        the end matching the wall's bottom-edge direction and is reversed if
+        its normal still opposes the wall's; otherwise the window is ordered
+        to face away from its zone center.
 
-                # Choose a ribbon window with width fraction and compute height from area
-                margin_h = max(0.3, story_height * 0.15)   # top/bottom margins
-                max_win_height = max(0.3, story_height - 2 * margin_h)
-                width_fraction = 0.7  # 70% of wall length by default
-                win_width = max(1.0, min(wall_length * width_fraction, wall_length - 0.6))
-
-                # Compute height from target area, limit to max_win_height
-                win_height = min(max_win_height, target_window_area / max(win_width, 0.1))
-                if win_height < 0.3:
-                    # Too small; try increasing width up to 90%
-                    win_width = max(1.0, min(wall_length * 0.9, wall_length - 0.4))
-                    win_height = min(max_win_height, target_window_area / max(win_width, 0.1))
-
-                # Vertical placement: center within allowed band
-                win_z_bottom = z_bottom + (story_height - win_height) / 2
-                win_z_top = win_z_bottom + win_height
-
-                # Horizontal placement: center along wall segment in projected XY
-                center_x = (x1 + x2) / 2
-                center_y = (y1 + y2) / 2
-
-                # Determine local wall direction vector to offset window width along wall axis
-                dx = x2 - x1
-                dy = y2 - y1
-                length = math.sqrt(dx*dx + dy*dy)
-                ux = dx / length
-                uy = dy / length
-
-                half_w = win_width / 2
-                # Endpoints along wall axis from center
-                ax = center_x - ux * half_w
-                ay = center_y - uy * half_w
-                bx = center_x + ux * half_w
-                by = center_y + uy * half_w
-
-                # CRITICAL FIX: Get the actual wall vertices to match window ordering
-                wall_name = f"{zone.name}_Wall_{i+1}"
-                wall_surface = wall_surfaces_by_name.get(wall_name)
-                
-                if wall_surface and wall_surface.get('vertices'):
-                    # Parse wall vertices to determine correct ordering
-                    wall_vertices_str = wall_surface.get('vertices', [])
-                    if len(wall_vertices_str) >= 4:
-                        try:
-                            # Parse wall vertices
-                            wall_verts = []
-                            for v_str in wall_vertices_str[:4]:  # Use first 4 vertices
-                                parts = v_str.split(',')
-                                if len(parts) >= 3:
-                                    wall_verts.append((float(parts[0]), float(parts[1]), float(parts[2])))
-                            
-                            if len(wall_verts) == 4:
-                                # Determine wall's bottom edge direction from first two vertices
-                                wall_bottom_start = wall_verts[0]
-                                wall_bottom_end = wall_verts[1]
-                                
-                                # Check if wall vertices go from (x1,y1) to (x2,y2) or reversed
-                                wall_dx = wall_bottom_end[0] - wall_bottom_start[0]
-                                wall_dy = wall_bottom_end[1] - wall_bottom_start[1]
-                                
-                                # Compare with segment direction
-                                seg_dx = x2 - x1
-                                seg_dy = y2 - y1
-                                
-                                # Dot product: if positive, same direction; if negative, reversed
-                                dot = wall_dx * seg_dx + wall_dy * seg_dy
-                                
-                                # Create window vertices matching wall's vertex pattern
-                                if dot >= 0:
-                                    # Wall goes same direction as segment: (x1,y1) -> (x2,y2)
-                                    window_vertices_3d = [
-                                        (ax, ay, win_z_bottom),  # Bottom-left (matches wall's first vertex pattern)
-                                        (bx, by, win_z_bottom),  # Bottom-right
-                                        (bx, by, win_z_top),     # Top-right
-                                        (ax, ay, win_z_top)      # Top-left
-                                    ]
-                                else:
-                                    # Wall is reversed: use (bx,by) first to match wall's reversed pattern
-                                    window_vertices_3d = [
-                                        (bx, by, win_z_bottom),  # Bottom-right (matches reversed wall)
-                                        (ax, ay, win_z_bottom),  # Bottom-left
-                                        (ax, ay, win_z_top),     # Top-left
-                                        (bx, by, win_z_top)      # Top-right
-                                    ]
-                                
-                                # Verify window normal matches wall normal direction
-                                from .geometry_utils import calculate_surface_normal
-                                wall_normal = calculate_surface_normal(wall_verts)
-                                window_normal = calculate_surface_normal(window_vertices_3d)
-                                
-                                # If normals point in opposite directions, reverse window vertices
-                                dot_normal = (wall_normal[0] * window_normal[0] + 
-                                            wall_normal[1] * window_normal[1] + 
-                                            wall_normal[2] * window_normal[2])
-                                if dot_normal < 0:
-                                    window_vertices_3d = list(reversed(window_vertices_3d))
-                        except (ValueError, IndexError, TypeError):
-                            # Fallback to original logic if parsing fails
-                            window_vertices_3d = [
-                                (ax, ay, win_z_bottom),
-                                (bx, by, win_z_bottom),
-                                (bx, by, win_z_top),
-                                (ax, ay, win_z_top)
-                            ]
-                            window_vertices_3d = fix_vertex_ordering_for_wall(window_vertices_3d, zone_center_2d)
-                    else:
-                        # Fallback if wall doesn't have enough vertices
-                        window_vertices_3d = [
-                            (ax, ay, win_z_bottom),
-                            (bx, by, win_z_bottom),
-                            (bx, by, win_z_top),
-                            (ax, ay, win_z_top)
-                        ]
-                        window_vertices_3d = fix_vertex_ordering_for_wall(window_vertices_3d, zone_center_2d)
-                else:
-                    # Fallback: use original logic if wall surface not found
-                    window_vertices_3d = [
-                        (ax, ay, win_z_bottom),
-                        (bx, by, win_z_bottom),
-                        (bx, by, win_z_top),
-                        (ax, ay, win_z_top)
-                    ]
-                    window_vertices_3d = fix_vertex_ordering_for_wall(window_vertices_3d, zone_center_2d)
-                
-                # Format vertices as strings for EnergyPlus
-                window_vertices = []
-                for x, y, z in window_vertices_3d:
-                    window_vertices.append(f"{x:.4f},{y:.4f},{z:.4f}")
-                
-                window = {
-                    'name': f"{zone.name}_Window_{i+1}",
-                    'construction': 'Window_Double_Clear',
-                    'building_surface_name': wall_name,
-                    'vertices': window_vertices
-                }
-                windows.append(window)
+        Args:
+            a_xy, b_xy: (n, 2) window end points along each wall segment
+            z_bottom, z_top: (n,) window sill and head heights
+            segment: (n, 2) polygon edge direction of each wall
+            wall_vertices: First four vertices of each parent wall, or None
+            zone_centers: (n, 2) center of each window's zone
 
-        return windows
+        Returns:
+            Array of shape (n, 4, 3) of window vertices
+        """
+        a_bottom = np.column_stack([a_xy, z_bottom])
+        b_bottom = np.column_stack([b_xy, z_bottom])
+        a_top = np.column_stack([a_xy, z_top])
+        b_top = np.column_stack([b_xy, z_top])
+        forward = np.stack([a_bottom, b_bottom, b_top, a_top], axis=1)
+
+        matched = np.array([verts is not None for verts in wall_vertices])
+        vertices = fix_vertex_ordering_for_walls(forward, zone_centers)
+        if not matched.any():
+            return vertices
+
+        walls = np.array([verts for verts in wall_vertices if verts is not None], dtype=float)
+        # Wall's bottom edge runs along the segment, or is reversed
+        wall_direction = walls[:, 1, :2] - walls[:, 0, :2]
+        same_direction = (wall_direction * segment[matched]).sum(axis=1) >= 0
+        reverse_start = np.stack([b_bottom, a_bottom, a_top, b_top], axis=1)[matched]
+        candidates = np.where(same_direction[:, None, None], forward[matched], reverse_start)
+        # If normals point in opposite directions, reverse window vertices
+        opposed = (calculate_surface_normals(walls) * calculate_surface_normals(candidates)).sum(axis=1) < 0
+        vertices[matched] = np.where(opposed[:, None, None], candidates[:, ::-1], candidates)
+        return vertices
 
     def _sanitize_location_label(self, location_label: Optional[str]) -> str:
         """Sanitize location label to remove special characters and limit length."""
@@ -3229,37 +3373,7 @@ Output:Meter,
 
     def _resolve_weather_file_path(self, weather_file: Optional[str]) -> Optional[str]:
         """Attempt to locate the EPW file locally for design day extraction."""
-        if not weather_file:
-            return None
-
-        weather_path = Path(weather_file)
-        candidates = []
-        if weather_path.is_absolute():
-            candidates.append(weather_path)
-        else:
-            cwd = Path(os.getcwd())
-            candidates.append(cwd / weather_path)
-            candidates.append(cwd / weather_path.name)
-
-        search_roots = [
-            Path(os.getcwd()),
-            Path(os.getcwd()) / 'artifacts',
-            Path(os.getcwd()) / 'artifacts' / 'desktop_files',
-            Path(os.getcwd()) / 'artifacts' / 'desktop_files' / 'weather',
-            Path(os.getcwd()) / 'artifacts' / 'desktop_files' / 'weather' / 'artifacts' / 'desktop_files' / 'weather',
-            Path(os.getcwd()) / 'data',
-            Path(os.getcwd()) / 'data' / 'weather'
-        ]
-        for root in search_roots:
-            candidates.append(root / weather_path.name)
-
-        for candidate in candidates:
-            try:
-                if candidate and candidate.exists():
-                    return str(candidate.resolve())
-            except OSError:
-                continue
-        return None
+        return resolve_weather_file_path(weather_file)
 
     def _parse_epw_design_conditions(self, weather_file_path: str,
                                      climate_zone: Optional[str]) -> Optional[Dict[str, float]]:
@@ -41,11 +41,23 @@ class Construction:
 class ProfessionalMaterialLibrary:
     """Comprehensive material library with ASHRAE 90.1 compliance"""
     
+    # Surface types indexed when the library is loaded; others are indexed on first use
+    SURFACE_TYPES = ('wall', 'roof', 'floor', 'window')
+    
     def __init__(self):
         self.materials = self._load_materials()
         self.constructions = self._load_constructions()
         self.climate_zones = self._load_climate_zones()
         self.age_adjuster = BuildingAgeAdjuster()
+        
+        # (surface_type, building_type, climate category) -> (load order, construction name)
+        self._construction_index: Dict[Tuple[str, str, str], Tuple[int, str]] = {}
+        # surface_type -> first construction whose name mentions the surface type
+        self._surface_fallback: Dict[str, Optional[str]] = {}
+        for surface_type in self.SURFACE_TYPES:
+            self._index_surface_type(surface_type)
+        # Resolved selections, shared by every model generated with this library
+        self._selection_cache: Dict[Tuple, Construction] = {}
     
     def _load_materials(self) -> Dict[str, Material]:
         """Load comprehensive material database"""
@@ -518,6 +530,42 @@ class ProfessionalMaterialLibrary:
             '8': '5-8'    # Subarctic
         }
     
+    def _index_surface_type(self, surface_type: str) -> None:
+        """Index constructions whose name mentions ``surface_type`` by building type and climate category."""
+        surface_type = surface_type.lower()
+        self._surface_fallback[surface_type] = None
+        for position, (construction_name, construction) in enumerate(self.constructions.items()):
+            if surface_type not in construction_name.lower():
+                continue
+            key = (surface_type, construction.building_type, construction.climate_zone)
+            self._construction_index.setdefault(key, (position, construction_name))
+            if self._surface_fallback[surface_type] is None:
+                self._surface_fallback[surface_type] = construction_name
+    
+    def _lookup_construction(self, surface_type: str, building_type: str, cz_category: str) -> Optional[str]:
+        """
+        Find the construction for a surface via the index.
+        
+        A construction for the building type or for 'All' building types in the
+        climate category wins (first loaded on ties); otherwise the first
+        construction for the surface type in any climate.
+        """
+        if surface_type not in self._surface_fallback:
+            self._index_surface_type(surface_type)
+        matches = [
+            self._construction_index.get((surface_type, bt, cz_category))
+            for bt in (building_type, 'All')
+        ]
+        matches = [match for match in matches if match is not None]
+        if matches:
+            return min(matches)[1]
+        return self._surface_fallback[surface_type]
+    
+    @staticmethod
+    def code_era(year_built: Optional[int]) -> str:
+        """Energy code era construction selection depends on: 'current' (2010+, or unknown) or 'legacy'."""
+        return 'current' if year_built is None or year_built >= 2010 else 'legacy'
+    
     def get_construction_assembly(self, building_type: str, climate_zone: str, 
                                 surface_type: str, year_built: Optional[int] = None,
                                 leed_level: Optional[str] = None) -> Construction:
@@ -530,30 +578,47 @@ class ProfessionalMaterialLibrary:
         if year_built is None:
             year_built = 2020
         
-        # Determine if building meets current code (post-2010)
-        code_era = 'current' if year_built >= 2010 else 'legacy'
-        
-        # Select construction based on parameters
-        construction_key = f"{surface_type}_{building_type}_{cz_category}_{code_era}"
-        
-        # Fallback to generic constructions if specific not found
-        fallback_key = f"{surface_type}_{cz_category}"
+        code_era = self.code_era(year_built)
         
-        # Try specific construction first, then fallback
-        for key in [construction_key, fallback_key]:
-            for construction_name, construction in self.constructions.items():
-                if (construction.climate_zone == cz_category and 
-                    construction.building_type in [building_type, 'All'] and
-                    surface_type.lower() in construction_name.lower()):
-                    return construction
-        
-        # Ultimate fallback - return first matching construction
-        for construction in self.constructions.values():
-            if surface_type.lower() in construction.name.lower():
-                return construction
+        surface_key = surface_type.lower()
+        key = (surface_key, building_type, cz_category, code_era, leed_level)
+        construction = self._selection_cache.get(key)
+        if construction is None:
+            construction_name = self._lookup_construction(surface_key, building_type, cz_category)
+            if construction_name is not None:
+                construction = self.constructions[construction_name]
+                self._selection_cache[key] = construction
+            else:
+                # If nothing found, return a basic construction (age and LEED-adjusted);
+                # basic windows depend on the exact year, so they are keyed on it
+                basic_key = (surface_key, year_built, leed_level)
+                construction = self._selection_cache.get(basic_key)
+                if construction is None:
+                    construction = self._get_basic_construction(surface_type, year_built, leed_level)
+                    self._selection_cache[basic_key] = construction
+        return construction
+    
+    def get_envelope_constructions(self, building_type: str, climate_zone: str,
+                                   year_built: Optional[int] = None,
+                                   leed_level: Optional[str] = None) -> Dict[str, Construction]:
+        """
+        Select the construction of every indexed surface type.
         
-              # If nothing found, return a basic construction (age and LEED-adjusted)
-        return self._get_basic_construction(surface_type, year_built, leed_level)
+        Args:
+            building_type: Building type
+            climate_zone: ASHRAE climate zone (e.g. '5A')
+            year_built: Year of construction
+            leed_level: Optional LEED certification level
+            
+        Returns:
+            {surface_type: Construction} for 'wall', 'roof', 'floor' and 'window'
+        """
+        return {
+            surface_type: self.get_construction_assembly(
+                building_type, climate_zone, surface_type, year_built, leed_level
+            )
+            for surface_type in self.SURFACE_TYPES
+        }
     
     def _get_basic_construction(self, surface_type: str, year_built: Optional[int] = None,
                                leed_level: Optional[str] = None) -> Construction:
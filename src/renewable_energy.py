@@ -1,11 +1,125 @@
 """
 Renewable Energy Systems Module
 Includes photovoltaic, solar thermal, and wind energy systems
+
+PV yield can be estimated before simulation from the site's EPW: hourly
+GHI / DNI / DHI are transposed to the plane of array (Hay-Davies sky
+diffuse) for any number of tilt / azimuth candidates at once with NumPy.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass
+from pathlib import Path
 import math
+import os
+
+import numpy as np
+
+from .utils.common import resolve_weather_file_path
+
+# Typical plane-of-array irradiation used when no weather file is available (kWh/m²/year)
+TYPICAL_ANNUAL_IRRADIANCE = 1800.0
+
+# Inverter + wiring / soiling / mismatch losses
+PV_SYSTEM_EFFICIENCY = 0.85
+
+# Module temperature model: NOCT (°C) and power temperature coefficient (1/°C)
+PV_NOCT = 45.0
+PV_TEMPERATURE_COEFFICIENT = -0.004
+
+# Ground reflectance used when the EPW does not report albedo
+DEFAULT_ALBEDO = 0.2
+
+# Orientation candidates evaluated per batch (bounds memory to ~batch × 8760 floats)
+PV_SCREENING_BATCH = 256
+
+_CUMULATIVE_DAYS = np.cumsum([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30])
+
+
+@dataclass
+class EPWSolarData:
+    """Hourly solar and temperature data of an EPW weather file"""
+    latitude: float
+    longitude: float
+    time_zone: float
+    month: np.ndarray  # 1-12
+    day: np.ndarray
+    hour: np.ndarray  # 1-24, hour ending
+    dry_bulb: np.ndarray  # °C
+    ghi: np.ndarray  # Global horizontal irradiance (W/m²)
+    dni: np.ndarray  # Direct normal irradiance (W/m²)
+    dhi: np.ndarray  # Diffuse horizontal irradiance (W/m²)
+    extraterrestrial_dni: np.ndarray  # W/m²
+    albedo: np.ndarray
+
+    def sun_vectors(self) -> np.ndarray:
+        """
+        Unit vectors towards the sun at the middle of each hour.
+
+        Returns:
+            (3, hours) array of (east, north, up) components
+        """
+        day_of_year = _CUMULATIVE_DAYS[self.month - 1] + self.day
+        b = 2.0 * np.pi * (day_of_year - 1) / 365.0
+        declination = (0.006918 - 0.399912 * np.cos(b) + 0.070257 * np.sin(b)
+                       - 0.006758 * np.cos(2 * b) + 0.000907 * np.sin(2 * b)
+                       - 0.002697 * np.cos(3 * b) + 0.00148 * np.sin(3 * b))
+        equation_of_time = 229.18 * (0.000075 + 0.001868 * np.cos(b) - 0.032077 * np.sin(b)
+                                     - 0.014615 * np.cos(2 * b) - 0.04089 * np.sin(2 * b))
+        solar_time = self.hour - 0.5 + (4.0 * (self.longitude - 15.0 * self.time_zone) + equation_of_time) / 60.0
+        hour_angle = np.radians(15.0 * (solar_time - 12.0))
+        latitude = math.radians(self.latitude)
+        return np.vstack([
+            -np.cos(declination) * np.sin(hour_angle),
+            math.cos(latitude) * np.sin(declination) - math.sin(latitude) * np.cos(declination) * np.cos(hour_angle),
+            math.sin(latitude) * np.sin(declination) + math.cos(latitude) * np.cos(declination) * np.cos(hour_angle),
+        ])
+
+
+# EPW parse cache keyed by (path, modification time)
+_EPW_CACHE: Dict[Tuple[str, int], EPWSolarData] = {}
+
+
+def read_epw_solar(epw_path: Union[str, Path]) -> EPWSolarData:
+    """
+    Read the location header and hourly solar columns of an EPW file (cached).
+
+    Args:
+        epw_path: Path to the .epw file
+
+    Returns:
+        EPWSolarData
+    """
+    path = str(Path(epw_path).resolve())
+    key = (path, os.stat(path).st_mtime_ns)
+    if key in _EPW_CACHE:
+        return _EPW_CACHE[key]
+
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        location = f.readline().split(',')
+    # month, day, hour, dry bulb, ETR normal, GHI, DNI, DHI, albedo
+    columns = np.genfromtxt(path, delimiter=',', skip_header=8, usecols=(1, 2, 3, 6, 11, 13, 14, 15, 32),
+                            invalid_raise=False, filling_values=np.nan)
+    columns = np.atleast_2d(columns)
+    albedo = columns[:, 8]
+    albedo = np.where((albedo > 0) & (albedo < 1), albedo, DEFAULT_ALBEDO)
+
+    data = EPWSolarData(
+        latitude=float(location[6]),
+        longitude=float(location[7]),
+        time_zone=float(location[8]),
+        month=columns[:, 0].astype(int),
+        day=columns[:, 1].astype(int),
+        hour=columns[:, 2].astype(int),
+        dry_bulb=columns[:, 3],
+        extraterrestrial_dni=np.nan_to_num(columns[:, 4]),
+        ghi=np.clip(np.nan_to_num(columns[:, 5]), 0.0, None),
+        dni=np.clip(np.nan_to_num(columns[:, 6]), 0.0, None),
+        dhi=np.clip(np.nan_to_num(columns[:, 7]), 0.0, None),
+        albedo=albedo,
+    )
+    _EPW_CACHE[key] = data
+    return data
 
 
 @dataclass
@@ -290,18 +404,159 @@ ElectricLoadCenter:Distribution,
         
         return schedule
     
-    def calculate_pv_output(self, system_capacity_kw: float, location: Dict) -> Dict:
-        """Calculate expected PV system output"""
-        # Simplified calculation - would use actual irradiance data in practice
-        annual_irradiance = 1800  # kWh/m²/year (typical)
-        system_efficiency = 0.85  # Inverter + system losses
-        
-        annual_output_kwh = system_capacity_kw * (annual_irradiance / 1000) * system_efficiency
+    def plane_of_array_irradiance(
+        self,
+        weather: Union[str, Path, EPWSolarData],
+        tilts: Sequence[float],
+        azimuths: Sequence[float]
+    ) -> np.ndarray:
+        """
+        Hourly plane-of-array irradiance for a set of orientations.
+
+        Beam on the plane, Hay-Davies sky diffuse (circumsolar share from the
+        anisotropy index DNI / extraterrestrial DNI) and isotropic ground
+        reflection.
+
+        Args:
+            weather: EPW path or parsed EPWSolarData
+            tilts: Surface tilts from horizontal (degrees)
+            azimuths: Surface azimuths clockwise from north (degrees, 180 = south)
+
+        Returns:
+            (orientations, hours) array in W/m²
+        """
+        weather = weather if isinstance(weather, EPWSolarData) else read_epw_solar(weather)
+        tilt = np.radians(np.asarray(tilts, dtype=float).ravel())
+        azimuth = np.radians(np.asarray(azimuths, dtype=float).ravel())
+        normals = np.column_stack([np.sin(tilt) * np.sin(azimuth), np.sin(tilt) * np.cos(azimuth), np.cos(tilt)])
+
+        sun = weather.sun_vectors()
+        cos_zenith = sun[2]
+        daylight = cos_zenith > 0
+        cos_incidence = np.clip(normals @ sun, 0.0, None) * daylight
+        anisotropy = np.divide(weather.dni, weather.extraterrestrial_dni,
+                               out=np.zeros_like(weather.dni), where=weather.extraterrestrial_dni > 0)
+        anisotropy = np.clip(anisotropy, 0.0, 1.0)
+        # Ratio of beam on the plane to beam on the horizontal (limited near sunrise / sunset)
+        beam_ratio = cos_incidence / np.maximum(cos_zenith, 0.087)
+
+        cos_tilt = np.cos(tilt)[:, None]
+        beam = weather.dni * cos_incidence
+        sky = weather.dhi * (anisotropy * beam_ratio + (1.0 - anisotropy) * (1.0 + cos_tilt) / 2.0)
+        ground = weather.ghi * weather.albedo * (1.0 - cos_tilt) / 2.0
+        return beam + sky + ground
+
+    def _pv_hourly(self, weather: EPWSolarData, tilts: np.ndarray,
+                   azimuths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hourly plane-of-array irradiance (W/m²) and AC output (kW per kW DC)
+        for a set of orientations, with an NOCT cell temperature derate.
+        """
+        poa = self.plane_of_array_irradiance(weather, tilts, azimuths)
+        cell_temperature = weather.dry_bulb + poa * (PV_NOCT - 20.0) / 800.0
+        dc = poa / 1000.0 * (1.0 + PV_TEMPERATURE_COEFFICIENT * (cell_temperature - 25.0))
+        return poa, np.clip(dc, 0.0, None) * PV_SYSTEM_EFFICIENCY
+
+    def screen_pv_options(
+        self,
+        weather: Union[str, Path, EPWSolarData],
+        tilts: Union[float, Sequence[float]],
+        azimuths: Union[float, Sequence[float]],
+        capacities_kw: Union[float, Sequence[float]] = 1.0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Annual PV yield of many tilt / azimuth / capacity candidates at once.
+
+        The inputs are broadcast against each other. Each distinct orientation
+        is evaluated once over all hours; output scales linearly with capacity.
+
+        Args:
+            weather: EPW path or parsed EPWSolarData
+            tilts: Tilts from horizontal (degrees)
+            azimuths: Azimuths clockwise from north (degrees)
+            capacities_kw: DC capacities (kW)
+
+        Returns:
+            Dictionary of arrays with the broadcast shape: 'annual_output_kwh',
+            'specific_yield_kwh_per_kw', 'annual_irradiance_kwh_m2' (plane of
+            array) and 'capacity_factor' (%)
+        """
+        weather = weather if isinstance(weather, EPWSolarData) else read_epw_solar(weather)
+        tilts, azimuths, capacities = np.broadcast_arrays(
+            np.asarray(tilts, dtype=float), np.asarray(azimuths, dtype=float), np.asarray(capacities_kw, dtype=float)
+        )
+        orientations, inverse = np.unique(np.column_stack([tilts.ravel(), azimuths.ravel()]),
+                                          axis=0, return_inverse=True)
+
+        specific_yield = np.empty(len(orientations))
+        irradiance = np.empty(len(orientations))
+        for start in range(0, len(orientations), PV_SCREENING_BATCH):
+            batch = orientations[start:start + PV_SCREENING_BATCH]
+            poa, ac = self._pv_hourly(weather, batch[:, 0], batch[:, 1])
+            specific_yield[start:start + len(batch)] = ac.sum(axis=1)
+            irradiance[start:start + len(batch)] = poa.sum(axis=1) / 1000.0
+
+        shape = tilts.shape
+        per_kw = specific_yield[inverse.ravel()].reshape(shape)
+        hours = len(weather.ghi)
+        return {
+            'annual_output_kwh': per_kw * capacities,
+            'specific_yield_kwh_per_kw': per_kw,
+            'annual_irradiance_kwh_m2': irradiance[inverse.ravel()].reshape(shape),
+            'capacity_factor': per_kw / hours * 100.0,
+        }
+
+    def calculate_pv_output(
+        self,
+        system_capacity_kw: float,
+        location: Dict,
+        tilt: Optional[float] = None,
+        azimuth: Optional[float] = None
+    ) -> Dict:
+        """
+        Calculate expected PV system output.
+
+        Uses the hourly irradiance of the location's EPW ('weather_file_path'
+        or 'weather_file') when it can be found; otherwise a typical annual
+        irradiation.
+
+        Args:
+            system_capacity_kw: DC capacity (kW)
+            location: Location data
+            tilt: Array tilt (degrees; default: rooftop template)
+            azimuth: Array azimuth (degrees clockwise from north; default: rooftop template)
+
+        Returns:
+            Dictionary with capacity, annual and monthly output, capacity factor
+            and the irradiance source ('epw' or 'typical')
+        """
+        template = self.system_templates['pv_rooftop']
+        tilt = template['surface_tilt'] if tilt is None else tilt
+        azimuth = template['surface_azimuth'] if azimuth is None else azimuth
+
+        epw_path = resolve_weather_file_path(location.get('weather_file_path') or location.get('weather_file'))
+        if epw_path:
+            try:
+                weather = read_epw_solar(epw_path)
+                hourly = self._pv_hourly(weather, np.array([tilt]), np.array([azimuth]))[1][0] * system_capacity_kw
+            except (OSError, ValueError, IndexError) as e:
+                print(f"⚠️  Could not read weather file for PV estimate: {e}")
+            else:
+                annual_output_kwh = float(hourly.sum())
+                monthly = np.bincount(weather.month - 1, weights=hourly, minlength=12)
+                return {
+                    'system_capacity_kw': system_capacity_kw,
+                    'annual_output_kwh': annual_output_kwh,
+                    'monthly_output_kwh': monthly[:12].tolist(),
+                    'capacity_factor': (annual_output_kwh / (system_capacity_kw * len(hourly))) * 100 if system_capacity_kw else 0.0,
+                    'irradiance_source': 'epw',
+                }
+
+        annual_output_kwh = system_capacity_kw * (TYPICAL_ANNUAL_IRRADIANCE / 1000) * PV_SYSTEM_EFFICIENCY
         
         return {
             'system_capacity_kw': system_capacity_kw,
             'annual_output_kwh': annual_output_kwh,
-            'capacity_factor': (annual_output_kwh / (system_capacity_kw * 8760)) * 100
+            'capacity_factor': (annual_output_kwh / (system_capacity_kw * 8760)) * 100,
+            'irradiance_source': 'typical',
         }
-
-
@@ -0,0 +1,372 @@
+"""
+Representative-period simulation (experimental).
+
+The accuracy and error bounds have only been checked against synthetic
+weather and energy signatures; scripts/benchmark_representative_periods.py
+compares them with full-year EnergyPlus runs. Treat the mode as
+experimental, and the speed-up and bounds as unverified, until its results
+are attached.
+
+A full-year run simulates 365 days; retrofit screening and calibration loops
+mostly need annual totals. The year's 52 weeks are clustered by their hourly
+weather (daily temperature and solar statistics) within each season, one
+actual week per cluster is simulated as its own RunPeriod, and every week of
+the year takes the energy of its cluster's representative. Error bounds come
+from a degree-hour energy signature fitted to the simulated weeks: how much
+the other weeks' weather differs from their representative's, plus the
+signature's residual scatter.
+
+Seven-day periods always contain five weekdays and a weekend, so schedules
+are sampled in their true proportions whatever day a period starts on.
+"""
+
+import math
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .renewable_energy import read_epw_solar
+from .utils.sql_results import ELECTRICITY_METER, GAS_METER, read_environment_totals
+
+# Weeks simulated per season; 2 × 4 seasons = 8 of 52 weeks
+DEFAULT_WEEKS_PER_SEASON = 2
+
+# Calendar seasons by month (northern-hemisphere names)
+SEASONS = {
+    'winter': (12, 1, 2),
+    'spring': (3, 4, 5),
+    'summer': (6, 7, 8),
+    'fall': (9, 10, 11),
+}
+
+# Balance temperature of the degree-hour energy signature (°C)
+SIGNATURE_BASE_TEMPERATURE = 18.0
+
+# Two-sided 95% normal quantile for the error bounds
+BOUND_Z = 1.96
+
+# End-use meters reported per run period in representative mode
+END_USE_METERS = (
+    'InteriorLights:Electricity',
+    'InteriorEquipment:Electricity',
+    'Fans:Electricity',
+    'Pumps:Electricity',
+    'Cooling:Electricity',
+    'Heating:Electricity',
+    'Heating:NaturalGas',
+)
+
+WEEKS_PER_YEAR = 52
+HOURS_PER_WEEK = 168
+DAYS_PER_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_MONTH_OF_DAY = np.repeat(np.arange(1, 13), DAYS_PER_MONTH)  # Index: day of year - 1
+_CLUSTER_ITERATIONS = 100
+
+
+@dataclass
+class RepresentativePeriod:
+    """One simulated week and the weeks of the year it stands for"""
+    name: str
+    week_index: int  # 0-51; days 7 * week_index + 1 .. + 7 of the year
+    season: str
+    weeks: List[int] = field(default_factory=list)
+
+    @property
+    def weight(self) -> int:
+        """Number of weeks represented."""
+        return len(self.weeks)
+
+    @property
+    def start_day_of_year(self) -> int:
+        return 7 * self.week_index + 1
+
+    def month_day(self, day_of_year: int) -> Tuple[int, int]:
+        month = int(_MONTH_OF_DAY[day_of_year - 1])
+        return month, day_of_year - sum(DAYS_PER_MONTH[:month - 1])
+
+    @property
+    def begin(self) -> Tuple[int, int]:
+        """(month, day) of the first day."""
+        return self.month_day(self.start_day_of_year)
+
+    @property
+    def end(self) -> Tuple[int, int]:
+        """(month, day) of the last day."""
+        return self.month_day(self.start_day_of_year + 6)
+
+
+@dataclass
+class PeriodSelection:
+    """Representative weeks of a weather file"""
+    epw_path: str
+    periods: List[RepresentativePeriod]
+    week_period: np.ndarray  # (52,) index into periods for every week
+    heating_degree_hours: np.ndarray  # (52,) K·h below SIGNATURE_BASE_TEMPERATURE
+    cooling_degree_hours: np.ndarray  # (52,) K·h above SIGNATURE_BASE_TEMPERATURE
+
+    @property
+    def simulated_days(self) -> int:
+        return 7 * len(self.periods)
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable summary of the selection."""
+        return {
+            'epw_path': self.epw_path,
+            'simulated_days': self.simulated_days,
+            'periods': [{'name': p.name, 'season': p.season, 'begin': p.begin, 'end': p.end, 'weight': p.weight}
+                        for p in self.periods],
+        }
+
+
+def weekly_weather_features(dry_bulb: np.ndarray, ghi: np.ndarray) -> np.ndarray:
+    """
+    Standardized weather features of each week.
+
+    Daily mean / max / min dry bulb and daily global horizontal irradiation,
+    each sorted within the week (so the order of days does not matter) and
+    scaled by the feature's spread over the year.
+
+    Args:
+        dry_bulb: Hourly dry bulb temperatures (°C), at least 52 weeks
+        ghi: Hourly global horizontal irradiance (W/m²)
+
+    Returns:
+        (52, 28) feature array
+    """
+    hours = WEEKS_PER_YEAR * HOURS_PER_WEEK
+    temperature = np.asarray(dry_bulb[:hours], dtype=float).reshape(WEEKS_PER_YEAR, 7, 24)
+    solar = np.asarray(ghi[:hours], dtype=float).reshape(WEEKS_PER_YEAR, 7, 24)
+    groups = [temperature.mean(axis=2), temperature.max(axis=2), temperature.min(axis=2), solar.sum(axis=2) / 1000.0]
+    features = []
+    for daily in groups:
+        spread = daily.std() or 1.0
+        features.append(np.sort((daily - daily.mean()) / spread, axis=1))
+    return np.hstack(features)
+
+
+def _cluster(features: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Deterministic k-means with farthest-point initialization.
+
+    Returns:
+        (labels, medoids): cluster of each row, and the row closest to each cluster center
+    """
+    first = int(np.argmin(((features - features.mean(axis=0)) ** 2).sum(axis=1)))
+    centers = [features[first]]
+    while len(centers) < k:
+        distance = np.min([((features - c) ** 2).sum(axis=1) for c in centers], axis=0)
+        centers.append(features[int(np.argmax(distance))])
+    centers = np.array(centers)
+
+    labels = None
+    for _ in range(_CLUSTER_ITERATIONS):
+        distance = ((features[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        new_labels = distance.argmin(axis=1)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for cluster in range(k):
+            if np.any(labels == cluster):
+                centers[cluster] = features[labels == cluster].mean(axis=0)
+
+    medoids = np.empty(k, dtype=int)
+    for cluster in range(k):
+        members = np.flatnonzero(labels == cluster)
+        medoids[cluster] = members[np.argmin(((features[members] - centers[cluster]) ** 2).sum(axis=1))]
+    return labels, medoids
+
+
+def select_weeks(dry_bulb: np.ndarray, ghi: np.ndarray, weeks_per_season: int = DEFAULT_WEEKS_PER_SEASON,
+                 epw_path: str = '') -> PeriodSelection:
+    """
+    Pick representative weeks from hourly weather.
+
+    Args:
+        dry_bulb: Hourly dry bulb temperatures (°C) from January 1
+        ghi: Hourly global horizontal irradiance (W/m²)
+        weeks_per_season: Clusters (simulated weeks) per season
+        epw_path: Source weather file, for reference
+
+    Returns:
+        PeriodSelection with periods in calendar order
+    """
+    if len(dry_bulb) < WEEKS_PER_YEAR * HOURS_PER_WEEK or len(ghi) < WEEKS_PER_YEAR * HOURS_PER_WEEK:
+        raise ValueError("Representative weeks need a full year of hourly weather data")
+    features = weekly_weather_features(dry_bulb, ghi)
+    # Season of the middle day of each week
+    week_months = _MONTH_OF_DAY[7 * np.arange(WEEKS_PER_YEAR) + 3]
+
+    picked = []  # (week index, season, member weeks)
+    for season, months in SEASONS.items():
+        weeks = np.flatnonzero(np.isin(week_months, months))
+        labels, medoids = _cluster(features[weeks], max(1, min(weeks_per_season, len(weeks))))
+        for cluster, medoid in enumerate(medoids):
+            picked.append((int(weeks[medoid]), season, [int(w) for w in weeks[labels == cluster]]))
+    picked.sort()
+
+    periods = []
+    week_period = np.empty(WEEKS_PER_YEAR, dtype=int)
+    for index, (week, season, members) in enumerate(picked):
+        periods.append(RepresentativePeriod(name=f"Representative Week {index + 1}", week_index=week,
+                                            season=season, weeks=members))
+        week_period[members] = index
+
+    temperature = np.asarray(dry_bulb[:WEEKS_PER_YEAR * HOURS_PER_WEEK], dtype=float).reshape(WEEKS_PER_YEAR, -1)
+    return PeriodSelection(
+        epw_path=epw_path,
+        periods=periods,
+        week_period=week_period,
+        heating_degree_hours=np.clip(SIGNATURE_BASE_TEMPERATURE - temperature, 0.0, None).sum(axis=1),
+        cooling_degree_hours=np.clip(temperature - SIGNATURE_BASE_TEMPERATURE, 0.0, None).sum(axis=1),
+    )
+
+
+# Selections keyed by (path, modification time, weeks per season)
+_SELECTION_CACHE: Dict[Tuple[str, int, int], PeriodSelection] = {}
+
+
+def select_representative_weeks(epw_path: Union[str, Path],
+                                weeks_per_season: int = DEFAULT_WEEKS_PER_SEASON) -> PeriodSelection:
+    """
+    Representative weeks of an EPW file (cached).
+
+    Args:
+        epw_path: Path to the .epw file
+        weeks_per_season: Clusters (simulated weeks) per season
+
+    Returns:
+        PeriodSelection
+    """
+    path = str(Path(epw_path).resolve())
+    key = (path, os.stat(path).st_mtime_ns, int(weeks_per_season))
+    if key not in _SELECTION_CACHE:
+        weather = read_epw_solar(path)
+        _SELECTION_CACHE[key] = select_weeks(weather.dry_bulb, weather.ghi, weeks_per_season, epw_path=path)
+    return _SELECTION_CACHE[key]
+
+
+def extrapolate_annual(period_totals: Dict[str, Dict[str, float]], selection: PeriodSelection) -> Dict:
+    """
+    Weighted annual and monthly estimates from representative-week totals.
+
+    Every week of the year takes its representative's energy (December 31
+    takes the last week's daily average). The bound around each annual
+    estimate adds the shift a degree-hour signature fitted to the simulated
+    weeks predicts for the non-simulated weeks' weather, and BOUND_Z times
+    the signature's residual scatter for each non-simulated week. With fewer
+    simulated weeks than signature terms + 1 no bound is given.
+
+    Args:
+        period_totals: {run period name (any case): {meter: kWh}}
+        selection: The selection the run periods were generated from
+
+    Returns:
+        Dictionary with 'annual_kwh', 'monthly_kwh', 'monthly_measured' (False),
+        'gas_annual_kwh', 'monthly_gas_kwh', 'annual_kwh_bounds',
+        'end_uses' ({meter: {'annual_kwh', 'low_kwh', 'high_kwh'}}),
+        'simulated_days' and 'representative_periods'
+    """
+    totals = {name.upper(): values for name, values in period_totals.items()}
+    missing = [p.name for p in selection.periods if p.name.upper() not in totals]
+    if missing:
+        raise ValueError(f"No results for representative period(s): {', '.join(missing)}")
+
+    meters = sorted({meter for p in selection.periods for meter in totals[p.name.upper()]})
+    energy = np.array([[totals[p.name.upper()].get(m, 0.0) for m in meters] for p in selection.periods]).reshape(-1, len(meters))
+    week_energy = energy[selection.week_period]  # (52, meters)
+
+    daily = np.repeat(week_energy / 7.0, 7, axis=0)
+    daily = np.vstack([daily, daily[-1:]])  # December 31
+    monthly = np.zeros((12, len(meters)))
+    np.add.at(monthly, _MONTH_OF_DAY - 1, daily)
+    annual = monthly.sum(axis=0)
+
+    half_width = _signature_bounds(energy, week_energy, selection)
+    end_uses = {}
+    for column, meter in enumerate(meters):
+        end_uses[meter] = {
+            'annual_kwh': float(annual[column]),
+            'low_kwh': float(annual[column] - half_width[column]) if half_width is not None else None,
+            'high_kwh': float(annual[column] + half_width[column]) if half_width is not None else None,
+        }
+
+    def series(meter):
+        return monthly[:, meters.index(meter)].tolist() if meter in meters else []
+
+    electricity = end_uses.get(ELECTRICITY_METER, {'annual_kwh': 0.0, 'low_kwh': None, 'high_kwh': None})
+    return {
+        'annual_kwh': electricity['annual_kwh'],
+        'monthly_kwh': series(ELECTRICITY_METER) or [0.0] * 12,
+        'monthly_measured': False,
+        'gas_annual_kwh': end_uses.get(GAS_METER, {}).get('annual_kwh', 0.0),
+        'monthly_gas_kwh': series(GAS_METER),
+        'annual_kwh_bounds': (electricity['low_kwh'], electricity['high_kwh']),
+        'end_uses': end_uses,
+        'simulated_days': selection.simulated_days,
+        'representative_periods': len(selection.periods),
+    }
+
+
+def _signature_bounds(energy: np.ndarray, week_energy: np.ndarray,
+                      selection: PeriodSelection) -> Optional[np.ndarray]:
+    """Half-width of the annual error bound per meter (None with too few periods)."""
+    signature = np.column_stack([np.ones(WEEKS_PER_YEAR), selection.heating_degree_hours,
+                                 selection.cooling_degree_hours])
+    simulated = signature[[p.week_index for p in selection.periods]]
+    rank = np.linalg.matrix_rank(simulated)
+    dof = len(selection.periods) - rank
+    if dof <= 0:
+        return None
+
+    coefficients, _, _, _ = np.linalg.lstsq(simulated, energy, rcond=None)
+    residual = energy - simulated @ coefficients
+    scatter = np.sqrt((residual ** 2).sum(axis=0) / dof)
+    # Weather shift of each week relative to its representative, through the signature
+    shift = (signature - simulated[selection.week_period]) @ coefficients
+    shift = shift.sum(axis=0) + shift[-1] / 7.0  # December 31 as in the estimate
+    # December 31 is a seventh of a week: its variance scales by (1/7)²
+    unsimulated = WEEKS_PER_YEAR - len(selection.periods)
+    return np.abs(shift) + BOUND_Z * scatter * math.sqrt(unsimulated + (1 / 7.0) ** 2)
+
+
+def selection_for_run_periods(epw_path: Union[str, Path],
+                              run_period_names: List[str]) -> Optional[PeriodSelection]:
+    """
+    The selection a representative-week run was generated from.
+
+    Selections are deterministic per weather file and cluster count, so the
+    run's weather file and run period names are enough to recover it.
+
+    Args:
+        epw_path: Weather file the run was simulated with
+        run_period_names: Weather run period names of the run (see read_run_period_names)
+
+    Returns:
+        PeriodSelection, or None if the run periods are not this file's representative weeks
+    """
+    names = sorted(name.upper() for name in run_period_names)
+    if not names or len(names) % len(SEASONS) or not all(n.startswith('REPRESENTATIVE WEEK ') for n in names):
+        return None
+    try:
+        selection = select_representative_weeks(epw_path, len(names) // len(SEASONS))
+    except (OSError, ValueError):
+        return None
+    return selection if sorted(p.name.upper() for p in selection.periods) == names else None
+
+
+def extract_representative_results(sqlite_file: Union[str, Path], selection: PeriodSelection) -> Dict:
+    """
+    Annual estimates from the SQLite output of a representative-period run.
+
+    Args:
+        sqlite_file: Path to eplusout.sql
+        selection: The selection the run periods were generated from
+
+    Returns:
+        See extrapolate_annual
+    """
+    totals = read_environment_totals(sqlite_file, (ELECTRICITY_METER, GAS_METER) + END_USE_METERS)
+    return extrapolate_annual(totals, selection)
@@ -15,7 +15,7 @@ Reference:
 - LBNL Retrofit Database
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 import copy
@@ -25,6 +25,16 @@ import re
 import os
 from pathlib import Path
 
+import numpy as np
+
+from .economic_analyzer import EconomicAnalyzer, EconomicParameters, replacement_schedule
+from .utils.common import resolve_worker_count
+from .utils.sql_results import extract_energy_results
+from .parametric_edits import ParametricEdit, ParametricModel, compose_deltas
+
+# Rough peak memory of one EnergyPlus run, used to cap concurrent simulations
+SIMULATION_MEMORY_MB = 512.0
+
 
 class RetrofitMeasureType(Enum):
     """Types of retrofit measures"""
@@ -45,6 +55,63 @@ class RetrofitMeasureType(Enum):
     DEMAND_RESPONSE = "demand_response"
 
 
+# Parametric edits per measure (see src/parametric_edits.py for field names)
+MEASURE_EDITS: Dict[RetrofitMeasureType, Tuple[ParametricEdit, ...]] = {
+    RetrofitMeasureType.LIGHTING_LED: (
+        ParametricEdit('Lights.power', scale=0.6),  # 40% LPD reduction
+    ),
+    RetrofitMeasureType.LIGHTING_CONTROLS: (
+        ParametricEdit('Lights.power', scale=0.85),  # 15% reduction from occupancy sensors
+    ),
+    RetrofitMeasureType.LIGHTING_DAYLIGHTING: (
+        ParametricEdit('Lights.power', scale=0.80),  # 20% reduction from daylight dimming
+    ),
+    RetrofitMeasureType.HVAC_EFFICIENCY: (
+        ParametricEdit('cooling_cop', scale=1.25),
+        ParametricEdit('Coil:Heating:Fuel.burner_efficiency', scale=1.25, maximum=1.0),
+        ParametricEdit('Coil:Heating:Gas.burner_efficiency', scale=1.25, maximum=1.0),
+    ),
+    RetrofitMeasureType.HVAC_VFD: (
+        ParametricEdit('Fan:VariableVolume.fan_power_coefficients', scale=0.7),
+    ),
+    RetrofitMeasureType.ENVELOPE_INSULATION: (
+        ParametricEdit('Material:NoMass.thermal_resistance', scale=1.5),
+    ),
+    RetrofitMeasureType.ENVELOPE_WINDOWS: (
+        ParametricEdit('WindowMaterial:SimpleGlazingSystem.u_factor', scale=0.7),
+    ),
+    RetrofitMeasureType.ENVELOPE_AIR_SEALING: (
+        ParametricEdit('ZoneInfiltration:DesignFlowRate.flow', scale=0.8),
+    ),
+    RetrofitMeasureType.BAS_AUTOMATION: (
+        ParametricEdit('Lights.power', scale=0.92),  # 8% reduction from better control
+    ),
+    # HVAC_ECONOMIZER: economizer already present in generated IDFs
+    # RENEWABLE_PV: handled in post-processing (reduces grid electricity)
+}
+
+
+def measure_field_overrides(
+    model: ParametricModel,
+    measure_types: List[RetrofitMeasureType]
+) -> Dict[Tuple[int, int], str]:
+    """
+    Compute field overrides that apply retrofit measures to a parsed IDF.
+    
+    Each measure's delta is resolved once per baseline and cached on the
+    model; measures touching the same field compound in order, matching
+    sequential application.
+    
+    Returns:
+        Overrides for IDFDocument.render, keyed by (object index, field index)
+    """
+    return model.overrides(compose_deltas(*(
+        model.delta(MEASURE_EDITS[measure_type])
+        for measure_type in measure_types
+        if measure_type in MEASURE_EDITS
+    )))
+
+
 @dataclass
 class RetrofitMeasure:
     """Definition of a retrofit measure"""
@@ -92,33 +159,70 @@ class RetrofitScenario:
     roi: Optional[float] = None  # Return on investment (%)
     payback_years: Optional[float] = None
     npv: Optional[float] = None  # Net present value (20-year)
+    irr: Optional[float] = None  # Internal rate of return
+    sir: Optional[float] = None  # Savings to investment ratio
     description: str = ""
     
     def calculate_economics(self, utility_rates: UtilityRates, discount_rate: float = 0.05):
         """Calculate economic metrics"""
-        if not self.energy_savings_kwh:
-            return
-        
-        # Annual cost savings
-        self.annual_savings = utility_rates.calculate_annual_cost(self.energy_savings_kwh)
-        
-        # Simple payback
-        if self.annual_savings > 0:
-            self.payback_years = self.implementation_cost / self.annual_savings
-        
-        # ROI (simple, annual)
-        if self.implementation_cost > 0:
-            self.roi = (self.annual_savings / self.implementation_cost) * 100.0
-        
-        # NPV (20-year)
-        npv_sum = 0.0
-        for year in range(1, 21):
-            # Account for utility rate escalation
-            year_savings = self.annual_savings * ((1 + utility_rates.escalation_rate) ** year)
-            discounted = year_savings / ((1 + discount_rate) ** year)
-            npv_sum += discounted
-        
-        self.npv = npv_sum - self.implementation_cost
+        calculate_scenario_economics([self], utility_rates, discount_rate)
+
+
+def calculate_scenario_economics(
+    scenarios: List[RetrofitScenario],
+    utility_rates: UtilityRates,
+    discount_rate: float = 0.05,
+    analysis_years: int = 20
+) -> None:
+    """
+    Calculate economic metrics for many scenarios in one vectorized pass.
+    
+    Savings escalate with the utility rate from year 1. Measures are replaced
+    at the end of their lifetime within the analysis period, at their share of
+    the scenario's implementation cost, and annual maintenance is deducted.
+    Scenarios without energy savings are left unchanged.
+    """
+    scenarios = [s for s in scenarios if s.energy_savings_kwh]
+    if not scenarios:
+        return
+    
+    annual_savings = np.array([utility_rates.calculate_annual_cost(s.energy_savings_kwh) for s in scenarios])
+    implementation = np.array([s.implementation_cost for s in scenarios], dtype=float)
+    maintenance = np.array([sum(m.maintenance_cost_annual for m in s.measures) for s in scenarios])
+    
+    width = max(len(s.measures) for s in scenarios)
+    component_costs = np.zeros((len(scenarios), width))
+    lifetimes = np.zeros((len(scenarios), width))
+    for i, scenario in enumerate(scenarios):
+        weights = np.array([m.cost_per_sf for m in scenario.measures], dtype=float)
+        weights = weights / weights.sum() if weights.sum() > 0 else np.full(len(weights), 1.0 / len(weights))
+        component_costs[i, :len(weights)] = weights * scenario.implementation_cost
+        lifetimes[i, :len(weights)] = [m.lifetime_years for m in scenario.measures]
+    
+    analyzer = EconomicAnalyzer(EconomicParameters(
+        discount_rate=discount_rate,
+        utility_escalation_rate=utility_rates.escalation_rate,
+        analysis_period_years=analysis_years
+    ))
+    result = analyzer.analyze_batch(
+        implementation,
+        annual_savings,
+        annual_costs=maintenance,
+        replacement_costs=replacement_schedule(component_costs, lifetimes, analysis_years),
+        first_year_escalated=True
+    )
+    
+    for i, scenario in enumerate(scenarios):
+        scenario.annual_savings = float(annual_savings[i])
+        if annual_savings[i] > 0:
+            # Simple payback
+            scenario.payback_years = float(implementation[i] / annual_savings[i])
+        if implementation[i] > 0:
+            # ROI (simple, annual)
+            scenario.roi = float(result.roi[i])
+        scenario.npv = float(result.npv[i])
+        scenario.irr = None if np.isnan(result.irr[i]) else float(result.irr[i])
+        scenario.sir = float(result.sir[i])
 
 
 class RetrofitOptimizer:
@@ -364,8 +468,7 @@ class RetrofitOptimizer:
             Ranked list of scenarios
         """
         # Calculate economics for all scenarios
-        for scenario in scenarios:
-            scenario.calculate_economics(utility_rates)
+        calculate_scenario_economics(scenarios, utility_rates)
         
         # Filter by constraints
         filtered = scenarios
@@ -391,17 +494,24 @@ class RetrofitOptimizer:
         baseline_idf_path: str,
         weather_file: str,
         output_dir: Optional[str] = None,
-        max_concurrent: int = 4
+        max_concurrent: int = 4,
+        progress_callback: Optional[Callable[[int, int, RetrofitScenario], None]] = None
     ) -> List[RetrofitScenario]:
         """
         Run EnergyPlus simulations for all retrofit scenarios.
         
+        The baseline IDF is parsed once. Each worker process receives the parsed
+        baseline when it starts, applies a scenario's measures as field edits,
+        writes the scenario IDF and simulates it, so IDF preparation overlaps
+        with running simulations. Results are applied as they complete.
+        
         Args:
             scenarios: List of retrofit scenarios to simulate
             baseline_idf_path: Path to baseline IDF file
             weather_file: Path to weather file (.epw)
             output_dir: Directory for simulation outputs
-            max_concurrent: Maximum concurrent simulations (for parallel processing)
+            max_concurrent: Maximum concurrent simulations (capped by available cores and memory)
+            progress_callback: Optional callable(completed, total, scenario) invoked as each scenario finishes
             
         Returns:
             List of scenarios with simulated_energy_kwh populated
@@ -421,237 +531,152 @@ class RetrofitOptimizer:
         
         print(f"\n🔄 Running simulations for {len(scenarios)} retrofit scenarios...")
         
-        # Run baseline simulation first
-        baseline_results = self._run_simulation(baseline_idf_path, weather_file, output_dir / "baseline")
-        baseline_annual = baseline_results.get('annual_kwh', 0.0)
+        baseline_model = ParametricModel.from_file(baseline_idf_path)
         
-        if baseline_annual == 0:
-            print("⚠️  Baseline simulation failed. Using estimated savings.")
-            return scenarios
+        # Job 0 is the baseline; scenario jobs are numbered from 1
+        jobs = [(0, None, str(baseline_idf_path), str(weather_file), str(output_dir / "baseline"))]
+        for i, scenario in enumerate(scenarios, 1):
+            jobs.append((
+                i,
+                [m.measure_type for m in scenario.measures],
+                str(output_dir / f"scenario_{i}.idf"),
+                str(weather_file),
+                str(output_dir / f"scenario_{i}_output")
+            ))
         
-        # Run scenarios in parallel if max_concurrent > 1
-        if max_concurrent > 1 and len(scenarios) > 1:
-            from concurrent.futures import ThreadPoolExecutor, as_completed
-            
-            with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
-                futures = {}
-                
-                for i, scenario in enumerate(scenarios, 1):
-                    # Create modified IDF for this scenario
-                    scenario_idf = self._apply_retrofit_measures(
-                        baseline_idf_path,
-                        scenario.measures,
-                        output_dir / f"scenario_{i}.idf"
-                    )
-                    
-                    # Validate IDF before simulation
-                    if not self._validate_modified_idf(scenario_idf):
-                        print(f"  ⚠️  Scenario {i} IDF validation failed, skipping simulation")
+        workers = resolve_worker_count(max_concurrent, SIMULATION_MEMORY_MB) if len(scenarios) > 1 else 1
+        
+        baseline_annual = None
+        waiting = []  # Scenario results that finished before the baseline
+        completed = 0
+        total = len(scenarios)
+        
+        results_stream = self._iter_simulation_results(baseline_model, jobs, workers)
+        try:
+            for i, results in results_stream:
+                if i == 0:
+                    baseline_annual = results.get('annual_kwh', 0.0)
+                    if baseline_annual == 0:
+                        print("⚠️  Baseline simulation failed. Using estimated savings.")
+                        return scenarios
+                    ready, waiting = waiting, []
+                else:
+                    ready = [(i, results)]
+                    if baseline_annual is None:
+                        waiting.extend(ready)
                         continue
-                    
-                    # Submit simulation task
-                    future = executor.submit(
-                        self._run_simulation,
-                        scenario_idf,
-                        weather_file,
-                        output_dir / f"scenario_{i}_output"
-                    )
-                    futures[future] = (i, scenario)
-                
-                # Process results as they complete
-                for future in as_completed(futures):
-                    i, scenario = futures[future]
-                    try:
-                        results = future.result()
-                        scenario.simulated_energy_kwh = results.get('annual_kwh', 0.0)
-                        if scenario.simulated_energy_kwh > 0:
-                            scenario.energy_savings_kwh = baseline_annual - scenario.simulated_energy_kwh
-                            scenario.energy_savings_percent = (scenario.energy_savings_kwh / baseline_annual * 100) if baseline_annual > 0 else 0.0
-                            print(f"  [{i}/{len(scenarios)}] ✓ {scenario.description[:40]}... Savings: {scenario.energy_savings_kwh:,.0f} kWh ({scenario.energy_savings_percent:.1f}%)")
-                        else:
-                            print(f"  [{i}/{len(scenarios)}] ⚠️  {scenario.description[:40]}... Simulation failed, using estimated savings")
-                    except Exception as e:
-                        print(f"  [{i}/{len(scenarios)}] ❌ Error: {e}")
-        else:
-            # Sequential execution
-            for i, scenario in enumerate(scenarios, 1):
-                print(f"  [{i}/{len(scenarios)}] Simulating: {scenario.description[:50]}...")
-                
-                # Create modified IDF for this scenario
-                scenario_idf = self._apply_retrofit_measures(
-                    baseline_idf_path,
-                    scenario.measures,
-                    output_dir / f"scenario_{i}.idf"
-                )
-                
-                # Validate IDF before simulation
-                if not self._validate_modified_idf(scenario_idf):
-                    print(f"    ⚠️  IDF validation failed, skipping simulation")
-                    continue
-                
-                # Run simulation
-                results = self._run_simulation(scenario_idf, weather_file, output_dir / f"scenario_{i}_output")
                 
-                scenario.simulated_energy_kwh = results.get('annual_kwh', 0.0)
-                if scenario.simulated_energy_kwh > 0:
-                    scenario.energy_savings_kwh = baseline_annual - scenario.simulated_energy_kwh
-                    scenario.energy_savings_percent = (scenario.energy_savings_kwh / baseline_annual * 100) if baseline_annual > 0 else 0.0
-                    print(f"    ✓ Savings: {scenario.energy_savings_kwh:,.0f} kWh ({scenario.energy_savings_percent:.1f}%)")
-                else:
-                    print(f"    ⚠️  Simulation failed, using estimated savings")
+                for index, scenario_results in ready:
+                    scenario = scenarios[index - 1]
+                    self._record_simulation_result(index, total, scenario, scenario_results, baseline_annual)
+                    completed += 1
+                    if progress_callback:
+                        progress_callback(completed, total, scenario)
+        finally:
+            results_stream.close()
         
         return scenarios
     
+    def _iter_simulation_results(
+        self,
+        baseline_model: ParametricModel,
+        jobs: List[Tuple],
+        workers: int
+    ) -> Iterator[Tuple[int, Dict]]:
+        """
+        Yield (job index, results) pairs as simulation jobs complete.
+        
+        Uses a process pool when more than one worker is available; otherwise
+        runs the jobs in order in this process.
+        """
+        if workers <= 1:
+            for job in jobs:
+                yield self._simulate_job(baseline_model, *job)
+            return
+        
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_simulation_worker,
+            initargs=(baseline_model, self.energyplus_path)
+        )
+        futures = {executor.submit(_run_simulation_job, job): job[0] for job in jobs}
+        try:
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    print(f"  [{futures[future]}/{len(jobs) - 1}] ❌ Error: {e}")
+                    yield futures[future], {'annual_kwh': 0.0, 'monthly_kwh': [0.0] * 12}
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+    
+    def _simulate_job(
+        self,
+        baseline_model: ParametricModel,
+        index: int,
+        measure_types: Optional[List[RetrofitMeasureType]],
+        idf_path: str,
+        weather_file: str,
+        sim_output_dir: str
+    ) -> Tuple[int, Dict]:
+        """
+        Prepare and simulate one job.
+        
+        A job without measure types simulates ``idf_path`` as-is (the baseline);
+        otherwise the measures are applied to the parsed baseline and written to
+        ``idf_path`` first.
+        """
+        if measure_types is not None:
+            idf_content = baseline_model.doc.render(measure_field_overrides(baseline_model, measure_types))
+            if not self._validate_idf_content(idf_content):
+                print(f"  ⚠️  Scenario {index} IDF validation failed, skipping simulation")
+                return index, {'annual_kwh': 0.0, 'monthly_kwh': [0.0] * 12}
+            with open(idf_path, 'w', encoding='utf-8') as f:
+                f.write(idf_content)
+        
+        return index, self._run_simulation(idf_path, weather_file, Path(sim_output_dir))
+    
+    def _record_simulation_result(
+        self,
+        index: int,
+        total: int,
+        scenario: RetrofitScenario,
+        results: Dict,
+        baseline_annual: float
+    ) -> None:
+        """Apply a completed simulation to its scenario."""
+        scenario.simulated_energy_kwh = results.get('annual_kwh', 0.0)
+        if scenario.simulated_energy_kwh > 0:
+            scenario.energy_savings_kwh = baseline_annual - scenario.simulated_energy_kwh
+            scenario.energy_savings_percent = (scenario.energy_savings_kwh / baseline_annual * 100) if baseline_annual > 0 else 0.0
+            print(f"  [{index}/{total}] ✓ {scenario.description[:40]}... Savings: {scenario.energy_savings_kwh:,.0f} kWh ({scenario.energy_savings_percent:.1f}%)")
+        else:
+            print(f"  [{index}/{total}] ⚠️  {scenario.description[:40]}... Simulation failed, using estimated savings")
+    
     def _apply_retrofit_measures(
         self,
-        baseline_idf: str,
+        baseline_idf: Union[str, ParametricModel],
         measures: List[RetrofitMeasure],
         output_idf: Path
     ) -> str:
         """
-        Apply retrofit measures to IDF file with improved pattern matching.
+        Apply retrofit measures to an IDF as field edits and write the result.
+        
+        Args:
+            baseline_idf: Path to the baseline IDF, or an already parsed baseline
+            measures: Measures to apply
+            output_idf: Path for the modified IDF
         
         Returns:
             Path to modified IDF file
         """
-        with open(baseline_idf, 'r', encoding='utf-8') as f:
-            idf_content = f.read()
+        model = baseline_idf if isinstance(baseline_idf, ParametricModel) else ParametricModel.from_file(baseline_idf)
+        idf_content = model.doc.render(measure_field_overrides(model, [m.measure_type for m in measures]))
         
-        for measure in measures:
-            if measure.measure_type == RetrofitMeasureType.LIGHTING_LED:
-                # Reduce lighting power density by 40%
-                pattern = r'(Lights[^;]*Watts per Zone Floor Area[^,]*,\s*)([\d.E+-]+)'
-                def reduce_lighting(match):
-                    try:
-                        old_value = float(match.group(2))
-                        new_value = old_value * 0.6  # 40% reduction
-                        return match.group(1) + f"{new_value:.2f}"
-                    except ValueError:
-                        return match.group(0)
-                idf_content = re.sub(pattern, reduce_lighting, idf_content, flags=re.MULTILINE)
-            
-            elif measure.measure_type == RetrofitMeasureType.LIGHTING_CONTROLS:
-                # Add occupancy sensors - reduce lighting schedule values
-                # This is a simplified approach - full implementation would modify schedules
-                pattern = r'(Lights[^;]*Watts per Zone Floor Area[^,]*,\s*)([\d.E+-]+)'
-                def reduce_with_controls(match):
-                    try:
-                        old_value = float(match.group(2))
-                        new_value = old_value * 0.85  # 15% reduction from controls
-                        return match.group(1) + f"{new_value:.2f}"
-                    except ValueError:
-                        return match.group(0)
-                idf_content = re.sub(pattern, reduce_with_controls, idf_content, flags=re.MULTILINE)
-            
-            elif measure.measure_type == RetrofitMeasureType.LIGHTING_DAYLIGHTING:
-                # Daylighting controls already integrated in Phase 1
-                # Additional dimming reduces lighting load
-                pattern = r'(Lights[^;]*Watts per Zone Floor Area[^,]*,\s*)([\d.E+-]+)'
-                def reduce_daylighting(match):
-                    try:
-                        old_value = float(match.group(2))
-                        new_value = old_value * 0.80  # 20% reduction from daylighting
-                        return match.group(1) + f"{new_value:.2f}"
-                    except ValueError:
-                        return match.group(0)
-                idf_content = re.sub(pattern, reduce_daylighting, idf_content, flags=re.MULTILINE)
-            
-            elif measure.measure_type == RetrofitMeasureType.HVAC_EFFICIENCY:
-                # Improve HVAC efficiency - handle multiple coil types
-                # Cooling COP improvement
-                pattern = r'(Coil:Cooling:DX[^;]*Rated COP[^,]*,\s*)([\d.E+-]+)'
-                def improve_cop(match):
-                    try:
-                        old_value = float(match.group(2))
-                        new_value = old_value * 1.25  # 25% improvement
-                        return match.group(1) + f"{new_value:.2f}"
-                    except ValueError:
-                        return match.group(0)
-                idf_content = re.sub(pattern, improve_cop, idf_content, flags=re.MULTILINE)
-                
-                # Heating efficiency improvement
-                pattern = r'(Coil:Heating[^;]*Efficiency[^,]*,\s*)([\d.E+-]+)'
-                def improve_heating(match):
-                    try:
-                        old_value = float(match.group(2))
-                        new_value = old_value * 1.25  # 25% improvement
-                        return match.group(1) + f"{new_value:.2f}"
-                    except ValueError:
-                        return match.group(0)
-                idf_content = re.sub(pattern, improve_heating, idf_content, flags=re.MULTILINE)
-            
-            elif measure.measure_type == RetrofitMeasureType.HVAC_VFD:
-                # VFDs reduce fan energy - modify fan power coefficients
-                pattern = r'(Fan[^;]*Fan Power Coefficient[^,]*,\s*)([\d.E+-]+)'
-                def reduce_fan_power(match):
-                    try:
-                        old_value = float(match.group(2))
-                        new_value = old_value * 0.7  # 30% reduction with VFD
-                        return match.group(1) + f"{new_value:.3f}"
-                    except ValueError:
-                        return match.group(0)
-                idf_content = re.sub(pattern, reduce_fan_power, idf_content, flags=re.MULTILINE)
-            
-            elif measure.measure_type == RetrofitMeasureType.HVAC_ECONOMIZER:
-                # Economizer already integrated in Phase 1
-                # Additional savings come from free cooling
-                pass  # Already present in IDF
-            
-            elif measure.measure_type == RetrofitMeasureType.ENVELOPE_INSULATION:
-                # Increase insulation R-values - match Material objects
-                pattern = r'(Material[^;]*Thermal Resistance[^,]*,\s*)([\d.E+-]+)'
-                def increase_rvalue(match):
-                    try:
-                        old_value = float(match.group(2))
-                        new_value = old_value * 1.5  # 50% increase
-                        return match.group(1) + f"{new_value:.2f}"
-                    except ValueError:
-                        return match.group(0)
-                idf_content = re.sub(pattern, increase_rvalue, idf_content, flags=re.MULTILINE)
-            
-            elif measure.measure_type == RetrofitMeasureType.ENVELOPE_WINDOWS:
-                # Improve window U-value (lower = better)
-                pattern = r'(WindowMaterial:SimpleGlazingSystem[^;]*U-Factor[^,]*,\s*)([\d.E+-]+)'
-                def improve_window(match):
-                    try:
-                        old_value = float(match.group(2))
-                        new_value = old_value * 0.7  # 30% improvement (lower U-value)
-                        return match.group(1) + f"{new_value:.3f}"
-                    except ValueError:
-                        return match.group(0)
-                idf_content = re.sub(pattern, improve_window, idf_content, flags=re.MULTILINE)
-            
-            elif measure.measure_type == RetrofitMeasureType.ENVELOPE_AIR_SEALING:
-                # Reduce infiltration rates
-                pattern = r'(ZoneInfiltration:DesignFlowRate[^;]*Flow Rate[^,]*,\s*)([\d.E+-]+)'
-                def reduce_infiltration(match):
-                    try:
-                        old_value = float(match.group(2))
-                        new_value = old_value * 0.8  # 20% reduction
-                        return match.group(1) + f"{new_value:.6f}"
-                    except ValueError:
-                        return match.group(0)
-                idf_content = re.sub(pattern, reduce_infiltration, idf_content, flags=re.MULTILINE)
-            
-            elif measure.measure_type == RetrofitMeasureType.RENEWABLE_PV:
-                # PV systems generate electricity - would need to add Generator:Photovoltaic objects
-                # For now, this is handled in post-processing (reduces grid electricity)
-                pass
-            
-            elif measure.measure_type == RetrofitMeasureType.BAS_AUTOMATION:
-                # BAS improves overall efficiency through better control
-                # Reduce all loads slightly
-                pattern = r'(Lights[^;]*Watts per Zone Floor Area[^,]*,\s*)([\d.E+-]+)'
-                def reduce_bas_lighting(match):
-                    try:
-                        old_value = float(match.group(2))
-                        new_value = old_value * 0.92  # 8% reduction
-                        return match.group(1) + f"{new_value:.2f}"
-                    except ValueError:
-                        return match.group(0)
-                idf_content = re.sub(pattern, reduce_bas_lighting, idf_content, flags=re.MULTILINE)
-        
-        # Write modified IDF
         with open(output_idf, 'w', encoding='utf-8') as f:
             f.write(idf_content)
         
@@ -669,22 +694,23 @@ class RetrofitOptimizer:
             if not os.path.exists(idf_path):
                 return False
             
-            # Check for basic IDF structure
             with open(idf_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # Check for required objects
-            if 'Version,' not in content:
-                return False
-            
-            # Check for balanced semicolons (basic syntax check)
-            if content.count(';') < 10:  # Minimum expected objects
-                return False
-            
-            return True
+                return self._validate_idf_content(f.read())
         except Exception:
             return False
     
+    def _validate_idf_content(self, content: str) -> bool:
+        """Basic structural check of IDF text."""
+        # Check for required objects
+        if 'Version,' not in content:
+            return False
+        
+        # Check for balanced semicolons (basic syntax check)
+        if content.count(';') < 10:  # Minimum expected objects
+            return False
+        
+        return True
+    
     def _run_simulation(self, idf_file: str, weather_file: str, output_dir: Path) -> Dict:
         """Run EnergyPlus simulation and extract results"""
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -712,7 +738,7 @@ class RetrofitOptimizer:
         # Extract results
         sqlite_file = output_dir / "eplusout.sql"
         if sqlite_file.exists():
-            return self._extract_sqlite_results(sqlite_file)
+            return self._extract_sqlite_results(sqlite_file, weather_file)
         
         tabular_file = output_dir / "eplusout.tab"
         if tabular_file.exists():
@@ -720,81 +746,13 @@ class RetrofitOptimizer:
         
         return {'annual_kwh': 0.0, 'monthly_kwh': [0.0] * 12}
     
-    def _extract_sqlite_results(self, sqlite_file: Path) -> Dict:
-        """Extract energy results from SQLite output"""
+    def _extract_sqlite_results(self, sqlite_file: Path, weather_file: Optional[str] = None) -> Dict:
+        """Extract monthly electricity and gas meter results from SQLite output"""
         try:
-            import sqlite3
-            conn = sqlite3.connect(str(sqlite_file))
-            cursor = conn.cursor()
-            
-            annual_kwh = 0.0
-            
-            # Strategy 1: ReportMeterData (preferred for energy consumption)
-            try:
-                cursor.execute("""
-                    SELECT MAX(Value)
-                    FROM ReportMeterData
-                    WHERE ReportMeterDictionaryIndex IN (
-                        SELECT ReportMeterDictionaryIndex
-                        FROM ReportMeterDictionary
-                        WHERE Name = 'Electricity:Facility'
-                        AND ReportingFrequency = 'RunPeriod'
-                    )
-                """)
-                result = cursor.fetchone()
-                if result and result[0]:
-                    # Value is in Joules, convert to kWh
-                    annual_kwh = result[0] / 3600000.0
-            except:
-                pass
-            
-            # Strategy 2: ReportMeterDataDictionary (alternative schema)
-            if annual_kwh == 0:
-                try:
-                    cursor.execute("""
-                        SELECT MAX(Value)
-                        FROM ReportMeterData
-                        WHERE ReportMeterDataDictionaryIndex IN (
-                            SELECT ReportMeterDataDictionaryIndex
-                            FROM ReportMeterDataDictionary
-                            WHERE Name = 'Electricity:Facility'
-                            AND ReportingFrequency = 'RunPeriod'
-                        )
-                    """)
-                    result = cursor.fetchone()
-                    if result and result[0]:
-                        annual_kwh = result[0] / 3600000.0
-                except:
-                    pass
-            
-            # Strategy 3: ReportData (fallback)
-            if annual_kwh == 0:
-                try:
-                    cursor.execute("""
-                        SELECT SUM(Value)
-                        FROM ReportData
-                        WHERE ReportDataDictionaryIndex IN (
-                            SELECT ReportDataDictionaryIndex
-                            FROM ReportDataDictionary
-                            WHERE Name LIKE '%Electricity%Facility%'
-                            AND ReportingFrequency = 'RunPeriod'
-                        )
-                    """)
-                    result = cursor.fetchone()
-                    if result and result[0]:
-                        # Assume Joules if large number, otherwise kWh
-                        annual_kwh = result[0] / 3600000.0 if result[0] > 1000000 else result[0]
-                except:
-                    pass
-            
-            conn.close()
-            
-            if annual_kwh > 0:
-                return {
-                    'annual_kwh': annual_kwh,
-                    'monthly_kwh': [annual_kwh / 12.0] * 12
-                }
-        except Exception as e:
+            results = extract_energy_results(sqlite_file, weather_file=weather_file)
+            if results['annual_kwh'] > 0:
+                return results
+        except Exception:
             pass
         
         return {'annual_kwh': 0.0, 'monthly_kwh': [0.0] * 12}
@@ -844,3 +802,18 @@ Top {min(top_n, len(scenarios))} Scenarios (Ranked by NPV):
         
         return report
 
+
+# Per-process state for simulation workers (set by the pool initializer)
+_WORKER_STATE: Dict = {}
+
+
+def _init_simulation_worker(baseline_model: ParametricModel, energyplus_path: str) -> None:
+    """Process-pool initializer: keep the parsed baseline for this worker's jobs."""
+    _WORKER_STATE['baseline'] = baseline_model
+    _WORKER_STATE['optimizer'] = RetrofitOptimizer(energyplus_path=energyplus_path)
+
+
+def _run_simulation_job(job: Tuple) -> Tuple[int, Dict]:
+    """Process-pool entry point for one simulation job."""
+    return _WORKER_STATE['optimizer']._simulate_job(_WORKER_STATE['baseline'], *job)
+
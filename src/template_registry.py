@@ -0,0 +1,118 @@
+"""
+Process-wide registry of template libraries.
+
+Building type, material, geometry, HVAC and envelope templates never change
+after they are loaded, so they are built once per process and shared by
+every generator (and therefore every IDFCreator, web request and
+AutoFixEngine). Only per-generation state - unique names, outdoor air
+nodes, plumbing nodes, the VAV schedule flag - stays on the objects that
+are created per generator.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from .advanced_geometry_engine import AdvancedGeometryEngine
+from .advanced_ground_coupling import AdvancedGroundCoupling
+from .advanced_hvac_controls import AdvancedHVACControls
+from .advanced_hvac_systems import AdvancedHVACSystems, HVACSystem
+from .advanced_infiltration import AdvancedInfiltration
+from .advanced_ventilation import AdvancedVentilation
+from .advanced_window_modeling import AdvancedWindowModeling
+from .area_validator import AreaValidator
+from .building_age_adjustments import BuildingAgeAdjuster
+from .building_estimator import BuildingEstimator
+from .infiltration_ventilation import InfiltrationVentilationEngine
+from .multi_building_types import MultiBuildingTypes
+from .professional_material_library import ProfessionalMaterialLibrary
+from .shading_daylighting import ShadingDaylightingEngine
+
+
+@dataclass(frozen=True)
+class TemplateRegistry:
+    """
+    Read-only template libraries shared by all generators in the process.
+
+    The libraries are stateless apart from internal lookup caches, so they
+    can be shared between threads. Treat the template dictionaries they
+    expose as read-only.
+    """
+    age_adjuster: BuildingAgeAdjuster
+    material_library: ProfessionalMaterialLibrary
+    building_types: MultiBuildingTypes
+    geometry_engine: AdvancedGeometryEngine
+    advanced_controls: AdvancedHVACControls
+    shading_daylighting: ShadingDaylightingEngine
+    infiltration_ventilation: InfiltrationVentilationEngine
+    advanced_ventilation: AdvancedVentilation
+    advanced_window: AdvancedWindowModeling
+    advanced_ground: AdvancedGroundCoupling
+    advanced_infiltration: AdvancedInfiltration
+    area_validator: AreaValidator
+    # Template dictionaries of AdvancedHVACSystems (whose instances hold per-building state)
+    hvac_templates: Dict[str, HVACSystem]
+    hvac_equipment_templates: Dict
+    hvac_control_templates: Dict
+    # Memoized HVAC template / sizing profile resolutions (see AdvancedHVACSystems)
+    hvac_resolution_cache: Dict = field(default_factory=dict, repr=False, compare=False)
+    _estimators: Dict[str, BuildingEstimator] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def load(cls) -> 'TemplateRegistry':
+        """Load every template library (use get_instance() to share them)."""
+        hvac = AdvancedHVACSystems()
+        return cls(
+            age_adjuster=BuildingAgeAdjuster(),
+            material_library=ProfessionalMaterialLibrary(),
+            building_types=MultiBuildingTypes(),
+            geometry_engine=AdvancedGeometryEngine(),
+            advanced_controls=AdvancedHVACControls(),
+            shading_daylighting=ShadingDaylightingEngine(),
+            infiltration_ventilation=InfiltrationVentilationEngine(),
+            advanced_ventilation=AdvancedVentilation(),
+            advanced_window=AdvancedWindowModeling(),
+            advanced_ground=AdvancedGroundCoupling(),
+            advanced_infiltration=AdvancedInfiltration(),
+            area_validator=AreaValidator(),
+            hvac_templates=hvac.hvac_templates,
+            hvac_equipment_templates=hvac.equipment_templates,
+            hvac_control_templates=hvac.control_templates,
+        )
+
+    @classmethod
+    def get_instance(cls) -> 'TemplateRegistry':
+        """Get the process-wide registry, loading it on first use."""
+        global _instance
+        if _instance is None:
+            with _lock:
+                if _instance is None:
+                    _instance = cls.load()
+        return _instance
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop the process-wide registry (the next get_instance() reloads it)."""
+        global _instance
+        with _lock:
+            _instance = None
+
+    def building_estimator(self, config_path: str = "config.yaml") -> BuildingEstimator:
+        """
+        Get the shared building estimator for a configuration file.
+
+        Args:
+            config_path: Path to configuration file
+
+        Returns:
+            BuildingEstimator shared by all callers using the same config
+        """
+        estimator = self._estimators.get(config_path)
+        if estimator is None:
+            with _lock:
+                estimator = self._estimators.setdefault(config_path, BuildingEstimator(config_path))
+        return estimator
+
+
+_instance: Optional[TemplateRegistry] = None
+_lock = threading.RLock()
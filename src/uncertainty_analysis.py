@@ -1 +1,927 @@
+"""
+Uncertainty Analysis Module - Phase 1, Priority #4
+Monte Carlo uncertainty quantification of simulated energy use intensity.
 
+Features:
+- Parameter distributions derived from the generator's own inputs
+  (BuildingAgeAdjuster eras, AdvancedInfiltration ACH, MultiBuildingTypes
+  LPD / EPD, HVAC efficiencies)
+- Latin hypercube sampling
+- Variant IDFs generated as parametric edits of one parsed base model
+- Parallel simulation with a results cache
+- Streaming EUI distribution (P10 / P50 / P90 as runs complete)
+- Sensitivity: standardized regression / rank correlation, Morris
+  elementary effects and Sobol indices
+
+Reference:
+- ASHRAE Guideline 14 (Uncertainty of savings)
+- Saltelli et al., Global Sensitivity Analysis: The Primer (2008)
+- Morris, Factorial Sampling Plans for Preliminary Computational Experiments (1991)
+"""
+
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+from pathlib import Path
+import bisect
+import hashlib
+import json
+import math
+import os
+
+import numpy as np
+
+from .advanced_infiltration import AdvancedInfiltration
+from .building_age_adjustments import BuildingAgeAdjuster
+from .model_calibration import SIMULATION_MEMORY_MB, ModelCalibrator
+from .multi_building_types import MultiBuildingTypes
+from .parametric_edits import ParametricEdit, ParametricModel
+from .utils.common import resolve_worker_count
+
+# Site energy conversions
+KBTU_PER_KWH = 3.412
+FT2_PER_M2 = 10.7639
+
+# Representative construction years of the BuildingAgeAdjuster eras (plus
+# pre-1930 stock, which AdvancedInfiltration treats separately)
+ERA_YEARS = (1925, 1970, 1990, 2005, 2015)
+MODERN_YEAR = 2015
+
+# Relative spread (± fraction of the era value) used when the construction year is known
+KNOWN_AGE_SPREAD: Dict[str, float] = {
+    'infiltration_rate': 0.5,
+    'lighting_power_density': 0.2,
+    'equipment_power_density': 0.3,
+    'cooling_cop': 0.15,
+    'heating_efficiency': 0.1,
+}
+
+# Central percentile intervals reported with each result
+CONFIDENCE_LEVELS = (68, 90, 95)
+
+# Bumped whenever the cached result format changes so stale files are ignored
+RESULT_CACHE_VERSION = 2
+
+# Results recorded for a simulation that raised (excluded from the distribution)
+_FAILED_RUN: Dict = {'annual_kwh': 0.0, 'monthly_kwh': [0.0] * 12}
+
+
+@dataclass(frozen=True)
+class UncertaintyParameter:
+    """
+    An uncertain model input and the fields it drives.
+
+    Values are sampled in physical units and applied to the base model as a
+    multiplier of the fields: ``value / nominal``, where ``nominal`` is the
+    value the base model was generated with.
+
+    Args:
+        name: Parameter name
+        distribution: 'uniform' or 'triangular'
+        low: Lower bound
+        high: Upper bound
+        nominal: Value assumed by the base model
+        mode: Peak of a triangular distribution (default: nominal)
+        targets: Parametric field / group names scaled by the parameter
+        maximum: Optional upper bound on the edited field values
+        units: Units of the sampled values
+    """
+    name: str
+    distribution: str
+    low: float
+    high: float
+    nominal: float
+    mode: Optional[float] = None
+    targets: Tuple[str, ...] = ()
+    maximum: Optional[float] = None
+    units: str = ''
+
+    def __post_init__(self):
+        if self.distribution not in ('uniform', 'triangular'):
+            raise ValueError(f"Unknown distribution for {self.name}: {self.distribution}")
+        if self.high < self.low:
+            raise ValueError(f"Invalid range for {self.name}: [{self.low}, {self.high}]")
+
+    def ppf(self, u: np.ndarray) -> np.ndarray:
+        """Map probabilities in [0, 1] to parameter values (inverse CDF)."""
+        u = np.clip(np.asarray(u, dtype=float), 0.0, 1.0)
+        width = self.high - self.low
+        if width <= 0:
+            return np.full_like(u, self.low)
+        if self.distribution == 'uniform':
+            return self.low + u * width
+        mode = min(max(self.nominal if self.mode is None else self.mode, self.low), self.high)
+        split = (mode - self.low) / width
+        rising = self.low + np.sqrt(u * width * (mode - self.low))
+        falling = self.high - np.sqrt((1.0 - u) * width * (self.high - mode))
+        return np.where(u < split, rising, falling)
+
+    def sample(self, size: Optional[int] = None, rng: Optional[np.random.Generator] = None):
+        """Draw random values (a float when ``size`` is None)."""
+        rng = rng or np.random.default_rng()
+        values = self.ppf(rng.random(1 if size is None else size))
+        return float(values[0]) if size is None else values
+
+    def edits(self, value: float) -> List[ParametricEdit]:
+        """Parametric edits that set this parameter to ``value``."""
+        scale = value / self.nominal if self.nominal else 1.0
+        return [ParametricEdit(target, scale=scale, maximum=self.maximum) for target in self.targets]
+
+
+def _era_parameter(
+    name: str,
+    era_values: Dict[int, float],
+    year_built: Optional[int],
+    current: float,
+    targets: Tuple[str, ...],
+    units: str,
+    maximum: Optional[float] = None,
+    extra_values: Sequence[float] = ()
+) -> UncertaintyParameter:
+    """
+    Triangular distribution of a parameter across construction eras.
+
+    With an unknown construction year the range spans all eras and peaks at
+    the modern value; with a known year it is the era value ± KNOWN_AGE_SPREAD.
+    """
+    if year_built is None:
+        values = list(era_values.values()) + list(extra_values)
+        low, high = min(values), max(values)
+    else:
+        spread = KNOWN_AGE_SPREAD[name]
+        low, high = current * (1.0 - spread), current * (1.0 + spread)
+    if maximum is not None:
+        high = min(high, maximum)
+        low = min(low, high)
+    return UncertaintyParameter(
+        name=name, distribution='triangular', low=low, high=high, nominal=current,
+        targets=targets, maximum=maximum, units=units
+    )
+
+
+def default_distributions(
+    building_type: str = 'office',
+    year_built: Optional[int] = None
+) -> Dict[str, UncertaintyParameter]:
+    """
+    Default input distributions for a building type and construction year.
+
+    Nominal values are those the generator assumes for the building; ranges
+    come from the construction-era adjustments.
+
+    Args:
+        building_type: MultiBuildingTypes key (e.g. 'office', 'retail')
+        year_built: Construction year, or None if unknown (modern nominal values)
+
+    Returns:
+        Parameter name -> UncertaintyParameter
+    """
+    adjuster = BuildingAgeAdjuster()
+    infiltration = AdvancedInfiltration()
+    types = MultiBuildingTypes()
+    template = (types.get_building_type_template(building_type.lower().replace(' ', '_'))
+                or types.get_building_type_template('office'))
+    year = year_built or MODERN_YEAR
+
+    def ach(y: int) -> float:
+        tightness = infiltration.determine_building_tightness(y)
+        return adjuster.adjust_infiltration(infiltration.infiltration_templates[tightness]['base_ach'], y)
+
+    def lpd(y: int) -> float:
+        ratio = adjuster.get_lighting_power_density(y) / adjuster.get_lighting_power_density(MODERN_YEAR)
+        return template.lighting_power_density * ratio
+
+    def epd(y: int) -> float:
+        ratio = adjuster.get_equipment_power_density(y) / adjuster.get_equipment_power_density(MODERN_YEAR)
+        return template.equipment_power_density * ratio
+
+    def cooling_cop(y: int) -> float:
+        return adjuster.get_hvac_efficiency_values(y, 'VAV')['cooling_eer'] / 3.412
+
+    def heating_efficiency(y: int) -> float:
+        return adjuster.get_hvac_efficiency_values(y, 'RTU')['heating_efficiency']
+
+    tight_ach = infiltration.infiltration_templates['tight']['base_ach']
+    return {
+        'infiltration_rate': _era_parameter(
+            'infiltration_rate', {y: ach(y) for y in ERA_YEARS}, year_built, ach(year),
+            ('ZoneInfiltration:DesignFlowRate.flow',), 'ACH', extra_values=(tight_ach,)
+        ),
+        'lighting_power_density': _era_parameter(
+            'lighting_power_density', {y: lpd(y) for y in ERA_YEARS}, year_built, lpd(year),
+            ('Lights.power',), 'W/m²'
+        ),
+        'equipment_power_density': _era_parameter(
+            'equipment_power_density', {y: epd(y) for y in ERA_YEARS}, year_built, epd(year),
+            ('ElectricEquipment.power',), 'W/m²'
+        ),
+        'cooling_cop': _era_parameter(
+            'cooling_cop', {y: cooling_cop(y) for y in ERA_YEARS}, year_built, cooling_cop(year),
+            ('cooling_cop',), 'W/W'
+        ),
+        'heating_efficiency': _era_parameter(
+            'heating_efficiency', {y: heating_efficiency(y) for y in ERA_YEARS}, year_built,
+            heating_efficiency(year), ('heating_efficiency',), '-', maximum=1.0
+        ),
+    }
+
+
+def latin_hypercube(count: int, dims: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Latin hypercube sample of the unit hypercube.
+
+    Returns:
+        (count, dims) array with exactly one point per stratum of each dimension
+    """
+    strata = np.argsort(rng.random((count, dims)), axis=0)
+    return (strata + rng.random((count, dims))) / count
+
+
+def model_floor_area(model: ParametricModel) -> float:
+    """Conditioned floor area (m²) of a model: the area of its floor surfaces."""
+    area = 0.0
+    for obj in model.doc.objects_of_type('BuildingSurface:Detailed'):
+        if len(obj.fields) < 2 or obj.fields[1].strip().lower() != 'floor':
+            continue
+        # Vertices are the trailing fields, preceded by their count
+        for start in range(2, len(obj.fields)):
+            try:
+                vertex_count = int(float(obj.fields[start]))
+            except ValueError:
+                continue
+            if vertex_count >= 3 and len(obj.fields) - start - 1 == 3 * vertex_count:
+                try:
+                    coords = np.array([float(v) for v in obj.fields[start + 1:]]).reshape(-1, 3)
+                except ValueError:
+                    break
+                edges = np.cross(coords, np.roll(coords, -1, axis=0)).sum(axis=0)
+                area += 0.5 * float(np.linalg.norm(edges))
+                break
+    return area
+
+
+@dataclass
+class UncertaintyResult:
+    """Results of an uncertainty analysis (EUI in kBtu/ft²/year)"""
+    mean_eui: float
+    std_eui: float
+    cv_eui: float  # Coefficient of variation (%)
+    percentile_5: float
+    percentile_50: float
+    percentile_95: float
+    confidence_intervals: Dict[str, Tuple[float, float]]  # e.g. {'90%': (P5, P95)}
+    sensitivity_ranking: List[Dict]  # [{'parameter', 'impact_score', 'correlation'}], most influential first
+    sample_size: int
+    percentile_10: Optional[float] = None
+    percentile_90: Optional[float] = None
+    eui_samples: List[float] = field(default_factory=list)
+    parameter_samples: Dict[str, List[float]] = field(default_factory=dict)
+    failed_runs: int = 0
+    cached_runs: int = 0
+    units: str = 'kBtu/ft²/year'
+
+
+class EUIDistribution:
+    """
+    Running EUI distribution, updated as simulations complete.
+
+    Mean and variance use Welford's method; values are kept sorted so
+    percentiles are available at any time.
+    """
+
+    def __init__(self):
+        self.values: List[float] = []
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, eui: float) -> None:
+        """Add one simulated EUI."""
+        bisect.insort(self.values, eui)
+        delta = eui - self.mean
+        self.mean += delta / len(self.values)
+        self._m2 += delta * (eui - self.mean)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self._m2 / (len(self.values) - 1)) if len(self.values) > 1 else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Percentile ``q`` (0-100), linearly interpolated."""
+        if not self.values:
+            return 0.0
+        position = (len(self.values) - 1) * q / 100.0
+        lower = int(math.floor(position))
+        upper = min(lower + 1, len(self.values) - 1)
+        return self.values[lower] + (self.values[upper] - self.values[lower]) * (position - lower)
+
+    def summary(self) -> Dict[str, float]:
+        """Sample count, mean, standard deviation, P10 / P50 / P90."""
+        return {
+            'n': len(self.values),
+            'mean': self.mean,
+            'std': self.std,
+            'p10': self.percentile(10),
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+        }
+
+
+class SimulationResultCache:
+    """
+    Simulation results keyed by base model, weather file and parameter values.
+
+    Repeated analyses of the same model (more iterations, a sensitivity run
+    after a Monte Carlo run) only simulate new parameter sets. The cache can
+    be persisted to a JSON file.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Optional JSON file to warm-start from and save to
+        """
+        self.path = str(Path(path).resolve()) if path else None
+        self._results: Dict[str, Dict] = {}
+        self._dirty = False
+        if self.path:
+            self._load()
+
+    @staticmethod
+    def make_key(model_hash: str, weather_key: str, edits: Sequence[ParametricEdit]) -> str:
+        """
+        Key of the results of a base model rendered with ``edits``.
+
+        The edits (target, scale and bound) determine the simulated IDF, so
+        parameter sets that render the same model share an entry and changing
+        a parameter's nominal value, targets or maximum invalidates it.
+        """
+        rendered = sorted((edit.target, round(edit.scale, 9), edit.maximum) for edit in edits)
+        payload = [model_hash, weather_key, rendered]
+        return hashlib.sha256(json.dumps(payload).encode('utf-8')).hexdigest()
+
+    def _load(self) -> None:
+        """Warm-start from the JSON file, ignoring missing, corrupt or stale files."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == RESULT_CACHE_VERSION:
+            self._results.update(data.get('results', {}))
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached results or None."""
+        return self._results.get(key)
+
+    def put(self, key: str, results: Dict) -> None:
+        """Store the results of a successful simulation."""
+        self._results[key] = {
+            'annual_kwh': float(results.get('annual_kwh', 0.0)),
+            'gas_annual_kwh': float(results.get('gas_annual_kwh', 0.0)),
+            'monthly_kwh': [float(v) for v in results.get('monthly_kwh', [])],
+        }
+        self._dirty = True
+
+    def save(self) -> Optional[str]:
+        """Write the results to the cache file (atomically) and return its path."""
+        if not self.path:
+            return None
+        if self._dirty:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = f"{self.path}.tmp{os.getpid()}"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': RESULT_CACHE_VERSION, 'results': self._results}, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        return self.path
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+class UncertaintyAnalyzer:
+    """
+    Monte Carlo uncertainty and sensitivity analysis of simulated EUI.
+
+    Each analysis parses the base IDF once; every sampled parameter set is
+    rendered from it as parametric edits and simulated, in a process pool
+    when more than one worker is available.
+    """
+
+    def __init__(
+        self,
+        energyplus_path: Optional[str] = None,
+        building_type: str = 'office',
+        year_built: Optional[int] = None,
+        cache_path: Optional[str] = None
+    ):
+        """
+        Initialize analyzer.
+
+        Args:
+            energyplus_path: Path to EnergyPlus executable (auto-detected if None)
+            building_type: Building type the default distributions are derived for
+            year_built: Construction year (None if unknown)
+            cache_path: Optional JSON file persisting simulation results
+        """
+        self.simulator = ModelCalibrator(energyplus_path=energyplus_path)
+        self.energyplus_path = self.simulator.energyplus_path
+        self.default_distributions = default_distributions(building_type, year_built)
+        self.result_cache = SimulationResultCache(cache_path)
+
+    def monte_carlo_analysis(
+        self,
+        idf_file: str,
+        weather_file: str,
+        n_iterations: int = 200,
+        parameters: Optional[Dict[str, UncertaintyParameter]] = None,
+        floor_area_m2: Optional[float] = None,
+        output_dir: Optional[str] = None,
+        max_concurrent: int = 4,
+        seed: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int, Dict[str, float]], None]] = None
+    ) -> UncertaintyResult:
+        """
+        Run a Monte Carlo analysis with Latin hypercube samples.
+
+        Args:
+            idf_file: Path to the base IDF file
+            weather_file: Path to weather file (.epw)
+            n_iterations: Number of parameter sets to simulate
+            parameters: Distributions to sample (default: default_distributions)
+            floor_area_m2: Floor area for EUI (default: area of the model's floor surfaces)
+            output_dir: Directory for variant IDFs and simulation outputs
+            max_concurrent: Maximum concurrent simulations (capped by available cores and memory)
+            seed: Random seed
+            progress_callback: Optional callable(completed, total, summary) invoked as each
+                run finishes; summary is the running EUIDistribution.summary()
+
+        Returns:
+            UncertaintyResult with EUI statistics and a sensitivity ranking
+        """
+        parameters = parameters or self.default_distributions
+        names = list(parameters)
+        rng = np.random.default_rng(seed)
+        points = latin_hypercube(n_iterations, len(names), rng)
+
+        print(f"\n🎲 Monte Carlo analysis: {n_iterations} samples of {len(names)} parameters...")
+        distribution = EUIDistribution()
+        euis = np.full(n_iterations, np.nan)
+        evaluation = self._iter_evaluations(
+            idf_file, weather_file, parameters, points, floor_area_m2, output_dir, max_concurrent, 'mc'
+        )
+        for index, eui in evaluation:
+            if eui is None:
+                continue
+            euis[index] = eui
+            distribution.add(eui)
+            if progress_callback:
+                progress_callback(len(distribution), n_iterations, distribution.summary())
+
+        valid = ~np.isnan(euis)
+        if not valid.any():
+            raise RuntimeError("All uncertainty simulations failed")
+        values = self._values(parameters, points)
+        result = self._summarize(distribution, euis[valid], values[valid], names)
+        result.failed_runs = int((~valid).sum())
+        result.cached_runs = evaluation.cached
+        result.parameter_samples = {name: values[valid, j].tolist() for j, name in enumerate(names)}
+        print(f"  ✓ EUI P10/P50/P90: {result.percentile_10:.1f} / {result.percentile_50:.1f} / "
+              f"{result.percentile_90:.1f} {result.units}")
+        return result
+
+    def morris_screening(
+        self,
+        idf_file: str,
+        weather_file: str,
+        trajectories: int = 10,
+        levels: int = 4,
+        parameters: Optional[Dict[str, UncertaintyParameter]] = None,
+        floor_area_m2: Optional[float] = None,
+        output_dir: Optional[str] = None,
+        max_concurrent: int = 4,
+        seed: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Morris elementary-effects screening: trajectories × (parameters + 1) runs.
+
+        Each trajectory starts at a random grid point and moves one parameter
+        at a time by Δ = levels / (2 (levels - 1)) of its probability range.
+
+        Returns:
+            [{'parameter', 'mu_star', 'mu', 'sigma'}] sorted by mu_star (EUI
+            change per full probability range), most influential first
+        """
+        parameters = parameters or self.default_distributions
+        names = list(parameters)
+        dims = len(names)
+        rng = np.random.default_rng(seed)
+        delta = levels / (2.0 * (levels - 1))
+        starts = np.arange(levels // 2) / (levels - 1)
+
+        points, moves = [], []
+        for _ in range(trajectories):
+            point = rng.choice(starts, size=dims)
+            points.append(point.copy())
+            for j in rng.permutation(dims):
+                point[j] += delta
+                points.append(point.copy())
+                moves.append(j)
+        points = np.array(points)
+
+        euis = self._evaluate(idf_file, weather_file, parameters, points, floor_area_m2,
+                              output_dir, max_concurrent, 'morris')
+        effects: Dict[int, List[float]] = {j: [] for j in range(dims)}
+        for t in range(trajectories):
+            base = t * (dims + 1)
+            for step in range(dims):
+                before, after = euis[base + step], euis[base + step + 1]
+                if not (np.isnan(before) or np.isnan(after)):
+                    effects[moves[t * dims + step]].append((after - before) / delta)
+
+        ranking = []
+        for j, name in enumerate(names):
+            ee = np.array(effects[j])
+            ranking.append({
+                'parameter': name,
+                'mu_star': float(np.abs(ee).mean()) if ee.size else 0.0,
+                'mu': float(ee.mean()) if ee.size else 0.0,
+                'sigma': float(ee.std(ddof=1)) if ee.size > 1 else 0.0,
+            })
+        ranking.sort(key=lambda item: item['mu_star'], reverse=True)
+        return ranking
+
+    def sobol_indices(
+        self,
+        idf_file: str,
+        weather_file: str,
+        n_base: int = 64,
+        parameters: Optional[Dict[str, UncertaintyParameter]] = None,
+        floor_area_m2: Optional[float] = None,
+        output_dir: Optional[str] = None,
+        max_concurrent: int = 4,
+        seed: Optional[int] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        First-order and total Sobol indices (Saltelli / Jansen estimators).
+
+        Uses two Latin hypercube matrices A and B and, per parameter, A with
+        that column taken from B: n_base × (parameters + 2) runs.
+
+        Returns:
+            Parameter name -> {'first_order', 'total_order'}
+        """
+        parameters = parameters or self.default_distributions
+        names = list(parameters)
+        dims = len(names)
+        rng = np.random.default_rng(seed)
+        a = latin_hypercube(n_base, dims, rng)
+        b = latin_hypercube(n_base, dims, rng)
+        blocks = [a, b]
+        for j in range(dims):
+            ab = a.copy()
+            ab[:, j] = b[:, j]
+            blocks.append(ab)
+
+        euis = self._evaluate(idf_file, weather_file, parameters, np.vstack(blocks), floor_area_m2,
+                              output_dir, max_concurrent, 'sobol').reshape(dims + 2, n_base)
+        valid = ~np.isnan(euis).any(axis=0)
+        f_a, f_b = euis[0, valid], euis[1, valid]
+        variance = np.var(np.concatenate([f_a, f_b]))
+
+        indices = {}
+        for j, name in enumerate(names):
+            f_ab = euis[j + 2, valid]
+            if variance > 0 and valid.any():
+                first = float(np.mean(f_b * (f_ab - f_a)) / variance)
+                total = float(0.5 * np.mean((f_a - f_ab) ** 2) / variance)
+            else:
+                first = total = 0.0
+            indices[name] = {'first_order': first, 'total_order': total}
+        return indices
+
+    def generate_report(self, result: UncertaintyResult) -> str:
+        """Generate text report of an uncertainty analysis"""
+        p10 = f"{result.percentile_10:.1f}" if result.percentile_10 is not None else 'n/a'
+        p90 = f"{result.percentile_90:.1f}" if result.percentile_90 is not None else 'n/a'
+        report = f"""
+================================================================================
+UNCERTAINTY ANALYSIS REPORT
+================================================================================
+
+Sample Size: {result.sample_size}
+Energy Use Intensity ({result.units}):
+   Mean: {result.mean_eui:.1f} ± {result.std_eui:.1f} (CV {result.cv_eui:.1f}%)
+   P5 / P50 / P95: {result.percentile_5:.1f} / {result.percentile_50:.1f} / {result.percentile_95:.1f}
+   P10 / P90: {p10} / {p90}
+
+Confidence Intervals:
+"""
+        for level, (low, high) in result.confidence_intervals.items():
+            report += f"   {level}: [{low:.1f}, {high:.1f}]\n"
+
+        report += "\nSensitivity Ranking:\n"
+        for i, item in enumerate(result.sensitivity_ranking, 1):
+            report += (f"   {i}. {item['parameter']}: impact {item['impact_score']:.2f}, "
+                       f"correlation {item['correlation']:+.2f}\n")
+
+        if result.failed_runs:
+            report += f"\n⚠️  {result.failed_runs} simulation(s) failed and were excluded\n"
+        return report
+
+    def _evaluate(
+        self,
+        idf_file: str,
+        weather_file: str,
+        parameters: Dict[str, UncertaintyParameter],
+        points: np.ndarray,
+        floor_area_m2: Optional[float],
+        output_dir: Optional[str],
+        max_concurrent: int,
+        label: str
+    ) -> np.ndarray:
+        """EUI of every point (NaN where the simulation failed)."""
+        euis = np.full(len(points), np.nan)
+        for index, eui in self._iter_evaluations(idf_file, weather_file, parameters, points,
+                                                 floor_area_m2, output_dir, max_concurrent, label):
+            if eui is not None:
+                euis[index] = eui
+        return euis
+
+    def _iter_evaluations(
+        self,
+        idf_file: str,
+        weather_file: str,
+        parameters: Dict[str, UncertaintyParameter],
+        points: np.ndarray,
+        floor_area_m2: Optional[float],
+        output_dir: Optional[str],
+        max_concurrent: int,
+        label: str
+    ) -> '_Evaluation':
+        """Stream (point index, EUI or None) pairs for points of the unit hypercube."""
+        if not self.energyplus_path:
+            raise ValueError("EnergyPlus executable not found. Please install EnergyPlus or specify path.")
+        if not os.path.exists(weather_file):
+            raise ValueError(f"Weather file not found: {weather_file}")
+
+        model = ParametricModel.from_file(idf_file)
+        floor_area = floor_area_m2 or model_floor_area(model)
+        if floor_area <= 0:
+            raise ValueError("Floor area could not be determined from the model; pass floor_area_m2")
+
+        if output_dir is None:
+            output_dir = os.path.dirname(idf_file) or '.'
+        output_dir = Path(output_dir) / "uncertainty_simulations"
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        names = list(parameters)
+        values = self._values(parameters, points)
+        model_hash = hashlib.sha256(model.doc.render().encode('utf-8')).hexdigest()
+        weather_stat = os.stat(weather_file)
+        weather_key = f"{Path(weather_file).resolve()}:{weather_stat.st_size}:{weather_stat.st_mtime_ns}"
+
+        jobs = []
+        for i, row in enumerate(values):
+            assignment = dict(zip(names, (float(v) for v in row)))
+            jobs.append((
+                i,
+                assignment,
+                str(output_dir / f"{label}_{i}.idf"),
+                str(weather_file),
+                str(output_dir / f"{label}_{i}")
+            ))
+        workers = resolve_worker_count(max_concurrent, SIMULATION_MEMORY_MB) if len(jobs) > 1 else 1
+        keys = {
+            job[0]: SimulationResultCache.make_key(
+                model_hash, weather_key,
+                [edit for name, value in job[1].items() for edit in parameters[name].edits(value)])
+            for job in jobs
+        }
+        return _Evaluation(self, model, parameters, jobs, keys, workers, floor_area)
+
+    @staticmethod
+    def _values(parameters: Dict[str, UncertaintyParameter], points: np.ndarray) -> np.ndarray:
+        """Map unit-hypercube points to parameter values."""
+        values = np.empty_like(points, dtype=float)
+        for j, parameter in enumerate(parameters.values()):
+            values[:, j] = parameter.ppf(points[:, j])
+        return values
+
+    @staticmethod
+    def _summarize(
+        distribution: EUIDistribution,
+        euis: np.ndarray,
+        values: np.ndarray,
+        names: List[str]
+    ) -> UncertaintyResult:
+        """EUI statistics and a regression-based sensitivity ranking."""
+        intervals = {}
+        for level in CONFIDENCE_LEVELS:
+            tail = (100 - level) / 2.0
+            intervals[f"{level}%"] = (distribution.percentile(tail), distribution.percentile(100 - tail))
+
+        return UncertaintyResult(
+            mean_eui=distribution.mean,
+            std_eui=distribution.std,
+            cv_eui=distribution.std / distribution.mean * 100 if distribution.mean else 0.0,
+            percentile_5=distribution.percentile(5),
+            percentile_50=distribution.percentile(50),
+            percentile_95=distribution.percentile(95),
+            confidence_intervals=intervals,
+            sensitivity_ranking=_regression_sensitivity(euis, values, names),
+            sample_size=len(distribution),
+            percentile_10=distribution.percentile(10),
+            percentile_90=distribution.percentile(90),
+            eui_samples=euis.tolist()
+        )
+
+    def _simulate_sample(
+        self,
+        model: ParametricModel,
+        parameters: Dict[str, UncertaintyParameter],
+        index: int,
+        values: Dict[str, float],
+        idf_path: str,
+        weather_file: str,
+        sim_output_dir: str
+    ) -> Tuple[int, Dict]:
+        """Write the base model with the sampled values applied and simulate it."""
+        model.write(idf_path, *(parameters[name].edits(value) for name, value in values.items()))
+        return index, self._run_simulation(idf_path, weather_file, Path(sim_output_dir))
+
+    def _run_simulation(self, idf_file: str, weather_file: str, output_dir: Path) -> Dict:
+        """Run EnergyPlus and extract annual / monthly energy results."""
+        return self.simulator._run_simulation(idf_file, weather_file, output_dir)
+
+
+class _Evaluation:
+    """
+    Iterator over (point index, EUI) pairs as simulations complete.
+
+    Cached parameter sets are yielded first without simulating; the rest run
+    in a process pool (or in order in this process with one worker). Failed
+    runs yield None.
+    """
+
+    def __init__(self, analyzer: UncertaintyAnalyzer, model: ParametricModel,
+                 parameters: Dict[str, UncertaintyParameter], jobs: List[Tuple],
+                 keys: Dict[int, str], workers: int, floor_area_m2: float):
+        self.analyzer = analyzer
+        self.model = model
+        self.parameters = parameters
+        self.jobs = jobs
+        self.keys = keys
+        self.workers = workers
+        self.floor_area_m2 = floor_area_m2
+        self.cached = 0
+
+    def __iter__(self) -> Iterator[Tuple[int, Optional[float]]]:
+        cache = self.analyzer.result_cache
+        pending = []
+        for job in self.jobs:
+            results = cache.get(self.keys[job[0]])
+            if results is None:
+                pending.append(job)
+            else:
+                self.cached += 1
+                yield job[0], self._eui(results)
+
+        try:
+            for index, results in self._iter_results(pending):
+                if results.get('annual_kwh', 0.0) > 0:
+                    cache.put(self.keys[index], results)
+                    yield index, self._eui(results)
+                else:
+                    yield index, None
+        finally:
+            cache.save()
+
+    def _eui(self, results: Dict) -> float:
+        """Site EUI (kBtu/ft²/year) from electricity and gas consumption."""
+        site_kwh = results.get('annual_kwh', 0.0) + results.get('gas_annual_kwh', 0.0)
+        return site_kwh * KBTU_PER_KWH / (self.floor_area_m2 * FT2_PER_M2)
+
+    def _iter_results(self, jobs: List[Tuple]) -> Iterator[Tuple[int, Dict]]:
+        if self.workers <= 1 or len(jobs) <= 1:
+            for job in jobs:
+                try:
+                    yield self.analyzer._simulate_sample(self.model, self.parameters, *job)
+                except Exception as e:
+                    print(f"  ❌ Sample {job[0]} failed: {e}")
+                    yield job[0], _FAILED_RUN
+            return
+
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        executor = ProcessPoolExecutor(
+            max_workers=min(self.workers, len(jobs)),
+            initializer=_init_uncertainty_worker,
+            initargs=(self.model, self.parameters, self.analyzer.energyplus_path)
+        )
+        futures = {executor.submit(_run_uncertainty_job, job): job[0] for job in jobs}
+        try:
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    print(f"  ❌ Sample {futures[future]} failed: {e}")
+                    yield futures[future], _FAILED_RUN
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+
+def _regression_sensitivity(euis: np.ndarray, values: np.ndarray, names: List[str]) -> List[Dict]:
+    """
+    Rank parameters by standardized regression coefficient.
+
+    impact_score is |SRC| (the EUI standard deviations per input standard
+    deviation, from a linear fit); correlation is the Spearman rank
+    correlation of the input with EUI.
+    """
+    def ranks(x: np.ndarray) -> np.ndarray:
+        return np.argsort(np.argsort(x, axis=0), axis=0).astype(float)
+
+    ranking = []
+    y_std = euis.std()
+    x_std = values.std(axis=0)
+    usable = (x_std > 0) & (len(euis) > values.shape[1])
+    if y_std > 0 and usable.any():
+        z = (values[:, usable] - values[:, usable].mean(axis=0)) / x_std[usable]
+        design = np.column_stack([np.ones(len(euis)), z])
+        coefficients = np.linalg.lstsq(design, (euis - euis.mean()) / y_std, rcond=None)[0][1:]
+    else:
+        coefficients = np.zeros(int(usable.sum()))
+    src = np.zeros(len(names))
+    src[usable] = coefficients
+
+    rank_y = ranks(euis)
+    rank_x = ranks(values)
+    for j, name in enumerate(names):
+        if x_std[j] > 0 and y_std > 0:
+            correlation = float(np.corrcoef(rank_x[:, j], rank_y)[0, 1])
+        else:
+            correlation = 0.0
+        ranking.append({'parameter': name, 'impact_score': float(abs(src[j])), 'correlation': correlation})
+    ranking.sort(key=lambda item: item['impact_score'], reverse=True)
+    return ranking
+
+
+# Per-process state for simulation workers (set by the pool initializer)
+_WORKER_STATE: Dict = {}
+
+
+def _init_uncertainty_worker(model: ParametricModel, parameters: Dict[str, UncertaintyParameter],
+                             energyplus_path: str) -> None:
+    """Process-pool initializer: keep the parsed base model for this worker's jobs."""
+    _WORKER_STATE['model'] = model
+    _WORKER_STATE['parameters'] = parameters
+    _WORKER_STATE['analyzer'] = UncertaintyAnalyzer(energyplus_path=energyplus_path)
+
+
+def _run_uncertainty_job(job: Tuple) -> Tuple[int, Dict]:
+    """Process-pool entry point for one parameter set."""
+    return _WORKER_STATE['analyzer']._simulate_sample(_WORKER_STATE['model'], _WORKER_STATE['parameters'], *job)
+
+
+def analyze_uncertainty(
+    idf_file: str,
+    weather_file: str,
+    n_iterations: int = 200,
+    building_type: str = 'office',
+    year_built: Optional[int] = None,
+    floor_area_m2: Optional[float] = None,
+    max_concurrent: int = 4,
+    seed: Optional[int] = None,
+    energyplus_path: Optional[str] = None
+) -> UncertaintyResult:
+    """
+    Convenience function for a Monte Carlo EUI analysis with default distributions.
+
+    Args:
+        idf_file: Path to the base IDF file
+        weather_file: Path to weather file (.epw)
+        n_iterations: Number of parameter sets to simulate
+        building_type: Building type the distributions are derived for
+        year_built: Construction year (None if unknown)
+        floor_area_m2: Floor area for EUI (default: from the model)
+        max_concurrent: Maximum concurrent simulations
+        seed: Random seed
+        energyplus_path: Path to EnergyPlus executable (auto-detected if None)
+
+    Returns:
+        UncertaintyResult
+    """
+    analyzer = UncertaintyAnalyzer(energyplus_path=energyplus_path, building_type=building_type,
+                                   year_built=year_built)
+    return analyzer.monte_carlo_analysis(
+        idf_file, weather_file, n_iterations=n_iterations, floor_area_m2=floor_area_m2,
+        max_concurrent=max_concurrent, seed=seed
+    )
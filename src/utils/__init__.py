@@ -9,10 +9,16 @@ from .common import (
     safe_int,
     ensure_directory,
     normalize_building_type,
+    resolve_weather_file_path,
     get_nested_value,
     set_nested_value,
+    resolve_worker_count,
 )
-from .idf_utils import dedupe_idf_string
+from .idf_utils import dedupe_idf_string, parse_idf, IDFDocument, IDFObject
+from .sql_results import read_meter_series, extract_energy_results, calibration_metrics
+from .artifact_cache import TemplateArtifactCache
+from .http_client import SharedHTTPClient
+from .llm_cache import LLMResponseCache
 
 __all__ = [
     'ConfigManager',
@@ -21,8 +27,19 @@ __all__ = [
     'safe_int',
     'ensure_directory',
     'normalize_building_type',
+    'resolve_weather_file_path',
     'get_nested_value',
     'set_nested_value',
+    'resolve_worker_count',
     'dedupe_idf_string',
+    'parse_idf',
+    'IDFDocument',
+    'IDFObject',
+    'read_meter_series',
+    'extract_energy_results',
+    'calibration_metrics',
+    'TemplateArtifactCache',
+    'SharedHTTPClient',
+    'LLMResponseCache',
 ]
 
@@ -0,0 +1,148 @@
+"""
+Cache of prebuilt IDF template artifacts.
+
+Schedules, material / construction blocks and performance curves depend
+only on a handful of template inputs (building type, space types, climate
+zone, building age, LEED level), so a portfolio of similar buildings
+re-renders the same object blocks over and over. The cache keeps each
+rendered block in memory and can persist them to a JSON file so a new
+process starts warm.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+# Environment variable naming the on-disk warm-start file of the shared cache
+ARTIFACT_CACHE_ENV = 'IDF_CREATOR_ARTIFACT_CACHE'
+
+# Bumped whenever a cached template changes so stale files are ignored
+ARTIFACT_CACHE_VERSION = 1
+
+
+class TemplateArtifactCache:
+    """
+    In-memory cache of rendered template blocks with an optional JSON warm start.
+
+    Artifacts are addressed by a kind (e.g. ``'schedules'``) and a key tuple
+    of the template inputs. Keys must be JSON-serializable scalars.
+    """
+
+    _instances: Dict[Optional[str], 'TemplateArtifactCache'] = {}
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Optional JSON file to warm-start from and save to
+        """
+        self.path = str(Path(path).resolve()) if path else None
+        self._artifacts: Dict[str, str] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if self.path:
+            self._load()
+
+    @classmethod
+    def get_instance(cls, path: Optional[str] = None) -> 'TemplateArtifactCache':
+        """
+        Get the process-wide cache for ``path`` (default: $IDF_CREATOR_ARTIFACT_CACHE).
+
+        Args:
+            path: Optional warm-start file
+
+        Returns:
+            Shared cache instance
+        """
+        path = path or os.environ.get(ARTIFACT_CACHE_ENV) or None
+        if path not in cls._instances:
+            cls._instances[path] = cls(path)
+        return cls._instances[path]
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all shared cache instances."""
+        cls._instances.clear()
+
+    @staticmethod
+    def _make_key(kind: str, key: Tuple[Hashable, ...]) -> str:
+        return json.dumps([kind, list(key)], separators=(',', ':'))
+
+    def _load(self) -> None:
+        """Warm-start from the JSON file, ignoring missing, corrupt or stale files."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == ARTIFACT_CACHE_VERSION:
+            self._artifacts.update(data.get('artifacts', {}))
+
+    def get(self, kind: str, key: Tuple[Hashable, ...]) -> Optional[str]:
+        """Return the cached artifact or None."""
+        return self._artifacts.get(self._make_key(kind, key))
+
+    def put(self, kind: str, key: Tuple[Hashable, ...], artifact: str) -> None:
+        """Store an artifact."""
+        self._artifacts[self._make_key(kind, key)] = artifact
+        self._dirty = True
+
+    def get_or_build(self, kind: str, key: Tuple[Hashable, ...], builder: Callable[[], str]) -> str:
+        """
+        Return the cached artifact, building and storing it on a miss.
+
+        Args:
+            kind: Artifact kind
+            key: Template inputs the artifact depends on
+            builder: Zero-argument callable rendering the artifact
+
+        Returns:
+            Rendered artifact text
+        """
+        cache_key = self._make_key(kind, key)
+        artifact = self._artifacts.get(cache_key)
+        if artifact is not None:
+            self.hits += 1
+            return artifact
+        self.misses += 1
+        artifact = builder()
+        self._artifacts[cache_key] = artifact
+        self._dirty = True
+        return artifact
+
+    def save(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Write the artifacts to the warm-start file (atomically).
+
+        Args:
+            path: Optional file overriding the cache's own path
+
+        Returns:
+            Path written, or None when the cache has no file
+        """
+        target = path or self.path
+        if not target:
+            return None
+        if not self._dirty and target == self.path:
+            return target
+        Path(target).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{target}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': ARTIFACT_CACHE_VERSION, 'artifacts': self._artifacts}, f)
+        os.replace(tmp_path, target)
+        if target == self.path:
+            self._dirty = False
+        return target
+
+    def clear(self) -> None:
+        """Drop all in-memory artifacts and reset the hit counters."""
+        self._artifacts.clear()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._artifacts)
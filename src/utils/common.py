@@ -3,6 +3,7 @@ Common utility functions used across the codebase.
 """
 from typing import Dict, Any, Optional
 from pathlib import Path
+import os
 
 
 def merge_params(*param_dicts: Dict[str, Any]) -> Dict[str, Any]:
@@ -86,6 +87,52 @@ def normalize_building_type(building_type: Optional[str]) -> str:
     return building_type.capitalize()
 
 
+def resolve_weather_file_path(weather_file: Optional[str]) -> Optional[str]:
+    """
+    Locate an EPW file on disk.
+    
+    Absolute paths are used as given; bare names and relative paths are looked
+    up in the working directory and the usual weather folders.
+    
+    Args:
+        weather_file: EPW path or file name
+        
+    Returns:
+        Resolved absolute path, or None if the file was not found
+    """
+    if not weather_file:
+        return None
+
+    weather_path = Path(weather_file)
+    candidates = []
+    if weather_path.is_absolute():
+        candidates.append(weather_path)
+    else:
+        cwd = Path(os.getcwd())
+        candidates.append(cwd / weather_path)
+        candidates.append(cwd / weather_path.name)
+
+    search_roots = [
+        Path(os.getcwd()),
+        Path(os.getcwd()) / 'artifacts',
+        Path(os.getcwd()) / 'artifacts' / 'desktop_files',
+        Path(os.getcwd()) / 'artifacts' / 'desktop_files' / 'weather',
+        Path(os.getcwd()) / 'artifacts' / 'desktop_files' / 'weather' / 'artifacts' / 'desktop_files' / 'weather',
+        Path(os.getcwd()) / 'data',
+        Path(os.getcwd()) / 'data' / 'weather'
+    ]
+    for root in search_roots:
+        candidates.append(root / weather_path.name)
+
+    for candidate in candidates:
+        try:
+            if candidate and candidate.exists():
+                return str(candidate.resolve())
+        except OSError:
+            continue
+    return None
+
+
 def get_nested_value(data: Dict[str, Any], key_path: str, default: Any = None) -> Any:
     """
     Get a value from a nested dictionary using dot notation.
@@ -132,6 +179,45 @@ def set_nested_value(data: Dict[str, Any], key_path: str, value: Any) -> None:
     current[keys[-1]] = value
 
 
+def available_memory_mb() -> Optional[float]:
+    """
+    Best-effort estimate of memory available to new processes.
+    
+    Returns:
+        Available memory in MB, or None if it cannot be determined
+    """
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return float(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / (1024.0 * 1024.0)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def resolve_worker_count(requested: int, memory_per_worker_mb: float = 512.0) -> int:
+    """
+    Cap a requested worker count by available CPU cores and memory.
+    
+    Args:
+        requested: Desired number of concurrent workers
+        memory_per_worker_mb: Expected peak memory of one worker (MB)
+        
+    Returns:
+        Number of workers to use (at least 1)
+    """
+    workers = max(1, int(requested or 1))
+    workers = min(workers, os.cpu_count() or 1)
+    memory_mb = available_memory_mb()
+    if memory_mb is not None and memory_per_worker_mb > 0:
+        workers = min(workers, int(memory_mb // memory_per_worker_mb))
+    return max(1, workers)
+
+
 def normalize_node_name(node_name: str) -> str:
     """
     Normalize node name to uppercase for EnergyPlus compatibility.
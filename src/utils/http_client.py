@@ -0,0 +1,283 @@
+"""
+Shared HTTP client for the external data fetchers.
+
+All fetchers (geocoding, footprints, climate and census data) go through one
+connection-pooled session. Each host gets a token bucket sized to the
+provider's rate limit and a cap on concurrent requests, and every request
+has a timeout. Requests can be made synchronously or from asyncio code:
+async requests wait for their rate-limit token and concurrency slot without
+holding a thread, so a batch of hundreds of lookups only occupies as many
+threads as the hosts allow requests in flight.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# (connect, read) timeout in seconds used when a request does not set one
+DEFAULT_TIMEOUT = (5.0, 20.0)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    """Rate limit, concurrency cap and default timeout of one host."""
+    rate_per_second: float
+    burst: int = 1
+    max_concurrency: int = 4
+    timeout: Timeout = DEFAULT_TIMEOUT
+
+
+# Provider limits (usage policies / documented quotas, with some headroom)
+HOST_POLICIES: Dict[str, HostPolicy] = {
+    # Nominatim usage policy: at most 1 request per second
+    'nominatim.openstreetmap.org': HostPolicy(1 / 1.1, burst=1, max_concurrency=1, timeout=(5.0, 15.0)),
+    # Overpass allows a couple of concurrent queries per IP; queries run up to 25 s
+    'overpass-api.de': HostPolicy(1.0, burst=2, max_concurrency=2, timeout=(5.0, 30.0)),
+    'maps.googleapis.com': HostPolicy(20.0, burst=10, max_concurrency=8),
+    'atlas.microsoft.com': HostPolicy(20.0, burst=10, max_concurrency=8),
+    # NREL developer keys: 1,000 requests per hour
+    'developer.nrel.gov': HostPolicy(0.25, burst=5, max_concurrency=2),
+    'api.census.gov': HostPolicy(5.0, burst=5, max_concurrency=4),
+}
+DEFAULT_POLICY = HostPolicy(5.0, burst=5, max_concurrency=8)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Callers reserve a token and are told how long to wait for it, so waiting
+    happens outside the lock and waiters are served in arrival order.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: int = 1):
+        self.rate = float(rate_per_second)
+        self.capacity = max(1, int(capacity))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return the delay (s) before it may be used."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Wait (without blocking the event loop) until a token is available."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class SharedHTTPClient:
+    """
+    Process-wide pooled HTTP client with per-host rate and concurrency limits.
+
+    Use get_instance() to share it; session() hands each fetcher a view with
+    its own default headers.
+    """
+
+    _instance: Optional['SharedHTTPClient'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, policies: Optional[Dict[str, HostPolicy]] = None,
+                 default_policy: HostPolicy = DEFAULT_POLICY, pool_maxsize: int = 32):
+        """
+        Initialize the client.
+
+        Args:
+            policies: Host name -> policy (default: HOST_POLICIES)
+            default_policy: Policy of hosts without their own entry
+            pool_maxsize: Connections kept open per host
+        """
+        self.policies = dict(HOST_POLICIES if policies is None else policies)
+        self.default_policy = default_policy
+        self.pool_maxsize = pool_maxsize
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=pool_maxsize)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        # Event loop -> {host: asyncio.Semaphore}
+        self._async_slots: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+        self._io_executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def get_instance(cls) -> 'SharedHTTPClient':
+        """Get the process-wide client."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Close and drop the process-wide client."""
+        with cls._instance_lock:
+            if cls._instance is not None:
+                cls._instance.close()
+            cls._instance = None
+
+    def policy(self, host: str) -> HostPolicy:
+        """Policy applied to ``host``."""
+        return self.policies.get((host or '').lower(), self.default_policy)
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            policy = self.policy(host)
+            with self._lock:
+                bucket = self._buckets.setdefault(host, TokenBucket(policy.rate_per_second, policy.burst))
+        return bucket
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        slot = self._slots.get(host)
+        if slot is None:
+            with self._lock:
+                slot = self._slots.setdefault(host, threading.BoundedSemaphore(self.policy(host).max_concurrency))
+        return slot
+
+    def _async_slot(self, host: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            slots = self._async_slots.setdefault(loop, {})
+            if host not in slots:
+                slots[host] = asyncio.Semaphore(self.policy(host).max_concurrency)
+            return slots[host]
+
+    def rate_limit(self, host: str) -> None:
+        """Block until ``host``'s rate limit allows another request (for clients not using this one)."""
+        self._bucket(host.lower()).acquire()
+
+    def _send(self, method: str, url: str, host: str, timeout: Optional[Timeout], **kwargs) -> requests.Response:
+        with self._slot(host):
+            return self._session.request(method, url, timeout=timeout or self.policy(host).timeout, **kwargs)
+
+    def request(self, method: str, url: str, timeout: Optional[Timeout] = None, **kwargs) -> requests.Response:
+        """
+        Send a request, waiting for the host's rate limit and a free slot.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            timeout: (connect, read) timeout; defaults to the host policy's
+            **kwargs: Passed to requests (params, data, json, headers, ...)
+
+        Returns:
+            The response
+        """
+        host = (urlsplit(url).hostname or '').lower()
+        self._bucket(host).acquire()
+        return self._send(method, url, host, timeout, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    async def request_async(self, method: str, url: str, timeout: Optional[Timeout] = None,
+                            **kwargs) -> requests.Response:
+        """
+        Send a request from asyncio code.
+
+        Waiting for the rate limit and for a concurrency slot happens on the
+        event loop; only the request itself runs on a worker thread.
+
+        Raises:
+            asyncio.TimeoutError: If the request exceeds its total timeout
+        """
+        host = (urlsplit(url).hostname or '').lower()
+        timeout = timeout or self.policy(host).timeout
+        total_timeout = sum(timeout) if isinstance(timeout, tuple) else timeout
+        await self._bucket(host).acquire_async()
+        async with self._async_slot(host):
+            loop = asyncio.get_running_loop()
+            call = partial(self._send, method, url, host, timeout, **kwargs)
+            return await asyncio.wait_for(loop.run_in_executor(self._executor(), call), total_timeout)
+
+    async def get_async(self, url: str, **kwargs) -> requests.Response:
+        return await self.request_async('GET', url, **kwargs)
+
+    async def post_async(self, url: str, **kwargs) -> requests.Response:
+        return await self.request_async('POST', url, **kwargs)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._io_executor is None:
+            with self._lock:
+                if self._io_executor is None:
+                    self._io_executor = ThreadPoolExecutor(max_workers=self.pool_maxsize, thread_name_prefix='http-io')
+        return self._io_executor
+
+    def session(self, headers: Optional[Dict[str, str]] = None) -> 'FetcherSession':
+        """Session-like view of the client with its own default headers."""
+        return FetcherSession(self, headers)
+
+    def close(self) -> None:
+        """Close pooled connections and stop the I/O threads."""
+        self._session.close()
+        if self._io_executor is not None:
+            self._io_executor.shutdown(wait=False)
+            self._io_executor = None
+
+
+class FetcherSession:
+    """
+    requests.Session-like view of the shared client.
+
+    Fetchers keep their own default headers (``session.headers.update(...)``
+    works as before) while sharing the client's connections and limits.
+    """
+
+    def __init__(self, client: SharedHTTPClient, headers: Optional[Dict[str, str]] = None):
+        self.client = client
+        self.headers = CaseInsensitiveDict(headers or {})
+
+    def _headers(self, headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+        merged = dict(self.headers)
+        merged.update(headers or {})
+        return merged
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+        return self.client.request(method, url, headers=self._headers(headers), **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    async def request_async(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                            **kwargs) -> requests.Response:
+        return await self.client.request_async(method, url, headers=self._headers(headers), **kwargs)
+
+    async def get_async(self, url: str, **kwargs) -> requests.Response:
+        return await self.request_async('GET', url, **kwargs)
+
+    async def post_async(self, url: str, **kwargs) -> requests.Response:
+        return await self.request_async('POST', url, **kwargs)
@@ -2,7 +2,8 @@
 IDF utilities: helpers for working with assembled IDF strings.
 """
 
-from typing import List, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
 
 
 def dedupe_idf_string(idf_text: str) -> str:
@@ -63,3 +64,151 @@ def dedupe_idf_string(idf_text: str) -> str:
             out_lines.append(line)
             i += 1
     return '\n'.join(out_lines)
+
+
+@dataclass
+class IDFObject:
+    """One parsed IDF object: its type, field values and per-field comments."""
+    obj_type: str
+    fields: List[str]
+    comments: List[str]
+    raw: str
+
+    @property
+    def name(self) -> str:
+        """First field of the object (the Name for almost every object type)."""
+        return self.fields[0] if self.fields else ''
+
+    def to_idf(self, overrides: Optional[Dict[int, str]] = None) -> str:
+        """
+        Format the object, replacing the given field values.
+
+        Unedited objects are returned exactly as they were read so unchanged
+        regions of a file stay byte-identical.
+        """
+        if not overrides:
+            return self.raw
+        lines = [f"{self.obj_type},"]
+        last = len(self.fields) - 1
+        for idx, value in enumerate(self.fields):
+            value = overrides.get(idx, value)
+            entry = f"  {value}{';' if idx == last else ','}"
+            comment = self.comments[idx]
+            lines.append(f"{entry:<27}!- {comment}" if comment else entry)
+        return '\n'.join(lines)
+
+
+@dataclass
+class IDFDocument:
+    """
+    Structured view of an IDF file that supports field-level edits.
+
+    The document keeps the original text between objects, so rendering
+    without overrides reproduces the input exactly. Edits are expressed as
+    ``{(object_index, field_index): value}`` overrides, which lets many
+    variants be rendered from one parsed baseline without copying it.
+    """
+    segments: List[Union[str, int]]
+    objects: List[IDFObject]
+    _by_type: Dict[str, List[int]] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        if not self._by_type:
+            for idx, obj in enumerate(self.objects):
+                self._by_type.setdefault(obj.obj_type.lower(), []).append(idx)
+
+    @classmethod
+    def from_file(cls, idf_path: str) -> 'IDFDocument':
+        """Parse an IDF file from disk."""
+        with open(idf_path, 'r', encoding='utf-8') as f:
+            return parse_idf(f.read())
+
+    def indices_of_type(self, obj_type: str) -> List[int]:
+        """Object indices for an object type (case-insensitive)."""
+        return self._by_type.get(obj_type.lower(), [])
+
+    def objects_of_type(self, obj_type: str) -> List[IDFObject]:
+        """Objects of an object type (case-insensitive), in file order."""
+        return [self.objects[i] for i in self.indices_of_type(obj_type)]
+
+    def render(self, overrides: Optional[Dict[Tuple[int, int], str]] = None) -> str:
+        """
+        Render the document as IDF text.
+
+        Args:
+            overrides: Field values to replace, keyed by (object index, field index)
+
+        Returns:
+            IDF text
+        """
+        per_object: Dict[int, Dict[int, str]] = {}
+        for (obj_idx, field_idx), value in (overrides or {}).items():
+            per_object.setdefault(obj_idx, {})[field_idx] = value
+        parts = []
+        for segment in self.segments:
+            if isinstance(segment, int):
+                parts.append(self.objects[segment].to_idf(per_object.get(segment)))
+            else:
+                parts.append(segment)
+        return '\n'.join(parts)
+
+
+def parse_idf(idf_text: str) -> IDFDocument:
+    """
+    Parse IDF text into an :class:`IDFDocument`.
+
+    Objects are split on ``,``/``;`` outside ``!`` comments. A comment is
+    attached to the last field completed on its line, which matches how the
+    generators in this package annotate fields.
+    """
+    segments: List[Union[str, int]] = []
+    objects: List[IDFObject] = []
+    between: List[str] = []
+    obj_lines: List[str] = []
+    values: List[str] = []
+    comments: List[str] = []
+    pending = ''
+
+    for line in idf_text.split('\n'):
+        code, bang, comment = line.partition('!')
+        if not obj_lines and not code.strip():
+            between.append(line)
+            continue
+        if not obj_lines and between:
+            segments.append('\n'.join(between))
+            between = []
+        obj_lines.append(line)
+
+        start = 0
+        completed_on_line = None
+        terminated = False
+        for pos, char in enumerate(code):
+            if char == ',' or char == ';':
+                values.append((pending + code[start:pos]).strip())
+                comments.append('')
+                pending = ''
+                start = pos + 1
+                completed_on_line = len(values) - 1
+                if char == ';':
+                    terminated = True
+                    break
+        if not terminated:
+            pending += code[start:]
+        if bang and completed_on_line is not None:
+            comments[completed_on_line] = comment.lstrip('-').strip()
+
+        if terminated:
+            objects.append(IDFObject(
+                obj_type=values[0],
+                fields=values[1:],
+                comments=comments[1:],
+                raw='\n'.join(obj_lines),
+            ))
+            segments.append(len(objects) - 1)
+            obj_lines, values, comments, pending = [], [], [], ''
+
+    # Unterminated trailing text is kept verbatim
+    between.extend(obj_lines)
+    if between:
+        segments.append('\n'.join(between))
+    return IDFDocument(segments=segments, objects=objects)
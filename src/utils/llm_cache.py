@@ -0,0 +1,188 @@
+"""
+Cache of LLM extraction results.
+
+Parsing a building description with an LLM takes seconds and costs money,
+and the same descriptions come back often (retries, re-generation with
+other options, batch runs). Results are cached under a key built from the
+normalized text and the provider / model / prompt version, expire after a
+TTL, and can be persisted to an SQLite file shared by several processes.
+Concurrent requests for the same key are coalesced into one call.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Environment variable naming the on-disk file of the shared cache
+LLM_CACHE_ENV = 'IDF_CREATOR_LLM_CACHE'
+
+# Cached results expire after 30 days
+DEFAULT_LLM_CACHE_TTL = 30 * 24 * 3600.0
+
+
+def normalize_text(text: str) -> str:
+    """Lower-case text with whitespace runs collapsed to single spaces."""
+    return ' '.join((text or '').lower().split())
+
+
+class LLMResponseCache:
+    """
+    TTL cache of JSON-serializable LLM results with request coalescing.
+
+    Without a path the cache lives in memory; with one it is an SQLite file,
+    so results survive restarts and are shared between worker processes.
+    """
+
+    _instances: Dict[Optional[str], 'LLMResponseCache'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: float = DEFAULT_LLM_CACHE_TTL):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Optional SQLite file to persist results in
+            ttl_seconds: Age after which a cached result is ignored
+        """
+        self.path = str(Path(path).resolve()) if path else None
+        self.ttl_seconds = ttl_seconds
+        if self.path:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path or ':memory:', check_same_thread=False, timeout=10.0)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS llm_results (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)'
+        )
+        self._db.commit()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @classmethod
+    def get_instance(cls, path: Optional[str] = None) -> 'LLMResponseCache':
+        """
+        Get the process-wide cache for ``path`` (default: $IDF_CREATOR_LLM_CACHE).
+
+        Args:
+            path: Optional SQLite file
+
+        Returns:
+            Shared cache instance
+        """
+        path = path or os.environ.get(LLM_CACHE_ENV) or None
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Close and drop all shared cache instances."""
+        with cls._instances_lock:
+            for instance in cls._instances.values():
+                instance.close()
+            cls._instances.clear()
+
+    @staticmethod
+    def make_key(text: str, *namespace: str) -> str:
+        """
+        Cache key of ``text`` (normalized) within a namespace.
+
+        Args:
+            text: Input text, e.g. a building description
+            *namespace: Provider, model, prompt version, ...
+        """
+        payload = json.dumps([list(namespace), normalize_text(text)], separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached, unexpired result or None."""
+        with self._lock:
+            return self._lookup(key)
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        """get() for callers already holding the lock."""
+        row = self._db.execute('SELECT value, created FROM llm_results WHERE key = ?', (key,)).fetchone()
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a result."""
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO llm_results (key, value, created) VALUES (?, ?, ?)',
+                (key, json.dumps(value), time.time())
+            )
+            self._db.commit()
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """
+        Return the cached result, fetching it on a miss.
+
+        Concurrent callers with the same key wait for the first caller's fetch
+        instead of starting their own. Only non-None results are stored.
+
+        Args:
+            key: Cache key (see make_key)
+            fetch: Zero-argument callable producing the result
+
+        Returns:
+            The result, or None if the fetch failed
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                # A leader may have stored the result since the check above
+                value = self._lookup(key)
+                if value is not None:
+                    self.hits += 1
+                    return value
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            self.coalesced += 1
+            return future.result()
+
+        self.misses += 1
+        try:
+            value = fetch()
+            if value is not None:
+                self.put(key, value)
+            future.set_result(value)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return value
+
+    def purge_expired(self) -> int:
+        """Delete expired results and return how many were removed."""
+        with self._lock:
+            cursor = self._db.execute('DELETE FROM llm_results WHERE created < ?', (time.time() - self.ttl_seconds,))
+            self._db.commit()
+            return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM llm_results').fetchone()[0]
@@ -0,0 +1,281 @@
+"""
+Energy meter extraction from EnergyPlus SQLite output (eplusout.sql).
+
+Facility meters are read with one grouped query that sums every reported
+value per meter, reporting frequency and month. Run period rows give the
+annual total; monthly rows (or daily / hourly / timestep rows summed by
+month when no monthly meter was requested) give the monthly series.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+ELECTRICITY_METER = 'Electricity:Facility'
+GAS_METER = 'NaturalGas:Facility'
+JOULES_PER_KWH = 3.6e6
+
+# Reporting frequencies (normalized) that can be summed into months, finest last
+_SUB_ANNUAL_FREQUENCIES = ('monthly', 'daily', 'hourly', 'timestep', 'zonetimestep', 'hvacsystemtimestep')
+
+# EnvironmentPeriods.EnvironmentType of weather-file run periods
+_WEATHER_RUN_PERIOD = 3
+
+
+def _normalize_frequency(frequency: str) -> str:
+    """'Run Period' / 'RunPeriod' -> 'runperiod', 'Zone Timestep' -> 'zonetimestep'."""
+    return (frequency or '').replace(' ', '').lower()
+
+
+def _table_names(conn: sqlite3.Connection) -> set:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+
+
+def _grouped_meter_query(tables: set, meter_count: int) -> Optional[str]:
+    """Build the grouped query for the schema present in the database."""
+    placeholders = ', '.join('?' * meter_count)
+    if {'ReportData', 'ReportDataDictionary', 'Time'} <= tables:
+        data, dictionary, index = 'ReportData', 'ReportDataDictionary', 'ReportDataDictionaryIndex'
+    elif {'ReportMeterData', 'ReportMeterDataDictionary', 'Time'} <= tables:
+        # Schema used by EnergyPlus before 8.2
+        data, dictionary, index = 'ReportMeterData', 'ReportMeterDataDictionary', 'ReportMeterDataDictionaryIndex'
+    else:
+        return None
+
+    environment = ''
+    if 'EnvironmentPeriods' in tables:
+        environment = (
+            " AND (t.EnvironmentPeriodIndex IS NULL OR t.EnvironmentPeriodIndex IN ("
+            f"SELECT EnvironmentPeriodIndex FROM EnvironmentPeriods WHERE EnvironmentType = {_WEATHER_RUN_PERIOD}))"
+        )
+    return f"""
+        SELECT d.Name, d.ReportingFrequency, t.Month, SUM(r.Value)
+        FROM {data} r
+        JOIN {dictionary} d ON r.{index} = d.{index}
+        JOIN Time t ON r.TimeIndex = t.TimeIndex
+        WHERE d.Name IN ({placeholders})
+          AND (t.WarmupFlag IS NULL OR t.WarmupFlag = 0){environment}
+        GROUP BY d.Name, d.ReportingFrequency, t.Month
+    """
+
+
+def read_meter_series(
+    sqlite_file: Union[str, Path],
+    meters: Sequence[str] = (ELECTRICITY_METER, GAS_METER),
+    include_hourly: bool = False
+) -> Dict[str, Dict]:
+    """
+    Read annual and monthly totals of facility meters in kWh.
+
+    Args:
+        sqlite_file: Path to eplusout.sql
+        meters: Meter names to read
+        include_hourly: Also read the hourly series of each meter (when reported hourly)
+
+    Returns:
+        {meter: {'annual': float, 'monthly': ndarray(12) or None, 'hourly': ndarray or None}}
+        for meters with any data
+    """
+    conn = sqlite3.connect(str(sqlite_file))
+    try:
+        tables = _table_names(conn)
+        query = _grouped_meter_query(tables, len(meters))
+        if query is None:
+            return {}
+
+        # {meter: {frequency: ndarray(13)}} indexed by month (index 0 unused)
+        sums: Dict[str, Dict[str, np.ndarray]] = {}
+        for name, frequency, month, value in conn.execute(query, tuple(meters)):
+            by_month = sums.setdefault(name, {}).setdefault(_normalize_frequency(frequency), np.zeros(13))
+            if month and 1 <= month <= 12:
+                by_month[month] += value or 0.0
+            else:
+                by_month[0] += value or 0.0
+
+        series = {}
+        for name, frequencies in sums.items():
+            monthly = None
+            for frequency in _SUB_ANNUAL_FREQUENCIES:
+                if frequency in frequencies:
+                    monthly = frequencies[frequency][1:] / JOULES_PER_KWH
+                    break
+            if 'runperiod' in frequencies:
+                annual = float(frequencies['runperiod'].sum() / JOULES_PER_KWH)
+            elif 'annual' in frequencies:
+                annual = float(frequencies['annual'].sum() / JOULES_PER_KWH)
+            else:
+                annual = float(monthly.sum()) if monthly is not None else 0.0
+            series[name] = {'annual': annual, 'monthly': monthly, 'hourly': None}
+
+        if include_hourly and series and 'ReportData' in tables:
+            rows = conn.execute("""
+                SELECT d.Name, r.Value
+                FROM ReportData r
+                JOIN ReportDataDictionary d ON r.ReportDataDictionaryIndex = d.ReportDataDictionaryIndex
+                JOIN Time t ON r.TimeIndex = t.TimeIndex
+                WHERE d.Name IN ({}) AND d.ReportingFrequency = 'Hourly'
+                  AND (t.WarmupFlag IS NULL OR t.WarmupFlag = 0)
+                ORDER BY r.TimeIndex
+            """.format(', '.join('?' * len(meters))), tuple(meters)).fetchall()
+            for name in series:
+                values = [value for row_name, value in rows if row_name == name]
+                if values:
+                    series[name]['hourly'] = np.asarray(values, dtype=float) / JOULES_PER_KWH
+        return series
+    finally:
+        conn.close()
+
+
+def read_run_period_names(sqlite_file: Union[str, Path]) -> List[str]:
+    """
+    Names (upper case) of the weather-file run periods in the SQLite output, in run order.
+
+    Args:
+        sqlite_file: Path to eplusout.sql
+
+    Returns:
+        Run period names; empty if the output has no EnvironmentPeriods table
+    """
+    conn = sqlite3.connect(str(sqlite_file))
+    try:
+        if 'EnvironmentPeriods' not in _table_names(conn):
+            return []
+        rows = conn.execute(
+            "SELECT EnvironmentName FROM EnvironmentPeriods WHERE EnvironmentType = ? "
+            "ORDER BY EnvironmentPeriodIndex", (_WEATHER_RUN_PERIOD,)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [(name or '').upper() for name, in rows]
+
+
+def read_environment_totals(
+    sqlite_file: Union[str, Path],
+    meters: Sequence[str] = (ELECTRICITY_METER, GAS_METER)
+) -> Dict[str, Dict[str, float]]:
+    """
+    Read meter totals per weather-file run period in kWh.
+
+    Used when an IDF has several RunPeriods (e.g. representative weeks):
+    each run period is an environment of its own in the SQLite output.
+
+    Args:
+        sqlite_file: Path to eplusout.sql
+        meters: Meter names to read
+
+    Returns:
+        {run period name (upper case): {meter: kWh}} for meters with any data
+    """
+    conn = sqlite3.connect(str(sqlite_file))
+    try:
+        tables = _table_names(conn)
+        if not {'ReportData', 'ReportDataDictionary', 'Time', 'EnvironmentPeriods'} <= tables:
+            return {}
+        rows = conn.execute(f"""
+            SELECT e.EnvironmentName, d.Name, d.ReportingFrequency, SUM(r.Value)
+            FROM ReportData r
+            JOIN ReportDataDictionary d ON r.ReportDataDictionaryIndex = d.ReportDataDictionaryIndex
+            JOIN Time t ON r.TimeIndex = t.TimeIndex
+            JOIN EnvironmentPeriods e ON t.EnvironmentPeriodIndex = e.EnvironmentPeriodIndex
+            WHERE d.Name IN ({', '.join('?' * len(meters))})
+              AND (t.WarmupFlag IS NULL OR t.WarmupFlag = 0)
+              AND e.EnvironmentType = {_WEATHER_RUN_PERIOD}
+            GROUP BY e.EnvironmentName, d.Name, d.ReportingFrequency
+        """, tuple(meters)).fetchall()
+    finally:
+        conn.close()
+
+    # Every reporting frequency sums to the same total; prefer the run period meter
+    preference = ('runperiod', 'annual') + _SUB_ANNUAL_FREQUENCIES
+    totals: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for environment, name, frequency, value in rows:
+        totals.setdefault((environment or '').upper(), {}).setdefault(name, {})[_normalize_frequency(frequency)] = value or 0.0
+    return {
+        environment: {
+            name: next(by_frequency[f] for f in preference + tuple(by_frequency) if f in by_frequency) / JOULES_PER_KWH
+            for name, by_frequency in by_meter.items()
+        }
+        for environment, by_meter in totals.items()
+    }
+
+
+def extract_energy_results(sqlite_file: Union[str, Path], include_hourly: bool = False,
+                           weather_file: Optional[Union[str, Path]] = None) -> Dict:
+    """
+    Extract facility electricity and gas results in the format used by the
+    calibration and retrofit modules.
+
+    Monthly electricity falls back to an even split of the annual total when
+    the run did not report a sub-annual meter; ``monthly_measured`` says which.
+
+    A run with several weather-file run periods does not cover the year.
+    Representative-week runs are extrapolated to annual estimates (see
+    representative_periods) when the weather file they were selected from
+    is given; otherwise the periods are summed with a warning.
+
+    Args:
+        sqlite_file: Path to eplusout.sql
+        include_hourly: Also return the hourly electricity series
+        weather_file: Weather file of the run (for representative-week runs)
+
+    Returns:
+        Dictionary with 'annual_kwh', 'monthly_kwh', 'monthly_measured',
+        'gas_annual_kwh', 'monthly_gas_kwh' and, if requested, 'hourly_kwh'
+    """
+    run_periods = read_run_period_names(sqlite_file)
+    if len(run_periods) > 1:
+        # Imported here: representative_periods reads its totals through this module
+        from ..representative_periods import extract_representative_results, selection_for_run_periods
+
+        selection = selection_for_run_periods(weather_file, run_periods) if weather_file else None
+        if selection is not None:
+            results = extract_representative_results(sqlite_file, selection)
+            if include_hourly:
+                results['hourly_kwh'] = []
+            return results
+        print(f"⚠️  {len(run_periods)} weather run periods in {sqlite_file}; "
+              f"annual totals only cover the simulated periods")
+
+    series = read_meter_series(sqlite_file, include_hourly=include_hourly)
+    electricity = series.get(ELECTRICITY_METER, {'annual': 0.0, 'monthly': None, 'hourly': None})
+    gas = series.get(GAS_METER, {'annual': 0.0, 'monthly': None, 'hourly': None})
+
+    annual_kwh = electricity['annual']
+    monthly_measured = electricity['monthly'] is not None
+    monthly = electricity['monthly'] if monthly_measured else np.full(12, annual_kwh / 12.0)
+
+    results = {
+        'annual_kwh': annual_kwh,
+        'monthly_kwh': monthly.tolist(),
+        'monthly_measured': monthly_measured,
+        'gas_annual_kwh': gas['annual'],
+        'monthly_gas_kwh': gas['monthly'].tolist() if gas['monthly'] is not None else [],
+    }
+    if include_hourly:
+        results['hourly_kwh'] = electricity['hourly'].tolist() if electricity['hourly'] is not None else []
+    return results
+
+
+def calibration_metrics(simulated: Sequence[float], measured: Sequence[float]) -> Dict[str, float]:
+    """
+    Mean bias error and CV(RMSE) of a simulated series against measured data.
+
+    Returns:
+        {'mbe': |MBE| (%), 'cvrmse': CV(RMSE) (%)}; CV(RMSE) is 100 when the
+        series cannot be compared
+    """
+    simulated = np.asarray(simulated, dtype=float)
+    measured = np.asarray(measured, dtype=float)
+    if simulated.shape != measured.shape or measured.size == 0:
+        return {'mbe': 0.0, 'cvrmse': 100.0}
+
+    errors = simulated - measured
+    mean_measured = measured.mean()
+    if mean_measured <= 0:
+        return {'mbe': 0.0, 'cvrmse': 100.0}
+    return {
+        'mbe': float(abs(errors.mean() / mean_measured * 100)),
+        'cvrmse': float(np.sqrt(np.mean(errors ** 2)) / mean_measured * 100),
+    }
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test batched calibration: parameter sets sampled per round, a fitted
+adjustment, and reuse of the baseline simulation.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from src.model_calibration import ModelCalibrator, UtilityData
+from src.utils.idf_utils import parse_idf
+
+
+BASELINE_IDF = """Version,24.2;
+
+Lights,
+  Zone1_Lights,            !- Name
+  Zone1,                   !- Zone or ZoneList Name
+  LIGHTING_SCHEDULE,       !- Schedule Name
+  Watts/Area,              !- Design Level Calculation Method
+  ,                        !- Lighting Level {W}
+  10.0,                    !- Watts per Zone Floor Area {W/m2}
+  ,                        !- Watts per Person {W/person}
+  0.0;                     !- Return Air Fraction
+
+ElectricEquipment,
+  Zone1_Equipment,         !- Name
+  Zone1,                   !- Zone or ZoneList Name
+  EQUIPMENT_SCHEDULE,      !- Schedule Name
+  Watts/Area,              !- Design Level Calculation Method
+  ,                        !- Design Level {W}
+  8.0,                     !- Watts per Zone Floor Area {W/m2}
+  ,                        !- Watts per Person {W/person}
+  0.0;                     !- Fraction Latent
+
+Coil:Cooling:DX:SingleSpeed,
+  Zone1_CoolingCoilDX,
+  Always On,
+  20000.0,
+  0.68,
+  3.0,
+  1.2;
+"""
+
+
+def _fake_simulation(calls):
+    """Energy model linear in LPD / EPD and inverse in COP, with a seasonal shape."""
+    shape = np.array([1.3, 1.2, 1.0, 0.9, 0.85, 0.95, 1.1, 1.1, 0.9, 0.85, 0.95, 1.2])
+
+    def run(self, idf_file, weather_file, output_dir):
+        calls.append(str(output_dir))
+        doc = parse_idf(Path(idf_file).read_text())
+        lpd = float(doc.objects_of_type('Lights')[0].fields[5])
+        epd = float(doc.objects_of_type('ElectricEquipment')[0].fields[5])
+        cop = float(doc.objects_of_type('Coil:Cooling:DX:SingleSpeed')[0].fields[4])
+        annual = 10000.0 * lpd + 8000.0 * epd + 90000.0 / cop
+        return {'annual_kwh': annual, 'monthly_kwh': list(annual * shape / shape.sum())}
+
+    return run
+
+
+def test_batched_calibration_converges_in_few_rounds(tmp_path, monkeypatch):
+    """Batched rounds fit the adjustment and reuse the baseline simulation."""
+    idf_path = tmp_path / 'baseline.idf'
+    idf_path.write_text(BASELINE_IDF)
+    weather_path = tmp_path / 'weather.epw'
+    weather_path.write_text('LOCATION,Test')
+
+    calls = []
+    monkeypatch.setattr(ModelCalibrator, '_run_simulation', _fake_simulation(calls))
+
+    # Bills 25% below the baseline (214,000 kWh) with the same seasonal shape
+    baseline = ModelCalibrator._run_simulation(None, str(idf_path), '', tmp_path)
+    utility_data = UtilityData(monthly_kwh=[kwh * 0.75 for kwh in baseline['monthly_kwh']])
+    calls.clear()
+
+    calibrator = ModelCalibrator(energyplus_path='energyplus')
+    result = calibrator.calibrate_to_utility_bills(
+        str(idf_path),
+        utility_data,
+        str(weather_path),
+        tolerance=0.05,
+        max_iterations=4,
+        output_dir=str(tmp_path / 'calibration'),
+        batch_size=6,
+        max_concurrent=1,
+        seed=3
+    )
+
+    assert result.converged
+    assert result.iterations <= 4
+    assert result.accuracy_annual <= 5.0
+    assert result.accuracy_monthly_cvrmse <= 15.0
+    # The baseline is simulated once and the report reuses the best result
+    assert sum(call.endswith('baseline') for call in calls) == 1
+    assert not any('final_calibrated' in call for call in calls)
+    assert Path(result.calibrated_idf_path).exists()
+    assert set(result.adjusted_parameters) == {
+        'infiltration', 'lighting_multiplier', 'equipment_multiplier', 'hvac_efficiency'
+    }
+
+
+def test_coordinate_sampling_perturbs_each_parameter():
+    """Coordinate sampling yields a ± perturbation per parameter within bounds."""
+    center = np.zeros(4)
+    samples = ModelCalibrator._sample_parameter_sets(
+        center, 0.2, 0, 'coordinate', np.random.default_rng(0), np.log(0.5), np.log(2.0)
+    )
+    assert len(samples) == 8
+    assert all(np.count_nonzero(s) == 1 for s in samples)
+    assert np.allclose(sum(samples), 0.0)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test the indexed construction lookup against the original linear scan.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.professional_material_library import ProfessionalMaterialLibrary
+
+
+def _linear_scan(library, building_type, climate_zone, surface_type):
+    """Selection rule of the original implementation (None -> basic construction)."""
+    cz_category = library.climate_zones.get(climate_zone, '3-4')
+    for name, construction in library.constructions.items():
+        if (construction.climate_zone == cz_category and
+                construction.building_type in [building_type, 'All'] and
+                surface_type.lower() in name.lower()):
+            return name
+    for construction in library.constructions.values():
+        if surface_type.lower() in construction.name.lower():
+            return construction.name
+    return None
+
+
+def test_index_matches_linear_scan():
+    """Every combination resolves to the construction the linear scan picked."""
+    library = ProfessionalMaterialLibrary()
+    for building_type in ['office', 'Residential', 'All', 'retail']:
+        for climate_zone in list(library.climate_zones) + ['unknown']:
+            for surface_type in ['wall', 'Roof', 'floor', 'window']:
+                expected = _linear_scan(library, building_type, climate_zone, surface_type)
+                selected = library.get_construction_assembly(building_type, climate_zone, surface_type, 1995, 'gold')
+                assert selected.name == expected, (building_type, climate_zone, surface_type)
+
+
+def test_selection_is_cached_and_falls_back_to_basic():
+    """Repeated selections reuse the cached construction; unknown surfaces get a basic one."""
+    library = ProfessionalMaterialLibrary()
+    first = library.get_envelope_constructions('Residential', '3A', 2015, None)
+    assert first['wall'].name == 'Wall_SteelFrame_R19_CZ3_4'
+    assert library.get_envelope_constructions('Residential', '3A', 2015, None)['wall'] is first['wall']
+
+    ceiling = library.get_construction_assembly('office', '5A', 'ceiling_wall_interior', 2000)
+    assert ceiling.name == 'Basic_Wall'
+    assert library.get_construction_assembly('office', '5A', 'ceiling_wall_interior', 2000) is ceiling
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test context shading from surrounding buildings: obstruction-angle and sun
+path culling, merging of touching neighbours, the surface budget and the
+Shading:Building:Detailed objects in the generated IDF.
+"""
+
+import contextlib
+import io
+import math
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+from shapely.geometry import Polygon
+
+from src.context_shading import EARTH_RADIUS_M, ContextShadingBuilder, sun_path
+from src.geometry_utils import calculate_surface_normal
+
+LAT, LON = 40.0, -105.0
+SITE = Polygon([(-10, -10), (10, -10), (10, 10), (-10, 10)])
+
+
+def _neighbour(x, y, width=10.0, depth=10.0, height=None, levels=None):
+    """OSM area-search result for a box centered (x, y) meters from the site."""
+    corners = [(x - width / 2, y - depth / 2), (x + width / 2, y - depth / 2),
+               (x + width / 2, y + depth / 2), (x - width / 2, y + depth / 2)]
+    footprint = [(LAT + math.degrees(cy / EARTH_RADIUS_M),
+                  LON + math.degrees(cx / (EARTH_RADIUS_M * math.cos(math.radians(LAT)))))
+                 for cx, cy in corners]
+    return {'footprint': footprint + footprint[:1], 'tags': {},
+            'properties': {'building': 'yes', 'levels': levels, 'height': height}}
+
+
+def test_culls_low_distant_and_sunless_neighbours():
+    """Only neighbours tall enough for their distance and on the sun side are kept."""
+    builder = ContextShadingBuilder()
+    buildings = [
+        _neighbour(0, 0, width=18, depth=18, height=30),  # the site building itself
+        _neighbour(0, -30, height=20),                    # south, tall: shades
+        _neighbour(0, 30, height=20),                     # north: the sun never stands behind it
+        _neighbour(60, -60, height=4),                    # low for its distance
+        _neighbour(0, -400, height=200),                  # outside the search radius
+        _neighbour(-35, 0, levels=5),                     # west, height from levels
+    ]
+    neighbours = builder.neighbours_from_osm(buildings, LAT, LON, SITE)
+    assert len(neighbours) == 5
+    assert neighbours[-1].height == 15.0
+
+    blocks = builder.select(neighbours, SITE, LAT)
+    centers = sorted((round(b.polygon.centroid.x), round(b.polygon.centroid.y)) for b in blocks)
+    assert centers == [(-35, 0), (0, -30)]
+    # The south neighbour blocks more of the sun path and ranks first
+    assert (round(blocks[0].polygon.centroid.x), round(blocks[0].polygon.centroid.y)) == (0, -30)
+    assert all(b.obstruction_angle >= builder.min_obstruction_angle for b in blocks)
+
+    # A wider search radius for this site keeps the distant tower
+    wider = builder.select(neighbours, SITE, LAT, radius=450.0)
+    assert (0, -400) in [(round(b.polygon.centroid.x), round(b.polygon.centroid.y)) for b in wider]
+
+
+def test_sun_path_spans_the_solar_year():
+    """Noon elevations range between the winter and summer solstice altitudes."""
+    azimuth, elevation = sun_path(LAT)
+    assert elevation.min() > 0
+    assert elevation.max() == pytest.approx(90 - LAT + 23.44, abs=1.0)
+    assert azimuth.min() < 90 < 270 < azimuth.max()
+
+
+def test_touching_neighbours_of_similar_height_merge():
+    """A terrace becomes one block; a much taller neighbour stays separate."""
+    builder = ContextShadingBuilder()
+    terrace = [_neighbour(x, -30, width=8.0, height=12.0 + 0.5 * i) for i, x in enumerate(range(-16, 17, 8))]
+    tower = _neighbour(24, -30, width=8.0, height=60.0)
+    blocks = builder.select(builder.neighbours_from_osm(terrace + [tower], LAT, LON, SITE), SITE, LAT)
+
+    assert len(blocks) == 2
+    merged = next(b for b in blocks if b.source_count == 5)
+    assert abs(merged.polygon.area - 5 * 80.0) < 1.0
+    assert 12.0 < merged.height < 14.0
+
+    surfaces = builder.build_surfaces(terrace + [tower], LAT, LON, SITE)
+    assert len(surfaces) == 2 * (4 + 1)
+
+
+def test_surface_budget_and_orientation():
+    """A dense neighbourhood is emitted within budget, most shading blocks first."""
+    builder = ContextShadingBuilder(max_surfaces=30)
+    rng = np.random.default_rng(3)
+    buildings = [_neighbour(x, y, width=7.0, depth=7.0, height=float(rng.uniform(8, 40)))
+                 for x in range(-120, 121, 20) for y in range(-120, 121, 20) if abs(x) > 25 or abs(y) > 25]
+    with contextlib.redirect_stdout(io.StringIO()):
+        surfaces = builder.build_surfaces(buildings, LAT, LON, SITE)
+
+    assert 0 < len(surfaces) <= 30
+    assert len({s['name'] for s in surfaces}) == len(surfaces)
+    for surface in surfaces:
+        vertices = [tuple(float(v) for v in vertex.split(',')) for vertex in surface['vertices']]
+        normal = calculate_surface_normal(vertices)
+        if surface['name'].endswith('_Roof'):
+            assert normal[2] > 0.99
+            continue
+        # Walls face away from their own block
+        block = surface['name'].rsplit('_Wall_', 1)[0]
+        roof = next(s for s in surfaces if s['name'] == f"{block}_Roof")
+        roof_xy = np.array([[float(c) for c in v.split(',')[:2]] for v in roof['vertices']]).mean(axis=0)
+        wall_xy = np.array([v[:2] for v in vertices]).mean(axis=0)
+        assert np.dot(wall_xy - roof_xy, normal[:2]) > 0
+
+
+def test_generator_emits_context_shading():
+    """Context buildings in the location data become Shading:Building:Detailed objects."""
+    from src.professional_idf_generator import ProfessionalIDFGenerator
+
+    generator = ProfessionalIDFGenerator()
+    location = {'latitude': LAT, 'longitude': LON, 'climate_zone': 'ASHRAE_C5', 'time_zone': -7,
+                'elevation': 1600, 'weather_file': 'USA_CO_Denver.Intl.AP.725650_TMY3.epw'}
+    params = {'building_type': 'Office', 'stories': 2, 'floor_area': 1600, 'name': 'Context'}
+
+    np.random.seed(5)
+    with contextlib.redirect_stdout(io.StringIO()):
+        plain = generator.generate_professional_idf('x', dict(params), dict(location))
+    assert 'Shading:Building:Detailed' not in plain
+
+    location['building'] = {'context_buildings': [_neighbour(0, -45, width=30, height=25),
+                                                  _neighbour(0, 60, width=30, height=25)]}
+    np.random.seed(5)
+    with contextlib.redirect_stdout(io.StringIO()):
+        shaded = generator.generate_professional_idf('x', dict(params), location)
+    assert shaded.count('Shading:Building:Detailed,') == 5
+    assert 'Context_1_Roof' in shaded
+
+    # The radius requested for the area search also bounds the culling
+    location['building'] = {'context_buildings': [_neighbour(0, -250, width=30, height=150)]}
+    for radius, expected in ((None, 0), (300.0, 5)):
+        np.random.seed(5)
+        with contextlib.redirect_stdout(io.StringIO()):
+            far = generator.generate_professional_idf('x', dict(params, context_shading_radius=radius), location)
+        assert far.count('Shading:Building:Detailed,') == expected
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Test LLM description parsing with a local stub provider: the pattern fast
+path, the persistent TTL cache, request coalescing, batch mode and the
+per-key providers and parsers shared by the web API.
+"""
+
+import json
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from src.nlp_building_parser import BuildingDescriptionParser, LLMProvider, OpenAIProvider
+from src.utils.llm_cache import LLMResponseCache
+
+# Needs the LLM: no stories or size in the text
+VAGUE = 'A mid-century hospital wing with a central plant'
+
+
+class StubProvider(LLMProvider):
+    """Answers extraction prompts locally and records each call."""
+    name = 'stub'
+    model = 'stub-1'
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = []
+        self.delay = delay
+
+    def complete(self, system_prompt, user_prompt, max_tokens=500):
+        self.calls.append(user_prompt)
+        time.sleep(self.delay)
+        answer = {'building_type': 'hospital', 'stories': 4, 'area': 12000.0, 'hvac_system': 'chilled_water'}
+        if 'each of these descriptions' in user_prompt:
+            items = json.loads(user_prompt.split(': ', 1)[1])
+            # Leave out the last item to exercise the pattern fallback
+            return '```json\n' + json.dumps([dict(answer, id=item['id'], stories=item['id'] + 1)
+                                              for item in items[:-1]]) + '\n```'
+        return json.dumps(answer)
+
+
+def test_fast_path_skips_llm_for_complete_descriptions(tmp_path):
+    """Type, stories and size all matched: no LLM call; otherwise the LLM result is used."""
+    provider = StubProvider()
+    parser = BuildingDescriptionParser(provider=provider, cache=LLMResponseCache(str(tmp_path / 'llm.sqlite')))
+
+    parsed = parser.parse_description('A 5-story office building of 50,000 sq ft built in 1990')
+    assert provider.calls == []
+    assert parsed['stories'] == 5
+    assert parsed['year_built'] == 1990
+    assert round(parsed['area']) == 4645
+
+    parsed = parser.parse_description(VAGUE)
+    assert len(provider.calls) == 1
+    assert parsed['stories'] == 4
+    assert parsed['special_features'] == []
+
+
+def test_cache_persists_and_normalizes_descriptions(tmp_path):
+    """Results survive a new parser / process and ignore case and whitespace; TTL expires them."""
+    path = str(tmp_path / 'llm.sqlite')
+    provider = StubProvider()
+    BuildingDescriptionParser(provider=provider, cache=LLMResponseCache(path)).parse_description(VAGUE)
+
+    warm = BuildingDescriptionParser(provider=provider, cache=LLMResponseCache(path))
+    assert warm.parse_description('  ' + VAGUE.upper().replace(' ', '   '))['building_type'] == 'hospital'
+    assert len(provider.calls) == 1
+
+    expired = BuildingDescriptionParser(provider=provider, cache=LLMResponseCache(path, ttl_seconds=0.0))
+    time.sleep(0.01)
+    expired.parse_description(VAGUE)
+    assert len(provider.calls) == 2
+
+
+def test_concurrent_identical_descriptions_share_one_call():
+    """Threads asking for the same description wait for one in-flight request."""
+    provider = StubProvider(delay=0.2)
+    cache = LLMResponseCache()
+    parser = BuildingDescriptionParser(provider=provider, cache=cache)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(parser.parse_description(VAGUE))) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(provider.calls) == 1
+    assert len(results) == 6 and all(result == results[0] for result in results)
+    assert cache.coalesced == 5
+
+
+def test_result_stored_by_a_finishing_leader_is_not_fetched_again():
+    """A miss is re-checked under the lock, so a leader finishing in between is not repeated."""
+    cache = LLMResponseCache()
+    key = cache.make_key(VAGUE, 'stub')
+    cache.put(key, {'stories': 4})
+    # The unlocked check saw the miss just before the leader stored its result
+    cache.get = lambda _key: None
+    calls = []
+    assert cache.get_or_fetch(key, lambda: calls.append(1) or {'stories': 5}) == {'stories': 4}
+    assert calls == []
+
+
+def test_openai_providers_keep_their_own_keys(monkeypatch):
+    """Two keys used one after the other: every request is sent with its own provider's key."""
+    sent = []
+
+    class StubOpenAI:
+        def __init__(self, api_key=None, timeout=None):
+            completions = types.SimpleNamespace(create=lambda **kwargs: sent.append(api_key) or types.SimpleNamespace(
+                choices=[types.SimpleNamespace(message=types.SimpleNamespace(content='{}'))]))
+            self.chat = types.SimpleNamespace(completions=completions)
+
+    monkeypatch.setitem(sys.modules, 'openai', types.SimpleNamespace(OpenAI=StubOpenAI))
+    first, second = OpenAIProvider('key-a'), OpenAIProvider('key-b')
+    first.complete('system', 'user')
+    second.complete('system', 'user')
+    first.complete('system', 'user')
+    assert sent == ['key-a', 'key-b', 'key-a']
+
+    with pytest.raises(TypeError):
+        LLMProvider()
+
+
+def test_batch_mode_groups_llm_requests():
+    """Only uncached, ambiguous, distinct descriptions are sent, several per call."""
+    provider = StubProvider()
+    parser = BuildingDescriptionParser(provider=provider, cache=LLMResponseCache())
+    vague = [f'{VAGUE} number {i}' for i in range(5)]
+    descriptions = vague + ['', 'A 3 story retail store of 2000 sq ft', vague[0]]
+
+    results = parser.parse_descriptions(descriptions, batch_size=3)
+
+    assert len(provider.calls) == 2
+    sent = [json.loads(call.split(': ', 1)[1]) for call in provider.calls]
+    assert [len(items) for items in sent] == [3, 2]
+    # Batch ids map back to their descriptions; the item missing from each response falls back
+    assert [result['stories'] for result in results[:5]] == [1, 2, None, 1, None]
+    assert results[5]['building_type'] == 'office' and results[5]['stories'] is None
+    assert results[6]['building_type'] == 'retail'
+    assert results[7] == results[0]
+
+    # A second batch is served from the cache, except the fallbacks
+    provider.calls.clear()
+    parser.parse_descriptions(vague[:2] + [vague[3]])
+    assert provider.calls == []
+
+
+def test_api_reuses_parser_per_provider():
+    """/api/generate requests share one parser per LLM configuration."""
+    import web_interface
+
+    assert web_interface.get_description_parser() is web_interface.get_description_parser('none', None)
+    keyed = web_interface.get_description_parser('anthropic', 'key')
+    assert keyed is web_interface.get_description_parser('anthropic', 'key')
+    assert keyed is not web_interface.get_description_parser()
+    # Raw keys are not held as dictionary keys
+    assert all('key' not in key for key in web_interface._description_parsers)
+
+
+def test_api_parsers_are_evicted_least_recently_used(monkeypatch):
+    """Past the limit the least recently used parser goes; recently used ones stay."""
+    import web_interface
+
+    monkeypatch.setattr(web_interface, '_description_parsers', web_interface.OrderedDict())
+    monkeypatch.setattr(web_interface, 'MAX_DESCRIPTION_PARSERS', 3)
+    parsers = [web_interface.get_description_parser('anthropic', f'key-{i}') for i in range(3)]
+    assert web_interface.get_description_parser('anthropic', 'key-0') is parsers[0]
+    web_interface.get_description_parser('anthropic', 'key-3')
+
+    assert len(web_interface._description_parsers) == 3
+    assert parsers[1] not in web_interface._description_parsers.values()
+    assert web_interface.get_description_parser('anthropic', 'key-0') is parsers[0]
+    assert web_interface.get_description_parser('anthropic', 'key-2') is parsers[2]
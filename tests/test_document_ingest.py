@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test document ingest: page streaming with early stop, PDFs split into page
+ranges across a process pool, document batches and the OCR text cache.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.document_parser as document_parser
+from src.document_parser import DocumentParser, OCRTextCache
+
+FILLER = 'Mechanical room inspection notes. ' * 20
+
+# Every target field, with "floor area" split across the page break
+PAGES = [FILLER + 'The office tower was built 1984 and has 12 story levels.',
+         FILLER + 'Measured floor',
+         ' area: 5400 m2 total. ' + FILLER,
+         'Glazing: window 40% of facade.',
+         'Appendix: a residential annex built 2001.']
+
+
+def _fake_pdf(monkeypatch, pages, read_log=None):
+    """Serve page texts for any .pdf path, recording which pages are read."""
+    def iter_pages(pdf_path, start=0, stop=None):
+        for index in range(start, len(pages) if stop is None else min(stop, len(pages))):
+            if read_log is not None:
+                read_log.append(index)
+            yield pages[index]
+    monkeypatch.setattr(document_parser, 'pdf_page_count', lambda pdf_path: len(pages))
+    monkeypatch.setattr(document_parser, 'iter_pdf_pages', iter_pages)
+
+
+def test_pages_stream_until_all_fields_found(tmp_path, monkeypatch):
+    """Pages are read in order and reading stops at the page completing the fields."""
+    read = []
+    _fake_pdf(monkeypatch, PAGES, read)
+    params = DocumentParser(ocr_cache=OCRTextCache(), max_workers=1).parse_pdf(str(tmp_path / 'audit.pdf'))
+
+    assert read == [0, 1, 2, 3]
+    assert params == {'building_type': 'Office', 'year_built': 1984, 'stories': 12,
+                      'floor_area': 5400.0, 'window_to_wall_ratio': 0.4}
+
+    # Same result as parsing the whole document at once
+    assert DocumentParser(ocr_cache=OCRTextCache()).parse_text(''.join(PAGES[:4])) == params
+
+
+def test_large_pdf_page_ranges_parse_in_pool(tmp_path, monkeypatch):
+    """A PDF split over workers merges ranges in page order and skips later ranges."""
+    pages = [FILLER] * (document_parser.PDF_PAGE_CHUNK * 6)
+    pages[3] = 'A hotel of 7 story height.'
+    pages[document_parser.PDF_PAGE_CHUNK * 2 - 1] = FILLER + 'Gross floor'
+    pages[document_parser.PDF_PAGE_CHUNK * 2] = ' area 900 sqm; window 30% glazed; built 1962.'
+    pages[-1] = 'A school built 2020 of 2 story.'
+    _fake_pdf(monkeypatch, pages)
+    monkeypatch.setattr(document_parser, 'resolve_worker_count', lambda requested, memory: requested)
+
+    params = DocumentParser(ocr_cache=OCRTextCache(), max_workers=3).parse_pdf(str(tmp_path / 'audit.pdf'))
+
+    assert params == {'building_type': 'Hotel', 'stories': 7, 'floor_area': 900.0,
+                      'window_to_wall_ratio': 0.3, 'year_built': 1962}
+    assert params == DocumentParser(ocr_cache=OCRTextCache(), max_workers=1).parse_pdf('audit.pdf')
+
+
+def test_ocr_text_cached_by_file_hash(tmp_path, monkeypatch):
+    """Identical scans are OCRed once, also across parsers sharing a cache directory."""
+    calls = []
+    monkeypatch.setattr(document_parser, 'ocr_image',
+                        lambda path: calls.append(path) or 'Retail store, 2 story, built 1999')
+    first = tmp_path / 'scan.png'
+    first.write_bytes(b'scan-bytes')
+    copy = tmp_path / 'scan_copy.png'
+    copy.write_bytes(b'scan-bytes')
+
+    cache_dir = str(tmp_path / 'ocr')
+    parser = DocumentParser(ocr_cache=OCRTextCache(cache_dir))
+    assert parser.parse_image(str(first)) == {'stories': 2, 'building_type': 'Retail', 'year_built': 1999}
+    assert parser.parse_image(str(copy))['stories'] == 2
+    assert len(calls) == 1
+
+    warm = DocumentParser(ocr_cache=OCRTextCache(cache_dir))
+    assert warm.parse_image(str(copy))['year_built'] == 1999
+    assert len(calls) == 1 and warm.ocr_cache.hits == 1
+
+
+def test_document_batch_keeps_order_and_collects_ocr(tmp_path, monkeypatch):
+    """Batch results follow the input order; worker OCR text lands in the parent cache."""
+    monkeypatch.setattr(document_parser, 'ocr_image', lambda path: f'{Path(path).stem} built 1975')
+    monkeypatch.setattr(document_parser, 'resolve_worker_count', lambda requested, memory: requested)
+    paths = []
+    for i, text in enumerate(['3 story warehouse', 'floor area 250 m2']):
+        path = tmp_path / f'notes_{i}.txt'
+        path.write_text(text)
+        paths.append(str(path))
+    scan = tmp_path / 'elevation.png'
+    scan.write_bytes(b'elevation')
+    paths.append(str(scan))
+
+    cache = OCRTextCache()
+    results = DocumentParser(ocr_cache=cache, max_workers=2).parse_documents(paths)
+    assert results == [{'stories': 3, 'building_type': 'Warehouse'}, {'floor_area': 250.0}, {'year_built': 1975}]
+    assert len(cache) == 1
+
+    # The scan is now served from the cache without a worker
+    monkeypatch.setattr(document_parser, 'ocr_image', lambda path: 1 / 0)
+    assert DocumentParser(ocr_cache=cache, max_workers=1).parse_documents([str(scan)]) == [{'year_built': 1975}]
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test that the geometry engine lays out each distinct floor plate once and
+stacks it: shared zone polygons, per-floor names and adjacencies, and
+surfaces identical to generating every zone from scratch.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from shapely.geometry import Polygon
+
+from src.advanced_geometry_engine import AdvancedGeometryEngine, BuildingFootprint
+
+L_SHAPE = Polygon([(0, 0), (60, 0), (60, 40), (30, 40), (30, 25), (0, 25)])
+
+
+def _footprint(stories):
+    return BuildingFootprint(polygon=L_SHAPE, height=3.0 * stories, stories=stories,
+                             building_type='office', roof_type='flat')
+
+
+def _zones_by_floor(zones):
+    floors = {}
+    for zone in zones:
+        floors.setdefault(zone.floor_level, []).append(zone)
+    return floors
+
+
+def _pairwise_adjacency(zones):
+    """Reference adjacency: names of the touching (or nearly touching) zones on the same floor."""
+    return [[other.name for other in zones
+             if other is not zone and other.floor_level == zone.floor_level
+             and (zone.polygon.touches(other.polygon) or zone.polygon.distance(other.polygon) < 0.1)]
+            for zone in zones]
+
+
+def test_layout_computed_once_per_plate(monkeypatch):
+    """A 40-story tower partitions its plate once; every floor gets its own named copies."""
+    engine = AdvancedGeometryEngine()
+    calls = []
+    original = engine._generate_floor_zones
+    monkeypatch.setattr(engine, '_generate_floor_zones', lambda *args: calls.append(args[1]) or original(*args))
+    np.random.seed(11)
+
+    zones = engine.generate_zone_layout(_footprint(40), 'office')
+
+    assert calls == [0]
+    floors = _zones_by_floor(zones)
+    assert sorted(floors) == list(range(40))
+    ground, top = floors[0], floors[39]
+    assert len(top) == len(ground)
+    for below, above in zip(ground, top):
+        assert above.polygon is below.polygon
+        assert above.name == below.name.rsplit('_', 1)[0] + '_39'
+        assert above.area == below.area
+        assert [name.rsplit('_', 1)[0] for name in above.adjacent_zones] == \
+            [name.rsplit('_', 1)[0] for name in below.adjacent_zones]
+        assert all(name.endswith('_39') for name in above.adjacent_zones)
+
+    # Adjacency matches the pairwise check on one floor
+    assert _pairwise_adjacency(top) == [zone.adjacent_zones for zone in top]
+
+
+def test_distinct_plates_each_get_a_layout(monkeypatch):
+    """Stories with a different plate (e.g. a setback) are partitioned separately."""
+    engine = AdvancedGeometryEngine()
+    setback = Polygon([(0, 0), (30, 0), (30, 25), (0, 25)])
+    monkeypatch.setattr(engine, '_floor_plates', lambda footprint: [L_SHAPE] * 3 + [setback] * 2)
+    np.random.seed(5)
+
+    floors = _zones_by_floor(engine.generate_zone_layout(_footprint(5), 'office'))
+
+    assert floors[1][0].polygon is floors[0][0].polygon
+    assert floors[4][0].polygon is floors[3][0].polygon
+    assert floors[3][0].polygon is not floors[0][0].polygon
+    assert sum(zone.area for zone in floors[3]) < sum(zone.area for zone in floors[0])
+
+
+def test_stacked_surfaces_match_per_zone_generation():
+    """After area scaling, reused surfaces equal those generated zone by zone."""
+    engine = AdvancedGeometryEngine()
+    np.random.seed(2)
+    footprint = _footprint(12)
+    zones = engine.generate_zone_layout(footprint, 'office')
+    footprint, zones, metrics = engine.match_layout_to_total_area(footprint, zones, 12 * 2500.0)
+    assert abs(metrics['scale_factor'] - 1.0) > 0.01
+    assert len({id(zone.polygon) for zone in zones}) == len(_zones_by_floor(zones)[0])
+
+    surfaces = engine.generate_building_surfaces(zones, footprint)
+
+    expected = []
+    for zone in zones:
+        for surface in (engine._generate_floor_surface(zone, footprint),
+                        engine._generate_ceiling_surface(zone, footprint)):
+            if surface:
+                expected.append(surface)
+        expected.extend(engine._generate_wall_surfaces(zone, footprint))
+    assert surfaces == expected
+    assert {surface['zone'] for surface in surfaces} == {zone.name for zone in zones}
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test the footprint simplification stage: Douglas-Peucker within an area
+budget, the vertex cap, preserved courtyards and the change report.
+"""
+
+import math
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+from shapely.geometry import Polygon
+
+from src.advanced_geometry_engine import AdvancedGeometryEngine, FootprintSimplification
+
+
+def _dense_outline(nodes_per_side=150, jitter=0.05, seed=0):
+    """A 40 m x 25 m block traced with many slightly noisy nodes, as in OSM / Microsoft data."""
+    rng = np.random.default_rng(seed)
+    corners = [(0.0, 0.0), (40.0, 0.0), (40.0, 25.0), (0.0, 25.0)]
+    ring = []
+    for (x1, y1), (x2, y2) in zip(corners, corners[1:] + corners[:1]):
+        for t in np.linspace(0.0, 1.0, nodes_per_side, endpoint=False):
+            ring.append((x1 + t * (x2 - x1) + rng.uniform(-jitter, jitter),
+                         y1 + t * (y2 - y1) + rng.uniform(-jitter, jitter)))
+    return Polygon(ring)
+
+
+def test_dense_outline_reduced_within_area_budget():
+    """Noise nodes are dropped; area stays within budget and the report says by how much."""
+    engine = AdvancedGeometryEngine()
+    outline = _dense_outline()
+    simplified, report = engine.simplify_footprint(outline)
+
+    assert report.original_vertices == 600
+    assert report.simplified_vertices <= 12
+    assert report.within_area_budget
+    assert abs(report.area_change_pct) <= 0.5
+    assert report.area_change_pct == pytest.approx((simplified.area - outline.area) / outline.area * 100)
+    assert report.perimeter_change_pct < 0  # the jitter zig-zag is gone
+    assert simplified.is_valid
+
+
+def test_courtyard_survives_simplification():
+    """Topology is preserved: the courtyard ring stays a hole of the footprint."""
+    outer = _dense_outline()
+    courtyard = Polygon([(15 + 5 * math.cos(a), 12.5 + 5 * math.sin(a)) for a in np.linspace(0, 2 * math.pi, 90, endpoint=False)])
+    with_courtyard = outer.difference(courtyard)
+
+    simplified, report = AdvancedGeometryEngine().simplify_footprint(with_courtyard)
+
+    assert len(simplified.interiors) == 1
+    assert simplified.is_valid
+    assert report.simplified_vertices < report.original_vertices
+    assert report.within_area_budget
+
+
+def test_vertex_cap_wins_over_area_budget():
+    """A genuinely jagged outline is capped; the report flags the exceeded budget."""
+    star = Polygon([((30 if i % 2 else 22) * math.cos(a), (30 if i % 2 else 22) * math.sin(a))
+                    for i, a in enumerate(np.linspace(0, 2 * math.pi, 400, endpoint=False))])
+    settings = FootprintSimplification(max_vertices=16)
+    simplified, report = AdvancedGeometryEngine().simplify_footprint(star, settings)
+
+    assert report.simplified_vertices <= 16
+    assert not report.within_area_budget
+    assert simplified.is_valid
+
+
+def test_simple_footprints_untouched_and_stage_configurable():
+    """Rectangles keep their corners; a disabled stage returns the polygon and no report."""
+    engine = AdvancedGeometryEngine()
+    rectangle = Polygon([(0, 0), (30, 0), (30, 20), (0, 20)])
+    simplified, report = engine.simplify_footprint(rectangle)
+    assert simplified.equals(rectangle)
+    assert report.simplified_vertices == report.original_vertices == 4
+
+    outline = _dense_outline()
+    assert engine.simplify_footprint(outline, FootprintSimplification(enabled=False)) == (outline, None)
+
+
+def test_osm_footprint_simplified_before_zoning():
+    """generate_complex_footprint attaches the report; zone walls stay few."""
+    engine = AdvancedGeometryEngine()
+    lat0, lon0 = 40.0, -105.0
+    ring = [[lon0 + x / (111320.0 * math.cos(math.radians(lat0))), lat0 + y / 110540.0]
+            for x, y in _dense_outline(nodes_per_side=250).exterior.coords]
+    np.random.seed(4)
+    footprint = engine.generate_complex_footprint({'geometry': {'type': 'Polygon', 'coordinates': [ring]}},
+                                                  'residential', None, 2)
+
+    assert footprint.simplification.original_vertices >= 1000
+    assert footprint.simplification.simplified_vertices <= engine.simplification.max_vertices
+    zones = engine.generate_zone_layout(footprint, 'residential')
+    walls = [s for s in engine.generate_building_surfaces(zones, footprint) if s['surface_type'] == 'Wall']
+    assert len(walls) < 20 * len(zones)
+
+
+def test_generator_passes_simplification_per_call():
+    """building_params settings reach the engine for that call only."""
+    import contextlib
+    import io
+    from src.professional_idf_generator import ProfessionalIDFGenerator
+
+    generator = ProfessionalIDFGenerator()
+    defaults = generator.geometry_engine.simplification
+    lat0, lon0 = 40.0, -105.0
+    outline = [(lat0 + y / 110540.0, lon0 + x / (111320.0 * math.cos(math.radians(lat0))))
+               for x, y in _dense_outline(nodes_per_side=250).exterior.coords]
+    location = {'latitude': lat0, 'longitude': lon0, 'building': {'osm_footprint': outline}}
+    settings = generator._footprint_simplification({'footprint_simplification': {'max_vertices': 12}})
+
+    np.random.seed(4)
+    with contextlib.redirect_stdout(io.StringIO()):
+        footprint = generator._generate_complex_footprint(location, 'residential', {'stories': 1}, settings)
+    report = footprint.simplification
+    assert report.original_vertices > 12 >= report.simplified_vertices
+    assert generator.geometry_engine.simplification is defaults
+    assert generator._footprint_simplification({}) is None
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test per-call generation contexts: one generator serves concurrent calls
+without sharing names, outdoor air nodes or construction maps.
+"""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import GenerationContext
+from src.professional_idf_generator import ProfessionalIDFGenerator
+
+
+LOCATION = {
+    'latitude': 41.88, 'longitude': -87.63, 'climate_zone': '5A',
+    'time_zone': -6, 'elevation': 180,
+}
+
+
+def test_contexts_isolate_unique_names_between_threads():
+    """Each thread allocates names against its own context."""
+    generator = ProfessionalIDFGenerator()
+    barrier = threading.Barrier(2)
+
+    def allocate():
+        with generator.generation_context():
+            first = generator._generate_unique_name('Zone1')
+            barrier.wait()
+            second = generator._generate_unique_name('Zone1')
+            return first, second
+
+    with ThreadPoolExecutor(2) as executor:
+        results = list(executor.map(lambda _: allocate(), range(2)))
+
+    assert results == [('Zone1', 'Zone1_1'), ('Zone1', 'Zone1_1')]
+    # Nothing leaks into the generator's own state
+    assert 'Zone1' not in generator.unique_names
+
+
+def test_shared_generator_serves_concurrent_generations():
+    """Concurrent generations on one generator each get complete per-building state."""
+    generator = ProfessionalIDFGenerator()
+    params = [
+        {'building_type': 'Office', 'stories': 2, 'floor_area': 2000, 'name': f'Building {i}'}
+        for i in range(4)
+    ]
+
+    def generate(building_params):
+        context = GenerationContext()
+        idf = generator.generate_professional_idf('Chicago, IL', building_params, dict(LOCATION), context=context)
+        return idf, context
+
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(generate, params))
+
+    for idf, context in results:
+        assert context.construction_map['Building_ExteriorWall'] in idf
+        assert context.outdoor_air_nodes
+        assert all(node in idf for node in context.outdoor_air_nodes)
+        # One-time objects are emitted for every building, not just the first
+        assert idf.count('VAV Minimum Flow Fraction Schedule,') == 1
+    assert generator.construction_map == {}
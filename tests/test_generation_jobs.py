@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test background generation jobs and the /api/jobs endpoints.
+"""
+
+import gzip
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.stage_reporting import PIPELINE_STAGES, report_stage
+from src.generation_jobs import GenerationJobManager, JOB_FAILED, JOB_SUCCEEDED
+
+
+class FakeLocationFetcher:
+    """Offline stand-in for the geocoding / footprint services."""
+
+    def fetch_comprehensive_location_data(self, address):
+        report_stage('footprint')
+        return {
+            'address': address,
+            'latitude': 41.88,
+            'longitude': -87.63,
+            'climate_zone': 'ASHRAE_C5',
+            'time_zone': -6,
+            'elevation': 180,
+            'weather_file': 'USA_IL_Chicago-OHare.Intl.AP.725300_TMY3.epw',
+            'building': {},
+        }
+
+
+def test_job_reports_stage_progress():
+    """Stages reported by the runner show up in order; repeats are ignored."""
+    release = threading.Event()
+
+    def runner(job):
+        report_stage('geocode')
+        report_stage('footprint')
+        report_stage('footprint')
+        release.wait(5)
+        report_stage('geometry')
+        report_stage('hvac')
+        report_stage('write')
+        return {'filename': 'x.idf', 'output_path': '/tmp/x.idf'}
+
+    manager = GenerationJobManager(runner, max_workers=1)
+    try:
+        job = manager.submit({'address': 'somewhere'})
+        while job.stage != 'footprint':
+            manager.wait_for_change(job, job.version, timeout=5)
+        view = job.to_dict()
+        assert view['status'] == 'running'
+        assert [state['status'] for state in view['stages']] == ['done', 'running', 'pending', 'pending', 'pending']
+        assert view['progress'] == 1 / len(PIPELINE_STAGES)
+
+        release.set()
+        job = manager.wait(job.job_id, timeout=5)
+        assert job.status == JOB_SUCCEEDED
+        assert job.to_dict()['progress'] == 1.0
+        assert job.output_path == '/tmp/x.idf'
+        assert 'output_path' not in job.to_dict()['result']
+    finally:
+        manager.shutdown()
+
+
+def test_failed_job_records_error():
+    """Exceptions from the runner fail the job at the stage it reached."""
+    def runner(job):
+        report_stage('geocode')
+        raise ValueError('no coordinates')
+
+    manager = GenerationJobManager(runner, max_workers=1)
+    try:
+        job = manager.wait(manager.submit({}).job_id, timeout=5)
+        assert job.status == JOB_FAILED
+        assert job.error == {'error': 'no coordinates', 'type': 'ValueError'}
+        assert job.to_dict()['stages'][0]['status'] == 'failed'
+        assert job.output_path is None
+    finally:
+        manager.shutdown()
+
+
+def test_api_job_lifecycle(tmp_path, monkeypatch):
+    """Submit, poll, stream events and download the gzip-encoded IDF."""
+    import web_interface
+    from main import IDFCreator
+
+    monkeypatch.setattr(web_interface, 'API_OUTPUT_DIR', tmp_path)
+    client = web_interface.app.test_client()
+
+    with patch.object(IDFCreator, 'location_fetcher', FakeLocationFetcher()):
+        response = client.post('/api/jobs', json={'address': '1 Main St, Chicago, IL', 'building_type': 'Office', 'stories': 2})
+        assert response.status_code == 202
+        job_id = response.get_json()['job_id']
+        job = web_interface.get_job_manager().wait(job_id, timeout=120)
+
+    assert job.status == JOB_SUCCEEDED, job.error
+    status = client.get(f'/api/jobs/{job_id}').get_json()
+    assert status['status'] == 'succeeded'
+    assert [state['status'] for state in status['stages']] == ['done'] * len(PIPELINE_STAGES)
+
+    events = client.get(f'/api/jobs/{job_id}/events').get_data(as_text=True)
+    assert 'event: done' in events
+
+    plain = client.get(f'/api/jobs/{job_id}/idf')
+    compressed = client.get(f'/api/jobs/{job_id}/idf', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
+    assert b'Version,' in plain.get_data()
+
+    assert client.get('/api/jobs/unknown').status_code == 404
+    assert client.post('/api/jobs', json={'description': 'no address'}).status_code == 400
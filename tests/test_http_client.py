@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test the shared HTTP client: token buckets, per-host concurrency limits and
+the async batch path, against a local HTTP server.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.osm_fetcher import OSMFetcher
+from src.utils.http_client import HostPolicy, SharedHTTPClient, TokenBucket
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers after a short delay, recording concurrency and request headers."""
+    in_flight = 0
+    max_in_flight = 0
+    headers_seen = []
+    lock = threading.Lock()
+
+    def _respond(self, body: bytes):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+            cls.headers_seen.append(dict(self.headers))
+        time.sleep(0.05)
+        with cls.lock:
+            cls.in_flight -= 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond(b'{"ok": true}')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        # Two buildings around (41.0, -87.0); the second one is closer
+        elements = [
+            {'tags': {'building': 'far'}, 'geometry': [
+                {'lat': 41.01, 'lon': -87.01}, {'lat': 41.01, 'lon': -87.0}, {'lat': 41.02, 'lon': -87.0}]},
+            {'tags': {'building': 'near'}, 'geometry': [
+                {'lat': 41.0, 'lon': -87.0}, {'lat': 41.0, 'lon': -86.9999}, {'lat': 41.0001, 'lon': -86.9999}]},
+        ]
+        self._respond(json.dumps({'elements': elements}).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.in_flight = _Handler.max_in_flight = 0
+    _Handler.headers_seen = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}'
+    httpd.shutdown()
+
+
+def test_token_bucket_spaces_requests():
+    """After the burst, tokens are handed out at the configured rate."""
+    bucket = TokenBucket(rate_per_second=10.0, capacity=2)
+    delays = [bucket.reserve() for _ in range(4)]
+    assert delays[0] == 0.0 and delays[1] == 0.0
+    assert delays[2] == pytest.approx(0.1, abs=0.02)
+    assert delays[3] == pytest.approx(0.2, abs=0.02)
+
+
+def test_async_requests_respect_host_limits(server):
+    """Concurrent async requests stay within the host's concurrency cap and rate."""
+    client = SharedHTTPClient(policies={'127.0.0.1': HostPolicy(40.0, burst=4, max_concurrency=2, timeout=(2.0, 5.0))})
+
+    async def fetch_all():
+        return await asyncio.gather(*(client.get_async(f'{server}/item/{i}') for i in range(12)))
+
+    try:
+        start = time.monotonic()
+        responses = asyncio.run(fetch_all())
+        elapsed = time.monotonic() - start
+    finally:
+        client.close()
+
+    assert [response.json() for response in responses] == [{'ok': True}] * 12
+    assert _Handler.max_in_flight <= 2
+    # 12 requests, 2 at a time, 50 ms each
+    assert elapsed >= 0.25
+
+
+def test_fetcher_sessions_keep_their_headers(server):
+    """Each fetcher's default headers are sent, on a connection pool shared with others."""
+    client = SharedHTTPClient()
+    try:
+        first = client.session({'User-Agent': 'first'})
+        second = client.session()
+        second.headers.update({'User-Agent': 'second'})
+        first.get(f'{server}/a')
+        second.get(f'{server}/b', headers={'X-Extra': '1'})
+    finally:
+        client.close()
+
+    assert _Handler.headers_seen[0]['User-Agent'] == 'first'
+    assert _Handler.headers_seen[1]['User-Agent'] == 'second'
+    assert _Handler.headers_seen[1]['X-Extra'] == '1'
+
+
+def test_osm_batch_footprints(server):
+    """Batch footprint lookups return the closest building for each location, in order."""
+    fetcher = OSMFetcher()
+    fetcher.OVERPASS_URL = f'{server}/api/interpreter'
+    results = fetcher.get_building_footprints([(41.0, -87.0)] * 5)
+    assert len(results) == 5
+    assert all(result['properties']['building'] == 'near' for result in results)
+    assert results[0] == fetcher.get_building_footprint(41.0, -87.0)
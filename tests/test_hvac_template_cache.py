@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test memoized HVAC template and sizing resolution in AdvancedHVACSystems.
+"""
+
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from src.advanced_hvac_systems import AdvancedHVACSystems
+from src.core.generation_context import activate_generation_context
+from src.template_registry import TemplateRegistry
+
+
+def test_template_resolution_is_memoized_and_shared():
+    """Adjusted templates are resolved once per (type, year, LEED) and shared via the registry."""
+    registry = TemplateRegistry.get_instance()
+    first = AdvancedHVACSystems(registry=registry)
+    second = AdvancedHVACSystems(registry=registry)
+
+    template = first._resolve_hvac_template('PTAC', 1995, 'Gold')
+    assert second._resolve_hvac_template('PTAC', 1995, 'Gold') is template
+    assert replace(template, efficiency=dict(template.efficiency), components=list(template.components)) == \
+        first._build_hvac_template('PTAC', 1995, 'Gold')
+
+
+def test_templates_are_keyed_on_code_era():
+    """Construction years of one code era share a template; other eras and unknown years do not."""
+    hvac = AdvancedHVACSystems(registry=TemplateRegistry.get_instance())
+    template = hvac._resolve_hvac_template('RTU', 1983, None)
+    assert hvac._resolve_hvac_template('RTU', 1999, None) is template
+    assert hvac._resolve_hvac_template('RTU', 2000, None) is not template
+    assert hvac._resolve_hvac_template('RTU', None, None) is not template
+    assert dict(hvac._resolve_hvac_template('RTU', 1991, None).efficiency) == \
+        hvac._build_hvac_template('RTU', 1991, None).efficiency
+
+
+def test_shared_resolutions_are_read_only():
+    """Cached templates and sizing profiles cannot be modified by one generator for all others."""
+    hvac = AdvancedHVACSystems(registry=TemplateRegistry.get_instance())
+    template = hvac._resolve_hvac_template('VAV', 2001, None)
+    profile = hvac._sizing_profile('office', '5A', 'office_open')
+    assert hvac._sizing_profile('office', '5A', 'office_open') is profile
+
+    with pytest.raises(TypeError):
+        template.efficiency['cooling_eer'] = 1.0
+    with pytest.raises(TypeError):
+        profile['climate_multipliers']['cooling'] = 2.0
+    with pytest.raises(TypeError):
+        profile['sensible_heat_ratio'] = 0.5
+    assert isinstance(template.components, tuple)
+
+
+def test_cached_generation_matches_uncached():
+    """Zones generated with warm caches match a fresh, cache-less instance."""
+    warm = AdvancedHVACSystems(registry=TemplateRegistry.get_instance())
+    for hvac_type in ['VAV', 'PTAC', 'RTU']:
+        for idx, zone in enumerate(['office_open_0_z1', 'storage_1_z2', 'lobby_z3', 'office_open_2_z4'], start=1):
+            kwargs = dict(
+                building_type='office', zone_name=zone, zone_area=120.0 * idx, hvac_type=hvac_type,
+                climate_zone='5A', unique_suffix=f'_z{idx}', year_built=1990, leed_level='Silver'
+            )
+            with activate_generation_context():
+                expected = AdvancedHVACSystems().generate_hvac_system(**kwargs)
+            with activate_generation_context():
+                assert warm.generate_hvac_system(**kwargs) == expected
+
+
+def test_zone_usage_strips_index_suffixes():
+    """Zone usage drops the zone index and numeric suffixes."""
+    assert AdvancedHVACSystems._zone_usage('Office_Open_2_z7') == 'office_open'
+    assert AdvancedHVACSystems._zone_usage('break_room_1_3') == 'break_room'
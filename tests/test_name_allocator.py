@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test the unique name allocator: per-base counters and case-insensitive
+collisions, as EnergyPlus compares names.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core import NameAllocator
+from src.professional_idf_generator import ProfessionalIDFGenerator
+
+
+def test_allocate_uses_per_base_counters():
+    """Repeated bases get increasing suffixes; reserved names are skipped."""
+    names = NameAllocator()
+    assert names.allocate('Zone1 Fan') == 'Zone1 Fan'
+    assert names.allocate('Zone1 Fan') == 'Zone1 Fan_1'
+    names.add('Zone1 Fan_2')
+    assert names.allocate('Zone1 Fan') == 'Zone1 Fan_3'
+    assert names.allocate('Other') == 'Other'
+    assert len(names) == 5
+
+
+def test_collisions_are_case_insensitive():
+    """Names differing only in case collide."""
+    names = NameAllocator(['ZONE1 COIL'])
+    assert 'zone1 coil' in names
+    assert names.allocate('Zone1 Coil') == 'Zone1 Coil_1'
+    assert list(names) == ['ZONE1 COIL', 'Zone1 Coil_1']
+
+
+def test_allocation_stays_linear_for_large_models():
+    """Allocating a repeated base name 20,000 times does not probe earlier suffixes."""
+    names = NameAllocator()
+    start = time.perf_counter()
+    allocated = [names.allocate('Zone Node') for _ in range(20000)]
+    elapsed = time.perf_counter() - start
+    assert allocated[-1] == 'Zone Node_19999'
+    assert len(set(allocated)) == 20000
+    assert elapsed < 1.0
+
+
+def test_hvac_component_names_are_claimed_once():
+    """Duplicate HVAC component names are renamed through the generator's allocator."""
+    generator = ProfessionalIDFGenerator()
+    with generator.generation_context():
+        first = {'type': 'Fan:VariableVolume', 'name': 'Zone1 Fan'}
+        assert generator._claim_component_name(first) is first
+        renamed = generator._claim_component_name({'type': 'Fan:VariableVolume', 'name': 'ZONE1 FAN'})
+        assert renamed['name'] == 'ZONE1 FAN_1'
+        assert generator._generate_unique_name('Zone1 Fan') == 'Zone1 Fan_2'
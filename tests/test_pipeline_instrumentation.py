@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test per-stage spans, object counters and the Prometheus export.
+"""
+
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.instrumentation import MetricsRegistry, add_bytes, collect_metrics, count, span
+from src.professional_idf_generator import ProfessionalIDFGenerator
+
+LOCATION = {
+    'latitude': 41.88,
+    'longitude': -87.63,
+    'climate_zone': 'ASHRAE_C5',
+    'time_zone': -6,
+    'elevation': 180,
+    'weather_file': 'USA_IL_Chicago-OHare.Intl.AP.725300_TMY3.epw',
+    'building': {},
+}
+
+
+def test_measurements_are_collected_per_run():
+    """Spans add up per stage; counters and bytes go to the active run and the registry."""
+    MetricsRegistry.clear_cache()
+
+    @span('decorated')
+    def work():
+        count('things', 2)
+
+    with collect_metrics() as metrics:
+        with span('outer'):
+            work()
+            work()
+        add_bytes('idf', 10)
+
+    # Measured outside a run: registry only
+    count('things')
+
+    assert metrics.span_calls == {'decorated': 2, 'outer': 1}
+    assert metrics.spans['outer'] >= metrics.spans['decorated']
+    assert metrics.counters == {'things': 4}
+    assert metrics.bytes == {'idf': 10}
+    snapshot = MetricsRegistry.get_instance().snapshot()
+    assert snapshot['counters'] == {'things': 5}
+    assert snapshot['spans']['decorated']['count'] == 2
+    assert snapshot['runs'] == 1
+
+
+def test_concurrent_runs_are_isolated():
+    """Each thread collects only its own measurements."""
+    results = {}
+
+    def run(name, amount):
+        with collect_metrics() as metrics:
+            count('zones', amount)
+        results[name] = metrics.counters
+
+    threads = [threading.Thread(target=run, args=(f't{i}', i + 1)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {f't{i}': {'zones': i + 1} for i in range(4)}
+
+
+def test_generation_reports_stages_and_output_size():
+    """A professional generation reports its stages, object counts and IDF size."""
+    generator = ProfessionalIDFGenerator()
+    with collect_metrics() as metrics:
+        idf = generator.generate_professional_idf(
+            'x', {'building_type': 'Office', 'stories': 2, 'floor_area': 2000, 'name': 'Metrics'}, dict(LOCATION)
+        )
+
+    for stage in ['footprint_geometry', 'zone_layout', 'area_matching', 'surfaces', 'surface_format', 'windows',
+                  'schedules', 'loads', 'hvac', 'hvac_objects', 'serialize', 'dedupe']:
+        assert stage in metrics.spans, stage
+    assert metrics.counters['zones'] > 0
+    assert metrics.counters['surfaces'] >= metrics.counters['zones']
+    assert metrics.bytes['idf'] == len(idf.encode('utf-8'))
+
+
+def test_prometheus_export():
+    """The registry renders histograms, counters and bytes in the text format."""
+    MetricsRegistry.clear_cache()
+    with collect_metrics():
+        with span('hvac'):
+            count('zones', 3)
+        add_bytes('idf', 1234)
+
+    text = MetricsRegistry.get_instance().render_prometheus()
+    assert '# TYPE idf_creator_stage_duration_seconds histogram' in text
+    assert 'idf_creator_stage_duration_seconds_bucket{stage="hvac",le="+Inf"} 1' in text
+    assert 'idf_creator_stage_duration_seconds_count{stage="hvac"} 1' in text
+    assert 'idf_creator_objects_total{kind="zones"} 3' in text
+    assert 'idf_creator_output_bytes_total{kind="idf"} 1234' in text
+    assert 'idf_creator_runs_total 1' in text
+
+
+def test_api_returns_metrics(tmp_path, monkeypatch):
+    """/api/generate includes per-stage metrics on request; /metrics serves the aggregate."""
+    import web_interface
+    from main import IDFCreator
+
+    class FakeLocationFetcher:
+        def fetch_comprehensive_location_data(self, address):
+            return dict(LOCATION, address=address)
+
+    monkeypatch.setattr(web_interface, 'API_OUTPUT_DIR', tmp_path)
+    client = web_interface.app.test_client()
+    with patch.object(IDFCreator, 'location_fetcher', FakeLocationFetcher()):
+        response = client.post('/api/generate', json={
+            'address': '1 Main St, Chicago, IL', 'building_type': 'Office', 'stories': 2, 'include_metrics': True
+        })
+    assert response.status_code == 200
+    metrics = response.get_json()['metrics']
+    assert {'estimate', 'zone_layout', 'hvac', 'serialize', 'write'} <= set(metrics['spans_ms'])
+    assert metrics['bytes']['idf'] > 0
+
+    exported = client.get('/metrics')
+    assert exported.status_code == 200
+    assert 'idf_creator_stage_duration_seconds_bucket{stage="estimate"' in exported.get_data(as_text=True)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test portfolio archetype deduplication: canonical generation inputs, one
+generation and simulation per archetype, and area-normalized fan-out.
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+
+import src.portfolio as portfolio
+from src.portfolio import PortfolioBuilding, PortfolioRunner, archetype_key, footprint_signature, year_era
+
+CHICAGO = {'latitude': 41.88, 'longitude': -87.63, 'climate_zone': 'ASHRAE_C5', 'time_zone': -6,
+           'elevation': 180, 'weather_file': 'USA_IL_Chicago-OHare.Intl.AP.725300_TMY3.epw'}
+
+
+def _store(i, area=1200.0, year=1995, **overrides):
+    """A chain store: same prototype, its own name, address and coordinates."""
+    params = {'building_type': 'Retail', 'stories': 1, 'floor_area': area, 'year_built': year,
+              'name': f'Store_{i}', 'hvac_system': 'RTU'}
+    params.update(overrides)
+    location = dict(CHICAGO, latitude=41.88 + i * 0.01, longitude=-87.63 - i * 0.01,
+                    address=f'{100 + i} Main St, Chicago, IL')
+    return PortfolioBuilding(building_id=f'store-{i}', address=location['address'],
+                             building_params=params, location_data=location)
+
+
+def test_archetype_key_ignores_identity_and_same_era_years():
+    """Names, coordinates, floor area and same-era year differences share a key."""
+    base = archetype_key(_store(0))
+    assert archetype_key(_store(1, area=2000.0, year=1985)) == base
+    assert archetype_key(_store(2, building_type='retail')) == base
+
+    assert archetype_key(_store(3, year=2005)) != base
+    assert archetype_key(_store(5, stories=2)) != base
+    assert archetype_key(_store(6, hvac_system='PTAC')) != base
+    other_climate = _store(7)
+    other_climate.location_data['climate_zone'] = 'ASHRAE_C2'
+    assert archetype_key(other_climate) != base
+    # Age-adjusted internal loads depend on the exact year
+    assert archetype_key(_store(8, apply_internal_load_adjustments=True, year=1985)) != \
+        archetype_key(_store(9, apply_internal_load_adjustments=True, year=1995))
+
+    assert [year_era(y) for y in (1900, 1930, 1979, 1980, 2009, 2010, None)] == [0, 1, 1, 2, 3, 4, None]
+
+
+def test_floor_areas_cluster_within_tolerance():
+    """Areas chain into clusters no wider than the tolerance; the median member represents each."""
+    areas = [1000.0, 1180.0, 1010.0, 1200.0, 1040.0, 1230.0, 3000.0]
+    archetypes = PortfolioRunner(area_tolerance=0.05).group([_store(i, area=a) for i, a in enumerate(areas)])
+
+    members = [[b.building_params['floor_area'] for b in archetype.members] for archetype in archetypes]
+    assert members == [[1000.0, 1010.0, 1040.0], [1180.0, 1200.0, 1230.0], [3000.0]]
+    assert [a.representative.building_params['floor_area'] for a in archetypes] == [1010.0, 1200.0, 3000.0]
+    assert len({a.key for a in archetypes}) == 3
+
+
+def test_footprint_signature_keeps_shape_and_orientation():
+    """Moved and resized copies of a footprint match; a rotated copy does not."""
+    def ring(lat0, lon0, size, rotated=False):
+        w, d = (size, 2 * size) if rotated else (2 * size, size)
+        corners = [(0, 0), (w, 0), (w, d), (0, d), (0, 0)]
+        return [(lat0 + y, lon0 + x / np.cos(np.radians(lat0))) for x, y in corners]
+
+    signature = footprint_signature(ring(41.0, -87.0, 0.0002))
+    assert signature == footprint_signature(ring(41.0005, -87.001, 0.0003))
+    assert signature == footprint_signature(list(reversed(ring(41.0, -87.0, 0.0002))))
+    assert signature != footprint_signature(ring(41.0, -87.0, 0.0002, rotated=True))
+    assert footprint_signature([(41.0, -87.0), (41.0, -87.0)]) is None
+
+    unsized = [_store(i, floor_area=None) for i in range(2)]
+    for building, size in zip(unsized, (0.0002, 0.00025)):
+        building.location_data['building'] = {'osm_footprint': ring(building.location_data['latitude'], -87.0, size),
+                                              'osm_area_m2': 900.0, 'primary_area_source': 'osm'}
+    assert archetype_key(unsized[0]) == archetype_key(unsized[1])
+    unsized[1].location_data['building']['osm_area_m2'] = 1500.0
+    assert archetype_key(unsized[0]) != archetype_key(unsized[1])
+
+
+def test_portfolio_generates_and_simulates_each_archetype_once(tmp_path, monkeypatch):
+    """Ten stores and two schools: two IDFs, two simulations, results scaled per building."""
+    buildings = [_store(i, area=1200.0 + 5 * i) for i in range(10)]
+    buildings += [_store(10 + i, building_type='School', stories=2, floor_area=5000.0, year=2015, name=f'School_{i}')
+                  for i in range(2)]
+    weather = tmp_path / 'chicago.epw'
+    weather.write_text('LOCATION,Chicago\n')
+
+    runner = PortfolioRunner(energyplus_path='energyplus')
+    simulated = []
+
+    def fake_simulation(idf_file, weather_file, output_dir):
+        simulated.append(idf_file)
+        annual = 120000.0 if 'Store_' in Path(idf_file).read_text() else 400000.0
+        return {'annual_kwh': annual, 'monthly_kwh': [annual / 12.0] * 12,
+                'monthly_measured': True, 'gas_annual_kwh': 0.0}
+
+    monkeypatch.setattr(runner.simulator, '_run_simulation', fake_simulation)
+    monkeypatch.setattr(portfolio, 'resolve_worker_count', lambda requested, memory: 1)
+
+    np.random.seed(7)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = runner.run(buildings, str(tmp_path / 'portfolio'), weather_file=str(weather))
+
+    assert len(simulated) == 2
+    assert len(list((tmp_path / 'portfolio').glob('archetype_*.idf'))) == 2
+    assert [r.building_id for r in results] == [b.building_id for b in buildings]
+    assert len({r.archetype_key for r in results[:10]}) == 1 and results[10].archetype_key != results[0].archetype_key
+
+    # Area normalization: the median store was simulated, the others scaled to their area
+    representative_area = 1225.0
+    for building, result in zip(buildings[:10], results[:10]):
+        assert result.area_scale == pytest.approx(building.building_params['floor_area'] / representative_area)
+        assert result.results['annual_kwh'] == pytest.approx(120000.0 * result.area_scale)
+        assert sum(result.results['monthly_kwh']) == pytest.approx(result.results['annual_kwh'])
+        assert result.results['eui_kwh_m2'] == pytest.approx(120000.0 / representative_area)
+        assert result.results['monthly_measured'] is True
+    assert results[11].results['eui_kwh_m2'] == pytest.approx(80.0)
+
+
+def test_portfolio_without_energyplus_only_generates(tmp_path):
+    """Without EnergyPlus the archetype IDFs are still written and shared."""
+    runner = PortfolioRunner()
+    runner.energyplus_path = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = runner.run([_store(0), _store(1)], str(tmp_path))
+    assert results[0].idf_path == results[1].idf_path
+    assert Path(results[0].idf_path).exists()
+    assert results[0].results is None and results[1].area_scale == 1.0
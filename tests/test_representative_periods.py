@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Test representative-period mode: seasonal week clustering from the EPW,
+per-run-period SQLite totals, weighted annual extrapolation with error
+bounds and the RunPeriod objects in the generated IDF.
+"""
+
+import contextlib
+import io
+import math
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+
+from src.representative_periods import (
+    END_USE_METERS, SEASONS, extract_representative_results, extrapolate_annual, select_representative_weeks
+)
+from src.utils.sql_results import extract_energy_results, read_environment_totals, read_run_period_names
+
+DAYS_PER_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+J = 3.6e6
+
+
+def _write_epw(path: Path, seed: int = 11):
+    """A synthetic EPW with seasonal and diurnal temperature swings, weather fronts and cloudy days."""
+    rng = np.random.default_rng(seed)
+    front = np.repeat(rng.normal(0.0, 4.0, 365 // 3 + 1), 3)[:365]
+    cloud = rng.uniform(0.3, 1.0, 365)
+    lines = ["LOCATION,Test,CO,USA,Synthetic,000000,40.0,-105.0,-7.0,1600.0",
+             "DESIGN CONDITIONS,0", "TYPICAL/EXTREME PERIODS,0", "GROUND TEMPERATURES,0",
+             "HOLIDAYS/DAYLIGHT SAVINGS,No,0,0,0", "COMMENTS 1,Synthetic", "COMMENTS 2,Synthetic",
+             "DATA PERIODS,1,1,Data,Sunday, 1/ 1,12/31"]
+    day_of_year = 0
+    for month, days in enumerate(DAYS_PER_MONTH, 1):
+        for day in range(1, days + 1):
+            day_of_year += 1
+            for hour in range(1, 25):
+                daylight = max(math.sin(math.pi * (hour - 6) / 12), 0.0) if 6 < hour < 18 else 0.0
+                ghi = 900.0 * daylight * cloud[day_of_year - 1] * (0.6 + 0.4 * math.sin(math.pi * day_of_year / 365))
+                dry_bulb = (10.0 - 14.0 * math.cos(2 * math.pi * (day_of_year - 15) / 365)
+                            + front[day_of_year - 1] + 5.0 * math.sin(math.pi * (hour - 9) / 12))
+                fields = [1999, month, day, hour, 60, '?9?9?9?9E0?9?9?9', f"{dry_bulb:.1f}", 0.0, 50, 84000,
+                          0, 1367, 300, f"{ghi:.1f}", f"{0.8 * ghi:.1f}", f"{0.2 * ghi:.1f}"]
+                fields += [0] * 16 + [0.2, 0, 0]
+                lines.append(','.join(str(value) for value in fields))
+    path.write_text('\n'.join(lines) + '\n')
+    return path
+
+
+@pytest.fixture
+def selection(tmp_path):
+    return select_representative_weeks(_write_epw(tmp_path / 'synthetic.epw'))
+
+
+def _signature_energy(selection, weeks):
+    """Weekly energy of a building close to, but not exactly on, a degree-hour signature."""
+    heating, cooling = selection.heating_degree_hours[weeks], selection.cooling_degree_hours[weeks]
+    return 2000.0 + 0.9 * heating + 1.4 * cooling + 2e-4 * heating ** 2
+
+
+def test_selects_weeks_per_season(selection, tmp_path):
+    """Two calendar weeks per season, together standing for every week of the year."""
+    assert len(selection.periods) == 8
+    assert selection.simulated_days == 56
+    assert sum(p.weight for p in selection.periods) == 52
+    assert sorted(w for p in selection.periods for w in p.weeks) == list(range(52))
+
+    starts = [p.start_day_of_year for p in selection.periods]
+    assert starts == sorted(starts)
+    for index, period in enumerate(selection.periods):
+        assert period.week_index in period.weeks
+        assert all(selection.week_period[w] == index for w in period.weeks)
+        # Seasons go by the middle day of the week
+        assert period.month_day(period.start_day_of_year + 3)[0] in SEASONS[period.season]
+    assert [p.season for p in selection.periods].count('summer') == 2
+
+    # Cached per file and cluster count
+    assert select_representative_weeks(selection.epw_path) is selection
+    assert len(select_representative_weeks(selection.epw_path, weeks_per_season=3).periods) == 12
+
+
+def test_extrapolation_weights_weeks_and_bounds_the_full_year(selection):
+    """Constant loads extrapolate exactly; weather-driven loads stay within the bounds."""
+    constant = {p.name: {'Electricity:Facility': 700.0} for p in selection.periods}
+    results = extrapolate_annual(constant, selection)
+    assert results['annual_kwh'] == pytest.approx(100.0 * 365)
+    assert sum(results['monthly_kwh']) == pytest.approx(results['annual_kwh'])
+    assert results['monthly_kwh'][1] == pytest.approx(100.0 * 28)
+    assert results['monthly_measured'] is False
+    assert results['simulated_days'] == 56
+
+    simulated = np.array([p.week_index for p in selection.periods])
+    energy = _signature_energy(selection, simulated)
+    totals = {p.name.upper(): {'Electricity:Facility': float(e), 'Heating:NaturalGas': 0.5 * float(e)}
+              for p, e in zip(selection.periods, energy)}
+    results = extrapolate_annual(totals, selection)
+
+    weekly = _signature_energy(selection, np.arange(52))
+    full_year = weekly.sum() + weekly[-1] / 7.0
+    low, high = results['annual_kwh_bounds']
+    assert low < full_year < high
+    assert abs(results['annual_kwh'] - full_year) / full_year < 0.05
+    gas = results['end_uses']['Heating:NaturalGas']
+    assert gas['annual_kwh'] == pytest.approx(0.5 * results['annual_kwh'])
+    assert gas['low_kwh'] < gas['annual_kwh'] < gas['high_kwh']
+
+    with pytest.raises(ValueError, match='Representative Week 1'):
+        extrapolate_annual({}, selection)
+
+
+def _write_sql(path, selection, weekly_kwh):
+    """eplusout.sql of a representative run: design days, warmup and one environment per week."""
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE Time (TimeIndex INTEGER PRIMARY KEY, Month INTEGER, Day INTEGER, "
+                 "Hour INTEGER, WarmupFlag INTEGER, EnvironmentPeriodIndex INTEGER)")
+    conn.execute("CREATE TABLE EnvironmentPeriods (EnvironmentPeriodIndex INTEGER PRIMARY KEY, "
+                 "EnvironmentName TEXT, EnvironmentType INTEGER)")
+    conn.execute("CREATE TABLE ReportDataDictionary (ReportDataDictionaryIndex INTEGER PRIMARY KEY, "
+                 "Name TEXT, ReportingFrequency TEXT)")
+    conn.execute("CREATE TABLE ReportData (TimeIndex INTEGER, ReportDataDictionaryIndex INTEGER, Value REAL)")
+    conn.executemany("INSERT INTO ReportDataDictionary VALUES (?, ?, ?)", [
+        (1, 'Electricity:Facility', 'Run Period'), (2, 'Electricity:Facility', 'Monthly'),
+        (3, 'Fans:Electricity', 'Run Period'),
+    ])
+    environments = [(1, 'WINTER DESIGN DAY', 1)]
+    times = [(1, 1, 21, 24, 0, 1)]
+    rows = [(1, 1, 999 * J)]
+    for index, (period, kwh) in enumerate(zip(selection.periods, weekly_kwh)):
+        env, time = index + 2, 2 * index + 2
+        environments.append((env, period.name.upper(), 3))
+        times += [(time, period.begin[0], period.begin[1], 1, 1, env), (time + 1, *period.end, 24, 0, env)]
+        rows += [(time, 1, 999 * J), (time + 1, 1, kwh * J), (time + 1, 2, kwh * J), (time + 1, 3, 0.1 * kwh * J)]
+    conn.executemany("INSERT INTO EnvironmentPeriods VALUES (?, ?, ?)", environments)
+    conn.executemany("INSERT INTO Time VALUES (?, ?, ?, ?, ?, ?)", times)
+    conn.executemany("INSERT INTO ReportData VALUES (?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def test_reads_totals_per_run_period(selection, tmp_path):
+    """Each weather run period is totalled separately; design days and warmup are ignored."""
+    sql = tmp_path / 'eplusout.sql'
+    weekly = [1000.0 + 10 * i for i in range(len(selection.periods))]
+    _write_sql(sql, selection, weekly)
+
+    totals = read_environment_totals(sql, ('Electricity:Facility', 'Fans:Electricity'))
+    assert set(totals) == {p.name.upper() for p in selection.periods}
+    assert totals['REPRESENTATIVE WEEK 2']['Electricity:Facility'] == pytest.approx(1010.0)
+    assert totals['REPRESENTATIVE WEEK 2']['Fans:Electricity'] == pytest.approx(101.0)
+
+    results = extract_representative_results(sql, selection)
+    assert results['end_uses']['Fans:Electricity']['annual_kwh'] == pytest.approx(0.1 * results['annual_kwh'])
+    assert results['gas_annual_kwh'] == 0.0 and results['monthly_gas_kwh'] == []
+
+
+def test_energy_results_extrapolate_representative_runs(selection, tmp_path, capsys):
+    """Simulation consumers get annual estimates, not the sum of the simulated weeks."""
+    from src.model_calibration import ModelCalibrator
+
+    sql = tmp_path / 'eplusout.sql'
+    weekly = [1000.0 + 10 * i for i in range(len(selection.periods))]
+    _write_sql(sql, selection, weekly)
+    assert read_run_period_names(sql) == [p.name.upper() for p in selection.periods]
+
+    expected = extract_representative_results(sql, selection)
+    results = extract_energy_results(sql, weather_file=selection.epw_path)
+    assert results['annual_kwh'] == pytest.approx(expected['annual_kwh'])
+    assert results['annual_kwh'] > 5 * sum(weekly)
+    assert ModelCalibrator(energyplus_path='energyplus')._extract_sqlite_results(
+        sql, selection.epw_path)['annual_kwh'] == pytest.approx(expected['annual_kwh'])
+
+    # Without the weather file the weeks cannot be weighted: summed, with a warning
+    capsys.readouterr()
+    summed = extract_energy_results(sql)
+    assert summed['annual_kwh'] == pytest.approx(sum(weekly))
+    assert '8 weather run periods' in capsys.readouterr().out
+
+
+def test_generator_emits_representative_run_periods(selection):
+    """The IDF simulates the representative weeks and reports end uses per run period."""
+    from src.professional_idf_generator import ProfessionalIDFGenerator
+
+    generator = ProfessionalIDFGenerator()
+    location = {'latitude': 40.0, 'longitude': -105.0, 'climate_zone': 'ASHRAE_C5', 'time_zone': -7,
+                'elevation': 1600, 'weather_file': 'USA_CO_Denver.Intl.AP.725650_TMY3.epw'}
+    params = {'building_type': 'Office', 'stories': 1, 'floor_area': 800, 'name': 'Weeks',
+              'representative_periods': selection}
+    np.random.seed(5)
+    with contextlib.redirect_stdout(io.StringIO()):
+        idf = generator.generate_professional_idf('x', params, location)
+
+    assert idf.count('RunPeriod,') == 8
+    assert 'Year Round Run Period' not in idf
+    month, day = selection.periods[3].begin
+    assert f"Representative Week 4,   !- Name\n  {month}," in idf
+    for meter in END_USE_METERS:
+        assert f"Output:Meter,\n  {meter}," in idf
+
+    # No weather file to select from: the full year is simulated
+    location['weather_file'] = 'Nowhere_Synthetic.epw'
+    params['representative_periods'] = True
+    np.random.seed(5)
+    with contextlib.redirect_stdout(io.StringIO()):
+        idf = generator.generate_professional_idf('x', params, location)
+    assert idf.count('RunPeriod,') == 1 and 'Year Round Run Period' in idf
@@ -280,9 +280,9 @@ def test_retrofit_optimization():
     print("="*70)
     return True
 
-def create_minimal_test_idf():
-    """Create a minimal test IDF file"""
-    test_idf = Path('test_minimal_retrofit.idf')
+def create_minimal_test_idf(directory=None):
+    """Create a minimal test IDF file (in a temporary directory by default)"""
+    test_idf = Path(directory or tempfile.mkdtemp()) / 'test_minimal_retrofit.idf'
     
     minimal_idf_content = """Version,9.6.0;
 
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Test the retrofit scenario pipeline: parsed-baseline field edits and
+streamed scenario results.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.retrofit_optimizer import (
+    RetrofitOptimizer,
+    RetrofitMeasureType,
+    measure_field_overrides,
+)
+from src.parametric_edits import ParametricEdit, ParametricModel
+from src.apply_calibration_to_idf import apply_calibration_to_idf
+from src.utils.idf_utils import parse_idf
+
+
+BASELINE_IDF = """Version,
+  24.2;                    !- Version Identifier
+
+Timestep,4;
+
+Lights,
+  Zone1_Lights,            !- Name
+  Zone1,                   !- Zone or ZoneList Name
+  LIGHTING_SCHEDULE,       !- Schedule Name
+  Watts/Area,              !- Design Level Calculation Method
+  ,                        !- Lighting Level {W}
+  10.0, !- Watts per Zone Floor Area {W/m2}
+  ,                        !- Watts per Person {W/person}
+  0.0,                     !- Return Air Fraction
+  0.3,                     !- Fraction Radiant
+  0.2,                     !- Fraction Visible
+  ,                        !- Fraction Replaceable
+  General;                 !- End-Use Subcategory
+
+Coil:Cooling:DX:SingleSpeed,
+  Zone1_CoolingCoilDX,
+  Always On,
+  20000.0,
+  0.68,
+  3.2,
+  1.2;
+
+Coil:Heating:Fuel,
+  Zone1_HeatingCoil,       !- Name
+  Always On,               !- Availability Schedule Name
+  NaturalGas,              !- Fuel Type
+  0.9,                     !- Burner Efficiency
+  Autosize;                !- Nominal Capacity {W}
+
+ZoneInfiltration:DesignFlowRate,
+  Zone1_Infiltration,      !- Name
+  Zone1,                   !- Zone or ZoneList Name
+  Always On,               !- Schedule Name
+  Flow/Zone,               !- Design Flow Rate Calculation Method
+  0.05,                    !- Design Flow Rate {m3/s}
+  ,                        !- Flow per Zone Floor Area {m3/s-m2}
+  ,                        !- Flow per Exterior Surface Area {m3/s-m2}
+  ,                        !- Air Changes per Hour
+  1.0,                     !- Constant Term Coefficient
+  0.0,                     !- Temperature Term Coefficient
+  0.0,                     !- Velocity Term Coefficient
+  0.0;                     !- Velocity Squared Term Coefficient
+"""
+
+
+def test_parse_idf_round_trip():
+    """Rendering a parsed IDF without edits reproduces the input exactly."""
+    doc = parse_idf(BASELINE_IDF)
+    assert doc.render() == BASELINE_IDF
+    assert [obj.obj_type for obj in doc.objects][:2] == ['Version', 'Timestep']
+    lights = doc.objects_of_type('lights')[0]
+    assert lights.name == 'Zone1_Lights'
+    assert lights.fields[5] == '10.0'
+    assert lights.comments[5] == 'Watts per Zone Floor Area {W/m2}'
+
+
+def test_measure_overrides_edit_fields_by_index():
+    """Measures edit the targeted fields even when fields carry no comments."""
+    doc = parse_idf(BASELINE_IDF)
+    overrides = measure_field_overrides(ParametricModel(doc), [
+        RetrofitMeasureType.LIGHTING_LED,
+        RetrofitMeasureType.LIGHTING_CONTROLS,
+        RetrofitMeasureType.HVAC_EFFICIENCY,
+    ])
+    edited = parse_idf(doc.render(overrides))
+
+    # LED and controls compound: 10.0 * 0.6 * 0.85
+    assert float(edited.objects_of_type('Lights')[0].fields[5]) == 5.1
+    assert float(edited.objects_of_type('Coil:Cooling:DX:SingleSpeed')[0].fields[4]) == 4.0
+    # Burner efficiency is capped at 1.0; Autosize is left untouched
+    heating = edited.objects_of_type('Coil:Heating:Fuel')[0]
+    assert float(heating.fields[3]) == 1.0
+    assert heating.fields[4] == 'Autosize'
+    # Objects not touched by any measure keep their original text
+    infiltration = doc.objects_of_type('ZoneInfiltration:DesignFlowRate')[0]
+    assert infiltration.raw in doc.render(overrides)
+
+
+def test_measure_deltas_are_memoized_and_composed():
+    """Per-measure deltas are resolved once per baseline and reused by combinations."""
+    model = ParametricModel(parse_idf(BASELINE_IDF))
+    led = model.delta([ParametricEdit('Lights.power', scale=0.6)])
+    assert model.delta([ParametricEdit('Lights.power', scale=0.6)]) is led
+    # Only populated numeric fields are edited (Watts/Area populates field 5)
+    assert list(led) == [(2, 5)]
+
+    text = model.render(
+        [ParametricEdit('Lights.watts_per_area', scale=0.5)],
+        [ParametricEdit('Lights.watts_per_area', offset=1.0, maximum=5.5)],
+    )
+    assert float(parse_idf(text).objects_of_type('Lights')[0].fields[5]) == 5.5
+
+
+def test_apply_calibration_to_idf_edits_fields(tmp_path):
+    """Calibration factors scale fields by index and honour their bounds."""
+    idf_path = tmp_path / 'model.idf'
+    idf_path.write_text(BASELINE_IDF + """
+People,
+  Zone1_People,            !- Name
+  Zone1,                   !- Zone or ZoneList Name
+  OCCUPANCY_SCHEDULE,      !- Number of People Schedule Name
+  People,                  !- Number of People Calculation Method
+  3,                       !- Number of People
+  ,                        !- People per Zone Floor Area {person/m2}
+  ,                        !- Zone Floor Area per Person {m2/person}
+  0.3;                     !- Fraction Radiant
+
+Schedule:Compact,
+  Zone1_HeatingSetpoint,   !- Name
+  AnyNumber,               !- Schedule Type Limits Name
+  Through: 12/31,
+  For: AllDays,
+  Until: 7:00,
+  16.0,
+  Until: 24:00,
+  21.0;
+""")
+    calibrated = apply_calibration_to_idf(str(idf_path), {
+        'hvac_efficiency_multiplier': 1.5,
+        'infiltration_multiplier': 0.5,
+        'occupancy_multiplier': 0.2,
+    })
+    doc = parse_idf(Path(calibrated).read_text())
+
+    assert float(doc.objects_of_type('Coil:Cooling:DX:SingleSpeed')[0].fields[4]) == 4.8
+    assert float(doc.objects_of_type('Coil:Heating:Fuel')[0].fields[3]) == 1.0
+    assert float(doc.objects_of_type('ZoneInfiltration:DesignFlowRate')[0].fields[4]) == 0.025
+    assert doc.objects_of_type('People')[0].fields[4] == '1'
+    assert doc.objects_of_type('Schedule:Compact')[0].fields[5::2] == ['15', '16']
+
+
+def test_run_scenario_simulations_streams_progress(tmp_path, monkeypatch):
+    """Scenario results are recorded and reported as each simulation completes."""
+    baseline_path = tmp_path / 'baseline.idf'
+    baseline_path.write_text(BASELINE_IDF + "\n".join(f"Output:Variable,*,V{i},Hourly;" for i in range(10)))
+    weather_path = tmp_path / 'weather.epw'
+    weather_path.write_text('LOCATION,Test')
+
+    def fake_simulation(self, idf_file, weather_file, output_dir):
+        lpd = float(parse_idf(Path(idf_file).read_text()).objects_of_type('Lights')[0].fields[5])
+        return {'annual_kwh': 10000.0 * lpd, 'monthly_kwh': [0.0] * 12}
+
+    monkeypatch.setattr(RetrofitOptimizer, '_run_simulation', fake_simulation)
+
+    optimizer = RetrofitOptimizer(energyplus_path='energyplus')
+    scenarios = optimizer.generate_scenarios(
+        baseline_energy_kwh=100000,
+        floor_area_sf=10000,
+        max_measures_per_scenario=1
+    )[:3]
+
+    progress = []
+    optimizer.run_scenario_simulations(
+        scenarios,
+        str(baseline_path),
+        str(weather_path),
+        output_dir=str(tmp_path),
+        max_concurrent=1,
+        progress_callback=lambda done, total, scenario: progress.append((done, total, scenario.description))
+    )
+
+    assert [p[0] for p in progress] == [1, 2, 3]
+    assert all(p[1] == 3 for p in progress)
+    led = scenarios[0]
+    assert led.measures[0].measure_type == RetrofitMeasureType.LIGHTING_LED
+    assert led.simulated_energy_kwh == 60000.0
+    assert abs(led.energy_savings_percent - 40.0) < 1e-9
+    assert (tmp_path / 'retrofit_simulations' / 'scenario_1.idf').exists()
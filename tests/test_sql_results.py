@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test monthly meter extraction from EnergyPlus SQLite output and the
+vectorized calibration metrics.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from src.utils.sql_results import calibration_metrics, extract_energy_results, read_meter_series
+
+J = 3.6e6
+DAYS = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
+
+def _write_sql(path, legacy=False, hourly=False):
+    """Write a minimal eplusout.sql with run period, monthly and (optionally) hourly meters."""
+    data, dictionary, index = (
+        ('ReportMeterData', 'ReportMeterDataDictionary', 'ReportMeterDataDictionaryIndex')
+        if legacy else ('ReportData', 'ReportDataDictionary', 'ReportDataDictionaryIndex')
+    )
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE Time (TimeIndex INTEGER PRIMARY KEY, Month INTEGER, Day INTEGER, "
+                 "Hour INTEGER, WarmupFlag INTEGER, EnvironmentPeriodIndex INTEGER)")
+    conn.execute("CREATE TABLE EnvironmentPeriods (EnvironmentPeriodIndex INTEGER PRIMARY KEY, "
+                 "EnvironmentName TEXT, EnvironmentType INTEGER)")
+    conn.execute(f"CREATE TABLE {dictionary} ({index} INTEGER PRIMARY KEY, Name TEXT, ReportingFrequency TEXT)")
+    conn.execute(f"CREATE TABLE {data} (TimeIndex INTEGER, {index} INTEGER, Value REAL)")
+    conn.executemany("INSERT INTO EnvironmentPeriods VALUES (?, ?, ?)", [(1, 'WINTER DESIGN DAY', 1), (2, 'RUN PERIOD 1', 3)])
+    conn.executemany(f"INSERT INTO {dictionary} VALUES (?, ?, ?)", [
+        (1, 'Electricity:Facility', 'Run Period'),
+        (2, 'Electricity:Facility', 'Monthly'),
+        (3, 'NaturalGas:Facility', 'Monthly'),
+        (4, 'Electricity:Facility', 'Hourly'),
+    ])
+    rows, times = [], []
+    # Design day values must be ignored
+    times.append((1, 1, 21, 24, 0, 1))
+    rows += [(1, 2, 999 * J), (1, 3, 999 * J)]
+    for month in range(1, 13):
+        times.append((1 + month, month, DAYS[month - 1], 24, 0, 2))
+        rows += [(1 + month, 2, 1000.0 * month * J), (1 + month, 3, 50.0 * (13 - month) * J)]
+    times.append((14, 12, 31, 24, 0, 2))
+    rows.append((14, 1, 78000.0 * J))
+    if hourly:
+        times.append((15, 1, 1, 1, 1, 2))  # Warmup
+        rows.append((15, 4, 5.0 * J))
+        for hour in range(24):
+            times.append((16 + hour, 1, 1, hour + 1, 0, 2))
+            rows.append((16 + hour, 4, float(hour) * J))
+    conn.executemany("INSERT INTO Time VALUES (?, ?, ?, ?, ?, ?)", times)
+    conn.executemany(f"INSERT INTO {data} VALUES (?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def test_extract_energy_results_reads_monthly_meters(tmp_path):
+    """Monthly electricity and gas come from the meters, excluding design days."""
+    sql = tmp_path / 'eplusout.sql'
+    _write_sql(sql)
+    results = extract_energy_results(sql)
+
+    assert results['annual_kwh'] == 78000.0
+    assert results['monthly_measured']
+    assert results['monthly_kwh'] == [1000.0 * m for m in range(1, 13)]
+    assert results['monthly_gas_kwh'] == [50.0 * (13 - m) for m in range(1, 13)]
+    assert results['gas_annual_kwh'] == sum(50.0 * (13 - m) for m in range(1, 13))
+
+
+def test_legacy_schema_and_hourly_series(tmp_path):
+    """Pre-8.2 meter tables are supported; hourly series skip warmup rows."""
+    legacy = tmp_path / 'legacy.sql'
+    _write_sql(legacy, legacy=True)
+    assert read_meter_series(legacy)['Electricity:Facility']['annual'] == 78000.0
+
+    sql = tmp_path / 'hourly.sql'
+    _write_sql(sql, hourly=True)
+    results = extract_energy_results(sql, include_hourly=True)
+    assert results['hourly_kwh'] == [float(h) for h in range(24)]
+    # Monthly meter takes precedence over summing hourly values
+    assert results['monthly_kwh'][0] == 1000.0
+
+
+def test_run_period_only_falls_back_to_even_split(tmp_path):
+    """Without a sub-annual meter the monthly series is an even split, flagged as such."""
+    sql = tmp_path / 'eplusout.sql'
+    conn = sqlite3.connect(str(sql))
+    conn.execute("CREATE TABLE Time (TimeIndex INTEGER PRIMARY KEY, Month INTEGER, WarmupFlag INTEGER)")
+    conn.execute("CREATE TABLE ReportDataDictionary (ReportDataDictionaryIndex INTEGER PRIMARY KEY, Name TEXT, ReportingFrequency TEXT)")
+    conn.execute("CREATE TABLE ReportData (TimeIndex INTEGER, ReportDataDictionaryIndex INTEGER, Value REAL)")
+    conn.execute("INSERT INTO Time VALUES (1, 12, 0)")
+    conn.execute("INSERT INTO ReportDataDictionary VALUES (1, 'Electricity:Facility', 'RunPeriod')")
+    conn.execute("INSERT INTO ReportData VALUES (1, 1, ?)", (1200.0 * J,))
+    conn.commit()
+    conn.close()
+
+    results = extract_energy_results(sql)
+    assert results['annual_kwh'] == 1200.0
+    assert results['monthly_kwh'] == [100.0] * 12
+    assert not results['monthly_measured']
+    assert results['monthly_gas_kwh'] == []
+
+
+def test_calibration_metrics_match_definitions():
+    """MBE and CV(RMSE) match their element-wise definitions."""
+    rng = np.random.default_rng(0)
+    measured = rng.uniform(800, 1200, 12)
+    simulated = measured * rng.uniform(0.9, 1.1, 12)
+    metrics = calibration_metrics(simulated, measured)
+
+    errors = [s - m for s, m in zip(simulated, measured)]
+    mean = sum(measured) / 12
+    assert abs(metrics['mbe'] - abs(sum(errors) / 12 / mean * 100)) < 1e-9
+    assert abs(metrics['cvrmse'] - (sum(e * e for e in errors) / 12) ** 0.5 / mean * 100) < 1e-9
+    assert calibration_metrics([1.0] * 11, [1.0] * 12) == {'mbe': 0.0, 'cvrmse': 100.0}
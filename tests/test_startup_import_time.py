@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: importing the web interface must stay within an import
+budget and must not load optional subsystems (LLM SDKs, geocoder,
+generators) before they are used.
+
+The budget can be raised on slow machines with IDF_CREATOR_IMPORT_BUDGET_S.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+IMPORT_BUDGET_S = float(os.environ.get('IDF_CREATOR_IMPORT_BUDGET_S', '1.5'))
+
+# Loaded on first use only
+LAZY_MODULES = [
+    'openai',
+    'anthropic',
+    'geopy',
+    'shapely',
+    'src.professional_idf_generator',
+    'src.idf_generator',
+    'src.enhanced_location_fetcher',
+    'src.renewable_energy',
+    'src.equipment_catalog.adapters.bcl',
+]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import web_interface
+from main import IDFCreator
+IDFCreator(enhanced=True, professional=True)
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'loaded': [m for m in %r if m in sys.modules]}))
+"""
+
+
+def _probe() -> dict:
+    """Import the web interface in a fresh interpreter and report timing."""
+    output = subprocess.run(
+        [sys.executable, '-c', _PROBE % (LAZY_MODULES,)],
+        cwd=str(ROOT), capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_startup_stays_within_import_budget():
+    """Cold import plus creator construction fits the budget and defers optional subsystems."""
+    result = _probe()
+    print(f"Cold start: {result['seconds']:.3f}s (budget {IMPORT_BUDGET_S:.1f}s)")
+    assert result['loaded'] == []
+    assert result['seconds'] < IMPORT_BUDGET_S
+
+
+def test_subsystems_are_created_on_first_use():
+    """Creator subsystems are built on first access and can be replaced."""
+    from main import IDFCreator
+
+    creator = IDFCreator(enhanced=False, professional=True)
+    assert creator._idf_generator is None
+    generator = creator.idf_generator
+    assert type(generator).__name__ == 'ProfessionalIDFGenerator'
+    assert creator.idf_generator is generator
+
+    creator.location_fetcher = 'stub'
+    assert creator.location_fetcher == 'stub'
+
+
+if __name__ == "__main__":
+    test_startup_stays_within_import_budget()
+    test_subsystems_are_created_on_first_use()
+    print("✅ Startup import budget respected")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test the template artifact cache: schedules, envelope blocks and curves are
+rendered once per template key and can be warm-started from disk.
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from src.professional_idf_generator import ProfessionalIDFGenerator
+from src.utils.artifact_cache import TemplateArtifactCache
+
+
+def test_get_or_build_builds_once_per_key():
+    """A builder runs only on the first request for a key."""
+    cache = TemplateArtifactCache()
+    calls = []
+
+    def build():
+        calls.append(1)
+        return 'Schedule:Compact,A;'
+
+    assert cache.get_or_build('schedules', ('office', 'lobby'), build) == 'Schedule:Compact,A;'
+    assert cache.get_or_build('schedules', ('office', 'lobby'), build) == 'Schedule:Compact,A;'
+    assert cache.get_or_build('schedules', ('office', 'storage'), build) == 'Schedule:Compact,A;'
+    assert len(calls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_warm_start_from_disk(tmp_path):
+    """Saved artifacts are served by a new cache without rebuilding."""
+    path = tmp_path / 'artifacts.json'
+    cache = TemplateArtifactCache(str(path))
+    cache.get_or_build('materials', ('office', '5A', 2005, None), lambda: 'Material,X;')
+    cache.save()
+
+    warm = TemplateArtifactCache(str(path))
+    assert warm.get_or_build('materials', ('office', '5A', 2005, None), lambda: 'rebuilt') == 'Material,X;'
+    assert warm.misses == 0
+
+    # Corrupt files are ignored rather than failing generation
+    path.write_text('{not json')
+    assert len(TemplateArtifactCache(str(path))) == 0
+
+
+def test_generator_reuses_schedule_and_curve_blocks():
+    """Generators share rendered schedules and curves for the same template inputs."""
+    TemplateArtifactCache.clear_cache()
+    first = ProfessionalIDFGenerator()
+    second = ProfessionalIDFGenerator()
+    assert first.artifact_cache is second.artifact_cache
+
+    schedules = first.generate_schedules('office', ['lobby', 'office_open'])
+    assert 'LOBBY_OCCUPANCY' in schedules
+    assert second.generate_schedules('office', ['lobby', 'office_open']) is schedules
+    assert second.generate_schedules('office', ['lobby']) != schedules
+    assert second._generate_hvac_performance_curves() is first._generate_hvac_performance_curves()
+    TemplateArtifactCache.clear_cache()
+
+
+def test_envelope_blocks_are_keyed_on_code_era():
+    """Construction years within one code era share envelope blocks; another era renders its own."""
+    TemplateArtifactCache.clear_cache()
+    generator = ProfessionalIDFGenerator()
+    location = {'latitude': 41.88, 'longitude': -87.63, 'climate_zone': 'ASHRAE_C5', 'time_zone': -6,
+                'elevation': 180, 'weather_file': 'USA_IL_Chicago-OHare.Intl.AP.725300_TMY3.epw'}
+    envelope_keys = set()
+    for year in (1975, 1988, 2003, 2015):
+        np.random.seed(3)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generator.generate_professional_idf('x', {'building_type': 'Office', 'stories': 1, 'floor_area': 500,
+                                                      'year_built': year}, dict(location))
+        envelope_keys.add(frozenset(key for key in generator.artifact_cache._artifacts
+                                    if 'materials' in str(key) or 'constructions' in str(key)))
+    # Three legacy-era years add nothing after the first; the current-era year adds one pair
+    assert [len(keys) for keys in sorted(envelope_keys, key=len)] == [2, 4]
+    TemplateArtifactCache.clear_cache()
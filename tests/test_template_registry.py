@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test the process-wide template registry: libraries are loaded once and
+shared, per-building state is not.
+"""
+
+import sys
+from dataclasses import FrozenInstanceError
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from main import IDFCreator
+from src.professional_idf_generator import ProfessionalIDFGenerator
+from src.template_registry import TemplateRegistry
+
+
+def test_generators_share_template_libraries():
+    """Two generators reuse the same libraries but keep their own per-building state."""
+    first = ProfessionalIDFGenerator()
+    second = ProfessionalIDFGenerator()
+
+    assert first.registry is second.registry is TemplateRegistry.get_instance()
+    assert first.material_library is second.material_library
+    assert first.geometry_engine is second.geometry_engine
+    assert first.hvac_systems.hvac_templates is second.hvac_systems.hvac_templates
+
+    assert first.hvac_systems is not second.hvac_systems
+    assert first.hvac_systems.node_generator is first
+    assert first.hvac_plumbing is not second.hvac_plumbing
+
+
+def test_registry_is_immutable():
+    """Registry fields cannot be rebound."""
+    registry = TemplateRegistry.get_instance()
+    with pytest.raises(FrozenInstanceError):
+        registry.material_library = None
+
+
+def test_creators_share_building_estimator():
+    """Creators using the same configuration share one building estimator."""
+    first = IDFCreator(enhanced=False, professional=True)
+    second = IDFCreator(enhanced=False, professional=True)
+    assert first.building_estimator is second.building_estimator
+    assert first.idf_generator.material_library is second.idf_generator.material_library
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Test the uncertainty engine: Latin hypercube sampling of the default
+distributions, streaming EUI statistics, the results cache and the
+Morris / Sobol sensitivities.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+
+from src.uncertainty_analysis import (
+    EUIDistribution, UncertaintyAnalyzer, UncertaintyParameter, default_distributions, latin_hypercube
+)
+from src.utils.idf_utils import parse_idf
+
+
+BASE_IDF = """Version,24.2;
+
+BuildingSurface:Detailed,
+  Zone1_Floor,             !- Name
+  Floor,                   !- Surface Type
+  Floor_Construction,      !- Construction Name
+  Zone1,                   !- Zone Name
+  ,                        !- Space Name
+  Ground,                  !- Outside Boundary Condition
+  ,                        !- Outside Boundary Condition Object
+  NoSun,                   !- Sun Exposure
+  NoWind,                  !- Wind Exposure
+  ,                        !- View Factor to Ground
+  4,                       !- Number of Vertices
+  0.0, 0.0, 0.0,
+  0.0, 10.0, 0.0,
+  10.0, 10.0, 0.0,
+  10.0, 0.0, 0.0;
+
+Lights,
+  Zone1_Lights,            !- Name
+  Zone1,                   !- Zone or ZoneList Name
+  LIGHTING_SCHEDULE,       !- Schedule Name
+  Watts/Area,              !- Design Level Calculation Method
+  ,                        !- Lighting Level {W}
+  10.8,                    !- Watts per Zone Floor Area {W/m2}
+  ,                        !- Watts per Person {W/person}
+  0.0;                     !- Return Air Fraction
+
+ElectricEquipment,
+  Zone1_Equipment,         !- Name
+  Zone1,                   !- Zone or ZoneList Name
+  EQUIPMENT_SCHEDULE,      !- Schedule Name
+  Watts/Area,              !- Design Level Calculation Method
+  ,                        !- Design Level {W}
+  8.1,                     !- Watts per Zone Floor Area {W/m2}
+  ,                        !- Watts per Person {W/person}
+  0.0;                     !- Fraction Latent
+
+Coil:Cooling:DX:SingleSpeed,
+  Zone1_CoolingCoilDX,
+  Always On,
+  20000.0,
+  0.68,
+  3.5,
+  1.2;
+"""
+
+
+def _fake_simulation(calls):
+    """Annual energy dominated by lighting, insensitive to infiltration."""
+    def run(self, idf_file, weather_file, output_dir):
+        calls.append(str(output_dir))
+        doc = parse_idf(Path(idf_file).read_text())
+        lpd = float(doc.objects_of_type('Lights')[0].fields[5])
+        epd = float(doc.objects_of_type('ElectricEquipment')[0].fields[5])
+        cop = float(doc.objects_of_type('Coil:Cooling:DX:SingleSpeed')[0].fields[4])
+        annual = 2000.0 * lpd + 300.0 * epd + 1000.0 / cop
+        return {'annual_kwh': annual, 'monthly_kwh': [annual / 12.0] * 12, 'gas_annual_kwh': 0.0}
+    return run
+
+
+@pytest.fixture
+def model_files(tmp_path):
+    idf_path = tmp_path / 'base.idf'
+    idf_path.write_text(BASE_IDF)
+    weather_path = tmp_path / 'weather.epw'
+    weather_path.write_text('LOCATION,Test')
+    return idf_path, weather_path
+
+
+def test_default_distributions_follow_generator_inputs():
+    """Nominal values are the generator's; unknown age spans all construction eras."""
+    unknown = default_distributions('office')
+    assert unknown['lighting_power_density'].nominal == pytest.approx(10.8)
+    assert unknown['infiltration_rate'].low == pytest.approx(0.15)
+    assert unknown['infiltration_rate'].high > 1.0
+    assert unknown['heating_efficiency'].high <= 1.0
+
+    old = default_distributions('office', year_built=1970)
+    assert old['infiltration_rate'].nominal > unknown['infiltration_rate'].nominal
+    assert old['cooling_cop'].nominal < unknown['cooling_cop'].nominal
+
+
+def test_latin_hypercube_stratifies_each_dimension():
+    """Every stratum of every dimension holds exactly one point; samples stay in range."""
+    points = latin_hypercube(20, 3, np.random.default_rng(1))
+    for j in range(3):
+        assert sorted(np.floor(points[:, j] * 20).astype(int)) == list(range(20))
+
+    parameter = UncertaintyParameter('x', 'triangular', low=1.0, high=3.0, nominal=1.5)
+    values = parameter.ppf(points[:, 0])
+    assert values.min() >= 1.0 and values.max() <= 3.0
+    assert parameter.ppf(np.array([0.0, 1.0])).tolist() == [1.0, 3.0]
+
+
+def test_streaming_distribution_matches_numpy():
+    """Running mean, standard deviation and percentiles match the batch values."""
+    values = np.random.default_rng(2).normal(80.0, 8.0, 101)
+    distribution = EUIDistribution()
+    for value in values:
+        distribution.add(float(value))
+    assert distribution.mean == pytest.approx(values.mean())
+    assert distribution.std == pytest.approx(values.std(ddof=1))
+    for q in (10, 50, 90):
+        assert distribution.percentile(q) == pytest.approx(np.percentile(values, q))
+
+
+def test_monte_carlo_streams_percentiles_and_reuses_cache(model_files, tmp_path, monkeypatch):
+    """Runs report P10/P50/P90 as they complete; repeated parameter sets come from the cache."""
+    idf_path, weather_path = model_files
+    calls = []
+    monkeypatch.setattr(UncertaintyAnalyzer, '_run_simulation', _fake_simulation(calls))
+
+    analyzer = UncertaintyAnalyzer(energyplus_path='energyplus', cache_path=str(tmp_path / 'results.json'))
+    progress = []
+    result = analyzer.monte_carlo_analysis(
+        str(idf_path), str(weather_path), n_iterations=40, max_concurrent=1, seed=5,
+        output_dir=str(tmp_path / 'mc'), progress_callback=lambda done, total, summary: progress.append(summary)
+    )
+
+    assert result.sample_size == 40 and len(calls) == 40
+    assert len(progress) == 40 and progress[-1]['p50'] == pytest.approx(result.percentile_50)
+    assert result.percentile_10 < result.percentile_50 < result.percentile_90
+    assert result.confidence_intervals['90%'] == (result.percentile_5, result.percentile_95)
+    assert result.sensitivity_ranking[0]['parameter'] == 'lighting_power_density'
+    assert result.sensitivity_ranking[0]['correlation'] > 0.8
+    assert 'UNCERTAINTY ANALYSIS REPORT' in analyzer.generate_report(result)
+
+    # EUI over the 100 m² floor surface, from the sampled values applied as multipliers
+    samples = {name: np.array(values) for name, values in result.parameter_samples.items()}
+    cop_nominal = analyzer.default_distributions['cooling_cop'].nominal
+    annual = 2000.0 * samples['lighting_power_density'] + 300.0 * samples['equipment_power_density'] \
+        + 1000.0 / (3.5 * samples['cooling_cop'] / cop_nominal)
+    assert np.allclose(result.eui_samples, annual * 3.412 / (100.0 * 10.7639), rtol=1e-4)
+
+    # Same seed with a fresh analyzer: everything is served by the persisted cache
+    calls.clear()
+    again = UncertaintyAnalyzer(energyplus_path='energyplus', cache_path=str(tmp_path / 'results.json'))
+    repeat = again.monte_carlo_analysis(str(idf_path), str(weather_path), n_iterations=40,
+                                        max_concurrent=1, seed=5, output_dir=str(tmp_path / 'mc'))
+    assert calls == []
+    assert repeat.cached_runs == 40
+    assert repeat.eui_samples == result.eui_samples
+
+
+def test_morris_and_sobol_identify_dominant_parameter(model_files, tmp_path, monkeypatch):
+    """Both screening methods rank lighting first and infiltration as inert."""
+    idf_path, weather_path = model_files
+    monkeypatch.setattr(UncertaintyAnalyzer, '_run_simulation', _fake_simulation([]))
+    analyzer = UncertaintyAnalyzer(energyplus_path='energyplus')
+
+    morris = analyzer.morris_screening(str(idf_path), str(weather_path), trajectories=6,
+                                       max_concurrent=1, seed=1, output_dir=str(tmp_path))
+    assert morris[0]['parameter'] == 'lighting_power_density'
+    assert next(item for item in morris if item['parameter'] == 'infiltration_rate')['mu_star'] == 0.0
+
+    sobol = analyzer.sobol_indices(str(idf_path), str(weather_path), n_base=32,
+                                   max_concurrent=1, seed=1, output_dir=str(tmp_path))
+    assert sobol['lighting_power_density']['total_order'] > 0.5
+    assert sobol['infiltration_rate']['total_order'] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_cache_keys_on_rendered_edits():
+    """Parameter sets key on the edits they render, not on names and sampled values."""
+    from src.uncertainty_analysis import SimulationResultCache
+
+    lpd = UncertaintyParameter('lpd', 'uniform', 5.0, 15.0, nominal=10.0, targets=('lighting_power_density',))
+    renamed = UncertaintyParameter('lights', 'uniform', 5.0, 15.0, nominal=10.0,
+                                   targets=('lighting_power_density',))
+    other_nominal = UncertaintyParameter('lpd', 'uniform', 5.0, 15.0, nominal=12.0,
+                                         targets=('lighting_power_density',))
+    capped = UncertaintyParameter('lpd', 'uniform', 5.0, 15.0, nominal=10.0,
+                                  targets=('lighting_power_density',), maximum=12.0)
+
+    def key(parameter, value):
+        return SimulationResultCache.make_key('model', 'weather', parameter.edits(value))
+
+    assert key(lpd, 12.0) == key(renamed, 12.0)
+    assert key(lpd, 12.0) != key(other_nominal, 12.0)
+    assert key(lpd, 12.0) != key(capped, 12.0)
+    assert key(lpd, 12.0) != key(lpd, 11.0)
+
+
+def test_failed_sequential_samples_are_recorded(model_files, tmp_path, monkeypatch):
+    """A sample that raises in this process is excluded like a failed pool run."""
+    idf_path, weather_path = model_files
+    calls = []
+    simulate = _fake_simulation(calls)
+
+    def flaky(self, idf_file, weather_file, output_dir):
+        if len(calls) == 3:
+            calls.append('failed')
+            raise RuntimeError('EnergyPlus crashed')
+        return simulate(self, idf_file, weather_file, output_dir)
+
+    monkeypatch.setattr(UncertaintyAnalyzer, '_run_simulation', flaky)
+    analyzer = UncertaintyAnalyzer(energyplus_path='energyplus')
+    result = analyzer.monte_carlo_analysis(str(idf_path), str(weather_path), n_iterations=10,
+                                           max_concurrent=1, seed=3, output_dir=str(tmp_path))
+    assert result.failed_runs == 1 and result.sample_size == 9
+    assert 'failed and were excluded' in analyzer.generate_report(result)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test batched window placement: orientation sectors, WWR sizing, vertex order
+matched to parent walls and the zone-center fallback.
+"""
+
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+from shapely import affinity
+from shapely.geometry import Polygon
+
+from src.advanced_geometry_engine import ZoneGeometry
+from src.geometry_utils import calculate_surface_normal, fix_vertex_ordering_for_wall
+from src.professional_idf_generator import ORIENTATION_ORDER, ProfessionalIDFGenerator
+
+
+def _zone(name, polygon, floor_level=0):
+    return ZoneGeometry(name=name, polygon=polygon, floor_level=floor_level, height=3.0,
+                        area=polygon.area, perimeter=polygon.length)
+
+
+def _walls(zone, reverse=()):
+    """Wall surfaces as the geometry engine builds them; listed edges use the opposite order."""
+    coords = list(zone.polygon.exterior.coords[:-1])
+    z_bottom = zone.floor_level * 3.0
+    walls = []
+    for i, (x1, y1) in enumerate(coords):
+        x2, y2 = coords[(i + 1) % len(coords)]
+        vertices = [(x1, y1, z_bottom), (x2, y2, z_bottom), (x2, y2, z_bottom + 3.0), (x1, y1, z_bottom + 3.0)]
+        if i in reverse:
+            vertices = vertices[::-1]
+        walls.append({'name': f"{zone.name}_Wall_{i + 1}", 'surface_type': 'Wall',
+                      'vertices': [f"{x:.4f},{y:.4f},{z:.4f}" for x, y, z in vertices]})
+    return walls
+
+
+def _vertices(window):
+    return [tuple(float(part) for part in vertex.split(',')) for vertex in window['vertices']]
+
+
+def _area(vertices):
+    (x1, y1, z1), (x2, y2, _), _, (_, _, z4) = vertices
+    return math.hypot(x2 - x1, y2 - y1) * abs(z4 - z1)
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return ProfessionalIDFGenerator()
+
+
+def test_vectorized_orientation_matches_scalar(generator):
+    """Every direction, including exact and rounded diagonals, lands in the scalar sector."""
+    angles = np.concatenate([np.linspace(0, 2 * math.pi, 721), np.random.default_rng(0).uniform(0, 2 * math.pi, 2000)])
+    dx, dy = 7.0710678118654755 * np.cos(angles), 7.0710678118654755 * np.sin(angles)
+    dx = np.concatenate([dx, [1.0, -1.0, 1.0, -1.0, -8.881784197001252e-16, 7.0710678118654755]])
+    dy = np.concatenate([dy, [1.0, 1.0, -1.0, -1.0, -14.142135623730951, -7.071067811865475]])
+
+    batched = generator._orientations_from_vectors(dx, dy)
+    assert [ORIENTATION_ORDER[i] for i in batched] == [
+        generator._orientation_from_vector(x, y) for x, y in zip(dx.tolist(), dy.tolist())]
+
+
+def test_windows_meet_oriented_wwr_targets(generator):
+    """Each wall gets one ribbon window sized to its orientation's WWR; short walls get none."""
+    zone = _zone('Office_1', Polygon([(0, 0), (30, 0), (30, 20), (1.5, 20), (0, 20)]))
+    windows = generator._generate_windows([zone], None, 'office', {'wwr': 0.3, 'wwr_s': 0.4}, _walls(zone))
+
+    assert [w['name'] for w in windows] == ['Office_1_Window_1', 'Office_1_Window_2',
+                                            'Office_1_Window_3', 'Office_1_Window_5']
+    areas = {w['building_surface_name']: _area(_vertices(w)) for w in windows}
+    assert areas['Office_1_Wall_2'] == pytest.approx(0.3 * 20 * 3.0, rel=1e-3)
+    # The edge running in -x gets the south ratio under the generator's convention
+    assert areas['Office_1_Wall_3'] == pytest.approx(0.4 * 28.5 * 3.0, rel=1e-3)
+    assert areas['Office_1_Wall_1'] == pytest.approx(0.3 * 30 * 3.0, rel=1e-3)
+    for window in windows:
+        z = [v[2] for v in _vertices(window)]
+        assert min(z) >= 0.45 - 1e-4 and max(z) <= 2.55 + 1e-4
+
+
+def test_window_vertex_order_follows_parent_wall(generator):
+    """Windows share their wall's normal, whichever way the wall lists its vertices."""
+    zone = _zone('Core_2', affinity.rotate(Polygon([(0, 0), (24, 0), (24, 16), (0, 16)]), 45, origin='centroid'),
+                 floor_level=2)
+    walls = _walls(zone, reverse={1, 2})
+    windows = generator._generate_windows([zone], None, 'office', {}, walls)
+    assert len(windows) == 4
+
+    by_name = {wall['name']: wall for wall in walls}
+    for window in windows:
+        wall_vertices = [tuple(float(p) for p in v.split(',')) for v in by_name[window['building_surface_name']]['vertices']]
+        wall_normal = calculate_surface_normal(wall_vertices)
+        window_normal = calculate_surface_normal(_vertices(window))
+        assert sum(a * b for a, b in zip(wall_normal, window_normal)) == pytest.approx(1.0, abs=1e-3)
+
+
+def test_windows_without_walls_face_away_from_zone(generator):
+    """Without a parent wall the order matches fix_vertex_ordering_for_wall."""
+    zone = _zone('Perimeter_1', Polygon([(0, 0), (12, 0), (18, 9), (6, 14), (-3, 8)]))
+    center = (sum(x for x, _ in zone.polygon.exterior.coords[:-1]) / 5,
+              sum(y for _, y in zone.polygon.exterior.coords[:-1]) / 5)
+    for window in generator._generate_windows([zone], None, 'retail', {}):
+        vertices = _vertices(window)
+        assert fix_vertex_ordering_for_wall(vertices, center) == vertices
+
+
+def test_hundreds_of_facade_segments_place_quickly(generator):
+    """A finely segmented curved facade over many floors is placed in one pass."""
+    ring = [(60 * math.cos(2 * math.pi * i / 120), 40 * math.sin(2 * math.pi * i / 120)) for i in range(120)]
+    zones = [_zone(f"Tower_{floor}", Polygon(ring), floor_level=floor) for floor in range(20)]
+    surfaces = [wall for zone in zones for wall in _walls(zone)]
+
+    start = time.perf_counter()
+    windows = generator._generate_windows(zones, None, 'office', {}, surfaces)
+    elapsed = time.perf_counter() - start
+
+    assert len(windows) == 120 * 20
+    assert elapsed < 2.0
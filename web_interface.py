@@ -7,9 +7,12 @@ Deployed: iteration3 (e53d3eb) - Railway auto-deploy trigger
 """
 
 from flask import Flask, render_template_string, request, jsonify, send_file
+import hashlib
 import os
 import sys
 import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 # Add src to path - ensure app root is in Python path
@@ -22,6 +25,7 @@ os.environ.setdefault('PYTHONPATH', str(app_root))
 from src.nlp_building_parser import BuildingDescriptionParser
 from src.document_parser import DocumentParser
 from src.location_fetcher import GeocodingError
+from src.core.instrumentation import MetricsRegistry, collect_metrics
 from main import IDFCreator
 
 app = Flask(__name__)
@@ -284,9 +288,188 @@ def api_health():
         'version': '1.0.0'
     })
 
+GEOCODING_FAILED_MESSAGE = (
+    'Geocoding failed: Could not find real coordinates for the provided address. '
+    'Please provide a valid address with city and state information.'
+)
+
+# Directory the API writes generated IDF files to (served by /download/<filename>)
+API_OUTPUT_DIR = Path('artifacts/desktop_files/idf')
+
+
+# Description parsers by (LLM provider, API key hash), least recently used first
+_description_parsers = OrderedDict()
+_description_parsers_lock = threading.Lock()
+MAX_DESCRIPTION_PARSERS = 32
+
+
+def get_description_parser(llm_provider='none', llm_api_key=None):
+    """Shared description parser for an LLM provider and key ('none': pattern matching only)"""
+    use_llm = bool(llm_provider != 'none' and llm_api_key)
+    # Keys are only held by the parsers' own clients, never as dictionary keys
+    key = (llm_provider, hashlib.sha256(llm_api_key.encode('utf-8')).hexdigest()) if use_llm else ('none', None)
+    with _description_parsers_lock:
+        parser = _description_parsers.get(key)
+        if parser is not None:
+            _description_parsers.move_to_end(key)
+            return parser
+        parser = _description_parsers[key] = BuildingDescriptionParser(
+            use_llm=use_llm,
+            llm_provider=llm_provider if use_llm else 'openai',
+            api_key=llm_api_key
+        )
+        while len(_description_parsers) > MAX_DESCRIPTION_PARSERS:
+            _description_parsers.popitem(last=False)
+    return parser
+
+
+def _api_user_params(data):
+    """Merge description-derived and explicit parameters of an /api/generate request"""
+    description = data.get('description')
+    llm_provider = data.get('llm_provider', 'none')
+    llm_api_key = data.get('llm_api_key', None)
+    strict_real = bool(data.get('strict_real_data', False))
+    
+    # Use NLP parsing if description provided
+    # Handle None description - convert to empty string
+    if description is None:
+        description = ''
+    
+    if description:
+        nlp_parser = get_description_parser(llm_provider, llm_api_key)
+        result = nlp_parser.process_and_generate_idf(description, data.get('address'))
+        idf_params = result['idf_parameters']
+    else:
+        idf_params = {}
+    
+    # Check for user_params in request, or extract direct parameters
+    user_params_request = data.get('user_params', {})
+    
+    # Merge parameters: user_params from request > direct parameters > parsed from description
+    # Apply safe defaults for all numeric parameters
+    stories = user_params_request.get('stories') or data.get('stories') or idf_params.get('stories')
+    floor_area_confirmed = bool(
+        user_params_request.get('floor_area_confirmed')
+        or data.get('floor_area_confirmed')
+        or idf_params.get('floor_area_confirmed')
+    )
+    floor_area = user_params_request.get('floor_area') or data.get('floor_area') or idf_params.get('floor_area')
+    building_type = user_params_request.get('building_type') or data.get('building_type') or idf_params.get('building_type') or 'Building'
+    
+    # Ensure numeric values are valid (not None and > 0)
+    story_provided = stories is not None and stories > 0
+    floor_area_provided = floor_area is not None and floor_area > 0
+
+    # Normalize invalid values to None so downstream logic can fall back to real data
+    if not story_provided:
+        stories = None
+    if not floor_area_provided:
+        floor_area = None
+    elif not floor_area_confirmed:
+        print(f"⚠️  Ignoring unconfirmed floor area override ({floor_area} m²). Real footprint data will be used instead.")
+        floor_area = None
+        floor_area_provided = False
+    
+    user_params = {}
+    if building_type:
+        user_params['building_type'] = building_type
+    if story_provided:
+        user_params['stories'] = stories
+    if floor_area_provided and floor_area_confirmed:
+        user_params['floor_area'] = floor_area
+        user_params['floor_area_source'] = 'user_confirmed'
+    elif floor_area_provided and not floor_area_confirmed:
+        user_params['floor_area_override_rejected'] = True
+    
+    # Also check for floor_area_per_story_m2
+    if user_params_request.get('floor_area_per_story_m2') or data.get('floor_area_per_story_m2'):
+        user_params['floor_area_per_story_m2'] = user_params_request.get('floor_area_per_story_m2') or data.get('floor_area_per_story_m2')
+    
+    if strict_real:
+        user_params['strict_real_data'] = True
+    return user_params
+
+
+def _create_api_idf(address, user_params, name_suffix='api'):
+    """Generate the IDF for an API request and move it to API_OUTPUT_DIR; returns the filename"""
+    creator = IDFCreator(enhanced=True, professional=True)
+    
+    # Create temporary output file
+    temp_dir = tempfile.mkdtemp()
+    building_name = (user_params.get('building_type') or 'Building').replace(' ', '_')
+    output_file = f"{building_name}_{name_suffix}.idf"
+    output_path = os.path.join(temp_dir, output_file)
+    
+    created_path = creator.create_idf(
+        address=address,
+        user_params=user_params,
+        output_path=output_path
+    )
+    
+    # Move to persistent location
+    API_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    final_path = API_OUTPUT_DIR / output_file
+    import shutil
+    shutil.move(created_path, final_path)
+    return output_file
+
+
+def _run_generation_job(job):
+    """Job runner: the /api/generate pipeline for one queued request"""
+    data = job.request
+    with collect_metrics() as metrics:
+        user_params = _api_user_params(data)
+        output_file = _create_api_idf(data['address'], user_params, name_suffix=f"api_{job.job_id[:12]}")
+    result = {
+        'filename': output_file,
+        'download_url': f'/api/jobs/{job.job_id}/idf',
+        'parameters_used': user_params,
+        'output_path': str(API_OUTPUT_DIR / output_file),
+    }
+    if data.get('include_metrics'):
+        result['metrics'] = metrics.to_dict()
+    return result
+
+
+_job_manager = None
+
+
+def get_job_manager():
+    """Background job manager, started on first use (workers: $IDF_CREATOR_JOB_WORKERS)"""
+    global _job_manager
+    if _job_manager is None:
+        from src.generation_jobs import GenerationJobManager
+        _job_manager = GenerationJobManager(
+            _run_generation_job,
+            max_workers=int(os.getenv('IDF_CREATOR_JOB_WORKERS', '4'))
+        )
+    return _job_manager
+
+
+def _job_view(job):
+    """JSON view of a job with links and the user-facing geocoding message"""
+    view = job.to_dict()
+    view['status_url'] = f'/api/jobs/{job.job_id}'
+    view['events_url'] = f'/api/jobs/{job.job_id}/events'
+    if job.output_path:
+        view['download_url'] = f'/api/jobs/{job.job_id}/idf'
+    if job.error and job.error.get('type') == 'GeocodingError':
+        view['error']['message'] = GEOCODING_FAILED_MESSAGE
+    return view
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Pipeline stage timings, object counts and output bytes in Prometheus text format"""
+    return app.response_class(
+        MetricsRegistry.get_instance().render_prometheus(),
+        mimetype='text/plain; version=0.0.4'
+    )
+
 @app.route('/api/generate', methods=['POST'])
 def api_generate_idf():
-    """API endpoint for JSON requests"""
+    """API endpoint for JSON requests (add "async": true to run it as a background job,
+    "include_metrics": true to get per-stage timings with the response)"""
     try:
         data = request.get_json()
         
@@ -297,117 +480,37 @@ def api_generate_idf():
             }), 400
         
         address = data.get('address')
-        description = data.get('description')
-        llm_provider = data.get('llm_provider', 'none')
-        llm_api_key = data.get('llm_api_key', None)
-        strict_real = bool(data.get('strict_real_data', False))
-        
         if not address:
             return jsonify({
                 'success': False,
                 'error': 'Address is required'
             }), 400
         
-        # Use NLP parsing if description provided
-        # Handle None description - convert to empty string
-        if description is None:
-            description = ''
-        
-        if description:
-            use_llm = llm_provider != 'none' and llm_api_key
-            nlp_parser = BuildingDescriptionParser(
-                use_llm=use_llm,
-                llm_provider=llm_provider if use_llm else 'openai',
-                api_key=llm_api_key
-            )
-            result = nlp_parser.process_and_generate_idf(description, address)
-            idf_params = result['idf_parameters']
-        else:
-            idf_params = {}
-        
-        # Check for user_params in request, or extract direct parameters
-        user_params_request = data.get('user_params', {})
-        
-        # Merge parameters: user_params from request > direct parameters > parsed from description
-        # Apply safe defaults for all numeric parameters
-        stories = user_params_request.get('stories') or data.get('stories') or idf_params.get('stories')
-        floor_area_confirmed = bool(
-            user_params_request.get('floor_area_confirmed')
-            or data.get('floor_area_confirmed')
-            or idf_params.get('floor_area_confirmed')
-        )
-        floor_area = user_params_request.get('floor_area') or data.get('floor_area') or idf_params.get('floor_area')
-        building_type = user_params_request.get('building_type') or data.get('building_type') or idf_params.get('building_type') or 'Building'
-        
-        # Ensure numeric values are valid (not None and > 0)
-        story_provided = stories is not None and stories > 0
-        floor_area_provided = floor_area is not None and floor_area > 0
-
-        # Normalize invalid values to None so downstream logic can fall back to real data
-        if not story_provided:
-            stories = None
-        if not floor_area_provided:
-            floor_area = None
-        elif not floor_area_confirmed:
-            print(f"⚠️  Ignoring unconfirmed floor area override ({floor_area} m²). Real footprint data will be used instead.")
-            floor_area = None
-            floor_area_provided = False
-        
-        user_params = {}
-        if building_type:
-            user_params['building_type'] = building_type
-        if story_provided:
-            user_params['stories'] = stories
-        if floor_area_provided and floor_area_confirmed:
-            user_params['floor_area'] = floor_area
-            user_params['floor_area_source'] = 'user_confirmed'
-        elif floor_area_provided and not floor_area_confirmed:
-            user_params['floor_area_override_rejected'] = True
-        
-        # Also check for floor_area_per_story_m2
-        if user_params_request.get('floor_area_per_story_m2') or data.get('floor_area_per_story_m2'):
-            user_params['floor_area_per_story_m2'] = user_params_request.get('floor_area_per_story_m2') or data.get('floor_area_per_story_m2')
-        
-        if strict_real:
-            user_params['strict_real_data'] = True
-        
-        # Generate IDF
-        creator = IDFCreator(enhanced=True, professional=True)
-        
-        # Create temporary output file
-        temp_dir = tempfile.mkdtemp()
-        building_name = (user_params.get('building_type') or 'Building').replace(' ', '_')
-        output_file = f"{building_name}_api.idf"
-        output_path = os.path.join(temp_dir, output_file)
-        
-        created_path = creator.create_idf(
-            address=address,
-            user_params=user_params,
-            output_path=output_path
-        )
-        
-        # Move to persistent location
-        persistent_dir = Path('artifacts/desktop_files/idf')
-        persistent_dir.mkdir(parents=True, exist_ok=True)
+        if data.get('async') or request.args.get('async') in ('1', 'true'):
+            return api_submit_job()
         
-        final_path = persistent_dir / output_file
-        import shutil
-        shutil.move(created_path, final_path)
+        with collect_metrics() as metrics:
+            user_params = _api_user_params(data)
+            output_file = _create_api_idf(address, user_params)
         
-        return jsonify({
+        response = {
             'success': True,
             'message': 'IDF file generated successfully',
             'filename': output_file,
             'download_url': f'/download/{output_file}',
             'parameters_used': user_params
-        })
+        }
+        if data.get('include_metrics'):
+            # Per-stage timings, object counts and output size of this request
+            response['metrics'] = metrics.to_dict()
+        return jsonify(response)
         
     except GeocodingError as e:
         return jsonify({
             'success': False,
             'error': str(e),
             'type': 'GeocodingError',
-            'message': 'Geocoding failed: Could not find real coordinates for the provided address. Please provide a valid address with city and state information.'
+            'message': GEOCODING_FAILED_MESSAGE
         }), 400
     except Exception as e:
         import traceback
@@ -421,6 +524,101 @@ def api_generate_idf():
             'traceback': error_traceback if app.debug else None
         }), 500
 
+@app.route('/api/jobs', methods=['POST'])
+def api_submit_job():
+    """Queue an /api/generate request and return its job ID immediately"""
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({
+            'success': False,
+            'error': 'No data provided'
+        }), 400
+    if not data.get('address'):
+        return jsonify({
+            'success': False,
+            'error': 'Address is required'
+        }), 400
+    
+    job = get_job_manager().submit(dict(data))
+    response = jsonify({'success': True, **_job_view(job)})
+    response.status_code = 202
+    response.headers['Location'] = f'/api/jobs/{job.job_id}'
+    return response
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def api_job_status(job_id):
+    """Poll the status and stage progress of a job"""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': f'Unknown job: {job_id}'}), 404
+    return jsonify({'success': True, **_job_view(job)})
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def api_job_events(job_id):
+    """Server-sent events: one 'progress' event per change, then 'done'"""
+    import json
+    manager = get_job_manager()
+    job = manager.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': f'Unknown job: {job_id}'}), 404
+    
+    def stream():
+        seen_version = -1
+        while True:
+            if job.version != seen_version:
+                seen_version = job.version
+                view = _job_view(job)
+                yield f"event: progress\ndata: {json.dumps(view)}\n\n"
+                if job.finished:
+                    yield f"event: done\ndata: {json.dumps(view)}\n\n"
+                    return
+            elif not manager.wait_for_change(job, seen_version, timeout=15.0):
+                # Keep proxies from closing an idle connection
+                yield ": keepalive\n\n"
+    
+    return app.response_class(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+
+@app.route('/api/jobs/<job_id>/idf', methods=['GET'])
+def api_job_download(job_id):
+    """Stream the generated IDF of a finished job (gzip-encoded when the client accepts it)"""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': f'Unknown job: {job_id}'}), 404
+    if not job.output_path or not os.path.exists(job.output_path):
+        return jsonify({'success': False, **_job_view(job), 'error': job.error or 'IDF not available yet'}), 409
+    
+    path = job.output_path
+    chunk_size = 64 * 1024
+    use_gzip = 'gzip' in (request.headers.get('Accept-Encoding') or '').lower()
+    
+    def stream():
+        import zlib
+        # wbits=31 writes a gzip container
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if use_gzip else None
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                if compressor is None:
+                    yield chunk
+                else:
+                    compressed = compressor.compress(chunk)
+                    if compressed:
+                        yield compressed
+        if compressor is not None:
+            yield compressor.flush()
+    
+    headers = {
+        'Content-Disposition': f'attachment; filename="{os.path.basename(path)}"',
+        'Vary': 'Accept-Encoding',
+    }
+    if use_gzip:
+        headers['Content-Encoding'] = 'gzip'
+    else:
+        headers['Content-Length'] = str(os.path.getsize(path))
+    return app.response_class(stream(), mimetype='application/octet-stream', headers=headers)
+
 @app.route('/generate', methods=['POST'])
 def generate_idf():
     """Generate IDF from JSON or form data"""
@@ -494,20 +692,14 @@ def generate_idf():
         # Parse description with optional LLM (only if description provided)
         idf_params = {}
         if description:
-            use_llm = llm_provider != 'none' and llm_api_key
-            nlp_parser = BuildingDescriptionParser(
-                use_llm=use_llm,
-                llm_provider=llm_provider if use_llm else 'openai',
-                api_key=llm_api_key
-            )
+            nlp_parser = get_description_parser(llm_provider, llm_api_key)
             result = nlp_parser.process_and_generate_idf(description, address)
             idf_params = result['idf_parameters']
         
-        # Parse documents if any
+        # Parse documents if any (in this request thread: a process pool per
+        # upload costs more than it saves for a few form documents)
         if document_paths:
-            doc_parser = DocumentParser()
-            for doc_path in document_paths:
-                doc_params = doc_parser.parse_document(doc_path)
+            for doc_params in DocumentParser(max_workers=1).parse_documents(document_paths):
                 idf_params.update(doc_params)
         
         # Merge parameters: JSON/form params > parsed from description